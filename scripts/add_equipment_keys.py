@@ -4,88 +4,37 @@ Add equipment_key to exercises in golden set JSON files
 Based on equipment catalog from migration 20260110170000
 """
 
+import argparse
 import json
 import os
-import re
+import sys
 from pathlib import Path
 
-# Equipment mapping based on exercise name patterns
-EQUIPMENT_MAPPING = {
-    # Barbell exercises
-    r'(?i)^(back squat|front squat|deadlift|bb |barbell|sumo deadlift|clean|snatch|overhead press|bench press|row.*barbell|hip thrust.*bb|elevated deadlift)': 'barbell',
-
-    # Dumbbell exercises (pair for bilateral, single for unilateral)
-    r'(?i)^(db |dumbbell|one arm.*row|single arm)': 'dumbbell',
-    r'(?i)^(dbs |dumbbells)': 'dumbbell_pair',
-
-    # Kettlebell
-    r'(?i)^(kb |kettlebell|swing|turkish get)': 'kettlebell',
-
-    # Rowing machine
-    r'(?i)^(row|c2 row|rowing|concept2|erg)': 'rowing_machine',
-
-    # Cardio machines
-    r'(?i)^(assault bike|air bike|ab )': 'assault_bike',
-    r'(?i)^(bike|cycle)': 'bike',
-    r'(?i)^(treadmill|run.*treadmill)': 'treadmill',
-    r'(?i)^(ski erg)': 'ski_erg',
-
-    # Cable/machines
-    r'(?i)^(cable|lat pulldown|leg press|machine|pallof press)': 'cable_machine',
-
-    # Bodyweight equipment
-    r'(?i)^(pull.?up|chin.?up)': 'pull_up_bar',
-    r'(?i)^(dip|bar dip)': 'dip_station',
-    r'(?i)^(ring|muscle up)': 'rings',
-
-    # Bands
-    r'(?i)^(band|resistance band|mini band)': 'resistance_band',
-
-    # Recovery/Mobility
-    r'(?i)^(foam roll|fr )': 'foam_roller',
-    r'(?i)^(lacrosse|lacrosse ball)': 'lacrosse_ball',
-    r'(?i)^(massage ball)': 'massage_ball',
-    r'(?i)^(pvc|dowel)': 'pvc_pipe',
-
-    # Functional equipment
-    r'(?i)^(slam ball)': 'slam_ball',
-    r'(?i)^(wall ball|wb )': 'wall_ball',
-    r'(?i)^(medicine ball|med ball)': 'medicine_ball',
-    r'(?i)^(jump rope|rope|double under|du)': 'jump_rope',
-    r'(?i)^(box jump|box step|step up)': 'box',
-    r'(?i)^(sandbag)': 'sandbag',
-    r'(?i)^(sled)': 'sled',
-
-    # Specialty
-    r'(?i)^(landmine)': 'landmine',
-    r'(?i)^(trx)': 'trx',
-    r'(?i)^(ab wheel)': 'ab_wheel',
-
-    # Bodyweight (must be last as it's the fallback for many exercises)
-    r'(?i)^(bw |bodyweight|air squat|push.?up|plank|burpee|sit.?up|bridge|lunge|step|walk|jog|run(?!.*treadmill)|sprint|breathing|stretch|mobility|hip switch|ankle|knee|dead bug|groiner|squat to stand|mcgill|glute bridge|hip airplane|calf raise|toe walk|heel walk|quad smash|hamstring)': 'bodyweight',
-}
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from lib.equipment_taxonomy import get_taxonomy  # noqa: E402
+from lib.lru import LRUCache  # noqa: E402
+from lib.workout_model import Block, Item, Session, Workout  # noqa: E402
+
+# Exercise names repeat heavily across logs, so classification is memoized.
+# The taxonomy casefolds names, so the lowercased name is a safe key.
+DEFAULT_CACHE_SIZE = 4096
+equipment_cache = LRUCache(DEFAULT_CACHE_SIZE)
 
 def determine_equipment(exercise_name: str) -> str:
     """Determine equipment_key based on exercise name"""
     if not exercise_name:
         return 'bodyweight'
 
-    # Check each pattern
-    for pattern, equipment_key in EQUIPMENT_MAPPING.items():
-        if re.search(pattern, exercise_name):
-            return equipment_key
-
-    # Default to bodyweight if no match
-    return 'bodyweight'
+    return equipment_cache.get_or_compute(exercise_name.lower(), get_taxonomy().resolve)
 
-def add_equipment_to_exercise(exercise: dict, path_context: str = "") -> tuple[dict, str]:
+def add_equipment_to_exercise(exercise: Item, path_context: str = "") -> tuple[Item, str]:
     """Add equipment_key to an exercise if missing. Returns (exercise, action_taken)"""
     if 'equipment_key' in exercise:
         return exercise, "already_present"
 
-    exercise_name = exercise.get('exercise_name', '')
+    exercise_name = exercise.exercise_name or ''
     equipment_key = determine_equipment(exercise_name)
-    exercise['equipment_key'] = equipment_key
+    exercise.equipment_key = equipment_key
 
     action = f"Added '{equipment_key}' to '{exercise_name}' {path_context}"
     return exercise, action
@@ -93,10 +42,12 @@ def add_equipment_to_exercise(exercise: dict, path_context: str = "") -> tuple[d
 def process_items(items: list, block_label: str = "") -> list[str]:
     """Process items in a block, return list of actions"""
     actions = []
-    if not items:
+    if not isinstance(items, list):
         return actions
 
     for idx, item in enumerate(items):
+        if not isinstance(item, Item):
+            continue
         context = f"(block {block_label}, item {idx+1})"
 
         # Check if item has exercise_name directly
@@ -106,8 +57,10 @@ def process_items(items: list, block_label: str = "") -> list[str]:
                 actions.append(action)
 
         # Check for exercise_options (array of exercises)
-        if 'exercise_options' in item and isinstance(item['exercise_options'], list):
-            for opt_idx, option in enumerate(item['exercise_options']):
+        if isinstance(item.exercise_options, list):
+            for opt_idx, option in enumerate(item.exercise_options):
+                if not isinstance(option, Item):
+                    continue
                 opt_context = f"(block {block_label}, item {idx+1}, option {opt_idx+1})"
                 _, action = add_equipment_to_exercise(option, opt_context)
                 if action != "already_present":
@@ -122,32 +75,33 @@ def process_workout_file(filepath: Path) -> tuple[bool, list[str]]:
     """
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+            workout = Workout.from_json(json.load(f))
 
         actions = []
         modified = False
 
-        # Navigate through sessions -> blocks -> items
-        if 'sessions' not in data:
+        if not isinstance(workout, Workout) or workout.sessions is None:
             return False, ["No sessions found"]
 
-        for session_idx, session in enumerate(data['sessions']):
-            if 'blocks' not in session:
+        # Navigate through sessions -> blocks -> items
+        for session in workout.sessions:
+            if not isinstance(session, Session) or not isinstance(session.blocks, list):
                 continue
 
-            for block_idx, block in enumerate(session['blocks']):
-                block_label = block.get('block_label', f"#{block_idx+1}")
+            for block_idx, block in enumerate(session.blocks):
+                if not isinstance(block, Block):
+                    continue
+                block_label = block.block_label if 'block_label' in block else f"#{block_idx+1}"
 
-                if 'items' in block:
-                    block_actions = process_items(block['items'], block_label)
-                    actions.extend(block_actions)
-                    if block_actions:
-                        modified = True
+                block_actions = process_items(block.items, block_label)
+                actions.extend(block_actions)
+                if block_actions:
+                    modified = True
 
         # Write back if modified
         if modified:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
+                json.dump(workout.to_json(), f, indent=4, ensure_ascii=False)
 
         return modified, actions
 
@@ -156,6 +110,14 @@ def process_workout_file(filepath: Path) -> tuple[bool, list[str]]:
 
 def main():
     """Main function to process all golden set files"""
+    global equipment_cache
+
+    parser = argparse.ArgumentParser(description="Add equipment_key to golden set exercises")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Max distinct exercise names kept in the lookup cache (default: {DEFAULT_CACHE_SIZE})")
+    args = parser.parse_args()
+    equipment_cache = LRUCache(args.cache_size)
+
     golden_set_dir = Path(__file__).parent.parent / 'data' / 'golden_set'
 
     if not golden_set_dir.exists():
@@ -195,6 +157,9 @@ def main():
     print(f"  Files processed: {len(json_files)}")
     print(f"  Files modified: {total_modified}")
     print(f"  Total equipment_keys added: {total_actions}")
+    print(f"  Equipment lookup cache: {equipment_cache.hits} hits, {equipment_cache.misses} misses, "
+          f"{equipment_cache.evictions} evictions ({equipment_cache.hit_rate:.1f}% hit rate, "
+          f"{len(equipment_cache)}/{equipment_cache.maxsize} entries)")
 
     # Print equipment key reference
     print("\n" + "=" * 80)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Benchmark: set-based validate_catalog_references vs the PL/pgSQL loop
+=====================================================================
+Seeds a synthetic exercise catalog (10k exercises + aliases by default) and
+a workout with 200 prescription steps inside one transaction, then times:
+
+- before: frozen copy of the nested-loop function (per-step NOT EXISTS on
+  LOWER(...), no expression indexes) created in pg_temp
+- after:  zamm.validate_catalog_references from migration
+          20260112110000_set_based_catalog_validation.sql, with its indexes
+
+Both must return the same rows. Everything is rolled back at the end.
+Needs a local Postgres with the migrations applied (DSN: --dsn or $DATABASE_URL).
+
+Usage: python3 scripts/benchmarks/bench_catalog_validation.py [--exercises 10000] [--steps 200]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.db import connect  # noqa: E402
+
+LOWER_INDEXES = (
+    'idx_exercise_catalog_display_name_lower',
+    'idx_exercise_catalog_key_lower',
+    'idx_exercise_aliases_alias_lower',
+    'idx_equipment_aliases_alias',
+)
+
+# Frozen copy of the pre-20260112 function. Only change: the catalog column is
+# display_name (lib_exercise_catalog has no exercise_name column).
+LEGACY_FUNCTION = """
+CREATE FUNCTION pg_temp.validate_catalog_references_legacy(parsed_json JSONB)
+RETURNS TABLE (is_valid BOOLEAN, severity TEXT, field TEXT, issue TEXT, location TEXT, value TEXT)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_session JSONB;
+    v_block JSONB;
+    v_step JSONB;
+    v_exercise_name TEXT;
+    v_equipment_key TEXT;
+    v_session_idx INT := 0;
+    v_block_idx INT := 0;
+    v_step_idx INT := 0;
+BEGIN
+    FOR v_session IN SELECT * FROM jsonb_array_elements(parsed_json->'sessions')
+    LOOP
+        v_session_idx := v_session_idx + 1;
+        v_block_idx := 0;
+        FOR v_block IN SELECT * FROM jsonb_array_elements(v_session->'blocks')
+        LOOP
+            v_block_idx := v_block_idx + 1;
+            v_step_idx := 0;
+            IF v_block->'prescription' ? 'steps' THEN
+                FOR v_step IN SELECT * FROM jsonb_array_elements(v_block->'prescription'->'steps')
+                LOOP
+                    v_step_idx := v_step_idx + 1;
+                    v_exercise_name := v_step->>'exercise_name';
+                    IF v_exercise_name IS NOT NULL THEN
+                        IF NOT EXISTS (
+                            SELECT 1 FROM zamm.lib_exercise_catalog
+                            WHERE LOWER(display_name) = LOWER(v_exercise_name)
+                        ) AND NOT EXISTS (
+                            SELECT 1 FROM zamm.lib_exercise_aliases
+                            WHERE LOWER(alias) = LOWER(v_exercise_name)
+                        ) THEN
+                            RETURN QUERY SELECT
+                                FALSE, 'error', 'exercise_name',
+                                format('Exercise "%s" not found in catalog', v_exercise_name),
+                                format('Session %s, Block %s, Step %s', v_session_idx, v_block_idx, v_step_idx),
+                                v_exercise_name;
+                        END IF;
+                    END IF;
+                    v_equipment_key := v_step->>'equipment_key';
+                    IF v_equipment_key IS NOT NULL THEN
+                        IF NOT EXISTS (
+                            SELECT 1 FROM zamm.lib_equipment_catalog
+                            WHERE equipment_key = v_equipment_key
+                        ) AND NOT EXISTS (
+                            SELECT 1 FROM zamm.lib_equipment_aliases
+                            WHERE alias = v_equipment_key
+                        ) THEN
+                            RETURN QUERY SELECT
+                                FALSE, 'error', 'equipment_key',
+                                format('Equipment "%s" not found in catalog', v_equipment_key),
+                                format('Session %s, Block %s, Step %s', v_session_idx, v_block_idx, v_step_idx),
+                                v_equipment_key;
+                        END IF;
+                    END IF;
+                END LOOP;
+            END IF;
+        END LOOP;
+    END LOOP;
+    IF NOT FOUND THEN
+        RETURN QUERY SELECT TRUE, 'info', NULL::TEXT, 'All catalog references are valid', NULL::TEXT, NULL::TEXT;
+    END IF;
+END;
+$$;
+"""
+
+SEED_CATALOG = """
+INSERT INTO zamm.lib_exercise_catalog (exercise_key, display_name, category, is_active)
+SELECT %(prefix)s || '_ex_' || g, 'Bench Exercise ' || %(prefix)s || ' ' || g, 'strength', true
+FROM generate_series(1, %(exercises)s) AS g
+"""
+
+SEED_ALIASES = """
+INSERT INTO zamm.lib_exercise_aliases (alias, exercise_key, locale)
+SELECT 'bex ' || %(prefix)s || ' ' || g, %(prefix)s || '_ex_' || g, 'en'
+FROM generate_series(1, %(exercises)s) AS g
+"""
+
+
+def build_workout(prefix: str, exercises: int, steps: int, equipment_keys, rng: random.Random):
+    """~60% catalog names (random case), ~20% aliases, ~20% unknown; steps spread over blocks of 20"""
+    step_list = []
+    for index in range(steps):
+        roll = rng.random()
+        number = rng.randint(1, exercises)
+        if roll < 0.6:
+            name = f"Bench Exercise {prefix} {number}"
+            name = name.upper() if rng.random() < 0.3 else name
+        elif roll < 0.8:
+            name = f"BEX {prefix} {number}"
+        else:
+            name = f"Unknown Movement {index}"
+        step = {'exercise_name': name}
+        if equipment_keys and rng.random() < 0.7:
+            step['equipment_key'] = rng.choice(equipment_keys) if rng.random() < 0.9 else f"unknown_gear_{index}"
+        step_list.append(step)
+
+    blocks = []
+    for start in range(0, steps, 20):
+        blocks.append({'block_code': 'STR', 'prescription': {'steps': step_list[start:start + 20]}})
+    return {'sessions': [{'blocks': blocks}]}
+
+
+def time_calls(cur, sql: str, payload: str, repeat: int):
+    rows = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cur.execute(sql, (payload,))
+        rows = cur.fetchall()
+    return (time.perf_counter() - start) / repeat, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--exercises', type=int, default=10000)
+    parser.add_argument('--steps', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--dsn')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    prefix = f"bench{rng.randrange(10 ** 6)}"
+    conn = connect(args.dsn)
+    cur = conn.cursor()
+    try:
+        cur.execute(SEED_CATALOG, {'prefix': prefix, 'exercises': args.exercises})
+        cur.execute(SEED_ALIASES, {'prefix': prefix, 'exercises': args.exercises})
+        cur.execute("SELECT equipment_key FROM zamm.lib_equipment_catalog")
+        equipment_keys = [row[0] for row in cur.fetchall()]
+        cur.execute(LEGACY_FUNCTION)
+        cur.execute("ANALYZE zamm.lib_exercise_catalog")
+        cur.execute("ANALYZE zamm.lib_exercise_aliases")
+
+        payload = json.dumps(build_workout(prefix, args.exercises, args.steps, equipment_keys, rng))
+
+        after_time, after_rows = time_calls(
+            cur, "SELECT * FROM zamm.validate_catalog_references(%s::jsonb)", payload, args.repeat)
+
+        for index in LOWER_INDEXES:
+            cur.execute(f"DROP INDEX IF EXISTS zamm.{index}")
+        before_time, before_rows = time_calls(
+            cur, "SELECT * FROM pg_temp.validate_catalog_references_legacy(%s::jsonb)", payload, args.repeat)
+    finally:
+        conn.rollback()
+        conn.close()
+
+    assert [tuple(r) for r in before_rows] == [tuple(r) for r in after_rows], "set-based results differ from legacy"
+
+    errors = sum(1 for row in after_rows if row[1] == 'error')
+    print(f"Catalog:      {args.exercises} exercises + {args.exercises} aliases (rolled back)")
+    print(f"Workout:      {args.steps} steps, {errors} unknown references (parity checked)")
+    print(f"Before loop:  {before_time * 1000:9.2f} ms/validation")
+    print(f"After (set):  {after_time * 1000:9.2f} ms/validation  {before_time / after_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
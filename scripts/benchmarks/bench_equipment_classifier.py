@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compiled equipment classifier vs legacy pattern loop
+===============================================================
+Classifies exercise names taken from the golden set and raw log lines with
+the original nested loop (lower() per pattern per name), the compiled
+EquipmentClassifier, and its batch classify_many(). Asserts all three agree.
+
+Usage: python3 scripts/benchmarks/bench_equipment_classifier.py [--names 200000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.equipment import CLASSIFIER, EQUIPMENT_MAP  # noqa: E402
+
+DATA_DIR = SCRIPTS_DIR.parent / 'data'
+
+
+def legacy_get_equipment_key(exercise_name):
+    """Frozen copy of the pre-compiled implementation"""
+    if not exercise_name:
+        return 'bodyweight'
+    name = ' ' + exercise_name + ' '
+    for equip_key, patterns in EQUIPMENT_MAP.items():
+        for pattern in patterns:
+            if pattern.lower() in name.lower():
+                return equip_key
+    return 'bodyweight'
+
+
+def collect_names() -> List[str]:
+    names = []
+
+    def walk(obj: Any):
+        if isinstance(obj, dict):
+            if isinstance(obj.get('exercise_name'), str):
+                names.append(obj['exercise_name'])
+            for value in obj.values():
+                walk(value)
+        elif isinstance(obj, list):
+            for value in obj:
+                walk(value)
+
+    for path in sorted((DATA_DIR / 'golden_set').glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            walk(json.load(f))
+    # Raw log lines give a much wider (and messier) sample for the parity check
+    for path in sorted((DATA_DIR / 'raw_logs').glob('*.txt')):
+        with open(path, 'r', encoding='utf-8') as f:
+            names.extend(line.strip() for line in f if line.strip())
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--names', type=int, default=200000)
+    args = parser.parse_args()
+
+    sample = collect_names()
+    mismatches = [n for n in sample if legacy_get_equipment_key(n) != CLASSIFIER.classify(n)]
+    assert not mismatches, f"classifier disagrees on: {mismatches[:5]}"
+
+    names = [sample[i % len(sample)] for i in range(args.names)]
+
+    start = time.perf_counter()
+    legacy = [legacy_get_equipment_key(n) for n in names]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [CLASSIFIER.classify(n) for n in names]
+    compiled_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = CLASSIFIER.classify_many(names)
+    batch_time = time.perf_counter() - start
+
+    assert legacy == compiled == batch
+
+    print(f"Names classified:     {len(names)} ({len(set(sample))} distinct, parity checked)")
+    print(f"Legacy loop:          {legacy_time:.3f}s  ({legacy_time / len(names) * 1e6:.2f} µs/name)")
+    print(f"Compiled classify():  {compiled_time:.3f}s  ({compiled_time / len(names) * 1e6:.2f} µs/name)  {legacy_time / compiled_time:.1f}x")
+    print(f"classify_many():      {batch_time:.3f}s  ({batch_time / len(names) * 1e6:.2f} µs/name)  {legacy_time / batch_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: nested JSON scan vs the columnar set fact table
+==========================================================
+Builds --workouts workouts from the golden-set files that record performed
+sets (spread over --athletes athletes and a year of dates, loads jittered),
+exports them with lib/fact_table and runs the same query both ways:
+
+- scan:  walk every parsed workout dict (sessions → blocks → items → sets)
+- facts: FactTable.select over the memory-mapped .npy columns
+
+Query: one athlete's Back Squat sets of at least 100 kg since 2025-07-01.
+Asserts both return the same sets.
+
+Usage: python3 scripts/benchmarks/bench_fact_table.py [--workouts 20000] [--athletes 20]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib import fact_table  # noqa: E402
+from lib.fact_table import FactTable, FactTableBuilder, flatten_workout  # noqa: E402
+
+GOLDEN_SET_DIR = SCRIPTS_DIR.parent / 'data' / 'golden_set'
+QUERY = {'exercise_name': 'Back Squat', 'date_from': '2025-07-01', 'min_load_kg': 100}
+
+
+def build_corpus(count: int, athletes: int, rng: random.Random):
+    templates = []
+    for path in sorted(GOLDEN_SET_DIR.glob('*.json')):
+        raw = path.read_text(encoding='utf-8')
+        if any(True for _ in flatten_workout(json.loads(raw), path.name)):
+            templates.append(raw)
+    corpus = []
+    for i in range(count):
+        data = json.loads(templates[i % len(templates)])
+        data['athlete_id'] = f"athlete_{i % athletes:03d}"
+        data['workout_date'] = (date(2025, 1, 1) + timedelta(days=rng.randrange(365))).isoformat()
+        for set_values in _iter_sets(data):
+            load = set_values.get('load')
+            if isinstance(load, dict) and isinstance(load.get('value'), (int, float)):
+                load['value'] = round(load['value'] * rng.uniform(0.85, 1.15), 1)
+        corpus.append(data)
+    return corpus
+
+
+def _iter_sets(data):
+    for session in data.get('sessions', []):
+        for block in session.get('blocks', []):
+            for item in block.get('items', []):
+                sets = (item.get('performed') or {}).get('sets')
+                for set_values in sets if isinstance(sets, list) else ():
+                    yield set_values
+
+
+def scan(corpus, athlete):
+    """The query as a nested walk (what a JSONB/JSON scan has to do)"""
+    found = []
+    for number, data in enumerate(corpus):
+        if data.get('athlete_id') != athlete or data.get('workout_date', '') < QUERY['date_from']:
+            continue
+        for session in data.get('sessions', []):
+            for block in session.get('blocks', []):
+                for item in block.get('items', []):
+                    if item.get('exercise_name', '').casefold() != QUERY['exercise_name'].casefold():
+                        continue
+                    for row in fact_table.iter_set_rows(item.get('performed')):
+                        if row['load_kg'] is not None and row['load_kg'] >= QUERY['min_load_kg']:
+                            found.append((number, row['set_index']))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workouts', type=int, default=20000)
+    parser.add_argument('--athletes', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    if fact_table.np is None:
+        print("NumPy not installed: pip install numpy")
+        return 1
+
+    corpus = build_corpus(args.workouts, args.athletes, random.Random(args.seed))
+    athlete = 'athlete_003'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / 'facts'
+        start = time.perf_counter()
+        builder = FactTableBuilder()
+        for number, data in enumerate(corpus):
+            builder.add_workout(data, source=f'workout_{number}.json')
+        builder.write(directory)
+        export_time = time.perf_counter() - start
+        size = sum(path.stat().st_size for path in directory.iterdir())
+
+        start = time.perf_counter()
+        expected = scan(corpus, athlete)
+        scan_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        table = FactTable(directory)
+        open_time = time.perf_counter() - start
+        start = time.perf_counter()
+        rows = table.select(athlete=athlete, **QUERY)
+        query_time = time.perf_counter() - start
+
+        workouts, set_index = table.column('workout')[rows].tolist(), table.column('set_index')[rows].tolist()
+        assert sorted(zip(workouts, set_index)) == sorted(expected), 'fact table and scan disagree'
+
+        print(f"Corpus:  {len(corpus)} workouts, {len(table)} sets, {args.athletes} athletes")
+        print(f"Export:  {export_time:.2f}s, {size / 1e6:.1f} MB on disk ({size / max(len(table), 1):.0f} B/set)")
+        print(f"Scan:    {scan_time * 1000:9.1f} ms  {len(expected)} sets (parsed dicts already in memory)")
+        print(f"Facts:   {query_time * 1000:9.1f} ms  {len(rows)} sets (+{open_time * 1000:.1f} ms to open)  "
+              f"{scan_time / query_time:.0f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fast-path prescription line parser
+=============================================
+Coverage and accuracy: every .txt/.json pair in data/golden_set is run
+through lib/line_parser.preparse_lines. Each fast-path item is matched to a
+golden item of the same block by exercise name, and its prescription is
+compared field by field after both sides are put in the canonical v3.2 shape
+(target_load/load_unit → target_weight, rest_sec → target_rest,
+"8/8" / target_reps_per_side → target_reps + target_sets_per_side: 1,
+durations in seconds).
+
+- coverage: golden items produced by the fast path (the rest go to the agent)
+- accuracy: matched items whose compared fields all agree
+- extras:   fast-path items with no golden counterpart in a block that has items
+
+Throughput: preparse_lines over every session body in data/raw_logs.
+
+Usage: python3 scripts/benchmarks/bench_line_parser.py [--repeat 5] [--verbose]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.line_parser import preparse_lines  # noqa: E402
+from lib.raw_logs import iter_logs  # noqa: E402
+
+DATA_DIR = SCRIPTS_DIR.parent / 'data'
+
+COMPARED_FIELDS = (
+    'target_sets', 'target_reps', 'target_reps_min', 'target_reps_max', 'target_sets_per_side',
+    'target_weight', 'target_duration', 'target_distance', 'target_rest',
+    'target_rpe', 'target_rpe_min', 'target_rpe_max',
+    'target_stroke_rate', 'target_stroke_rate_min', 'target_stroke_rate_max',
+)
+SECONDS = {'sec': 1, 'min': 60, 'hours': 3600}
+RENAMED = {
+    'rest_sec': 'target_rest',
+    'target_spm': 'target_stroke_rate',
+    'target_spm_min': 'target_stroke_rate_min',
+    'target_spm_max': 'target_stroke_rate_max',
+}
+
+
+def canonical(prescription: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    p = dict(prescription or {})
+    for old, new in RENAMED.items():
+        if old in p:
+            p[new] = p.pop(old)
+    if isinstance(p.get('target_rest'), (int, float)):
+        p['target_rest'] = {'value': p['target_rest'], 'unit': 'sec'}
+    if 'target_load' in p:
+        load, unit = p.pop('target_load'), p.pop('load_unit', 'kg')
+        p['target_weight'] = load if isinstance(load, dict) else {'value': load, 'unit': unit}
+    if 'target_reps_per_side' in p:
+        p['target_reps'] = p.pop('target_reps_per_side')
+        p['target_sets_per_side'] = 1
+    reps = p.get('target_reps')
+    if isinstance(reps, str):
+        if re.fullmatch(r'\d+/\d+', reps):
+            p['target_reps'] = int(reps.split('/')[0])
+            p['target_sets_per_side'] = 1
+        elif re.fullmatch(r'\d+-\d+', reps):
+            low, high = reps.split('-')
+            del p['target_reps']
+            p['target_reps_min'], p['target_reps_max'] = int(low), int(high)
+    for field in ('target_duration', 'target_rest'):
+        value = p.get(field)
+        if isinstance(value, dict) and value.get('unit') in SECONDS:
+            factor = SECONDS[value['unit']]
+            p[field] = {k: v * factor for k, v in value.items() if k != 'unit'}
+    return {field: p[field] for field in COMPARED_FIELDS if p.get(field) is not None}
+
+
+def _tokens(name: Optional[str]) -> set:
+    return set(re.findall(r'[a-z0-9]+', (name or '').lower().replace('-', '')))
+
+
+def name_score(a: Optional[str], b: Optional[str]) -> float:
+    left, right = _tokens(a), _tokens(b)
+    if not left or not right:
+        return 0.0
+    if left <= right or right <= left:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def golden_blocks(workout: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    blocks: Dict[str, List[Dict[str, Any]]] = {}
+    for session in workout.get('sessions') or []:
+        for block in session.get('blocks') or []:
+            blocks.setdefault(block.get('block_label') or '', []).extend(block.get('items') or [])
+    return blocks
+
+
+def evaluate_pair(txt_path: Path, json_path: Path, stats: Counter, fields: Counter, verbose: bool):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        blocks = golden_blocks(json.load(f))
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        results = preparse_lines(f.read().splitlines())
+
+    stats['golden_items'] += sum(len(items) for items in blocks.values())
+    used = set()
+    for result in results:
+        if result['block'] is None:
+            continue
+        stats['lines'] += 1
+        item = result['item']
+        if item is None:
+            continue
+        stats['fast_path_items'] += 1
+
+        label = result['block'] if result['block'] in blocks else result['block'][:1]
+        candidates = [(name_score(item['exercise_name'], golden.get('exercise_name')), index)
+                      for index, golden in enumerate(blocks.get(label, [])) if (label, index) not in used]
+        score, index = max(candidates, default=(0.0, None))
+        if index is None or score < 0.5:
+            if blocks.get(label):
+                stats['extras'] += 1
+                if verbose:
+                    print(f"  + {txt_path.name} {label}: {result['text']!r} (no golden item)")
+            continue
+
+        used.add((label, index))
+        golden = blocks[label][index]
+        stats['matched'] += 1
+        expected, actual = canonical(golden.get('prescription')), canonical(item['prescription'])
+        for field in set(expected) | set(actual):
+            fields[field, expected.get(field) == actual.get(field)] += 1
+        if expected == actual:
+            stats['exact'] += 1
+        elif verbose:
+            print(f"  ≠ {txt_path.name} {label}: {result['text']!r}\n      golden {expected}\n      parsed {actual}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5, help="Throughput passes over data/raw_logs")
+    parser.add_argument('--verbose', '-v', action='store_true', help="Show mismatches and extras")
+    args = parser.parse_args()
+
+    stats: Counter = Counter()
+    fields: Counter = Counter()
+    pairs = [(txt, txt.with_suffix('.json')) for txt in sorted((DATA_DIR / 'golden_set').glob('*.txt'))
+             if txt.with_suffix('.json').exists()]
+    for txt_path, json_path in pairs:
+        evaluate_pair(txt_path, json_path, stats, fields, args.verbose)
+
+    bodies = [record.body.splitlines() for record in iter_logs(sorted((DATA_DIR / 'raw_logs').glob('*.txt')))]
+    line_count = parsed = 0
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        line_count = parsed = 0
+        for body in bodies:
+            for result in preparse_lines(body):
+                line_count += 1
+                parsed += result['item'] is not None
+    elapsed = (time.perf_counter() - start) / args.repeat
+
+    golden = stats['golden_items'] or 1
+    matched = stats['matched'] or 1
+    print(f"Golden pairs:   {len(pairs)} ({stats['golden_items']} golden items, {stats['lines']} block lines)")
+    print(f"Fast path:      {stats['fast_path_items']} items, {stats['extras']} without a golden counterpart")
+    print(f"Coverage:       {stats['matched']}/{stats['golden_items']} golden items "
+          f"({stats['matched'] / golden:.0%}); the rest go to the agent")
+    print(f"Accuracy:       {stats['exact']}/{stats['matched']} matched items exact ({stats['exact'] / matched:.0%})")
+    for field in COMPARED_FIELDS:
+        right, wrong = fields[field, True], fields[field, False]
+        if right or wrong:
+            print(f"  {field:<24} {right:>4}/{right + wrong:<4} agree")
+    print(f"Raw logs:       {line_count} lines in {len(bodies)} sessions, {parsed} parsed on the fast path "
+          f"({parsed / max(line_count, 1):.0%})")
+    print(f"Throughput:     {line_count / elapsed:,.0f} lines/s ({elapsed * 1000:.1f} ms per pass)")
+
+
+if __name__ == '__main__':
+    main()
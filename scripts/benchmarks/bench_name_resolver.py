@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark: in-memory name resolver lookups
+==========================================
+Builds an exercise catalog from data/reference/catalog_snapshot.json when
+present, else from the golden-set exercise names padded with synthetic
+"<modifier> <movement>" names to --catalog entries, then times --lookups
+lookups of catalog names with log-style damage:
+
+- variant: case, doubled spaces, non-breaking hyphen / underscores (exact after lookup_key)
+- typo:    one deletion, duplication, substitution or adjacent transposition
+
+the last --repeat lookups again (typos now served by the fuzzy-result LRU),
+and one resolve_workout call per golden-set workout. --verify queries are
+checked against a brute-force edit-distance scan of the whole catalog
+(top-1 score must agree).
+
+Usage: python3 scripts/benchmarks/bench_name_resolver.py [--lookups 10000] [--catalog 3000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.name_resolver import (DEFAULT_SNAPSHOT, MIN_SCORE, NameResolver, edit_distance,  # noqa: E402
+                               lookup_key, workout_names)
+
+GOLDEN_SET_DIR = SCRIPTS_DIR.parent / 'data' / 'golden_set'
+
+MODIFIERS = ['Single Arm', 'Single Leg', 'Dumbbell', 'Kettlebell', 'Barbell', 'Banded', 'Incline', 'Decline',
+             'Tempo', 'Paused', 'Deficit', 'Half Kneeling', 'Seated', 'Standing', 'Cable', 'Landmine',
+             'Alternating', 'Isometric', 'Eccentric', 'Weighted']
+MOVEMENTS = ['Row', 'Press', 'Squat', 'Deadlift', 'Lunge', 'Curl', 'Pulldown', 'Fly', 'Carry', 'Step Up',
+             'Hip Thrust', 'Split Squat', 'Good Morning', 'Pull Apart', 'Shrug', 'Raise', 'Extension',
+             'Rotation', 'Bridge', 'Chop']
+
+
+def load_workouts():
+    workouts = []
+    for path in sorted(GOLDEN_SET_DIR.glob('*.json')):
+        try:
+            workouts.append(json.loads(path.read_text(encoding='utf-8')))
+        except ValueError:
+            continue
+    return workouts
+
+
+def build_catalog(workouts, size: int):
+    if DEFAULT_SNAPSHOT.exists():
+        return json.loads(DEFAULT_SNAPSHOT.read_text(encoding='utf-8'))
+    names = {}
+    for data in workouts:
+        for name in workout_names(data)[0]:
+            names.setdefault(lookup_key(name), name)
+    for modifier in MODIFIERS:
+        for movement in MOVEMENTS:
+            for suffix in ('', ' (Tempo 3010)', ' to Box', ' with Pause', ' on Bench'):
+                if len(names) >= size:
+                    break
+                name = f"{modifier} {movement}{suffix}"
+                names.setdefault(lookup_key(name), name)
+    return {'exercises': [{'exercise_key': key.replace(' ', '_'), 'display_name': name}
+                          for key, name in names.items()]}
+
+
+def damage(name: str, rng: random.Random):
+    """(query, kind) for a catalog name"""
+    if rng.random() < 0.5:
+        variant = rng.choice([name.upper(), name.lower(), name.replace(' ', '  '),
+                              name.replace(' ', '‑'), name.replace(' ', '_')])
+        return variant, 'variant'
+    chars = list(name)
+    i = rng.randrange(len(chars) - 1)
+    operation = rng.choice(('delete', 'double', 'substitute', 'transpose'))
+    if operation == 'delete':
+        del chars[i]
+    elif operation == 'double':
+        chars.insert(i, chars[i])
+    elif operation == 'substitute':
+        chars[i] = rng.choice('abcdefghijklmnopqrstuvwxyz')
+    else:
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    return ''.join(chars), 'typo'
+
+
+def brute_force(lookups, query: str):
+    """Best edit similarity >= MIN_SCORE over every catalog name (0.0 if none)"""
+    query = lookup_key(query)
+    best = 0.0
+    for candidate in lookups:
+        longest = max(len(query), len(candidate))
+        limit = int(longest * (1 - MIN_SCORE) + 1e-9)
+        distance = edit_distance(query, candidate, limit)
+        if distance <= limit:
+            best = max(best, 1 - distance / longest)
+    return round(best, 3)
+
+
+def percentile(values, fraction):
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lookups', type=int, default=10000)
+    parser.add_argument('--catalog', type=int, default=3000)
+    parser.add_argument('--repeat', type=int, default=2000)
+    parser.add_argument('--verify', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    workouts = load_workouts()
+    snapshot = build_catalog(workouts, args.catalog)
+    start = time.perf_counter()
+    resolver = NameResolver.from_snapshot(snapshot)
+    build_time = time.perf_counter() - start
+    index = resolver.exercises
+
+    names = [row['display_name'] for row in snapshot['exercises'] if len(row.get('display_name') or '') > 3]
+    queries = [damage(rng.choice(names), rng) for _ in range(args.lookups)]
+
+    timings = {'variant': [], 'typo': []}
+    resolved = {'variant': 0, 'typo': 0}
+    results = []
+    start_all = time.perf_counter()
+    for query, kind in queries:
+        start = time.perf_counter()
+        matches = index.search(query)
+        timings[kind].append(time.perf_counter() - start)
+        resolved[kind] += bool(matches)
+        results.append(matches)
+    total_time = time.perf_counter() - start_all
+    first_pass_hits = index.cache.hits
+
+    # The most recent queries again: typos are answered from the fuzzy-result LRU
+    recent = queries[-args.repeat:]
+    start = time.perf_counter()
+    for query, _ in recent:
+        index.search(query)
+    repeat_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for data in workouts:
+        resolver.resolve_workout(data)
+    workout_time = time.perf_counter() - start
+
+    disagreements = 0
+    brute_times = []
+    for (query, _), matches in list(zip(queries, results))[:args.verify]:
+        start = time.perf_counter()
+        expected = brute_force(index.lookups, query)
+        brute_times.append(time.perf_counter() - start)
+        if (matches[0].score if matches else 0.0) != expected:
+            disagreements += 1
+
+    print(f"Catalog:     {len(index)} exercise names ({build_time * 1000:.0f} ms to index)")
+    print(f"Lookups:     {len(queries)} in {total_time * 1000:.0f} ms ({len(queries) / total_time:,.0f}/s)")
+    for kind, values in timings.items():
+        print(f"  {kind:<8}   {len(values):>6}  p50 {statistics.median(values) * 1e6:7.1f} µs  "
+              f"p99 {percentile(values, 0.99) * 1e6:7.1f} µs  resolved {resolved[kind] / len(values):.1%}")
+    print(f"Repeated:    {len(recent)} in {repeat_time * 1000:.0f} ms ({len(recent) / repeat_time:,.0f}/s; "
+          f"{first_pass_hits} cache hits in the first pass)")
+    print(f"Workouts:    {len(workouts)} resolve_workout calls in {workout_time * 1000:.0f} ms")
+    print(f"Brute force: p50 {statistics.median(brute_times) * 1e3:7.2f} ms per lookup; "
+          f"top-1 disagreements {disagreements}/{min(args.verify, len(queries))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LSH near-duplicate lookups vs a linear scan
+======================================================
+Indexes every data/raw_logs session with lib/near_duplicates.NearDuplicateIndex
+(optionally --copies times, with a few characters changed per copy, to grow
+each athlete's history), then queries every session:
+
+- linear: compare the query signature with every session of the athlete
+- lsh:    compare only with the LSH bucket candidates
+
+Recall is the share of linear-scan matches (estimated Jaccard >= threshold)
+that LSH also returns.
+
+Usage: python3 scripts/benchmarks/bench_near_duplicates.py [--copies 4] [--threshold 0.8]
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex, similarity  # noqa: E402
+from lib.raw_logs import iter_logs  # noqa: E402
+
+RAW_LOGS_DIR = SCRIPTS_DIR.parent / 'data' / 'raw_logs'
+
+
+def perturb(text: str, rng: random.Random, edits: int = 3) -> str:
+    chars = list(text)
+    for _ in range(edits):
+        chars[rng.randrange(len(chars))] = rng.choice('abcdefghij0123456789 ')
+    return ''.join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--copies', type=int, default=4, help="Perturbed copies per session (default: 4)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = list(iter_logs(sorted(RAW_LOGS_DIR.glob('*.txt'))))
+    index = NearDuplicateIndex(threshold=args.threshold)
+    start = time.perf_counter()
+    for record in records:
+        index.add(record.source_ref, record.raw_text, group=record.athlete)
+        for copy in range(args.copies):
+            index.add(f"{record.source_ref}~{copy}", perturb(record.raw_text, rng), group=record.athlete)
+    build_time = time.perf_counter() - start
+
+    by_group = defaultdict(list)
+    for key, group in index.groups.items():
+        by_group[group].append(key)
+
+    queries = [(record.source_ref, index.signatures[record.source_ref], record.athlete) for record in records]
+
+    start = time.perf_counter()
+    linear = {}
+    comparisons = 0
+    for key, sig, group in queries:
+        found = set()
+        for other in by_group[group]:
+            comparisons += 1
+            if other != key and similarity(sig, index.signatures[other]) >= args.threshold:
+                found.add(other)
+        linear[key] = found
+    linear_time = time.perf_counter() - start
+
+    index.comparisons = 0
+    start = time.perf_counter()
+    lsh = {key: {other for other, _ in index.query_signature(sig, group, exclude=key)} for key, sig, group in queries}
+    lsh_time = time.perf_counter() - start
+
+    expected = sum(len(found) for found in linear.values())
+    recalled = sum(len(linear[key] & lsh[key]) for key in linear)
+    print(f"Index:     {len(index)} texts ({len(records)} sessions x {args.copies + 1}), "
+          f"{len(by_group)} athletes, built in {build_time:.2f}s")
+    print(f"Linear:    {linear_time / len(queries) * 1e6:9.1f} µs/query  {comparisons} comparisons")
+    print(f"LSH:       {lsh_time / len(queries) * 1e6:9.1f} µs/query  {index.comparisons} comparisons  "
+          f"{linear_time / lsh_time:.1f}x")
+    print(f"Recall:    {recalled}/{expected} linear-scan matches ({recalled / max(expected, 1):.1%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parse-result cache lookups
+=====================================
+Fills a throwaway lib/parse_cache.ParseCache with one entry per data/raw_logs
+session (payload: a golden-set JSON, ~3-10 KB), then times:
+
+- put:  storing every session (batched, with eviction checks)
+- hit:  get() of every session text (normalize + SHA-256 + SQLite lookup)
+- miss: get() of the same texts with one character changed
+- normalized hit: get() of texts re-wrapped with CRLF, tabs and NBSPs
+
+With --max-entries below the session count, the oldest entries are evicted
+and the hit pass reports the misses.
+
+Usage: python3 scripts/benchmarks/bench_parse_cache.py [--max-entries 50000]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.parse_cache import DEFAULT_MAX_ENTRIES, ParseCache, text_key  # noqa: E402
+from lib.raw_logs import iter_logs  # noqa: E402
+
+DATA_DIR = SCRIPTS_DIR.parent / 'data'
+
+
+def timed_gets(cache: ParseCache, texts):
+    found = 0
+    start = time.perf_counter()
+    for text in texts:
+        found += cache.get(text) is not None
+    return (time.perf_counter() - start) / len(texts), found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES)
+    args = parser.parse_args()
+
+    texts = [record.raw_text for record in iter_logs(sorted((DATA_DIR / 'raw_logs').glob('*.txt')))]
+    payloads = []
+    for path in sorted((DATA_DIR / 'golden_set').glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            payloads.append(json.load(f))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with ParseCache(Path(tmp) / 'parse_cache.sqlite', 'bench@1', max_entries=args.max_entries) as cache:
+            start = time.perf_counter()
+            cache.put_many((text_key(text), payloads[index % len(payloads)]) for index, text in enumerate(texts))
+            put_time = time.perf_counter() - start
+
+            hit_time, hits = timed_gets(cache, texts)
+            miss_time, false_hits = timed_gets(cache, [text + '!' for text in texts])
+            rewrapped = [text.replace('\n', '\r\n').replace(' ', '\t', 1).replace(' ', '\u00a0', 1) for text in texts]
+            normalized_time, normalized_hits = timed_gets(cache, rewrapped)
+            stats = cache.stats()
+
+    print(f"Sessions:        {len(texts)} from data/raw_logs, {stats['size']} cached "
+          f"({stats['bytes'] / 1e6:.1f} MB, {stats['evictions']} evicted)")
+    print(f"Put (batched):   {put_time * 1000:9.1f} ms total")
+    print(f"Hit:             {hit_time * 1e6:9.1f} µs/lookup  ({hits}/{len(texts)} found)")
+    print(f"Miss:            {miss_time * 1e6:9.1f} µs/lookup  ({false_hits} false hits)")
+    print(f"Normalized hit:  {normalized_time * 1e6:9.1f} µs/lookup  ({normalized_hits}/{len(texts)} found)")
+
+
+if __name__ == '__main__':
+    main()
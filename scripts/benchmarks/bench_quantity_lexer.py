@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass quantity lexer over data/raw_logs
+========================================================
+Lexes every line of every raw athlete log with lib/quantity_lexer.tokenize
+and reports lines/s, MB/s and token counts per kind.
+
+For comparison, "separate scans" runs one re.finditer per token kind over
+each line, which is how the individual scripts looked for numbers before
+(one regex or str.isdigit hack per field).
+
+Usage: python3 scripts/benchmarks/bench_quantity_lexer.py [--repeat 5]
+"""
+
+import argparse
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.quantity_lexer import NUM, RANGE, UNITS, tokenize  # noqa: E402
+
+RAW_LOGS_DIR = SCRIPTS_DIR.parent / 'data' / 'raw_logs'
+
+SEPARATE_SCANS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    rf'\bRPE\s*{RANGE}',
+    r'\d{1,2}(?::[0-5]\d){1,2}',
+    r'\d+\s*[x×](?=\s*\d)',
+    rf'{NUM}\s*/\s*{NUM}',
+    rf'{NUM}\s*(?:-|to)\s*{NUM}',
+    rf'{NUM}(?:\s*(?:{UNITS})\b)?',
+)]
+
+
+def separate_scans(line: str) -> int:
+    return sum(1 for pattern in SEPARATE_SCANS for _ in pattern.finditer(line))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    lines = []
+    size = 0
+    for path in sorted(RAW_LOGS_DIR.glob('*.txt')):
+        text = path.read_text(encoding='utf-8')
+        size += len(text.encode('utf-8'))
+        lines.extend(text.splitlines())
+
+    kinds: Counter = Counter()
+    for line in lines:
+        kinds.update(token.kind for token in tokenize(line))
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for line in lines:
+            tokenize(line)
+    lexer_time = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for line in lines:
+            separate_scans(line)
+    scans_time = (time.perf_counter() - start) / args.repeat
+
+    print(f"Raw logs:        {len(lines)} lines, {size / 1e6:.1f} MB")
+    print(f"Tokens:          {sum(kinds.values())} ({', '.join(f'{k} {n}' for k, n in kinds.most_common())})")
+    print(f"Separate scans:  {len(lines) / scans_time:12,.0f} lines/s  {size / scans_time / 1e6:6.1f} MB/s")
+    print(f"Lexer (1 pass):  {len(lines) / lexer_time:12,.0f} lines/s  {size / lexer_time / 1e6:6.1f} MB/s  "
+          f"{scans_time / lexer_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full recompute vs incremental training-load aggregates
+=================================================================
+Builds --workouts workouts from the golden-set files that record performed
+sets (spread over --athletes athletes and a year, loads and reps jittered),
+loads them into a lib/training_load store, then commits --new more:
+
+- full:        re-read every workout and aggregate from scratch (the old way)
+- incremental: TrainingLoadStore.add_workouts of the new workouts only
+
+Asserts the store's weekly rows equal the full recompute.
+
+Usage: python3 scripts/benchmarks/bench_training_load.py [--workouts 20000] [--new 50]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.checksum import calculate_checksum  # noqa: E402
+from lib.fact_table import flatten_workout  # noqa: E402
+from lib.training_load import TrainingLoadStore, workout_contributions  # noqa: E402
+
+GOLDEN_SET_DIR = SCRIPTS_DIR.parent / 'data' / 'golden_set'
+
+
+def build_corpus(count: int, athletes: int, rng: random.Random):
+    templates = []
+    for path in sorted(GOLDEN_SET_DIR.glob('*.json')):
+        raw = path.read_text(encoding='utf-8')
+        if any(True for _ in flatten_workout(json.loads(raw), path.name)):
+            templates.append(raw)
+    entries = []
+    for i in range(count):
+        data = json.loads(templates[i % len(templates)])
+        data['athlete_id'] = f"athlete_{i % athletes:03d}"
+        data['workout_date'] = (date(2025, 1, 1) + timedelta(days=rng.randrange(365))).isoformat()
+        for session in data.get('sessions', []):
+            for block in session.get('blocks', []):
+                for item in block.get('items', []):
+                    sets = (item.get('performed') or {}).get('sets')
+                    for set_values in sets if isinstance(sets, list) else ():
+                        if isinstance(set_values.get('reps'), int):
+                            set_values['reps'] = max(1, set_values['reps'] + rng.randint(-2, 2))
+                        load = set_values.get('load')
+                        if isinstance(load, dict) and isinstance(load.get('value'), (int, float)):
+                            load['value'] = round(load['value'] * rng.uniform(0.85, 1.15), 1)
+        raw = json.dumps(data)
+        entries.append((f'workout_{i:06d}.json', calculate_checksum(raw), raw))
+    return entries
+
+
+def full_recompute(entries):
+    """Every workout re-read and aggregated (sums, max e1RM, RPE sum/count per group)"""
+    weekly = {}
+    for source, _, raw in entries:
+        for key, group in workout_contributions(json.loads(raw), source).items():
+            total = weekly.setdefault(key, {'workouts': 0, 'sets': 0, 'reps': 0, 'tonnage_kg': 0.0,
+                                            'best_e1rm_kg': None, 'rpe_sum': 0.0, 'rpe_count': 0})
+            total['workouts'] += 1
+            for field in ('sets', 'reps', 'tonnage_kg', 'rpe_sum', 'rpe_count'):
+                total[field] += group[field]
+            if group['best_e1rm_kg'] is not None:
+                total['best_e1rm_kg'] = max(total['best_e1rm_kg'] or 0.0, group['best_e1rm_kg'])
+    return weekly
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workouts', type=int, default=20000)
+    parser.add_argument('--new', type=int, default=50)
+    parser.add_argument('--athletes', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    entries = build_corpus(args.workouts + args.new, args.athletes, random.Random(args.seed))
+    history, new = entries[:args.workouts], entries[args.workouts:]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with TrainingLoadStore(Path(tmp) / 'training_load.sqlite') as store:
+            start = time.perf_counter()
+            store.add_workouts(history)
+            initial_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            changed = store.add_workouts(new)
+            incremental_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            store.add_workouts(entries)
+            unchanged_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            expected = full_recompute(entries)
+            full_time = time.perf_counter() - start
+
+            rows = store.weekly()
+            assert len(rows) == len(expected), f'{len(rows)} weekly rows, expected {len(expected)}'
+            for row in rows:
+                total = expected[(row['athlete'] or '', row['exercise'], row['week'])]
+                assert (row['sets'], row['reps'], row['workouts']) == (total['sets'], total['reps'], total['workouts'])
+                assert abs(row['tonnage_kg'] - total['tonnage_kg']) < 0.01
+                assert (row['best_e1rm_kg'] is None) == (total['best_e1rm_kg'] is None)
+                if total['best_e1rm_kg'] is not None:
+                    assert abs(row['best_e1rm_kg'] - total['best_e1rm_kg']) < 0.01
+
+            stats = store.stats()
+
+    print(f"History:     {len(history)} workouts, {stats['weekly']} weekly rows (initial load {initial_time:.2f}s)")
+    print(f"Full:        {full_time * 1000:9.1f} ms  re-read all {len(entries)} workouts")
+    print(f"Incremental: {incremental_time * 1000:9.1f} ms  {len(changed)} new workouts  "
+          f"{full_time / incremental_time:.0f}x")
+    print(f"Re-add all:  {unchanged_time * 1000:9.1f} ms  unchanged checksums skipped")
+
+
+if __name__ == '__main__':
+    main()
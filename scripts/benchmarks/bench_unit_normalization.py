@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: unit normalization
+=============================
+Builds a corpus of --workouts workouts (the golden set, cycled; every
+other kg/m measurement relabelled lbs/yards so all three families convert)
+and normalizes it with lib/unit_normalization, timing the
+collect_measurements walk and the normalize_measurement conversion
+separately, then checks normalize_workouts gives the same JSON.
+
+Usage: python3 scripts/benchmarks/bench_unit_normalization.py [--workouts 20000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from lib.unit_normalization import collect_measurements, normalize_measurement, normalize_workouts  # noqa: E402
+
+GOLDEN_SET_DIR = SCRIPTS_DIR.parent / 'data' / 'golden_set'
+RELABEL = {'kg': 'lbs', 'm': 'yards'}
+
+
+def build_template(raw: bytes) -> str:
+    data = json.loads(raw)
+    for position, measurement in enumerate(collect_measurements(data, [])):
+        if position % 2 and measurement['unit'] in RELABEL:
+            measurement['unit'] = RELABEL[measurement['unit']]
+    return json.dumps(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workouts', type=int, default=20000)
+    args = parser.parse_args()
+
+    templates = [build_template(path.read_bytes()) for path in sorted(GOLDEN_SET_DIR.glob('*.json'))]
+    raws = [templates[i % len(templates)] for i in range(args.workouts)]
+
+    documents = [json.loads(raw) for raw in raws]
+    start = time.perf_counter()
+    measurements = [collect_measurements(document, []) for document in documents]
+    walk_time = time.perf_counter() - start
+    total = sum(map(len, measurements))
+
+    counts = Counter()
+    start = time.perf_counter()
+    for refs in measurements:
+        for measurement in refs:
+            normalize_measurement(measurement, counts)
+    convert_time = time.perf_counter() - start
+    result = json.dumps(documents)
+
+    documents = [json.loads(raw) for raw in raws]
+    workout_counts = Counter()
+    start = time.perf_counter()
+    normalize_workouts(documents, workout_counts)
+    workouts_time = time.perf_counter() - start
+
+    assert workout_counts == counts, f'counts differ: {workout_counts} vs {counts}'
+    assert json.dumps(documents) == result, 'normalized output differs'
+
+    print(f"Corpus:     {len(raws)} workouts, {total} measurements "
+          f"({counts['measurements_normalized']} convertible)")
+    print(f"Walk:       {walk_time * 1000:9.1f} ms  collect_measurements")
+    print(f"Convert:    {convert_time * 1000:9.1f} ms  {convert_time / total * 1e9:7.0f} ns/measurement")
+    print(f"Total:      {workouts_time * 1000:9.1f} ms  normalize_workouts")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass rule engine vs legacy five-pass validation
+=================================================================
+Builds a synthetic corpus by cycling the golden set workouts and times the
+legacy per-check recursions against the single-traversal RuleEngine used by
+validate_golden_sets.py (best of --repeat rounds, both timed in every
+round). Also asserts both produce identical issues.
+
+Usage: python3 scripts/benchmarks/bench_validate_golden_sets.py [--workouts 10000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR / 'tests'))
+import validate_golden_sets as vgs  # noqa: E402
+
+GOLDEN_SET_DIR = SCRIPTS_DIR.parent / 'data' / 'golden_set'
+
+
+# ---------------------------------------------------------------------------
+# Legacy implementation (frozen copy of the pre-engine validator walks)
+# ---------------------------------------------------------------------------
+
+def legacy_type_safety(obj: Any, path: str = "") -> List[str]:
+    issues = []
+    if isinstance(obj, dict):
+        numeric_fields = [
+            'target_reps', 'target_sets', 'actual_reps', 'actual_sets',
+            'target_duration_sec', 'actual_duration_sec', 'target_weight',
+            'actual_weight', 'rpe', 'rir', 'item_sequence'
+        ]
+        for key, value in obj.items():
+            current_path = f"{path}.{key}" if path else key
+            if key in numeric_fields and value is not None:
+                if key in ['target_weight', 'actual_weight'] and isinstance(value, dict):
+                    if 'value' in value and not isinstance(value['value'], (int, float)):
+                        issues.append(f"{current_path}.value is string: {value['value']}")
+                elif not isinstance(value, (int, float)):
+                    issues.append(f"{current_path} is string: {value}")
+            if isinstance(value, (dict, list)):
+                issues.extend(legacy_type_safety(value, current_path))
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            issues.extend(legacy_type_safety(item, f"{path}[{i}]"))
+    return issues
+
+
+def legacy_block_codes(data: Dict) -> List[str]:
+    issues = []
+
+    def check_recursive(obj, path=""):
+        if isinstance(obj, dict):
+            if 'block_code' in obj:
+                code = obj['block_code']
+                if code and code not in vgs.VALID_BLOCK_CODES:
+                    issues.append(f"{path}: Invalid block_code '{code}'")
+            for key, value in obj.items():
+                check_recursive(value, f"{path}.{key}" if path else key)
+        elif isinstance(obj, list):
+            for i, item in enumerate(obj):
+                check_recursive(item, f"{path}[{i}]")
+
+    check_recursive(data)
+    return issues
+
+
+def legacy_equipment(data: Dict) -> tuple:
+    total_items = 0
+    items_with_equipment = 0
+
+    def count_recursive(obj):
+        nonlocal total_items, items_with_equipment
+        if isinstance(obj, dict):
+            if 'items' in obj and isinstance(obj['items'], list):
+                for item in obj['items']:
+                    if isinstance(item, dict) and 'exercise_name' in item:
+                        total_items += 1
+                        if 'equipment_key' in item and item['equipment_key']:
+                            items_with_equipment += 1
+            for value in obj.values():
+                if isinstance(value, (dict, list)):
+                    count_recursive(value)
+        elif isinstance(obj, list):
+            for item in obj:
+                count_recursive(item)
+
+    count_recursive(data)
+    return items_with_equipment, total_items
+
+
+def legacy_separation(data: Dict) -> List[str]:
+    issues = []
+
+    def check_recursive(obj, path=""):
+        if isinstance(obj, dict):
+            has_prescription = 'prescription' in obj or 'performed' in obj
+            raw_fields = {'reps', 'sets', 'weight', 'duration'} & set(obj.keys())
+            if raw_fields and not has_prescription:
+                issues.append(f"{path}: Has raw fields {raw_fields} without prescription/performed wrapper")
+            for key, value in obj.items():
+                if isinstance(value, (dict, list)):
+                    check_recursive(value, f"{path}.{key}" if path else key)
+        elif isinstance(obj, list):
+            for i, item in enumerate(obj):
+                check_recursive(item, f"{path}[{i}]")
+
+    check_recursive(data)
+    return issues
+
+
+def legacy_validate(data: Dict) -> List[str]:
+    issues = vgs.validate_json_structure(data, '', vgs.ValidationStats())
+    issues += legacy_type_safety(data)
+    issues += legacy_block_codes(data)
+    legacy_equipment(data)
+    issues += legacy_separation(data)
+    return issues
+
+
+def engine_validate(data: Dict) -> List[str]:
+    rules = vgs.ENGINE.run(data)
+    return (rules['structure'].issues + rules['type_safety'].issues
+            + rules['block_codes'].issues + rules['separation'].issues)
+
+
+# ---------------------------------------------------------------------------
+
+def load_corpus(size: int) -> List[Dict]:
+    templates = []
+    for path in sorted(GOLDEN_SET_DIR.glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            templates.append(json.load(f))
+    # Validators are read-only, so the corpus can share the template objects
+    return [templates[i % len(templates)] for i in range(size)]
+
+
+def time_it(fns, corpus: List[Dict], repeat: int) -> List[float]:
+    """Best time per function; each round runs every function, so load drift hits all of them"""
+    best = [float('inf')] * len(fns)
+    for _ in range(repeat):
+        for index, fn in enumerate(fns):
+            start = time.perf_counter()
+            for data in corpus:
+                fn(data)
+            best[index] = min(best[index], time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workouts', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.workouts)
+
+    # Parity check on each distinct template
+    for data in {id(d): d for d in corpus}.values():
+        assert sorted(legacy_validate(data)) == sorted(engine_validate(data)), 'issue mismatch'
+
+    legacy, engine = time_it([legacy_validate, engine_validate], corpus, args.repeat)
+
+    print(f"Workouts:            {len(corpus)}")
+    print(f"Legacy (5 walks):    {legacy:.3f}s  ({legacy / len(corpus) * 1e6:.1f} µs/workout)")
+    print(f"RuleEngine (1 walk): {engine:.3f}s  ({engine / len(corpus) * 1e6:.1f} µs/workout)")
+    print(f"Speedup:             {legacy / engine:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
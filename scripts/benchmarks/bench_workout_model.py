@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: workout dict trees vs lib/workout_model
+==================================================
+Loads --workouts distinct workouts (the golden set, cycled) the way batch
+jobs hold an athlete history, once as json.loads dict trees and once as
+Workout.from_json models, and reports:
+
+- memory: tracemalloc-traced bytes held by the loaded corpus
+- load:   json.loads vs json.loads + Workout.from_json
+- dump:   json.dumps of the dicts vs of Workout.to_json()
+- validate: validate_golden_sets.ENGINE.run over each corpus
+
+Also asserts every model round-trips to the exact JSON it was loaded from.
+
+Usage: python3 scripts/benchmarks/bench_workout_model.py [--workouts 10000]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(SCRIPTS_DIR / 'tests'))
+from lib.workout_model import Workout  # noqa: E402
+import validate_golden_sets as vgs  # noqa: E402
+
+GOLDEN_SET_DIR = SCRIPTS_DIR.parent / 'data' / 'golden_set'
+
+
+def load_dicts(raws):
+    return [json.loads(raw) for raw in raws]
+
+
+def load_models(raws):
+    return [Workout.from_json(json.loads(raw)) for raw in raws]
+
+
+def measure(load, raws):
+    """(corpus, seconds, traced bytes still held by the corpus)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    corpus = load(raws)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return corpus, elapsed, held
+
+
+def timed(fn, corpus) -> float:
+    start = time.perf_counter()
+    for data in corpus:
+        fn(data)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workouts', type=int, default=10000)
+    args = parser.parse_args()
+
+    templates = [path.read_bytes() for path in sorted(GOLDEN_SET_DIR.glob('*.json'))]
+    raws = [templates[i % len(templates)] for i in range(args.workouts)]
+
+    for raw in templates:
+        data = json.loads(raw)
+        assert json.dumps(Workout.from_json(data).to_json()) == json.dumps(data), 'round-trip mismatch'
+
+    dicts, dict_load, dict_bytes = measure(load_dicts, raws)
+    del dicts
+    models, model_load, model_bytes = measure(load_models, raws)
+    del models
+    # Timings below run without tracemalloc overhead
+    start = time.perf_counter()
+    dicts = load_dicts(raws)
+    dict_load = time.perf_counter() - start
+    start = time.perf_counter()
+    models = load_models(raws)
+    model_load = time.perf_counter() - start
+
+    dict_dump = timed(json.dumps, dicts)
+    model_dump = timed(lambda workout: json.dumps(workout.to_json()), models)
+    dict_validate = timed(vgs.ENGINE.run, dicts)
+    model_validate = timed(vgs.ENGINE.run, models)
+
+    n = len(raws)
+    print(f"Workouts:   {n} ({sum(map(len, raws)) / 1e6:.1f} MB of JSON)")
+    print(f"{'':12}{'dicts':>14}{'model':>14}")
+    print(f"{'Memory':12}{dict_bytes / 1e6:11.1f} MB{model_bytes / 1e6:11.1f} MB  "
+          f"({model_bytes / dict_bytes:.0%} of dicts)")
+    print(f"{'Load':12}{dict_load / n * 1e6:11.1f} µs{model_load / n * 1e6:11.1f} µs  per workout")
+    print(f"{'Dump':12}{dict_dump / n * 1e6:11.1f} µs{model_dump / n * 1e6:11.1f} µs  per workout")
+    print(f"{'Validate':12}{dict_validate / n * 1e6:11.1f} µs{model_validate / n * 1e6:11.1f} µs  per workout")
+
+
+if __name__ == '__main__':
+    main()
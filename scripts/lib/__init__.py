@@ -0,0 +1,6 @@
+"""
+Shared Python helpers for the ZAMM parser tooling.
+
+Scripts under scripts/ops and scripts/tests put the scripts/ directory on
+sys.path and import from here, e.g. ``from lib.rule_engine import RuleEngine``.
+"""
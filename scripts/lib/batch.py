@@ -0,0 +1,137 @@
+"""
+Batch File Processing Helpers
+=============================
+- atomic_write_bytes / atomic_write_text: write to a temp file in the same
+  directory, fsync, then os.replace() over the target, so an interrupted run
+  leaves either the old or the new file - never truncated JSON.
+- ProgressJournal: append-only JSONL of completed files and the checksum of
+  what was written, so a restarted run can skip work that already finished.
+- map_files: order-preserving map that runs in-process or fans out to a
+  ProcessPoolExecutor with chunked submission.
+- count_changes / key_prefilter: decide whether a file needs rewriting (the
+  transform's Counter recorded an edit) or even parsing (its raw bytes
+  contain a key the transform rewrites).
+"""
+
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Counter keys transforms use for values they left alone (manual review), not edits
+NON_CHANGE_COUNTS = frozenset({'values_skipped'})
+
+
+def atomic_write_bytes(path: Path, content: bytes) -> None:
+    """Replace ``path`` with ``content`` atomically (same-directory temp file + os.replace)"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        else:
+            # mkstemp creates 0600; give new files the usual umask-based mode
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = 'utf-8') -> None:
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+class ProgressJournal:
+    """
+    Append-only record of completed files: one ``{"file": ..., "checksum": ...}``
+    JSON object per line, the last line per file wins. Every record is flushed
+    and fsynced before the next file starts, and a torn final line left by a
+    crash is ignored on load.
+    """
+
+    def __init__(self, path: Path, reset: bool = False):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._handle = None
+
+        if reset and self.path.exists():
+            self.path.unlink()
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.entries[entry['file']] = entry
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(name)
+
+    def is_done(self, name: str, checksum: str) -> bool:
+        entry = self.entries.get(name)
+        return entry is not None and entry['checksum'] == checksum
+
+    def record(self, name: str, checksum: str, **extra: Any) -> None:
+        entry = {'file': name, 'checksum': checksum, **extra}
+        self.entries[name] = entry
+        if self._handle is None:
+            self._handle = open(self.path, 'a', encoding='utf-8')
+        self._handle.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self) -> 'ProgressJournal':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def map_files(fn: Callable[[T], R], items: Iterable[T], workers: int = 1, chunk_size: int = 8) -> Iterator[R]:
+    """Apply ``fn`` to each item in order; ``workers > 1`` uses a process pool (fn must be picklable)"""
+    if workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(fn, items, chunksize=chunk_size)
+
+
+def count_changes(counts: Counter) -> int:
+    """Edits recorded by in-place transforms; 0 means the document is unchanged and need not be written"""
+    return sum(value for key, value in counts.items() if key not in NON_CHANGE_COUNTS)
+
+
+def key_prefilter(keys: Iterable[str]) -> Callable[[bytes], bool]:
+    """
+    Raw-bytes test for JSON object keys. False proves that no ``"key"`` of
+    ``keys`` occurs in the file, so a transform that only rewrites those keys
+    can skip it without parsing. True may be a false positive (the name
+    inside a string value); keys spelled with \\u escapes are not seen, which
+    json.dumps never produces for ASCII names.
+    """
+    pattern = re.compile(b'"(?:' + b'|'.join(re.escape(key.encode('utf-8')) for key in keys) + b')"')
+    return lambda raw: pattern.search(raw) is not None
@@ -0,0 +1,117 @@
+"""
+Batched Athlete / Catalog / Duplicate Lookups
+=============================================
+Python side of the ``*_batch`` functions from supabase/migrations/
+20260114100000_batched_lookup_functions.sql: every distinct name, duplicate
+key or athlete id of an ingest goes to Postgres as one array parameter (in
+chunks of ``batch_size``), over a lib/db.ConnectionPool with prepared
+statements, instead of one zamm.check_* call per name or workout.
+
+Results are keyed by the input value; inputs are de-duplicated first.
+
+Usage:
+    with ConnectionPool() as pool:
+        lookups = BatchLookups(pool)
+        athletes = lookups.athletes_by_name(['Yarden Frank', 'tomer yacov'])  # {name: row or None}
+        duplicates = lookups.workout_duplicates([(athlete_id, '2025-11-02', checksum)])
+        print(pool.round_trips)
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .db import ConnectionPool
+
+BATCH_SIZE = 1000
+
+# name → (parameter types, SQL); ids and dates travel as text[] and are cast in SQL
+STATEMENTS: Dict[str, Tuple[Sequence[str], str]] = {
+    'zamm_athletes_by_name': (
+        ('text[]',),
+        "SELECT ordinal, input_name, found, athlete_id::text, full_name, email, is_active "
+        "FROM zamm.check_athlete_by_name_batch($1)",
+    ),
+    'zamm_equipment_by_name': (
+        ('text[]',),
+        "SELECT ordinal, input_name, equipment_key, display_name, category, matched_via "
+        "FROM zamm.check_equipment_exists_batch($1)",
+    ),
+    'zamm_workout_duplicates': (
+        ('text[]', 'text[]', 'text[]'),
+        "SELECT ordinal, found, workout_id::text, created_at, session_title "
+        "FROM zamm.check_workout_duplicate_batch($1::uuid[], $2::date[], $3)",
+    ),
+    'zamm_athlete_contexts': (
+        ('text[]',),
+        "SELECT ordinal, athlete_id::text, context FROM zamm.get_athlete_context_batch($1::uuid[])",
+    ),
+}
+
+DuplicateKey = Tuple[str, str, str]
+
+
+def _distinct(values: Iterable[Any]) -> List[Any]:
+    return [value for value in dict.fromkeys(values) if value is not None]
+
+
+def _chunks(values: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class BatchLookups:
+    def __init__(self, pool: ConnectionPool, batch_size: int = BATCH_SIZE):
+        pool.statements.update(STATEMENTS)
+        self.pool = pool
+        self.batch_size = batch_size
+
+    def _run(self, name: str, values: List[Any], params: Callable[[List[Any]], Sequence[Any]]):
+        """(chunk, rows) per chunk of ``values``, all on one pooled connection"""
+        if not values:
+            return
+        with self.pool.connection() as conn:
+            for chunk in _chunks(values, self.batch_size):
+                yield chunk, self.pool.execute(conn, name, params(chunk))
+
+    def athletes_by_name(self, names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Active athlete per full name (case-insensitive, trimmed), None when unknown"""
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for chunk, rows in self._run('zamm_athletes_by_name', _distinct(names), lambda chunk: (chunk,)):
+            for ordinal, _, found, athlete_id, full_name, email, is_active in rows:
+                results[chunk[ordinal - 1]] = {
+                    'athlete_id': athlete_id, 'full_name': full_name, 'email': email, 'is_active': is_active,
+                } if found else None
+        return results
+
+    def equipment(self, names: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Catalog matches per name (exact first, then aliases; empty list when unknown)"""
+        values = _distinct(names)
+        results: Dict[str, List[Dict[str, Any]]] = {name: [] for name in values}
+        for chunk, rows in self._run('zamm_equipment_by_name', values, lambda chunk: (chunk,)):
+            for ordinal, _, equipment_key, display_name, category, matched_via in rows:
+                results[chunk[ordinal - 1]].append({
+                    'equipment_key': equipment_key, 'display_name': display_name,
+                    'category': category, 'matched_via': matched_via,
+                })
+        return results
+
+    def workout_duplicates(self, keys: Iterable[DuplicateKey]) -> Dict[DuplicateKey, Optional[Dict[str, Any]]]:
+        """Existing workout per (athlete_id, workout_date ISO, content hash), None when new"""
+        results: Dict[DuplicateKey, Optional[Dict[str, Any]]] = {}
+
+        def params(chunk):
+            return tuple(list(column) for column in zip(*chunk))
+
+        for chunk, rows in self._run('zamm_workout_duplicates', _distinct(keys), params):
+            for ordinal, found, workout_id, created_at, session_title in rows:
+                results[chunk[ordinal - 1]] = {
+                    'workout_id': workout_id, 'created_at': created_at, 'session_title': session_title,
+                } if found else None
+        return results
+
+    def athlete_contexts(self, athlete_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """get_athlete_context JSON per athlete id, None for unknown or inactive athletes"""
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for chunk, rows in self._run('zamm_athlete_contexts', _distinct(athlete_ids), lambda chunk: (chunk,)):
+            for ordinal, _, context in rows:
+                results[chunk[ordinal - 1]] = context
+        return results
@@ -0,0 +1,29 @@
+"""
+SHA-256 checksums shared with the JS pipeline and the database.
+
+``calculate_checksum`` returns the same hex digest as ``calculateChecksum``
+in scripts/pipeline/parse_workout.js and ``zamm.imports.checksum_sha256``
+(``encode(digest(raw_text, 'sha256'), 'hex')``), so a checksum computed here
+can be looked up in any of those places.
+"""
+
+import hashlib
+from typing import Iterable, Union
+
+
+def calculate_checksum(content: Union[str, bytes]) -> str:
+    """SHA-256 hex digest of text (UTF-8 encoded) or raw bytes"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def combined_checksum(parts: Iterable[Union[str, bytes]]) -> str:
+    """Order-sensitive SHA-256 over several parts (e.g. a rule set's sources)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
@@ -0,0 +1,160 @@
+"""
+Exercise name → equipment_key classification
+
+Substring patterns are checked in EQUIPMENT_MAP order (specific before
+general); the first match wins and unmatched names default to bodyweight.
+
+The map is compiled once at import into a single Aho–Corasick automaton, so
+a name is classified in one pass over its characters instead of a loop over
+every pattern of every key.
+"""
+
+from collections import Counter, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .batch import key_prefilter
+
+# Equipment mapping
+EQUIPMENT_MAP = {
+    'barbell': ['Back Squat', 'Front Squat', 'Barbell', ' Squat', 'Deadlift', 'Clean', 'Snatch', 'Press', 'Bench Press', 'Overhead Press', 'Thruster', 'Power Clean', 'Hang Clean', 'RDL', ' BB ', 'Hip Thrust'],
+    'dumbbell': [' DB ', 'Dumbbell', 'Dumbell'],
+    'kettlebell': [' KB ', ' KTB ', 'Kettlebell'],
+    'rowing_machine': ['Row', ' C2 ', 'Rowing', ' Erg', 'Concept2'],
+    'assault_bike': ['Assault Bike', ' AB ', 'Air Bike'],
+    'bike': ['Bike', 'Stationary Bike'],
+    'treadmill': ['Treadmill', ' Jog', ' Run'],
+    'ski_erg': ['Ski Erg', ' Ski'],
+    'cable_machine': ['Cable'],
+    'lat_pulldown': ['Lat Pulldown'],
+    'leg_press': ['Leg Press'],
+    'pull_up_bar': ['Pull-up', 'Pullup', 'Pull Up', 'Chin-up', 'Chinup', 'Bar Hang', 'Muscle-up', 'Dead Hang'],
+    'dip_station': [' Dip', 'Dips'],
+    'rings': ['Ring'],
+    'resistance_band': ['Band', 'Banded'],
+    'mini_band': ['Mini-Band', 'Mini Band', 'Miniband'],
+    'foam_roller': ['Foam Roll', ' FR ', 'Foam Roller'],
+    'lacrosse_ball': ['Lacrosse Ball', 'Lacrosse'],
+    'pvc_pipe': [' PVC', 'Dowel'],
+    'wall_ball': ['Wall Ball', ' WB '],
+    'medicine_ball': ['Medicine Ball', 'Med Ball'],
+    'slam_ball': ['Slam Ball'],
+    'jump_rope': ['Jump Rope', ' DU', 'Double Under', 'Single Under'],
+    'box': ['Box Jump', 'Step Up', 'Box Step'],
+    'sandbag': ['Sandbag', 'Sand Bag'],
+    'sled': ['Sled Push', 'Sled Pull', ' Sled'],
+    'landmine': ['Landmine'],
+    'bodyweight': [' BW ', 'Bodyweight', 'Body Weight', 'Air Squat', 'Push-up', 'Pushup', 'Push Up', 'Burpee', 'Plank', 'Sit-up', 'Situp', 'Mountain Climber', ' Lunge', ' Walk', 'Light Jog', 'Stretch', 'Breathing', 'Mobility', 'Activation', 'Scap', 'Shoulder', 'Dead Bug', 'Glute Bridge', 'Hip', 'Ankle', 'Calf', 'Cat', 'Frog', 'Inchworm', 'Couch', ' Cars', 'Curl-Up', 'Hard-Style', 'Back Extension', 'Isometric', 'Airplane', 'Groiner', 'Floss', 'Hyper', 'Open Books', 'Smash']
+}
+
+
+class EquipmentClassifier:
+    """
+    Aho–Corasick automaton over every (lowercased) pattern of an equipment
+    map. Each state stores the best (lowest) priority of any pattern ending
+    there, so one left-to-right pass over the name finds the same key as
+    checking the keys in map order.
+    """
+
+    def __init__(self, equipment_map: Dict[str, List[str]], default: str = 'bodyweight'):
+        self.default = default
+        self.keys = list(equipment_map)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._priority: List[Optional[int]] = [None]
+
+        for priority, patterns in enumerate(equipment_map.values()):
+            for pattern in patterns:
+                state = 0
+                for char in pattern.lower():
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._priority.append(None)
+                        self._goto[state][char] = next_state
+                    state = next_state
+                self._set_priority(state, priority)
+
+        # Breadth-first failure links; fold each fallback state's priority in
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._set_priority(next_state, self._priority[self._fail[next_state]])
+
+    def _set_priority(self, state: int, priority: Optional[int]) -> None:
+        current = self._priority[state]
+        if priority is not None and (current is None or priority < current):
+            self._priority[state] = priority
+
+    def classify(self, exercise_name: Optional[str]) -> str:
+        if not exercise_name:
+            return self.default
+        goto, fail, priorities = self._goto, self._fail, self._priority
+        state = 0
+        best = None
+        for char in ' ' + exercise_name.lower() + ' ':
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            priority = priorities[state]
+            if priority is not None and (best is None or priority < best):
+                best = priority
+                if best == 0:
+                    break
+        return self.default if best is None else self.keys[best]
+
+    def classify_many(self, names: Iterable[Optional[str]]) -> List[str]:
+        """Classify a batch; repeated names are matched once"""
+        seen: Dict[Optional[str], str] = {}
+        results = []
+        for name in names:
+            key = seen.get(name)
+            if key is None:
+                key = seen[name] = self.classify(name)
+            results.append(key)
+        return results
+
+CLASSIFIER = EquipmentClassifier(EQUIPMENT_MAP)
+
+
+def get_equipment_key(exercise_name):
+    return CLASSIFIER.classify(exercise_name)
+
+
+def classify_many(names: Iterable[Optional[str]]) -> List[str]:
+    return CLASSIFIER.classify_many(names)
+
+
+# Raw-bytes test: a file without any exercise_name key gets no equipment keys
+has_exercise_names = key_prefilter(('exercise_name',))
+
+
+def add_equipment_recursive(obj: Any, counts: Optional[Counter] = None,
+                            classify: Callable[[Optional[str]], str] = get_equipment_key) -> None:
+    """Recursively add equipment_key (right after exercise_name) to all exercise objects"""
+    if isinstance(obj, dict):
+        # If this is an exercise object
+        if 'exercise_name' in obj and 'equipment_key' not in obj:
+            fields = list(obj.items())
+            position = [key for key, _ in fields].index('exercise_name') + 1
+            fields.insert(position, ('equipment_key', classify(obj['exercise_name'])))
+            obj.clear()
+            obj.update(fields)
+            if counts is not None:
+                counts['equipment_keys_added'] += 1
+        
+        # Recurse into all values
+        for value in obj.values():
+            add_equipment_recursive(value, counts, classify)
+    
+    elif isinstance(obj, list):
+        # Recurse into list items
+        for item in obj:
+            add_equipment_recursive(item, counts, classify)
@@ -0,0 +1,187 @@
+"""
+Shared equipment taxonomy
+=========================
+One place to resolve an exercise/equipment name to an ``equipment_key``:
+
+1. Exact lookup in a hash index of every catalog key, display name and alias
+   from ``zamm.lib_equipment_catalog`` / ``zamm.lib_equipment_aliases``
+   (names are casefolded and whitespace-collapsed).
+2. Otherwise a name that starts with an equipment word ('DB ...', 'Landmine
+   ...', 'Single Arm KB ...') or a known exercise ('Pallof Press', 'Air
+   Squat') takes that key (LEADING_PATTERNS).
+3. Otherwise the precompiled substring matcher from lib/equipment.py, with
+   every alias added as a word-delimited pattern of its key.
+
+The tables are read from a local snapshot (data/reference/equipment_snapshot.json,
+written by scripts/ops/export_equipment_snapshot.sh). Building the index and
+automaton happens once per snapshot: the result is pickled to
+``.cache/equipment_taxonomy-<checksum>.pickle`` and later runs load it with a
+single read. Without a snapshot the taxonomy falls back to EQUIPMENT_MAP alone.
+"""
+
+import json
+import pickle
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .batch import atomic_write_bytes
+from .checksum import combined_checksum
+from .equipment import EQUIPMENT_MAP, EquipmentClassifier
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SNAPSHOT = REPO_ROOT / 'data' / 'reference' / 'equipment_snapshot.json'
+DEFAULT_CACHE_DIR = REPO_ROOT / '.cache'
+
+# Bump when the pickled layout of EquipmentTaxonomy changes
+CACHE_FORMAT = '1'
+
+_WHITESPACE = re.compile(r'\s+')
+
+# Checked against the start of the normalized name, in order. EQUIPMENT_MAP
+# ranks keys, not positions, so 'DB Romanian Deadlift' would otherwise hit
+# barbell's 'Deadlift' and 'Hamstring Floss' rings' 'Ring'
+LEADING_PATTERNS = {
+    'barbell': r'(?:bb|barbell)\b',
+    'dumbbell': r'(?:dbs?|dumbbells?)\b|one arm .*\brow',
+    'kettlebell': r'(?:kb|ktb|kettlebells?)\b',
+    'landmine': r'landmine\b',
+    'cable_machine': r'(?:cable|pallof)\b',
+    'bodyweight': r'(?:bw|bodyweight|air squats?|squat to stand|hamstring)\b',
+}
+_LEADING = re.compile(
+    r'(?:(?:single|one|1)[ -](?:arm|leg) )?(?:'
+    + '|'.join(f'(?P<{key}>{pattern})' for key, pattern in LEADING_PATTERNS.items())
+    + ')'
+)
+
+
+def normalize_name(name: str) -> str:
+    """Casefold and collapse whitespace (same key for 'DB', ' db ' and 'Db')"""
+    return _WHITESPACE.sub(' ', name).strip().casefold()
+
+
+class EquipmentTaxonomy:
+    """Catalog + alias index with a compiled fallback matcher"""
+
+    def __init__(self, catalog: List[Dict[str, Any]], aliases: List[Dict[str, Any]],
+                 fallback_map: Dict[str, List[str]] = EQUIPMENT_MAP,
+                 default: str = 'bodyweight', checksum: Optional[str] = None):
+        self.checksum = checksum
+        self.default = default
+        self.catalog: Dict[str, Dict[str, Any]] = {row['equipment_key']: row for row in catalog}
+        self.index: Dict[str, str] = {}
+
+        for key in fallback_map:
+            self.index.setdefault(normalize_name(key), key)
+            self.index.setdefault(normalize_name(key.replace('_', ' ')), key)
+        for row in catalog:
+            key = row['equipment_key']
+            self.index[normalize_name(key)] = key
+            self.index[normalize_name(row.get('display_name') or key)] = key
+        for row in aliases:
+            self.index[normalize_name(row['alias'])] = row['equipment_key']
+
+        # Aliases join their key's pattern list (keeping EQUIPMENT_MAP's
+        # specific-before-general order); keys only known from the snapshot are
+        # specialty equipment and go first, ahead of generic words like 'Row'
+        alias_patterns: Dict[str, List[str]] = {}
+        for row in aliases:
+            alias_patterns.setdefault(row['equipment_key'], []).append(f" {normalize_name(row['alias'])} ")
+        patterns: Dict[str, List[str]] = {
+            key: values for key, values in alias_patterns.items() if key not in fallback_map
+        }
+        for key, values in fallback_map.items():
+            patterns[key] = list(values) + alias_patterns.get(key, [])
+        self.matcher = EquipmentClassifier(patterns, default=default)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any], checksum: Optional[str] = None) -> 'EquipmentTaxonomy':
+        return cls(snapshot.get('catalog', []), snapshot.get('aliases', []), checksum=checksum)
+
+    def lookup(self, name: Optional[str]) -> Optional[str]:
+        """Exact catalog/alias hit, or None"""
+        if not name:
+            return None
+        return self.index.get(normalize_name(name))
+
+    def resolve(self, name: Optional[str]) -> str:
+        """Exact hit first, then a leading equipment word, then the substring matcher, then the default"""
+        if not name:
+            return self.default
+        normalized = normalize_name(name)
+        key = self.index.get(normalized)
+        if key is None:
+            leading = _LEADING.match(normalized)
+            key = leading.lastgroup if leading else self.matcher.classify(name)
+        return key
+
+    def resolve_many(self, names: Iterable[Optional[str]]) -> List[str]:
+        seen: Dict[Optional[str], str] = {}
+        results = []
+        for name in names:
+            key = seen.get(name)
+            if key is None:
+                key = seen[name] = self.resolve(name)
+            results.append(key)
+        return results
+
+    def is_known(self, equipment_key: str) -> bool:
+        """True if the key is active in the catalog (or in the fallback map when there is no catalog)"""
+        if self.catalog:
+            row = self.catalog.get(equipment_key)
+            return row is not None and row.get('is_active', True)
+        return equipment_key in self.matcher.keys
+
+
+def _cache_path(cache_dir: Path, checksum: str) -> Path:
+    return Path(cache_dir) / f'equipment_taxonomy-{checksum[:16]}.pickle'
+
+
+def load_taxonomy(snapshot_path: Path = DEFAULT_SNAPSHOT,
+                  cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> EquipmentTaxonomy:
+    """
+    Load the taxonomy for ``snapshot_path``, reusing the pickled build when the
+    snapshot and fallback map are unchanged. ``cache_dir=None`` disables the cache.
+    """
+    snapshot_path = Path(snapshot_path)
+    raw = snapshot_path.read_bytes() if snapshot_path.exists() else b''
+    checksum = combined_checksum([CACHE_FORMAT, raw, json.dumps(EQUIPMENT_MAP, sort_keys=True)])
+
+    cache_file = _cache_path(cache_dir, checksum) if cache_dir is not None else None
+    if cache_file is not None and cache_file.exists():
+        try:
+            taxonomy = pickle.loads(cache_file.read_bytes())
+            if isinstance(taxonomy, EquipmentTaxonomy) and taxonomy.checksum == checksum:
+                return taxonomy
+        except Exception:
+            pass  # stale or torn cache file: rebuild below
+
+    snapshot = json.loads(raw.decode('utf-8')) if raw else {}
+    taxonomy = EquipmentTaxonomy.from_snapshot(snapshot, checksum=checksum)
+
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            for old in cache_file.parent.glob('equipment_taxonomy-*.pickle'):
+                if old != cache_file:
+                    old.unlink()
+            atomic_write_bytes(cache_file, pickle.dumps(taxonomy, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:
+            pass  # read-only checkout: keep the in-memory build
+    return taxonomy
+
+
+_TAXONOMY: Optional[EquipmentTaxonomy] = None
+
+
+def get_taxonomy() -> EquipmentTaxonomy:
+    """Process-wide taxonomy, loaded on first use"""
+    global _TAXONOMY
+    if _TAXONOMY is None:
+        _TAXONOMY = load_taxonomy()
+    return _TAXONOMY
+
+
+def resolve_equipment_key(name: Optional[str]) -> str:
+    return get_taxonomy().resolve(name)
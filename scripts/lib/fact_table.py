@@ -0,0 +1,411 @@
+"""
+Columnar Set Fact Table
+=======================
+Flattens parsed workouts (sessions → blocks → items → performed sets) into
+one row per performed set, the rows ``commit_full_workout`` writes to
+``zamm.res_item_sets``, and stores them as NumPy ``.npy`` columns that
+dashboards open memory-mapped instead of scanning
+``workout_items.performed_data``.
+
+Rows come from ``performed.sets`` ({set_index, reps, load, duration,
+distance, rpe}); items that record per-set results as parallel lists
+(``actual_reps: [10, 9]``, ``actual_weight: [{value, unit}, ...]``) get one
+row per list position. Items of circuits (``exercises``) are included,
+``exercise_options`` alternatives are not. Loads, durations and distances
+are converted with ``extract_measurement_value`` (kg / sec / m).
+
+On disk (``<dir>/``):
+
+    manifest.json          row count, column dtypes, source files, data directory
+    data-<id>/dictionaries.json   code → string for athlete, block_code, exercise_name, equipment_key
+    data-<id>/<column>.npy        one array per column
+
+Each export writes a new ``data-<id>`` directory and then replaces
+manifest.json, which names it, in one rename: a reader sees the old table
+or the new one, never a mix. The previous data directory is kept for
+readers that loaded the old manifest; older ones are removed.
+
+String columns hold int32 dictionary codes (-1 = missing); ``date`` is
+datetime64[D] (NaT = missing); numeric columns use NaN for missing.
+
+Usage:
+    builder = FactTableBuilder()
+    builder.add_workout(json.load(f), source='tomer_2025-11-02_deadlift.json')
+    builder.write(Path('.cache/facts'))
+
+    table = FactTable(Path('.cache/facts'))
+    rows = table.select(athlete='tomer', exercise_name='Back Squat',
+                        date_from='2025-01-01', min_load_kg=100)
+    table.records(rows)                          # [{'athlete': 'tomer', 'load_kg': 102.5, ...}]
+    table.group_by(rows, 'exercise_name', 'load_kg', how='max')
+"""
+
+import json
+import re
+import shutil
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .batch import atomic_write_text
+from .unit_normalization import extract_measurement_value
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+FORMAT_VERSION = 2
+
+CATEGORICAL_COLUMNS = ('athlete', 'block_code', 'exercise_name', 'equipment_key')
+
+# column → dtype, in row order
+COLUMNS: Dict[str, str] = {
+    'workout': 'int32',          # index into manifest['sources']
+    'athlete': 'int32',
+    'date': 'datetime64[D]',
+    'block_code': 'int32',
+    'exercise_name': 'int32',
+    'equipment_key': 'int32',
+    'item': 'int32',             # item ordinal within the workout (groups the sets of one item)
+    'set_index': 'int16',
+    'reps': 'float32',
+    'load_kg': 'float64',
+    'duration_sec': 'float64',
+    'distance_m': 'float64',
+    'rpe': 'float32',
+}
+
+# Per-set fields of performed.sets: field → (column, target unit); None = plain number
+SET_FIELDS = {
+    'reps': ('reps', None),
+    'load': ('load_kg', 'kg'),
+    'duration': ('duration_sec', 'sec'),
+    'distance': ('distance_m', 'm'),
+    'rpe': ('rpe', None),
+}
+
+# Parallel per-set lists in performed, read when there is no ``sets`` array
+SET_LISTS = {
+    'actual_reps': 'reps',
+    'actual_weight': 'load',
+    'actual_load': 'load',
+    'actual_duration': 'duration',
+    'actual_distance': 'distance',
+    'actual_rpe': 'rpe',
+}
+
+# <athlete>_<YYYY-MM-DD>_... file names, for workouts without athlete_id
+FILENAME = re.compile(r'^(?P<athlete>.+?)_(?P<date>\d{4}-\d{2}-\d{2})')
+
+NULL_CODE = -1
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("NumPy not installed: pip install numpy")
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _parse_date(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10]).isoformat()
+        except ValueError:
+            return None
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Flattening
+# ---------------------------------------------------------------------------
+
+def _set_row(values: Dict[str, Any], position: int) -> Dict[str, Any]:
+    set_index = values.get('set_index')
+    row = {'set_index': set_index if isinstance(set_index, int) and not isinstance(set_index, bool) else position}
+    for field, (column, target_unit) in SET_FIELDS.items():
+        value = values.get(field)
+        row[column] = _number(value) if target_unit is None else extract_measurement_value(value, target_unit)
+    return row
+
+
+def iter_set_rows(performed: Any) -> Iterator[Dict[str, Any]]:
+    """Per-set values of one item's ``performed`` object"""
+    if not isinstance(performed, dict):
+        return
+    sets = performed.get('sets')
+    if isinstance(sets, list):
+        for position, values in enumerate(sets, start=1):
+            if isinstance(values, dict):
+                yield _set_row(values, position)
+        return
+    lists = {field: performed[key] for key, field in SET_LISTS.items() if isinstance(performed.get(key), list)}
+    if lists:
+        for position in range(1, max(map(len, lists.values())) + 1):
+            values = {field: entries[position - 1] for field, entries in lists.items() if position <= len(entries)}
+            yield _set_row(values, position)
+
+
+def _iter_items(items: Any) -> Iterator[Dict[str, Any]]:
+    for item in items if isinstance(items, list) else ():
+        if isinstance(item, dict):
+            yield item
+            yield from _iter_items(item.get('exercises'))
+
+
+def flatten_workout(data: Dict[str, Any], source: str = '') -> Iterator[Dict[str, Any]]:
+    """
+    One dict per performed set with string athlete/block_code/exercise_name/
+    equipment_key, ISO date and converted numbers. The athlete is
+    ``athlete_id``, else the ``<athlete>_<date>`` prefix of ``source``.
+    """
+    match = FILENAME.match(Path(source).name.lower()) if source else None
+    athlete = data.get('athlete_id') or (match.group('athlete') if match else None)
+    workout_date = _parse_date(data.get('workout_date')) or (match.group('date') if match else None)
+    item_number = 0
+    sessions = data.get('sessions')
+    for session in sessions if isinstance(sessions, list) else ():
+        blocks = session.get('blocks') if isinstance(session, dict) else None
+        for block in blocks if isinstance(blocks, list) else ():
+            if not isinstance(block, dict):
+                continue
+            for item in _iter_items(block.get('items')):
+                item_number += 1
+                for row in iter_set_rows(item.get('performed')):
+                    row.update(
+                        athlete=athlete,
+                        date=workout_date,
+                        block_code=block.get('block_code'),
+                        exercise_name=item.get('exercise_name'),
+                        equipment_key=item.get('equipment_key'),
+                        item=item_number,
+                    )
+                    yield row
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+class FactTableBuilder:
+    """Accumulates rows as Python lists; strings are dictionary-encoded as they arrive"""
+
+    def __init__(self):
+        self.sources: List[str] = []
+        self.dictionaries: Dict[str, List[str]] = {column: [] for column in CATEGORICAL_COLUMNS}
+        self._codes: Dict[str, Dict[str, int]] = {column: {} for column in CATEGORICAL_COLUMNS}
+        self.columns: Dict[str, List[Any]] = {column: [] for column in COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns['workout'])
+
+    def encode(self, column: str, value: Any) -> int:
+        if not isinstance(value, str) or not value:
+            return NULL_CODE
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return code
+
+    def add_workout(self, data: Any, source: str = '') -> int:
+        """Append the sets of one workout; returns the number of rows added"""
+        if not isinstance(data, dict):
+            return 0
+        workout = len(self.sources)
+        self.sources.append(source)
+        columns = self.columns
+        added = 0
+        for row in flatten_workout(data, source):
+            columns['workout'].append(workout)
+            for column in CATEGORICAL_COLUMNS:
+                columns[column].append(self.encode(column, row[column]))
+            for column in ('date', 'item', 'set_index', 'reps', 'load_kg', 'duration_sec', 'distance_m', 'rpe'):
+                columns[column].append(row[column])
+            added += 1
+        return added
+
+    def arrays(self) -> Dict[str, Any]:
+        _require_numpy()
+        arrays = {}
+        for column, dtype in COLUMNS.items():
+            values = self.columns[column]
+            if dtype.startswith('float'):
+                values = [np.nan if value is None else value for value in values]
+            elif dtype.startswith('datetime64'):
+                values = ['NaT' if value is None else value for value in values]
+            arrays[column] = np.array(values, dtype=dtype)
+        return arrays
+
+    def write(self, directory: Path) -> Dict[str, Any]:
+        """Write the columns and dictionaries to a new data directory, then switch manifest.json to it"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        data = f'data-{uuid.uuid4().hex[:12]}'
+        (directory / data).mkdir()
+        for column, array in self.arrays().items():
+            np.save(directory / data / f'{column}.npy', array, allow_pickle=False)
+        with open(directory / data / 'dictionaries.json', 'w', encoding='utf-8') as f:
+            json.dump(self.dictionaries, f, ensure_ascii=False)
+
+        previous = _manifest_data(directory)
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'rows': len(self),
+            'columns': COLUMNS,
+            'sources': self.sources,
+            'data': data,
+        }
+        atomic_write_text(directory / 'manifest.json', json.dumps(manifest, indent=2, ensure_ascii=False))
+        for stale in directory.glob('data-*'):
+            if stale.name not in (data, previous):
+                shutil.rmtree(stale, ignore_errors=True)
+        return manifest
+
+
+def _manifest_data(directory: Path) -> Optional[str]:
+    """Data directory named by an existing manifest.json (None for none or a v1 table)"""
+    try:
+        with open(directory / 'manifest.json', 'r', encoding='utf-8') as f:
+            return json.load(f).get('data')
+    except (OSError, ValueError):
+        return None
+
+
+def export_files(paths: Iterable[Path], directory: Path) -> Dict[str, Any]:
+    """Build and write the fact table for every workout JSON file in ``paths``"""
+    builder = FactTableBuilder()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            builder.add_workout(json.load(f), source=Path(path).name)
+    return builder.write(directory)
+
+
+# ---------------------------------------------------------------------------
+# Querying
+# ---------------------------------------------------------------------------
+
+Filter = Union[None, str, Sequence[str]]
+
+
+class FactTable:
+    """Read side: columns are memory-mapped, filters are vectorized masks"""
+
+    def __init__(self, directory: Path, mmap: bool = True):
+        _require_numpy()
+        directory = Path(directory)
+        with open(directory / 'manifest.json', 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"{directory}: fact table format {self.manifest.get('format_version')}, "
+                             f"expected {FORMAT_VERSION} (re-export)")
+        data = directory / self.manifest['data']
+        with open(data / 'dictionaries.json', 'r', encoding='utf-8') as f:
+            self.dictionaries: Dict[str, List[str]] = json.load(f)
+        self.sources: List[str] = self.manifest['sources']
+        mode = 'r' if mmap else None
+        self.columns = {column: np.load(data / f'{column}.npy', mmap_mode=mode, allow_pickle=False)
+                        for column in self.manifest['columns']}
+
+    def __len__(self) -> int:
+        return self.manifest['rows']
+
+    def column(self, name: str) -> Any:
+        return self.columns[name]
+
+    def codes(self, column: str, values: Filter) -> List[int]:
+        """Dictionary codes of ``values`` (case-insensitive) in a string column"""
+        wanted = {values.casefold()} if isinstance(values, str) else {value.casefold() for value in values}
+        return [code for code, text in enumerate(self.dictionaries[column]) if text.casefold() in wanted]
+
+    def mask(self, date_from: Optional[str] = None, date_to: Optional[str] = None, **filters: Any) -> Any:
+        """
+        Boolean row mask. String columns take a value or a list of values;
+        ``date_from``/``date_to`` are inclusive ISO dates; ``min_<column>`` /
+        ``max_<column>`` bound numeric columns (NaN never matches).
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for key, value in filters.items():
+            if value is None:
+                continue
+            if key in CATEGORICAL_COLUMNS:
+                mask &= np.isin(self.columns[key], self.codes(key, value))
+            elif key.startswith(('min_', 'max_')) and key[4:] in self.columns:
+                column = self.columns[key[4:]]
+                mask &= (column >= value) if key.startswith('min_') else (column <= value)
+            else:
+                raise ValueError(f"Unknown filter: {key}")
+        if date_from is not None:
+            mask &= self.columns['date'] >= np.datetime64(date_from, 'D')
+        if date_to is not None:
+            mask &= self.columns['date'] <= np.datetime64(date_to, 'D')
+        return mask
+
+    def select(self, **filters: Any) -> Any:
+        """Row numbers matching ``filters`` (see ``mask``)"""
+        return np.flatnonzero(self.mask(**filters))
+
+    def records(self, rows: Any = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Decoded rows: strings for codes, ISO dates, None for missing values"""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        if limit is not None:
+            rows = rows[:limit]
+        decoded = {}
+        for column, array in self.columns.items():
+            values = array[rows]
+            if column in CATEGORICAL_COLUMNS:
+                strings = self.dictionaries[column]
+                decoded[column] = [strings[code] if code >= 0 else None for code in values.tolist()]
+            elif column == 'workout':
+                decoded['source'] = [self.sources[index] for index in values.tolist()]
+            elif column == 'date':
+                decoded[column] = [None if np.isnat(day) else str(day) for day in values]
+            elif values.dtype.kind == 'f':
+                decoded[column] = [None if number != number else number for number in values.tolist()]
+            else:
+                decoded[column] = values.tolist()
+        return [dict(zip(decoded, row)) for row in zip(*decoded.values())]
+
+    def group_by(self, rows: Any, by: str, value: Optional[str] = None, how: str = 'sum') -> Dict[Any, float]:
+        """
+        Aggregate ``value`` over ``rows`` per ``by`` (a string column, 'date'
+        or 'workout'): how = 'sum' | 'max' | 'mean' | 'count'. NaN values are
+        left out; groups are decoded to strings/ISO dates/sources.
+        """
+        rows = np.asarray(rows)
+        keys = self.columns[by][rows]
+        if how == 'count':
+            values = np.ones(len(rows))
+        elif value is None:
+            raise ValueError(f"group_by(how={how!r}) needs a value column")
+        else:
+            values = self.columns[value][rows].astype(np.float64)
+            present = ~np.isnan(values)
+            keys, values = keys[present], values[present]
+        groups, inverse = np.unique(keys, return_inverse=True)
+        if how in ('sum', 'count'):
+            results = np.bincount(inverse, weights=values, minlength=len(groups))
+        elif how == 'mean':
+            results = np.bincount(inverse, weights=values, minlength=len(groups)) / np.bincount(inverse, minlength=len(groups))
+        elif how == 'max':
+            results = np.full(len(groups), -np.inf)
+            np.maximum.at(results, inverse, values)
+        else:
+            raise ValueError(f"Unknown aggregate: {how}")
+        return {self._decode_key(by, key): result for key, result in zip(groups.tolist(), results.tolist())}
+
+    def _decode_key(self, column: str, key: Any) -> Any:
+        if column in CATEGORICAL_COLUMNS:
+            return self.dictionaries[column][key] if key >= 0 else None
+        if column == 'workout':
+            return self.sources[key]
+        if column == 'date':
+            return None if key is None else key.isoformat()
+        return key
@@ -0,0 +1,301 @@
+"""
+Deterministic fast-path parser for prescription lines
+=====================================================
+Most lines in the athlete logs are regular: "3x 6/6 Dead Bug",
+"Back Squat 3x5 @ 100kg", "2 min - 90/90 Diaphragmatic Breathing",
+"4 min easy row @ 18-20 spm". ``parse_line`` turns such a line into a
+canonical v3.2 item (``target_sets``, ``target_reps``/``_min``/``_max``,
+``target_weight``, ``target_duration``, ``target_distance``, ``target_rest``
+as ``{value, unit}``, ...) and returns None for anything it is not sure about:
+circuits and round headers, notes, warm-up ladders, performance logs, non-Latin
+text, leftover numbers in the name. Those lines go to the agent unchanged.
+
+``preparse_lines`` walks a workout body, tracks the block headers
+(``A) Label: ...``) and, for quantity-only lines ("4×5 @ 55 kg"), uses the
+block label as the exercise name when the label is not a generic block
+name ("Warm up", "ACT", "Conditioning", ...).
+
+Coverage and accuracy against data/golden_set: scripts/benchmarks/bench_line_parser.py
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .equipment_taxonomy import resolve_equipment_key
+from .quantity_lexer import (
+    DISTANCE_UNITS, DURATION_UNITS, LOAD_UNITS, NUM, RANGE, canonical_unit, parse_range,
+)
+
+_TRANSLATE = str.maketrans({
+    '×': 'x', '‑': '-', '–': '-', '—': '-', '’': "'", '“': '"', '”': '"',
+    '\u200e': None, '\u200f': None,
+})
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _quantity(name: str) -> str:
+    return rf'(?P<{name}>{RANGE})\s*(?P<{name}_unit>{DURATION_UNITS}|{DISTANCE_UNITS})?\b'
+
+
+# sets x quantity, optionally per side: "3x5", "2 X 30s", "3x 6/6", "3×30/30m", "5×10/side", "3 X 20 sec / 20 sec"
+CORE = (rf'(?:(?P<sets>\d+)\s*x\s*)?{_quantity("qty")}'
+        rf'(?:\s*/\s*(?:(?P<side>side|leg|arm)\b|{_quantity("qty2")}))?')
+HEAD_FIRST = re.compile(rf'^{CORE}\s*(?:-\s*|\s)(?P<rest>.+)$', re.IGNORECASE)
+NAME_FIRST = re.compile(rf'^(?P<name>[^\d@:]+?)\s*:?\s+{CORE}(?P<rest>(?:\s.*|[@,].*)?)$', re.IGNORECASE)
+QUANTITY_ONLY = re.compile(rf'^{CORE}(?P<rest>(?:\s.*|[@,].*)?)$', re.IGNORECASE)
+
+MODIFIERS = re.compile(rf"""
+    (?P<rpe>@?\s*\bRPE\s*(?P<rpe_value>{RANGE}))
+  | (?P<rest>\brest\b:?\s*(?P<rest_value>{NUM})\s*(?P<rest_unit>{DURATION_UNITS})\b)
+  | (?P<rest_clock>\brest\b:?\s*(?P<rest_minutes>\d+):(?P<rest_seconds>\d{{2}})\b)
+  | (?P<spm>@?\s*(?:\bSPM\s*(?P<spm_value>{RANGE})|(?P<spm_value2>{RANGE})\s*spm\b))
+  | (?P<load>@?\s*(?:\d+\s*x\s*)?(?P<load_value>{RANGE})\s*(?P<load_unit>{LOAD_UNITS})\b)
+  | (?P<tempo>\(?\btempo\b:?\s*(?P<tempo_value>[\dx]-[\dx]-[\dx](?:-[\dx])?)\)?)
+  | (?P<per_side>\b(?:each|per)\s+(?:side|leg|arm)\b)
+  | (?P<paren>\((?P<paren_text>[^()]*)\))
+""", re.IGNORECASE | re.VERBOSE)
+
+# Leading/trailing descriptors that belong in notes, not in the exercise name
+INTENSITY_WORDS = frozenset({'easy', 'light', 'moderate', 'slow', 'fast', 'heavy', 'right', 'left'})
+
+# Block labels that name a section rather than an exercise (see zamm.block_code_aliases)
+GENERIC_LABEL_WORDS = frozenset({
+    'warm', 'warmup', 'warm-up', 'wu', 'activation', 'activations', 'act', 'mobility', 'mob',
+    'strength', 'str', 'accessory', 'accessories', 'acc', 'hypertrophy', 'power', 'skill',
+    'skills', 'technique', 'drills', 'gymnastics', 'metcon', 'conditioning', 'con', 'wod',
+    'intervals', 'cardio', 'aerobic', 'cool', 'cooldown', 'cd', 'stretch', 'stretching',
+    'breathing', 'core', 'rolling', 'release', 'fr', 'main', 'session', 'rehab', 'prep',
+    'finisher', 'circuit', 'weekly', 'traveling',
+})
+
+# Starts a circuit: the rest of the block keeps its structure, so it goes to the agent
+CIRCUIT = re.compile(r'\b(?:rounds?|for time|amrap|as many|emom|every|tabata|superset|circuit)\b', re.IGNORECASE)
+# Other lines the fast path leaves to the agent
+DEFER = re.compile(
+    r'\b(?:ladder|then|alternate|or)\b'
+    r'|^(?:rest|notes?|warm-?ups?|working|min\s*\d)\b|^[*#•\-]|:$|[\u0590-\u05ff]',
+    re.IGNORECASE)
+NAME_CHARS = re.compile(r"^(?=.*[A-Za-z])[A-Za-z0-9][A-Za-z0-9 '\-/.&°+]*$")
+# Digits are allowed in a name only inside a word ("C2", "T2B") or as "90/90"
+BARE_NUMBER = re.compile(r'(?<![A-Za-z0-9/])\d+(?:\.\d+)?(?![A-Za-z0-9/])')
+# A second prescription or a lone unit left in the name ("1 Leg Step up 3x5/5", "3x10 -15 sec")
+NOT_A_NAME = re.compile(rf'\d\s*x\s*\d|^(?:{DURATION_UNITS}|{DISTANCE_UNITS}|{LOAD_UNITS}|reps?)$', re.IGNORECASE)
+
+BLOCK_HEADER = re.compile(r'^(?P<letter>[A-Z][0-9]?)\)\s*(?P<body>.*)$')
+
+
+def normalize_line(line: str) -> str:
+    return _WHITESPACE.sub(' ', line.translate(_TRANSLATE)).strip()
+
+
+def _set_scalar(prescription: Dict[str, Any], field: str, text: str) -> None:
+    low, high = parse_range(text)
+    if high is None:
+        prescription[field] = low
+    else:
+        prescription[f'{field}_min'] = low
+        prescription[f'{field}_max'] = high
+
+
+def _measure(text: str, unit: str) -> Dict[str, Any]:
+    low, high = parse_range(text)
+    if high is None:
+        return {'value': low, 'unit': unit}
+    return {'value_min': low, 'value_max': high, 'unit': unit}
+
+
+def split_block_header(line: str) -> Optional[Tuple[str, str, str]]:
+    """``"C) DB Row (light): 3x10"`` → ``('C', 'DB Row (light)', '3x10')``; None if not a header"""
+    match = BLOCK_HEADER.match(line)
+    if not match:
+        return None
+    body = match.group('body')
+    depth = 0
+    for index, char in enumerate(body):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(depth - 1, 0)
+        elif char == ':' and depth == 0:
+            return match.group('letter'), body[:index].strip(), body[index:].lstrip(':').strip()
+    return match.group('letter'), body.strip(), ''
+
+
+def is_generic_label(label: str) -> bool:
+    words = re.findall(r"[a-z][a-z\-]*", label.lower())
+    return not words or any(word in GENERIC_LABEL_WORDS for word in words)
+
+
+def _mark_per_side(prescription: Dict[str, Any]) -> None:
+    # Golden-set / AI_PROMPTS.md convention: each set covers one side, so 1 (not target_sets)
+    prescription['execution_pattern'] = 'single_side'
+    prescription['target_sets_per_side'] = 1
+
+
+def _core_prescription(match: 're.Match') -> Optional[Dict[str, Any]]:
+    prescription: Dict[str, Any] = {}
+    sets = match.group('sets')
+    qty, unit = match.group('qty'), match.group('qty_unit')
+    qty2, unit2 = match.group('qty2'), match.group('qty2_unit')
+    per_side = bool(match.group('side'))
+
+    if qty2 is not None:
+        # "8/8", "40s/40s", "30/30m": the same amount each side
+        if parse_range(qty) != parse_range(qty2) or (unit and unit2 and canonical_unit(unit) != canonical_unit(unit2)):
+            return None
+        unit = unit or unit2
+        per_side = True
+
+    if sets is not None:
+        prescription['target_sets'] = int(sets)
+    if unit is None:
+        _set_scalar(prescription, 'target_reps', qty)
+    elif canonical_unit(unit) in ('sec', 'min'):
+        prescription['target_duration'] = _measure(qty, canonical_unit(unit))
+    else:
+        prescription['target_distance'] = _measure(qty, canonical_unit(unit))
+    if per_side:
+        _mark_per_side(prescription)
+    return prescription
+
+
+def _apply_modifiers(text: str, prescription: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """Pull RPE, rest, SPM, load, tempo and side markers out of ``text``; returns (leftover, notes)"""
+    notes: List[str] = []
+
+    def take(match: 're.Match') -> str:
+        if match.group('rpe'):
+            _set_scalar(prescription, 'target_rpe', match.group('rpe_value'))
+        elif match.group('rest'):
+            unit = canonical_unit(match.group('rest_unit'))
+            prescription['target_rest'] = _measure(match.group('rest_value'), unit)
+        elif match.group('rest_clock'):
+            seconds = int(match.group('rest_minutes')) * 60 + int(match.group('rest_seconds'))
+            prescription['target_rest'] = {'value': seconds, 'unit': 'sec'}
+        elif match.group('spm'):
+            _set_scalar(prescription, 'target_stroke_rate', match.group('spm_value') or match.group('spm_value2'))
+        elif match.group('load'):
+            unit = canonical_unit(match.group('load_unit'))
+            prescription['target_weight'] = _measure(match.group('load_value'), unit)
+        elif match.group('tempo'):
+            prescription['target_tempo'] = match.group('tempo_value').upper()
+        elif match.group('per_side'):
+            _mark_per_side(prescription)
+        elif match.group('paren_text').strip():
+            notes.append(match.group('paren_text').strip())
+        return ' '
+    leftover = MODIFIERS.sub(take, text)
+    return _WHITESPACE.sub(' ', leftover).strip(' ,;:"@'), notes
+
+
+def _split_name(text: str, notes: List[str]) -> str:
+    """Separate "T-Spine Open Books - slow!" / "easy row" into name and notes"""
+    if ' - ' in text:
+        text, note = text.split(' - ', 1)
+        notes.append(note.strip())
+    words = text.strip(' ,;:!.-').split()
+    while words and words[-1].lower() in INTENSITY_WORDS:
+        notes.append(words.pop())
+    while words and words[0].lower() in INTENSITY_WORDS:
+        notes.append(words.pop(0))
+    return ' '.join(words)
+
+
+def _valid_name(name: str) -> bool:
+    return (bool(name) and bool(NAME_CHARS.match(name))
+            and not BARE_NUMBER.search(name) and not NOT_A_NAME.search(name))
+
+
+def _item(name: str, prescription: Dict[str, Any], notes: List[str]) -> Dict[str, Any]:
+    if notes:
+        prescription['notes'] = ', '.join(notes)
+    return {
+        'exercise_name': name,
+        'equipment_key': resolve_equipment_key(name),
+        'prescription': prescription,
+    }
+
+
+def parse_line(line: str, default_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Item for one prescription line, or None to defer it to the agent.
+    ``default_name`` names quantity-only lines ("4×5 @ 55 kg").
+    """
+    text = normalize_line(line)
+    if not text or DEFER.search(text) or CIRCUIT.search(text):
+        return None
+
+    match = HEAD_FIRST.match(text)
+    if match:
+        prescription = _core_prescription(match)
+        if prescription is None:
+            return None
+        leftover, notes = _apply_modifiers(match.group('rest'), prescription)
+        name = _split_name(leftover, notes)
+        if not name and default_name:
+            return _item(default_name, prescription, notes)
+        return _item(name, prescription, notes) if _valid_name(name) else None
+
+    match = NAME_FIRST.match(text)
+    if match and (match.group('sets') or match.group('qty_unit') or match.group('qty2_unit')):
+        prescription = _core_prescription(match)
+        if prescription is None:
+            return None
+        leftover, notes = _apply_modifiers(match.group('rest'), prescription)
+        name = _split_name(match.group('name'), notes)
+        if leftover:
+            if not re.fullmatch(r"[A-Za-z][A-Za-z '\-]*[!.]?", leftover):
+                return None
+            notes.append(leftover)
+        return _item(name, prescription, notes) if _valid_name(name) else None
+
+    match = QUANTITY_ONLY.match(text)
+    if match and default_name and match.group('sets'):
+        prescription = _core_prescription(match)
+        if prescription is None:
+            return None
+        leftover, notes = _apply_modifiers(match.group('rest'), prescription)
+        if leftover:
+            return None
+        return _item(default_name, prescription, notes)
+    return None
+
+
+def _label_name(label: str) -> Optional[str]:
+    """Exercise name from a block label, or None for section labels"""
+    if is_generic_label(label):
+        return None
+    name = re.sub(r'\s*\([^()]*\)', '', normalize_line(label)).strip()
+    return name if _valid_name(name) else None
+
+
+def preparse_lines(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    One entry per non-empty line: ``{line_no, text, block, item}`` with
+    ``item`` None for lines left to the agent (headers without a
+    prescription, and everything after a circuit marker up to the next
+    block header, included).
+    """
+    results: List[Dict[str, Any]] = []
+    block: Optional[str] = None
+    label_name: Optional[str] = None
+    in_circuit = False
+
+    for line_no, raw in enumerate(lines, 1):
+        text = raw.strip()
+        if not text:
+            continue
+        item = None
+        header = split_block_header(normalize_line(text))
+        if header is not None:
+            block, label, remainder = header
+            label_name = _label_name(label)
+            in_circuit = bool(CIRCUIT.search(label) or CIRCUIT.search(remainder))
+            if remainder and not in_circuit and not split_block_header(remainder):
+                item = parse_line(remainder, label_name)
+        elif block is not None and not in_circuit:
+            in_circuit = bool(CIRCUIT.search(text))
+            if not in_circuit:
+                item = parse_line(text, label_name)
+        results.append({'line_no': line_no, 'text': text, 'block': block, 'item': item})
+    return results
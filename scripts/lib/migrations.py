@@ -0,0 +1,259 @@
+"""
+Workout JSON Migration Framework
+================================
+Registry of schema transforms plus a runner that applies every step a file
+still needs in a single read → parse → transform → serialize → write pass.
+
+Files are replaced atomically and can be processed by a worker pool. The
+schema version each file was last migrated to is recorded in an
+append-only manifest (``.schema_versions.jsonl``) next to the files,
+together with the SHA-256 of the bytes that were written. A file no step
+changed is stamped with the new version but not rewritten. A file whose
+checksum still matches its manifest entry only gets the steps newer than its
+recorded version; files that are up to date are skipped without parsing.
+
+A file with no (or a stale) entry has an unknown version. Unless the
+runner is told which version to assume for it, it only gets the steps
+that can tell from its raw bytes that they apply (``detect``: the legacy
+keys they rewrite occur in the file) and is then stamped with the target
+version. The other steps are not safe on current data - the v3.0 step
+reorders v3.2 item fields, equipment_keys would fill in keys a curated file
+leaves out - so they only run from a known (or assumed) version; a file
+of unknown version with pre-v3.0 weight keys is reported as an error
+instead of being stamped.
+
+Usage:
+    runner = MigrationRunner()
+    for outcome in runner.run(sorted(Path('data/golden_set').glob('*.json'))):
+        print(outcome['file'], outcome['status'])
+"""
+
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lib.batch import ProgressJournal, atomic_write_bytes, count_changes, map_files
+from lib.checksum import calculate_checksum
+from lib.profiling import Timings
+from lib.equipment import add_equipment_recursive
+from lib.schema_v3 import has_legacy_weights, process_items, transform_weights
+from lib.schema_v3_2 import convert_object, fix_circuit_config, has_legacy_circuit_fields, has_legacy_fields
+
+CURRENT_SCHEMA_VERSION = '3.2.0'
+MANIFEST_NAME = '.schema_versions.jsonl'
+
+Transform = Callable[[Any, Counter], Any]
+Detector = Callable[[bytes], bool]
+
+
+class Migration:
+    """One registered step: produces ``version`` when applied to older data"""
+
+    def __init__(self, name: str, version: str, transform: Transform, description: str,
+                 detect: Optional[Detector] = None, unversioned: bool = True):
+        self.name = name
+        self.version = version
+        self.transform = transform
+        self.description = description
+        self.detect = detect
+        self.unversioned = unversioned
+
+    def __repr__(self):
+        return f"Migration({self.name!r}, {self.version!r})"
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def register(name: str, version: str, description: str = '', detect: Optional[Detector] = None,
+             unversioned: bool = True):
+    """
+    Decorator adding a transform to the chain (applied in registration order).
+    ``detect(raw)`` is False when the file has nothing the step would change;
+    only steps with a detector run on files of unknown version, and a step
+    registered with ``unversioned=False`` makes such a file an error instead.
+    """
+    def decorator(transform: Transform) -> Transform:
+        MIGRATIONS.append(Migration(name, version, transform, description or transform.__doc__ or '',
+                                    detect, unversioned))
+        return transform
+    return decorator
+
+
+def parse_version(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in version.lstrip('v').split('.'))
+
+
+def steps_between(recorded: Optional[str], target: str = CURRENT_SCHEMA_VERSION) -> List[Migration]:
+    """Steps needed to bring data at ``recorded`` (None = unknown) up to ``target``"""
+    start = parse_version(recorded) if recorded else ()
+    end = parse_version(target)
+    return [m for m in MIGRATIONS if start < parse_version(m.version) <= end]
+
+
+# ---------------------------------------------------------------------------
+# Registered steps
+# ---------------------------------------------------------------------------
+
+@register('reorder_items_and_weights', '3.0.0', detect=has_legacy_weights, unversioned=False)
+def _reorder_items_and_weights(data: Any, counts: Counter) -> Any:
+    """v3.0: identity fields first, weights as {value, unit}"""
+    process_items(data, counts)
+    transform_weights(data, counts)
+    return data
+
+
+@register('duration_distance_units', '3.2.0', detect=has_legacy_fields)
+def _duration_distance_units(data: Any, counts: Counter) -> Any:
+    """v3.2: durations and distances as {value, unit}"""
+    return convert_object(data, counts)
+
+
+@register('circuit_config_rest', '3.2.0', detect=has_legacy_circuit_fields)
+def _circuit_config_rest(data: Any, counts: Counter) -> Any:
+    """v3.2: circuit_config rest_between_rounds as {value, unit}"""
+    return fix_circuit_config(data, counts)
+
+
+@register('equipment_keys', '3.2.0')
+def _equipment_keys(data: Any, counts: Counter) -> Any:
+    """v3.2: equipment_key on every exercise"""
+    add_equipment_recursive(data, counts)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Manifest & runner
+# ---------------------------------------------------------------------------
+
+class SchemaManifest(ProgressJournal):
+    """Per-directory journal of {file, checksum, version}; the last entry per file wins"""
+
+    def __init__(self, directory: Path):
+        super().__init__(Path(directory) / MANIFEST_NAME)
+
+    def record(self, filename: str, version: str, checksum: str) -> None:
+        super().record(filename, checksum, version=version)
+
+
+def serialize(data: Any, indent: int = 4) -> bytes:
+    """Golden set formatting: 4-space indent, UTF-8, no ASCII escaping"""
+    return json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+
+
+def migrate_path(path: Path, entry: Optional[Dict[str, str]], target_version: str = CURRENT_SCHEMA_VERSION,
+                 assume_version: Optional[str] = None, dry_run: bool = False, indent: int = 4) -> Dict[str, Any]:
+    """
+    Apply the pending chain to one file with a single parse and a single
+    atomic write. Does not touch the manifest: the version/checksum to record
+    is returned in ``outcome['record']`` so only one process ever appends.
+    ``outcome['timings']`` holds wall/CPU time per phase and per step.
+    """
+    timings = Timings()
+    outcome = {'file': str(path), 'status': 'current', 'from_version': None, 'steps': [],
+               'counts': Counter(), 'record': None, 'timings': timings}
+    try:
+        with timings.section('file:read'):
+            raw = path.read_bytes()
+        if entry and entry['checksum'] == calculate_checksum(raw):
+            outcome['from_version'] = entry['version']
+        else:
+            outcome['from_version'] = assume_version
+
+        steps = steps_between(outcome['from_version'], target_version)
+        if outcome['from_version'] is None:
+            # Unknown version: only steps whose legacy keys are in the file
+            steps = [step for step in steps if step.detect and step.detect(raw)]
+            blocked = [step.name for step in steps if not step.unversioned]
+            if blocked:
+                raise ValueError(f"unversioned file needs {', '.join(blocked)}: pass --assume-version")
+            if not steps:
+                if not dry_run:
+                    outcome['record'] = (target_version, calculate_checksum(raw))
+                return outcome
+        elif not steps:
+            if not entry and not dry_run:
+                outcome['record'] = (outcome['from_version'], calculate_checksum(raw))
+            return outcome
+
+        with timings.section('file:parse'):
+            data = json.loads(raw)
+        for step in steps:
+            with timings.section(f'step:{step.name}'):
+                data = step.transform(data, outcome['counts'])
+        outcome['steps'] = [step.name for step in steps]
+
+        if not count_changes(outcome['counts']):
+            # No step touched the document: stamp the version, keep the bytes
+            if not dry_run:
+                outcome['record'] = (target_version, calculate_checksum(raw))
+            return outcome
+
+        outcome['status'] = 'migrated'
+        if not dry_run:
+            with timings.section('file:write'):
+                content = serialize(data, indent)
+                atomic_write_bytes(path, content)
+            outcome['record'] = (target_version, calculate_checksum(content))
+
+    except Exception as error:
+        outcome['status'] = 'error'
+        outcome['error'] = str(error)
+    return outcome
+
+
+def _migrate_task(task: Tuple[Path, Optional[Dict[str, str]], Dict[str, Any]]) -> Dict[str, Any]:
+    path, entry, options = task
+    return migrate_path(path, entry, **options)
+
+
+class MigrationRunner:
+    """
+    Streams files through ``migrate_path``, in-process or across a worker
+    pool. The manifest doubles as the progress journal: it is appended (and
+    fsynced) by the parent as each file completes, so an interrupted run can
+    simply be restarted and skips every file that was already finished.
+    """
+
+    def __init__(self, target_version: str = CURRENT_SCHEMA_VERSION, dry_run: bool = False, indent: int = 4,
+                 assume_version: Optional[str] = None, workers: int = 1, chunk_size: int = 8):
+        self.options = {
+            'target_version': target_version,
+            'assume_version': assume_version,
+            'dry_run': dry_run,
+            'indent': indent,
+        }
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._manifests: Dict[Path, SchemaManifest] = {}
+
+    def manifest_for(self, path: Path) -> SchemaManifest:
+        directory = path.parent
+        if directory not in self._manifests:
+            self._manifests[directory] = SchemaManifest(directory)
+        return self._manifests[directory]
+
+    def _complete(self, outcome: Dict[str, Any]) -> Dict[str, Any]:
+        if outcome['record']:
+            path = Path(outcome['file'])
+            version, checksum = outcome['record']
+            self.manifest_for(path).record(path.name, version, checksum)
+        return outcome
+
+    def migrate_file(self, path: Path) -> Dict[str, Any]:
+        path = Path(path)
+        return self._complete(migrate_path(path, self.manifest_for(path).get(path.name), **self.options))
+
+    def run(self, files: Iterable[Path]) -> Iterator[Dict[str, Any]]:
+        """Migrate files, yielding each outcome (in input order) once it is journaled"""
+        tasks = (
+            (path, self.manifest_for(path).get(path.name), self.options)
+            for path in map(Path, files)
+        )
+        try:
+            for outcome in map_files(_migrate_task, tasks, self.workers, self.chunk_size):
+                yield self._complete(outcome)
+        finally:
+            for manifest in self._manifests.values():
+                manifest.close()
@@ -0,0 +1,297 @@
+"""
+Exercise / Equipment / Athlete Name Resolver
+============================================
+In-memory replacement for per-name ``zamm.check_exercise_exists`` /
+``check_equipment_exists`` / ``check_athlete_exists`` round trips: the
+catalog snapshot (data/reference/catalog_snapshot.json, written by
+scripts/ops/export_catalog_snapshot.sh) is indexed once and a whole
+workout's names are resolved in one call.
+
+Names are compared after ``lookup_key``: NFKC, Unicode dashes/invisible
+marks folded ("T‑Spine" with a non-breaking hyphen = "t spine"), diacritics
+dropped, casefolded, and any run of spaces/punctuation/underscores turned
+into one space (so exercise keys like ``back_squat`` match "Back Squat").
+
+Per index:
+
+1. exact: normalized name → entry (score 1.0)
+2. otherwise candidates from a character-trigram inverted index (pg_trgm
+   style padding, Dice coefficient), the best MAX_CANDIDATES re-ranked by
+   Damerau (optimal string alignment) edit similarity,
+   1 - distance / max(len): "Dumbell" → dumbbell (0.88), "riounds" → rounds.
+   The distance is computed in a band bounded by the best score still able
+   to make the result list, and fuzzy results are kept in an LRU (the same
+   typo recurs across a log).
+
+Matches below ``min_score`` are dropped; an empty list means "unknown name".
+
+Usage:
+    resolver = load_resolver()
+    resolver.exercises.search("Bulgarain Split Squat")   # [Match(key='bulgarian_split_squat', score=0.95, ...)]
+    resolver.resolve_workout(data)                       # {'exercises': {name: [Match]}, 'equipment': {...}}
+"""
+
+import heapq
+import json
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .equipment import EQUIPMENT_MAP
+from .lru import LRUCache
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SNAPSHOT = REPO_ROOT / 'data' / 'reference' / 'catalog_snapshot.json'
+
+MIN_SCORE = 0.75
+MAX_RESULTS = 5
+# Trigram candidates re-ranked by edit distance per query
+MAX_CANDIDATES = 16
+# Candidates sharing less than this Dice coefficient are not re-ranked
+MIN_DICE = 0.2
+FUZZY_CACHE_SIZE = 4096
+
+# Entry kinds, best first: an exact display_name wins over a key or alias with the same lookup key
+VIA_ORDER = ('display_name', 'exercise_key', 'equipment_key', 'full_name', 'alias', 'email')
+
+_DASHES = '‐‑‒–—―−⁃'
+_FOLD = {**dict.fromkeys(map(ord, '​‌‍‎‏⁦⁧⁨⁩﻿')),
+         **dict.fromkeys(map(ord, _DASHES), ' ')}
+_SEPARATORS = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def lookup_key(name: str) -> str:
+    """Comparable form of a name (see module docstring)"""
+    text = unicodedata.normalize('NFKD', unicodedata.normalize('NFKC', name).translate(_FOLD))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _SEPARATORS.sub(' ', text.casefold()).strip()
+
+
+def trigrams(key: str) -> List[str]:
+    """Distinct trigrams of each word padded like pg_trgm ('  w', ' wo', 'wor', 'ord', 'rd ')"""
+    grams = []
+    for word in key.split():
+        padded = f"  {word} "
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return list(dict.fromkeys(grams))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (adjacent transpositions cost 1), or
+    ``limit + 1`` once it exceeds ``limit``. Only the diagonal band of width
+    2 * limit + 1 is filled: cells outside it are already over the limit.
+    """
+    n, m = len(a), len(b)
+    if abs(n - m) > limit:
+        return limit + 1
+    over = limit + 1
+    previous2: List[int] = []
+    previous = [j if j <= limit else over for j in range(m + 1)]
+    for i in range(1, n + 1):
+        char_a = a[i - 1]
+        low, high = max(1, i - limit), min(m, i + limit)
+        current = [over] * (m + 1)
+        current[0] = i if i <= limit else over
+        best = current[0]
+        for j in range(low, high + 1):
+            char_b = b[j - 1]
+            value = previous[j - 1] if char_a == char_b else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value if value <= limit else over
+            if value < best:
+                best = value
+        if best > limit:
+            return over
+        previous2, previous = previous, current
+    return previous[m]
+
+
+class Match(NamedTuple):
+    key: str          # exercise_key / equipment_key / athlete_id
+    name: str         # catalog name or alias that matched
+    via: str          # display_name, exercise_key, alias, ...
+    score: float      # 1.0 = exact after lookup_key
+
+
+class NameIndex:
+    """Exact map + trigram inverted index over one catalog's names"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str, str]], cache_size: int = FUZZY_CACHE_SIZE):
+        """``entries``: (name, canonical key, via) triples; the first/best-ranked entry per lookup key wins"""
+        # Fuzzy results per lookup key: the same typo recurs across a log
+        self.cache = LRUCache(cache_size)
+        rank = {via: position for position, via in enumerate(VIA_ORDER)}
+        best: Dict[str, Tuple[str, str, str]] = {}
+        for name, key, via in entries:
+            if not name or not key:
+                continue
+            lookup = lookup_key(name)
+            if not lookup:
+                continue
+            current = best.get(lookup)
+            if current is None or rank.get(via, len(rank)) < rank.get(current[2], len(rank)):
+                best[lookup] = (key, name, via)
+
+        self.lookups: List[str] = list(best)
+        self.entries: List[Tuple[str, str, str]] = list(best.values())
+        self.exact: Dict[str, int] = {lookup: index for index, lookup in enumerate(self.lookups)}
+        self.gram_counts: List[int] = []
+        postings: Dict[str, List[int]] = {}
+        for index, lookup in enumerate(self.lookups):
+            grams = trigrams(lookup)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(index)
+        self.postings: Dict[str, Tuple[int, ...]] = {gram: tuple(ids) for gram, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.lookups)
+
+    def _match(self, index: int, score: float) -> Match:
+        key, name, via = self.entries[index]
+        return Match(key, name, via, score)
+
+    def search(self, name: Optional[str], limit: int = MAX_RESULTS, min_score: float = MIN_SCORE) -> List[Match]:
+        """Ranked matches for one name (best first); an exact hit is returned alone"""
+        if not name:
+            return []
+        query = lookup_key(name)
+        index = self.exact.get(query)
+        if index is not None:
+            return [self._match(index, 1.0)]
+        return list(self.cache.get_or_compute((query, limit, min_score), self._fuzzy))
+
+    def _fuzzy(self, request: Tuple[str, int, float]) -> Tuple[Match, ...]:
+        query, limit, min_score = request
+        grams = trigrams(query)
+        if not grams:
+            return ()
+        shared: Counter = Counter()
+        postings = self.postings
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids:
+                shared.update(ids)
+        query_grams = len(grams)
+        gram_counts = self.gram_counts
+        dice = heapq.nlargest(
+            MAX_CANDIDATES,
+            ((2 * count / (query_grams + gram_counts[index]), index) for index, count in shared.items()),
+        )
+
+        lookups = self.lookups
+        entries = self.entries
+        best: Dict[str, Tuple[float, float, int]] = {}
+        floor = min_score
+        for similarity, index in dice:
+            if similarity < MIN_DICE:
+                break
+            candidate = lookups[index]
+            longest = max(len(query), len(candidate))
+            # Anything further than this cannot reach min_score, or the limit-th best key so far
+            limit_distance = int(longest * (1 - floor) + 1e-9)
+            distance = edit_distance(query, candidate, limit_distance)
+            if distance > limit_distance:
+                continue
+            score = round(1 - distance / longest, 3)
+            key = entries[index][0]
+            # One result per canonical key: its best-matching name (ties: more shared trigrams)
+            if key not in best or score > best[key][0]:
+                best[key] = (score, similarity, index)
+                if len(best) >= limit:
+                    floor = max(min_score, sorted(value[0] for value in best.values())[-limit])
+        ranked = sorted(best.values(), key=lambda value: (-value[0], -value[1], lookups[value[2]]))
+        return tuple(self._match(index, score) for score, _, index in ranked[:limit])
+
+    def search_many(self, names: Iterable[Optional[str]], **options: Any) -> Dict[str, List[Match]]:
+        """Matches per distinct name (each looked up once)"""
+        results: Dict[str, List[Match]] = {}
+        for name in names:
+            if name and name not in results:
+                results[name] = self.search(name, **options)
+        return results
+
+
+def _iter_items(items: Any) -> Iterable[Dict[str, Any]]:
+    for item in items if isinstance(items, list) else ():
+        if isinstance(item, dict):
+            yield item
+            yield from _iter_items(item.get('exercises'))
+            yield from _iter_items(item.get('exercise_options'))
+
+
+def workout_names(data: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Distinct (exercise names, equipment keys) used by a parsed workout, in document order"""
+    exercises: Dict[str, None] = {}
+    equipment: Dict[str, None] = {}
+    sessions = data.get('sessions') if isinstance(data, dict) else None
+    for session in sessions if isinstance(sessions, list) else ():
+        blocks = session.get('blocks') if isinstance(session, dict) else None
+        for block in blocks if isinstance(blocks, list) else ():
+            if not isinstance(block, dict):
+                continue
+            for item in _iter_items(block.get('items')):
+                if isinstance(item.get('exercise_name'), str):
+                    exercises[item['exercise_name']] = None
+                if isinstance(item.get('equipment_key'), str):
+                    equipment[item['equipment_key']] = None
+    return list(exercises), list(equipment)
+
+
+class NameResolver:
+    def __init__(self, exercises: NameIndex, equipment: NameIndex, athletes: NameIndex):
+        self.exercises = exercises
+        self.equipment = equipment
+        self.athletes = athletes
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> 'NameResolver':
+        exercise_entries = []
+        for row in snapshot.get('exercises', []):
+            exercise_entries.append((row.get('display_name'), row['exercise_key'], 'display_name'))
+            exercise_entries.append((row['exercise_key'], row['exercise_key'], 'exercise_key'))
+        exercise_entries.extend((row['alias'], row['exercise_key'], 'alias')
+                                for row in snapshot.get('exercise_aliases', []))
+
+        # Without a catalog snapshot the equipment keys of lib/equipment.py stand in
+        equipment_rows = snapshot.get('equipment') or [{'equipment_key': key} for key in EQUIPMENT_MAP]
+        equipment_entries = []
+        for row in equipment_rows:
+            equipment_entries.append((row['equipment_key'], row['equipment_key'], 'equipment_key'))
+            if row.get('display_name'):
+                equipment_entries.append((row['display_name'], row['equipment_key'], 'display_name'))
+        equipment_entries.extend((row['alias'], row['equipment_key'], 'alias')
+                                 for row in snapshot.get('equipment_aliases', []))
+
+        athlete_entries = []
+        for row in snapshot.get('athlete_names', []):
+            athlete_entries.append((row.get('full_name'), row['athlete_id'], 'full_name'))
+            if row.get('email'):
+                athlete_entries.append((row['email'].split('@')[0], row['athlete_id'], 'email'))
+
+        return cls(NameIndex(exercise_entries), NameIndex(equipment_entries), NameIndex(athlete_entries))
+
+    def resolve_workout(self, data: Dict[str, Any], **options: Any) -> Dict[str, Dict[str, List[Match]]]:
+        """Matches for every distinct exercise name and equipment key of a workout, in one call"""
+        exercises, equipment = workout_names(data)
+        return {
+            'exercises': self.exercises.search_many(exercises, **options),
+            'equipment': self.equipment.search_many(equipment, **options),
+        }
+
+
+def load_resolver(snapshot_path: Path = DEFAULT_SNAPSHOT) -> NameResolver:
+    snapshot_path = Path(snapshot_path)
+    snapshot: Dict[str, Any] = {}
+    if snapshot_path.exists():
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    return NameResolver.from_snapshot(snapshot)
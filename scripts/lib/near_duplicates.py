@@ -0,0 +1,148 @@
+"""
+Near-Duplicate Workout Index
+============================
+MinHash signatures with LSH banding over raw workout texts. The import
+checksum (``zamm.imports.checksum_sha256``, lib/parse_cache keys) only
+matches identical text; this finds the re-export with a fixed typo, the
+session pasted twice under two titles, the week copied forward with one
+load changed - before it costs a parse and a commit.
+
+- Text → parse_cache.normalize_text, lowercased, then byte 5-gram shingles.
+- Signature: one-permutation MinHash (each shingle is hashed once with
+  CRC32 and lands in one of ``num_perm`` bins, empty bins borrow from the
+  next non-empty one), so building a signature is linear in the text.
+- LSH: ``bands`` x ``rows`` of the signature are hashed into buckets per
+  group (athlete). A query only compares against entries that share a
+  bucket, so lookups stay sub-linear in the athlete's history. With the
+  defaults (16 x 8) pairs above ~0.7 Jaccard are candidates with high
+  probability; candidates are kept when the estimated Jaccard (share of
+  equal bins) reaches ``threshold``.
+
+Usage:
+    index = NearDuplicateIndex()
+    for record in iter_logs(paths):
+        index.add(record.source_ref, record.raw_text, group=record.athlete)
+    index.query(new_text, group='itamar shatnay')   # [(key, similarity), ...]
+"""
+
+import zlib
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+from .parse_cache import normalize_text
+
+SHINGLE_SIZE = 5
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+
+_EMPTY = 0xFFFFFFFF
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Iterator[bytes]:
+    data = normalize_text(text).lower().encode('utf-8')
+    if len(data) <= size:
+        yield data
+        return
+    for start in range(len(data) - size + 1):
+        yield data[start:start + size]
+
+
+def signature(text: str, num_perm: int = DEFAULT_NUM_PERM) -> Tuple[int, ...]:
+    """One-permutation MinHash of ``text``'s shingles (``num_perm`` 32-bit mins)"""
+    bins = [_EMPTY] * num_perm
+    crc32 = zlib.crc32
+    for shingle in shingles(text):
+        # Multiplicative mixing so the bin index does not come from CRC32's low bits alone
+        value = (crc32(shingle) * 0x9E3779B1) & 0xFFFFFFFF
+        slot = value % num_perm
+        if value < bins[slot]:
+            bins[slot] = value
+    # Densification: an empty bin takes the next non-empty bin's value (rotating)
+    filled = [index for index, value in enumerate(bins) if value != _EMPTY]
+    if filled and len(filled) < num_perm:
+        dense = list(bins)
+        for index in range(num_perm):
+            if bins[index] == _EMPTY:
+                offset = 1
+                while bins[(index + offset) % num_perm] == _EMPTY:
+                    offset += 1
+                dense[index] = bins[(index + offset) % num_perm]
+        bins = dense
+    return tuple(bins)
+
+
+def similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity: share of equal signature bins"""
+    return sum(a == b for a, b in zip(left, right)) / len(left)
+
+
+class NearDuplicateIndex:
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        self.groups: Dict[Hashable, Optional[str]] = {}
+        self._buckets: Dict[Tuple[Optional[str], int, int], List[Hashable]] = {}
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.signatures
+
+    def _band_keys(self, sig: Tuple[int, ...], group: Optional[str]) -> Iterator[Tuple[Optional[str], int, int]]:
+        rows = self.rows
+        for band in range(self.bands):
+            yield group, band, hash(sig[band * rows:(band + 1) * rows])
+
+    def add(self, key: Hashable, text: str, group: Optional[str] = None) -> Tuple[int, ...]:
+        """Index ``text`` under ``key``; ``group`` (athlete) limits which entries it is compared with"""
+        if key in self.signatures:
+            raise ValueError(f"Duplicate key: {key!r}")
+        sig = signature(text, self.num_perm)
+        self.signatures[key] = sig
+        self.groups[key] = group
+        for bucket in self._band_keys(sig, group):
+            self._buckets.setdefault(bucket, []).append(key)
+        return sig
+
+    def candidates(self, sig: Tuple[int, ...], group: Optional[str] = None) -> List[Hashable]:
+        """Keys sharing at least one LSH bucket with ``sig`` (in first-seen order)"""
+        seen = {}
+        for bucket in self._band_keys(sig, group):
+            for key in self._buckets.get(bucket, ()):
+                seen.setdefault(key, None)
+        return list(seen)
+
+    def query_signature(self, sig: Tuple[int, ...], group: Optional[str] = None,
+                        exclude: Optional[Hashable] = None) -> List[Tuple[Hashable, float]]:
+        matches = []
+        for key in self.candidates(sig, group):
+            if key == exclude:
+                continue
+            self.comparisons += 1
+            score = similarity(sig, self.signatures[key])
+            if score >= self.threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+    def query(self, text: str, group: Optional[str] = None) -> List[Tuple[Hashable, float]]:
+        """Indexed entries of ``group`` whose estimated similarity to ``text`` reaches the threshold"""
+        return self.query_signature(signature(text, self.num_perm), group)
+
+    def pairs(self) -> Iterator[Tuple[Hashable, Hashable, float]]:
+        """Every near-duplicate pair in the index once, (earlier key, later key, similarity)"""
+        order = {key: index for index, key in enumerate(self.signatures)}
+        for key, sig in self.signatures.items():
+            for other, score in self.query_signature(sig, self.groups[key], exclude=key):
+                if order[other] > order[key]:
+                    yield key, other, score
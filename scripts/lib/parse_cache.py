@@ -0,0 +1,199 @@
+"""
+Parse-Result Cache
+==================
+Persistent SQLite store of parsed workout JSON keyed by
+(normalized text key, parser ruleset version). Re-importing a log or
+retrying a failed commit finds the draft for a workout text it has already
+parsed instead of running the parser again; the database-level dedupe
+(``zamm.import_raw_text_idempotent`` / ``check_import_duplicate``) only
+kicks in after the parse.
+
+The key is the SHA-256 of the text after ``normalize_text``: Unicode NFKC,
+no bidi/zero-width marks, LF line endings, runs of spaces/tabs collapsed,
+lines stripped and runs of blank lines collapsed. Two copies of a session
+that differ only in that way share one entry. Entries recorded under any
+other ruleset are pruned on open (as in validation_cache.py); the ruleset
+version comes from ``zamm.get_active_ruleset()`` (``fetch_ruleset_version``).
+
+The cache is bounded by entry count and payload bytes; the least recently
+used entries are evicted first. ``stats()`` reports hits, misses and
+evictions like lru.LRUCache.
+"""
+
+import json
+import re
+import sqlite3
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .checksum import calculate_checksum
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_cache (
+    text_key   TEXT NOT NULL,
+    ruleset    TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    last_used  REAL NOT NULL,
+    PRIMARY KEY (text_key, ruleset)
+)
+"""
+INDEX = "CREATE INDEX IF NOT EXISTS parse_cache_last_used ON parse_cache (last_used)"
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+TOUCH_BATCH = 256
+
+_INVISIBLE = dict.fromkeys(map(ord, '\u200b\u200c\u200d\u200e\u200f\u2066\u2067\u2068\u2069\ufeff'))
+_HORIZONTAL_SPACE = re.compile(r'[^\S\n]+')
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a workout text for cache keys (see module docstring)"""
+    text = unicodedata.normalize('NFKC', text).translate(_INVISIBLE)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = '\n'.join(line.strip() for line in _HORIZONTAL_SPACE.sub(' ', text).split('\n'))
+    return _BLANK_LINES.sub('\n\n', text).strip()
+
+
+def text_key(text: str) -> str:
+    return calculate_checksum(normalize_text(text))
+
+
+def fetch_ruleset_version(conn) -> str:
+    """``<ruleset_name>@<version>`` of the active parser ruleset (zamm.get_active_ruleset)"""
+    cur = conn.cursor()
+    cur.execute("SELECT ruleset_name, version FROM zamm.get_active_ruleset()")
+    row = cur.fetchone()
+    if row is None:
+        raise ValueError("No active parser ruleset (zamm.parser_rulesets.is_active)")
+    name, version = row
+    return f"{name}@{version}"
+
+
+class ParseCache:
+    def __init__(self, path: Path, ruleset: str, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be at least 1")
+        self.path = Path(path)
+        self.ruleset = ruleset
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # last_used updates from hits, written in batches so a lookup never waits on a commit
+        self._touched: Dict[str, float] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(SCHEMA)
+        self._conn.execute(INDEX)
+        self._conn.execute("DELETE FROM parse_cache WHERE ruleset != ?", (ruleset,))
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+
+    def get(self, text: str) -> Optional[Any]:
+        return self.get_by_key(text_key(text))
+
+    def get_by_key(self, key: str) -> Optional[Any]:
+        row = self._conn.execute(
+            "SELECT payload FROM parse_cache WHERE text_key = ? AND ruleset = ?",
+            (key, self.ruleset)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = time.time()
+        if len(self._touched) >= TOUCH_BATCH:
+            self._flush_touched()
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, text: str, payload: Any) -> str:
+        key = text_key(text)
+        self.put_many([(key, payload)])
+        return key
+
+    def put_many(self, entries: Iterable[Tuple[str, Any]]) -> None:
+        """Store (text_key, payload) pairs, then evict down to the size bounds"""
+        now = time.time()
+        rows = []
+        for key, payload in entries:
+            encoded = json.dumps(payload, ensure_ascii=False)
+            rows.append((key, self.ruleset, encoded, len(encoded.encode('utf-8')), now))
+        self._flush_touched()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO parse_cache (text_key, ruleset, payload, size, last_used) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        self._evict()
+        self._conn.commit()
+
+    def get_or_parse(self, text: str, parse: Callable[[str], Any]) -> Any:
+        """Cached parse of ``text``, running (and caching) ``parse(text)`` on a miss"""
+        key = text_key(text)
+        payload = self.get_by_key(key)
+        if payload is None:
+            payload = parse(text)
+            self.put_many([(key, payload)])
+        return payload
+
+    def _flush_touched(self) -> None:
+        self._conn.executemany(
+            "UPDATE parse_cache SET last_used = ? WHERE text_key = ? AND ruleset = ?",
+            [(used, key, self.ruleset) for key, used in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _evict(self) -> None:
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        doomed = []
+        for key, ruleset, size in self._conn.execute(
+                "SELECT text_key, ruleset, size FROM parse_cache ORDER BY last_used, text_key"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key, ruleset))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM parse_cache WHERE text_key = ? AND ruleset = ?", doomed)
+        self.evictions += len(doomed)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return (self.hits / lookups * 100) if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        size, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache").fetchone()
+        return {
+            'ruleset': self.ruleset,
+            'size': size,
+            'bytes': total,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hit_rate, 2),
+        }
+
+    def close(self) -> None:
+        self._flush_touched()
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> 'ParseCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
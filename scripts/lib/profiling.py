@@ -0,0 +1,182 @@
+"""
+Timing & Profiling Hooks
+========================
+- Timings: wall/CPU seconds and call counts per named section ("rule:structure",
+  "file:load", "step:equipment_keys") plus plain counters ("nodes:item").
+  Picklable and mergeable, so worker processes return theirs with their
+  results and the parent adds them up.
+- profiled(): opt-in cProfile around a block, writing ``<name>.prof``
+  (pstats; ``python3 -m pstats``, snakeviz) and ``<name>.collapsed``
+  (``a;b;c <µs>`` lines for flamegraph.pl / speedscope).
+- write_metrics(): one JSON document per run for nightly trend lines;
+  ``*.jsonl`` paths are appended to, anything else is overwritten.
+
+Usage:
+    timings = Timings()
+    with timings.section('file:load'):
+        data = json.loads(raw)
+    with profiled(Path('.cache/profile'), 'validate_golden_sets'):
+        main()
+    write_metrics(Path('metrics.jsonl'), 'validate_golden_sets', {'timings': timings.to_dict()})
+"""
+
+import cProfile
+import json
+import os
+import platform
+import pstats
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Collapsed stacks deeper than this are cut (recursive walkers)
+MAX_STACK_DEPTH = 64
+
+
+class Timings:
+    def __init__(self):
+        self.wall: Counter = Counter()
+        self.cpu: Counter = Counter()
+        self.calls: Counter = Counter()
+        self.counts: Counter = Counter()
+
+    def __bool__(self) -> bool:
+        return bool(self.calls or self.counts)
+
+    def add(self, name: str, wall: float, cpu: float, calls: int = 1) -> None:
+        self.wall[name] += wall
+        self.cpu[name] += cpu
+        self.calls[name] += calls
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+    def merge(self, other: 'Timings') -> None:
+        self.wall.update(other.wall)
+        self.cpu.update(other.cpu)
+        self.calls.update(other.calls)
+        self.counts.update(other.counts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'sections': {
+                name: {
+                    'wall_ms': round(self.wall[name] * 1000, 3),
+                    'cpu_ms': round(self.cpu[name] * 1000, 3),
+                    'calls': self.calls[name],
+                }
+                for name in sorted(self.calls)
+            },
+            'counts': dict(sorted(self.counts.items())),
+        }
+
+    def report_lines(self, prefix: str = '') -> List[str]:
+        """Sections matching ``prefix``, slowest first, for console summaries"""
+        names = sorted((name for name in self.calls if name.startswith(prefix)), key=lambda name: -self.wall[name])
+        return [
+            f"{name:<32} {self.wall[name] * 1000:10.1f} ms wall {self.cpu[name] * 1000:10.1f} ms cpu "
+            f"{self.calls[name]:>9} calls"
+            for name in names
+        ]
+
+
+# ---------------------------------------------------------------------------
+# cProfile
+# ---------------------------------------------------------------------------
+
+def _label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == '~':
+        return name.strip('<>')
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """
+    Approximate collapsed stacks (µs of own time per stack) from cProfile's
+    caller graph. cProfile keeps only caller → callee edges, so a function's
+    own time is split across its call paths in proportion to the cumulative
+    time each incoming edge accounts for.
+    """
+    entries = stats.stats
+    callees: Dict[Any, List[Any]] = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+    roots = [func for func, (_, _, _, _, callers) in entries.items() if not callers]
+
+    stacks: Counter = Counter()
+
+    def walk(func, path: Tuple[str, ...], share: float) -> None:
+        _, _, own, total, _ = entries[func]
+        path = path + (_label(func),)
+        if own * share >= 1e-6:
+            stacks[';'.join(path)] += int(own * share * 1e6)
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        for callee in callees.get(func, ()):
+            callee_total = entries[callee][3]
+            edge_total = entries[callee][4][func][3]
+            if callee_total <= 0 or _label(callee) in path:
+                continue
+            callee_share = share * edge_total / callee_total
+            # Paths worth less than a microsecond are dropped (keeps the walk from fanning out)
+            if callee_total * callee_share >= 1e-6:
+                walk(callee, path, callee_share)
+
+    for root in roots:
+        walk(root, (), 1.0)
+    return dict(stacks)
+
+
+@contextmanager
+def profiled(output_dir: Optional[Path], name: str) -> Iterator[Optional[cProfile.Profile]]:
+    """cProfile the block when ``output_dir`` is set; writes <name>.prof and <name>.collapsed there"""
+    if output_dir is None:
+        yield None
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(profiler)
+        stats.dump_stats(str(output_dir / f'{name}.prof'))
+        with open(output_dir / f'{name}.collapsed', 'w', encoding='utf-8') as f:
+            for stack, micros in sorted(collapsed_stacks(stats).items()):
+                f.write(f"{stack} {micros}\n")
+
+
+# ---------------------------------------------------------------------------
+# Metrics file
+# ---------------------------------------------------------------------------
+
+def write_metrics(path: Path, script: str, metrics: Dict[str, Any]) -> None:
+    """Write one run's metrics, stamped with time and interpreter; ``*.jsonl`` appends a line"""
+    document = {
+        'script': script,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        **metrics,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.jsonl':
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(document, ensure_ascii=False) + '\n')
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+            f.write('\n')
@@ -0,0 +1,145 @@
+"""
+Quantity lexer
+==============
+One compiled pattern that lexes the numbers in a prescription line into
+typed tokens in a single left-to-right pass (``re.finditer`` over an
+alternation; everything between tokens is skipped):
+
+    kind        examples                          value, value_max, unit
+    sets        "3x", "4 ×"                       3
+    rpe         "RPE 7.5", "RPE 6-7"              7.5 / 6, 7
+    clock       "2:00", "1:05:00"                 seconds, unit 'sec'
+    per_side    "8/8", "20s/20s", "30/30m"        8, 8 (left, right)
+    range       "20-30 sec", "8 - 10", "6 to 7"   20, 30, 'sec'
+    quantity    "100kg", "2 min", "12"            100, None, 'kg'
+
+Units are normalized to kg, lbs, m, km, min, sec, spm and cal. Numbers are
+ints when integral. ``parse_quantity`` reads a value that is exactly one
+quantity/range/clock ("20-30", "45", "2:00") - what the schema migrations
+need for legacy string fields.
+
+Throughput over data/raw_logs: scripts/benchmarks/bench_quantity_lexer.py
+"""
+
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+NUM = r'\d+(?:\.\d+)?'
+# "8-10", "18 -20", "6 to 7"; not the "8- 90" in "8/8- 90/90 Hips Switch"
+RANGE = rf'{NUM}(?:\s*(?:-|to)\s*{NUM}(?![\d/]))?'
+
+DURATION_UNITS = r'seconds?|secs?|s|minutes?|mins?|min'
+DISTANCE_UNITS = r'km|meters?|metres?|m'
+LOAD_UNITS = r'kgs?|kilos?|lbs?'
+RATE_UNITS = r'spm'
+ENERGY_UNITS = r'k?cals?'
+UNITS = rf'{RATE_UNITS}|{ENERGY_UNITS}|{LOAD_UNITS}|{DISTANCE_UNITS}|{DURATION_UNITS}'
+
+
+def _unit(name: str) -> str:
+    return rf'(?:\s*(?P<{name}>{UNITS})\b)?'
+
+
+# The leading lookahead lets the regex engine skip to the next digit / "R" instead of
+# trying every alternative at every position
+_TOKEN = re.compile(rf"""
+    (?=[\dRr])
+    (?:
+    (?P<rpe>\bRPE\s*(?P<rpe_low>{NUM})(?:\s*-\s*(?P<rpe_high>{NUM}))?)
+  | (?P<clock>(?<![\d.:])\d{{1,2}}(?::[0-5]\d){{1,2}}(?![\d:]))
+  | (?P<sets>(?<![\d.])(?P<sets_value>\d+)\s*[x×](?=\s*\d))
+  | (?P<per_side>(?<![\d.])(?P<left>{NUM}){_unit('left_unit')}\s*/\s*(?P<right>{NUM}){_unit('right_unit')}(?![\d/]))
+  | (?P<range>(?<![\d.])(?P<low>{NUM})\s*(?:-|to\b)\s*(?P<high>{NUM})(?![\d/]){_unit('range_unit')})
+  | (?P<quantity>(?<![\d.])(?P<value>{NUM}){_unit('unit')})
+    )
+""", re.IGNORECASE | re.VERBOSE)
+_RANGE_VALUE = re.compile(rf'\s*(?P<low>{NUM})(?:\s*(?:-|to\b)\s*(?P<high>{NUM}))?\s*', re.IGNORECASE)
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    start: int
+    value: Any
+    value_max: Any = None
+    unit: Optional[str] = None
+
+
+def number(text: str) -> Any:
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def canonical_unit(unit: str) -> str:
+    """"mins" → 'min', "Seconds" → 'sec', "kgs" → 'kg', "meters" → 'm', "kcal" → 'cal', ..."""
+    unit = unit.lower()
+    if unit == 'spm':
+        return 'spm'
+    if unit.startswith('s'):
+        return 'sec'
+    if unit.startswith('mi'):
+        return 'min'
+    if unit == 'km':
+        return 'km'
+    if unit.startswith('m'):
+        return 'm'
+    if unit.startswith('lb'):
+        return 'lbs'
+    if unit.endswith(('cal', 'cals')):
+        return 'cal'
+    return 'kg'
+
+
+def _token(match: 're.Match') -> Token:
+    kind, text, start = match.lastgroup, match.group(), match.start()
+    group = match.group
+    if kind == 'quantity':
+        unit = group('unit')
+        return Token(kind, text, start, number(group('value')), None, unit and canonical_unit(unit))
+    if kind == 'range':
+        unit = group('range_unit')
+        return Token(kind, text, start, number(group('low')), number(group('high')), unit and canonical_unit(unit))
+    if kind == 'per_side':
+        unit = group('left_unit') or group('right_unit')
+        return Token(kind, text, start, number(group('left')), number(group('right')), unit and canonical_unit(unit))
+    if kind == 'sets':
+        return Token(kind, text, start, int(group('sets_value')))
+    if kind == 'rpe':
+        high = group('rpe_high')
+        return Token(kind, text, start, number(group('rpe_low')), high and number(high))
+    seconds = 0
+    for part in text.split(':'):
+        seconds = seconds * 60 + int(part)
+    return Token(kind, text, start, seconds, None, 'sec')
+
+
+def tokenize(text: str) -> List[Token]:
+    """Typed tokens for every quantity in ``text``, left to right"""
+    return [_token(match) for match in _TOKEN.finditer(text)]
+
+
+def parse_quantity(text: str) -> Optional[Token]:
+    """The token when ``text`` is exactly one quantity, range or clock time; else None"""
+    text = text.strip()
+    match = _TOKEN.fullmatch(text)
+    if match is None or match.lastgroup not in ('quantity', 'range', 'clock'):
+        return None
+    return _token(match)
+
+
+def parse_range(text: str) -> Optional[Any]:
+    """(low, high) for "8-10" / "6 to 7", (value, None) for "8"; high is None when equal to low"""
+    match = _RANGE_VALUE.fullmatch(text)
+    if match is None:
+        return None
+    low, high = number(match.group('low')), match.group('high')
+    high = high and number(high)
+    return low, (high if high != low else None)
+
+
+def measure(token: Token, unit: Optional[str] = None) -> Dict[str, Any]:
+    """``{value, unit}`` or ``{value_min, value_max, unit}`` (the schema_v3 weight-range shape)"""
+    unit = token.unit or unit
+    if token.value_max is None or token.value_max == token.value:
+        return {'value': token.value, 'unit': unit}
+    return {'value_min': token.value, 'value_max': token.value_max, 'unit': unit}
@@ -0,0 +1,181 @@
+"""
+Byte-offset index over raw athlete logs
+=======================================
+``build_index()`` runs the streaming splitter (lib/raw_logs.py) once over a
+log and writes a sidecar ``<log>.idx`` next to it: one compact row per
+session with (workout_date, title, status, start offset, length, SHA-256 of
+the bytes). ``RawLogIndex`` loads the sidecar (rebuilding it if the log's
+size or mtime changed) and slices a session's text straight out of an mmap
+of the log, so fetching one day never rescans the file.
+
+    with RawLogIndex.open(RAW_LOGS_DIR / 'Workout Log: itamar shatnay.txt') as index:
+        text = index.read(index.find('2025-06-21')[0])
+"""
+
+import hashlib
+import json
+import mmap
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .batch import atomic_write_text
+from .raw_logs import split_log
+
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 1
+ENTRY_FIELDS = ('workout_date', 'title', 'status', 'start', 'length', 'sha256')
+
+
+def sidecar_path(log_path: Path) -> Path:
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name + INDEX_SUFFIX)
+
+
+class IndexEntry:
+    """One indexed session; ``start``/``length`` are byte offsets into the log"""
+
+    __slots__ = ENTRY_FIELDS
+
+    def __init__(self, workout_date: str, title: Optional[str], status: Optional[str],
+                 start: int, length: int, sha256: str):
+        self.workout_date = workout_date
+        self.title = title
+        self.status = status
+        self.start = start
+        self.length = length
+        self.sha256 = sha256
+
+    def __repr__(self):
+        return f"IndexEntry({self.workout_date}, {self.title!r}, start={self.start}, length={self.length})"
+
+
+def _log_stamp(log_path: Path) -> Dict[str, int]:
+    stat = Path(log_path).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def build_index(log_path: Path) -> Dict[str, Any]:
+    """Split ``log_path`` once and write its sidecar; returns the index document"""
+    log_path = Path(log_path)
+    stamp = _log_stamp(log_path)
+    athlete = None
+    rows = []
+    with open(log_path, 'rb') as handle:
+        view = _map(handle)
+        try:
+            for record in split_log(log_path):
+                athlete = athlete or record.athlete
+                digest = hashlib.sha256(view[record.start_offset:record.end_offset]).hexdigest()
+                rows.append([record.workout_date.isoformat(), record.title, record.status,
+                             record.start_offset, record.length, digest])
+        finally:
+            _unmap(view)
+
+    document = {
+        'version': INDEX_VERSION,
+        'source': log_path.name,
+        'athlete': athlete,
+        **stamp,
+        'fields': list(ENTRY_FIELDS),
+        'entries': rows,
+    }
+    atomic_write_text(sidecar_path(log_path),
+                      json.dumps(document, ensure_ascii=False, separators=(',', ':')))
+    return document
+
+
+def _map(handle):
+    """Read-only mmap of an open file (empty files cannot be mapped)"""
+    if Path(handle.name).stat().st_size == 0:
+        return b''
+    return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _unmap(view) -> None:
+    if isinstance(view, mmap.mmap):
+        view.close()
+
+
+def load_index(log_path: Path, rebuild: bool = True) -> Dict[str, Any]:
+    """Sidecar for ``log_path``; rebuilt when missing or stale (unless rebuild=False)"""
+    path = sidecar_path(log_path)
+    if path.exists():
+        document = json.loads(path.read_text(encoding='utf-8'))
+        stamp = _log_stamp(log_path)
+        if (document.get('version') == INDEX_VERSION and document.get('size') == stamp['size']
+                and document.get('mtime_ns') == stamp['mtime_ns']):
+            return document
+        if not rebuild:
+            raise ValueError(f"Stale index for {Path(log_path).name} (log changed since it was built)")
+    elif not rebuild:
+        raise FileNotFoundError(path)
+    return build_index(log_path)
+
+
+class RawLogIndex:
+    """Loaded sidecar + mmap of the log it describes"""
+
+    def __init__(self, log_path: Path, document: Dict[str, Any]):
+        self.log_path = Path(log_path)
+        self.athlete: Optional[str] = document.get('athlete')
+        self.entries = [IndexEntry(*row) for row in document['entries']]
+        self._by_date: Dict[str, List[IndexEntry]] = {}
+        for entry in self.entries:
+            self._by_date.setdefault(entry.workout_date, []).append(entry)
+        self._handle = open(self.log_path, 'rb')
+        self._view = _map(self._handle)
+
+    @classmethod
+    def open(cls, log_path: Path, rebuild: bool = True) -> 'RawLogIndex':
+        return cls(log_path, load_index(log_path, rebuild=rebuild))
+
+    def find(self, workout_date: Union[str, date], title: Optional[str] = None) -> List[IndexEntry]:
+        """Sessions on a date (optionally only those with this title, case-insensitive)"""
+        if isinstance(workout_date, date):
+            workout_date = workout_date.isoformat()
+        entries = self._by_date.get(workout_date, [])
+        if title is not None:
+            entries = [entry for entry in entries if (entry.title or '').lower() == title.lower()]
+        return entries
+
+    def read_bytes(self, entry: IndexEntry, verify: bool = False) -> bytes:
+        content = self._view[entry.start:entry.start + entry.length]
+        if verify and hashlib.sha256(content).hexdigest() != entry.sha256:
+            raise ValueError(f"Checksum mismatch for {self.log_path.name} {entry.workout_date}; rebuild the index")
+        return bytes(content)
+
+    def read(self, entry: IndexEntry, verify: bool = False) -> str:
+        return self.read_bytes(entry, verify).decode('utf-8')
+
+    def close(self) -> None:
+        _unmap(self._view)
+        self._handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def index_directory(paths: Iterable[Path]) -> List[Path]:
+    """(Re)build sidecars for log files / directories of *.txt logs; returns the logs indexed"""
+    logs = []
+    for path in paths:
+        path = Path(path)
+        logs.extend(sorted(path.glob('*.txt')) if path.is_dir() else [path])
+    for log in logs:
+        build_index(log)
+    return logs
+
+
+def find_log(directory: Path, athlete: str) -> Optional[Path]:
+    """Log in ``directory`` whose athlete name starts with ``athlete`` (case-insensitive)"""
+    wanted = ' '.join(athlete.lower().replace('_', ' ').split())
+    for log in sorted(Path(directory).glob('*.txt')):
+        name = load_index(log).get('athlete') or ''
+        if ' '.join(name.lower().split()).startswith(wanted):
+            return log
+    return None
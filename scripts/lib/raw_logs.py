@@ -0,0 +1,189 @@
+"""
+Streaming splitter for per-athlete raw logs (data/raw_logs)
+===========================================================
+A log is a ``Workout Log: <athlete>`` header followed by dated sessions:
+
+    Sunday June 15, 2025
+    Title: B0W1
+    Status: completed
+
+    A) Warm up: ...
+
+    -----
+
+``split_log()`` reads the file line by line in binary mode and yields one
+WorkoutRecord per session, so only the current session is held in memory.
+Byte offsets are exact, i.e. ``raw[start_offset:end_offset]`` of the file is
+``record.raw_text``, the same text that the hand-cut data/golden_set/*.txt
+files and ``zamm.import_raw_text_idempotent(p_raw_text => ...)`` take.
+"""
+
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+HEADER_PREFIX = 'Workout Log:'
+SEPARATOR = '-----'
+
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December')
+DAY_LINE = re.compile(
+    r'^(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+'
+    r'(' + '|'.join(MONTHS) + r')\s+(\d{1,2}),\s+(\d{4})\s*$'
+)
+TITLE_LINE = re.compile(r'^Title:\s*(.*?)\s*$')
+STATUS_LINE = re.compile(r'^Status:\s*(.*?)\s*$')
+
+
+def parse_day_line(line: str) -> Optional[date]:
+    """'Sunday June 15, 2025' / 'Sunday November  9, 2025' → date, else None"""
+    match = DAY_LINE.match(line)
+    if not match:
+        return None
+    month, day, year = match.groups()
+    return date(int(year), MONTHS.index(month) + 1, int(day))
+
+
+class WorkoutRecord:
+    """One dated session cut out of a raw log"""
+
+    __slots__ = ('athlete', 'workout_date', 'title', 'status', 'body',
+                 'source_file', 'start_offset', 'end_offset', 'raw_text')
+
+    def __init__(self, athlete: Optional[str], workout_date: date, title: Optional[str],
+                 status: Optional[str], body: str, source_file: str,
+                 start_offset: int, end_offset: int, raw_text: str):
+        self.athlete = athlete
+        self.workout_date = workout_date
+        self.title = title
+        self.status = status
+        self.body = body
+        self.source_file = source_file
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+        self.raw_text = raw_text
+
+    @property
+    def length(self) -> int:
+        return self.end_offset - self.start_offset
+
+    @property
+    def source_ref(self) -> str:
+        """Stable reference for stg_imports.source_ref: ``<file>#<start>-<end>``"""
+        return f"{self.source_file}#{self.start_offset}-{self.end_offset}"
+
+    def to_dict(self, include_text: bool = True) -> Dict[str, Any]:
+        result = {
+            'athlete': self.athlete,
+            'workout_date': self.workout_date.isoformat(),
+            'title': self.title,
+            'status': self.status,
+            'source_file': self.source_file,
+            'start_offset': self.start_offset,
+            'end_offset': self.end_offset,
+        }
+        if include_text:
+            result['body'] = self.body
+            result['raw_text'] = self.raw_text
+        return result
+
+    def __repr__(self):
+        return f"WorkoutRecord({self.athlete!r}, {self.workout_date.isoformat()}, {self.title!r})"
+
+
+def _build_record(athlete: Optional[str], source_file: str, start: int,
+                  lines: List[bytes], offsets: List[int]) -> WorkoutRecord:
+    """``lines[0]`` is the day line; trailing blank lines are not part of the record"""
+    end = len(lines)
+    while end > 1 and not lines[end - 1].strip():
+        end -= 1
+    end_offset = offsets[end - 1] + len(lines[end - 1].rstrip(b'\r\n'))
+    text_lines = [line.decode('utf-8').rstrip('\r\n') for line in lines[:end]]
+
+    # Header: the non-blank lines right after the day line. Title/Status are
+    # pulled out; anything else there (e.g. 'REST DAY') stays in the body.
+    title = status = None
+    body_lines = []
+    in_header = True
+    for line in text_lines[1:]:
+        if in_header and not line.strip():
+            in_header = False
+        elif in_header and title is None and TITLE_LINE.match(line):
+            title = TITLE_LINE.match(line).group(1) or None
+            continue
+        elif in_header and status is None and STATUS_LINE.match(line):
+            status = STATUS_LINE.match(line).group(1) or None
+            continue
+        body_lines.append(line)
+
+    return WorkoutRecord(
+        athlete=athlete,
+        workout_date=parse_day_line(text_lines[0]),
+        title=title,
+        status=status,
+        body='\n'.join(body_lines).strip(),
+        source_file=source_file,
+        start_offset=start,
+        end_offset=end_offset,
+        raw_text='\n'.join(text_lines),
+    )
+
+
+def split_log(path: Path) -> Iterator[WorkoutRecord]:
+    """Yield each dated session of one raw log, in file order"""
+    path = Path(path)
+    athlete = None
+    current: List[bytes] = []
+    offsets: List[int] = []
+    start = 0
+    offset = 0
+
+    with open(path, 'rb') as handle:
+        for raw_line in handle:
+            line = raw_line.decode('utf-8').rstrip('\r\n')
+            if athlete is None and not current and line.startswith(HEADER_PREFIX):
+                athlete = ' '.join(line[len(HEADER_PREFIX):].split()) or None
+            elif parse_day_line(line):
+                if current:
+                    yield _build_record(athlete, path.name, start, current, offsets)
+                current, offsets, start = [raw_line], [offset], offset
+            elif line.strip() == SEPARATOR:
+                if current:
+                    yield _build_record(athlete, path.name, start, current, offsets)
+                current, offsets = [], []
+            elif current:
+                current.append(raw_line)
+                offsets.append(offset)
+            offset += len(raw_line)
+
+    if current:
+        yield _build_record(athlete, path.name, start, current, offsets)
+
+
+def iter_logs(paths: Iterable[Path]) -> Iterator[WorkoutRecord]:
+    """Chain split_log() over files (directories expand to their *.txt logs)"""
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            for child in sorted(path.glob('*.txt')):
+                yield from split_log(child)
+        else:
+            yield from split_log(path)
+
+
+def filter_records(records: Iterable[WorkoutRecord], since: Optional[date] = None,
+                   until: Optional[date] = None, status: Optional[str] = None) -> Iterator[WorkoutRecord]:
+    """Lazy date-range / status filter for a record stream"""
+    for record in records:
+        if since and record.workout_date < since:
+            continue
+        if until and record.workout_date > until:
+            continue
+        if status and record.status != status:
+            continue
+        yield record
+
+
+def parse_iso_date(value: str) -> date:
+    return datetime.strptime(value, '%Y-%m-%d').date()
@@ -0,0 +1,210 @@
+"""
+Single-Pass Rule Engine
+=======================
+Walks a parsed workout tree exactly once and dispatches every dict node to
+the rules registered for its kind (workout/session/block/item/prescription/
+performed). Trees loaded with lib/workout_model are walked the same way:
+model nodes are Mappings over their JSON keys. Node paths such as ``sessions[0].blocks[2].items[1]`` are only
+rendered when a rule actually reports an issue.
+
+Usage:
+    engine = RuleEngine([MyRule(), OtherRule()])
+    rules = engine.run(data)
+    rules['my_rule'].issues
+
+InstrumentedRuleEngine runs the same walk and also records per-rule
+wall/CPU time and the number of nodes visited per kind (lib/profiling.Timings).
+"""
+
+import time
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from .profiling import Timings
+from .workout_model import Node
+
+# Node kinds
+WORKOUT = 'workout'
+SESSION = 'session'
+BLOCK = 'block'
+ITEM = 'item'
+PRESCRIPTION = 'prescription'
+PERFORMED = 'performed'
+OTHER = 'other'
+ANY = '*'
+
+NODE_KINDS = (WORKOUT, SESSION, BLOCK, ITEM, PRESCRIPTION, PERFORMED, OTHER)
+
+# Kind of the dicts found inside a list, keyed by the list's field name
+LIST_ELEMENT_KINDS = {
+    'sessions': SESSION,
+    'blocks': BLOCK,
+    'items': ITEM,
+    'exercises': ITEM,
+    'exercise_options': ITEM,
+}
+
+# JSON objects: plain dicts or workout_model nodes
+OBJECT_TYPES = (dict, Node)
+
+# Kind of a dict stored directly under a field
+DICT_VALUE_KINDS = {
+    'prescription': PRESCRIPTION,
+    'performed': PERFORMED,
+}
+
+
+class NodeContext:
+    """Position of a node in the tree. The path string is built on demand."""
+
+    __slots__ = ('parent', 'key', 'kind')
+
+    def __init__(self, parent: Optional['NodeContext'], key: Union[str, int], kind: str):
+        self.parent = parent
+        self.key = key
+        self.kind = kind
+
+    @property
+    def path(self) -> str:
+        keys = []
+        ctx = self
+        while ctx.parent is not None:
+            keys.append(ctx.key)
+            ctx = ctx.parent
+        path = ctx.key
+        for key in reversed(keys):
+            path = _join(path, key)
+        return path
+
+    def child_path(self, key: Union[str, int]) -> str:
+        return _join(self.path, key)
+
+
+def _join(path: str, key: Union[str, int]) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else key
+
+
+class Rule:
+    """
+    Base class for a check run by the engine.
+
+    Override ``visit`` to see every dict node of the kinds listed in
+    ``kinds``, and/or ``visit_field`` to see only the fields named in
+    ``fields`` (cheaper: the engine skips the call for all other keys).
+    """
+
+    name = 'rule'
+    kinds: Tuple[str, ...] = (ANY,)
+    fields: FrozenSet[str] = frozenset()
+
+    def begin(self) -> None:
+        """Reset per-document state. Called before each run."""
+        self.issues: List[str] = []
+
+    def visit(self, node: Dict[str, Any], ctx: NodeContext) -> None:
+        pass
+
+    def visit_field(self, node: Dict[str, Any], key: str, value: Any, ctx: NodeContext) -> None:
+        pass
+
+    def finish(self) -> None:
+        """Called after the walk completes."""
+
+    def report(self, message: str) -> None:
+        self.issues.append(message)
+
+
+def _overrides(rule: Rule, method: str) -> bool:
+    return getattr(type(rule), method) is not getattr(Rule, method)
+
+
+class RuleEngine:
+    """Runs a fixed set of rules over a document in one traversal."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = list(rules)
+
+        self._node_dispatch: Dict[str, list] = {}
+        self._field_dispatch: Dict[str, list] = {}
+        for kind in NODE_KINDS:
+            wanted = [r for r in self.rules if ANY in r.kinds or kind in r.kinds]
+            self._node_dispatch[kind] = [self._bind(r, r.visit) for r in wanted if _overrides(r, 'visit')]
+            self._field_dispatch[kind] = [
+                (r.fields, self._bind(r, r.visit_field)) for r in wanted
+                if r.fields and _overrides(r, 'visit_field')
+            ]
+
+    def _bind(self, rule: Rule, method):
+        """Callable the walk dispatches to for ``rule``; subclasses may wrap it"""
+        return method
+
+    def run(self, data: Any, path: str = '') -> Dict[str, Rule]:
+        """Walk ``data`` once and return the rules keyed by name."""
+        for rule in self.rules:
+            rule.begin()
+
+        if isinstance(data, OBJECT_TYPES):
+            self._walk_dict(data, NodeContext(None, path, WORKOUT))
+        elif isinstance(data, list):
+            self._walk_list(data, NodeContext(None, path, OTHER))
+
+        for rule in self.rules:
+            rule.finish()
+        return {rule.name: rule for rule in self.rules}
+
+    def _walk_dict(self, node: Dict[str, Any], ctx: NodeContext) -> None:
+        for visit in self._node_dispatch[ctx.kind]:
+            visit(node, ctx)
+
+        field_rules = self._field_dispatch[ctx.kind]
+        for key, value in (node.items() if isinstance(node, dict) else node.fields()):
+            for fields, visit_field in field_rules:
+                if key in fields:
+                    visit_field(node, key, value, ctx)
+
+            if isinstance(value, OBJECT_TYPES):
+                self._walk_dict(value, NodeContext(ctx, key, DICT_VALUE_KINDS.get(key, OTHER)))
+            elif isinstance(value, list):
+                self._walk_list(value, NodeContext(ctx, key, LIST_ELEMENT_KINDS.get(key, OTHER)))
+
+    def _walk_list(self, node: List[Any], ctx: NodeContext) -> None:
+        kind = ctx.kind
+        for i, value in enumerate(node):
+            if isinstance(value, OBJECT_TYPES):
+                self._walk_dict(value, NodeContext(ctx, i, kind))
+            elif isinstance(value, list):
+                self._walk_list(value, NodeContext(ctx, i, OTHER))
+
+
+class InstrumentedRuleEngine(RuleEngine):
+    """
+    RuleEngine that times every rule callback (``rule:<name>`` sections) and
+    counts visited nodes (``nodes:<kind>``) into ``self.timings``. The extra
+    clock reads cost roughly as much as the checks, so it is opt-in.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        self.timings = Timings()
+        super().__init__(rules)
+
+    def _bind(self, rule: Rule, method):
+        section = f"rule:{rule.name}"
+        perf_counter, process_time = time.perf_counter, time.process_time
+
+        def timed(*args):
+            wall, cpu = perf_counter(), process_time()
+            try:
+                return method(*args)
+            finally:
+                self.timings.add(section, perf_counter() - wall, process_time() - cpu)
+        return timed
+
+    def _walk_dict(self, node: Dict[str, Any], ctx: NodeContext) -> None:
+        self.timings.counts[f"nodes:{ctx.kind}"] += 1
+        super()._walk_dict(node, ctx)
+
+    def drain(self) -> Timings:
+        """Timings recorded since the last drain; recording continues into a fresh set"""
+        timings, self.timings = self.timings, Timings()
+        return timings
@@ -0,0 +1,158 @@
+"""
+Schema v3.0 transforms
+
+1. Reorder item fields: item_sequence → exercise_name → equipment_key → prescription → performed
+2. Convert weight fields from simple values to {value, unit} structure
+
+Each transform mutates the document in place and, when given a Counter,
+records what it changed. Weights already in {value, unit} form are not
+converted again (only a legacy ``_kg`` name is renamed), so transform_weights is a no-op on v3.x data; the field order is
+not (v3.2 documents order item fields differently).
+"""
+
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from .batch import key_prefilter
+
+# Weight field patterns to transform
+WEIGHT_FIELDS = [
+    'actual_weight_kg',
+    'target_weight_kg',
+    'target_weight_kg_min',
+    'target_weight_kg_max',
+    'target_load',
+    'actual_load'
+]
+
+# Raw-bytes test for the pre-v3.0 *_kg keys (target_load / actual_load exist in every version)
+has_legacy_weights = key_prefilter([field for field in WEIGHT_FIELDS if '_kg' in field])
+
+
+def convert_weight(value: Any) -> Any:
+    """Convert weight value to new structure"""
+    if value is None:
+        return None
+    
+    # Handle arrays (multiple sets)
+    if isinstance(value, list):
+        return [{'value': v, 'unit': 'kg'} for v in value]
+    
+    # Handle single values
+    return {'value': value, 'unit': 'kg'}
+
+
+def is_converted(value: Any) -> bool:
+    """True for values already in {value, unit} form (or a list of them)"""
+    if isinstance(value, list):
+        return all(isinstance(v, dict) for v in value)
+    return isinstance(value, dict)
+
+
+def transform_weights(obj: Any, counts: Optional[Counter] = None) -> None:
+    """Transform weight fields in an object"""
+    if not isinstance(obj, dict):
+        return
+    if counts is None:
+        counts = Counter()
+    
+    # Handle min/max range pattern
+    if 'target_weight_kg_min' in obj and 'target_weight_kg_max' in obj:
+        obj['target_weight'] = {
+            'value_min': obj['target_weight_kg_min'],
+            'value_max': obj['target_weight_kg_max'],
+            'unit': 'kg'
+        }
+        del obj['target_weight_kg_min']
+        del obj['target_weight_kg_max']
+        counts['weight_fields_converted'] += 2
+    
+    # Handle individual weight fields (target_load / actual_load keep their name)
+    for field in WEIGHT_FIELDS:
+        if field in obj and field not in ['target_weight_kg_min', 'target_weight_kg_max']:
+            new_field = field.replace('_kg', '')
+            if is_converted(obj[field]):
+                # Already {value, unit}: only a legacy _kg name is left to fix
+                if new_field != field:
+                    obj[new_field] = obj.pop(field)
+                    counts['weight_fields_renamed'] += 1
+                continue
+            if new_field == field and obj[field] is None:
+                continue
+            obj[new_field] = convert_weight(obj[field])
+            if new_field != field:
+                del obj[field]
+            counts['weight_fields_converted'] += 1
+    
+    # Recursively process nested objects and arrays
+    for key, value in list(obj.items()):
+        if isinstance(value, list):
+            for item in value:
+                transform_weights(item, counts)
+        elif isinstance(value, dict):
+            transform_weights(value, counts)
+
+
+def reorder_item_fields(item: Dict[str, Any], counts: Optional[Counter] = None) -> Dict[str, Any]:
+    """Reorder fields in an item object"""
+    if not isinstance(item, dict):
+        return item
+    
+    # Check if this is an item with exercise fields
+    if not ('exercise_name' in item or 'exercises' in item or 'exercise_options' in item):
+        return item
+    
+    # Create new dict with desired field order
+    ordered_item = {}
+    
+    # 1. Sequence
+    if 'item_sequence' in item:
+        ordered_item['item_sequence'] = item['item_sequence']
+    
+    # 2. Identity fields (exercise_name, equipment_key)
+    if 'exercise_name' in item:
+        ordered_item['exercise_name'] = item['exercise_name']
+    if 'equipment_key' in item:
+        ordered_item['equipment_key'] = item['equipment_key']
+    
+    # 3. Prescription
+    if 'prescription' in item:
+        ordered_item['prescription'] = item['prescription']
+    
+    # 4. Performed
+    if 'performed' in item:
+        ordered_item['performed'] = item['performed']
+    
+    # 5. All other fields
+    for key, value in item.items():
+        if key not in ordered_item:
+            ordered_item[key] = value
+    
+    if counts is not None and list(ordered_item) != list(item):
+        counts['items_reordered'] += 1
+    return ordered_item
+
+
+def process_items(obj: Any, counts: Optional[Counter] = None) -> None:
+    """Process all items in blocks recursively"""
+    if not isinstance(obj, dict):
+        return
+    
+    # If this is an items array, reorder each item
+    if 'items' in obj and isinstance(obj['items'], list):
+        obj['items'] = [reorder_item_fields(item, counts) for item in obj['items']]
+        
+        # Process nested exercises/exercise_options
+        for item in obj['items']:
+            if 'exercises' in item and isinstance(item['exercises'], list):
+                item['exercises'] = [reorder_item_fields(ex, counts) for ex in item['exercises']]
+            if 'exercise_options' in item and isinstance(item['exercise_options'], list):
+                item['exercise_options'] = [reorder_item_fields(ex, counts) for ex in item['exercise_options']]
+    
+    # Recursively process nested structures
+    for key, value in obj.items():
+        if isinstance(value, list):
+            for item in value:
+                process_items(item, counts)
+        elif isinstance(value, dict):
+            process_items(value, counts)
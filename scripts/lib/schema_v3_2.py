@@ -0,0 +1,162 @@
+"""
+Schema v3.1 → v3.2 transforms
+
+Converts duration, distance and circuit rest fields from plain numbers to
+the {value, unit} structure. Legacy string values are read with
+lib/quantity_lexer: "45" → {value}, "20-30" → {value_min, value_max},
+"2:00" → seconds. Each transform mutates the document in place and, when
+given a Counter, records every edit it made (``batch.count_changes`` is 0
+for an untouched document). Values it cannot read stay where they are and
+are counted as ``values_skipped``.
+
+``has_legacy_fields`` / ``has_legacy_circuit_fields`` test a file's raw
+bytes: when they are False the transform has nothing to do and the file
+need not be parsed.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from .batch import key_prefilter
+from .quantity_lexer import measure, parse_quantity
+
+# Every key convert_object rewrites
+LEGACY_FIELDS = (
+    'target_duration_min', 'target_duration_sec', 'target_rest_min', 'target_rest_sec',
+    'target_amrap_duration_sec', 'target_fortime_cap_sec', 'actual_duration_sec', 'actual_time_sec',
+    'target_meters', 'actual_meters', 'target_distance_m', 'actual_distance_m', 'distance_unit',
+)
+# Every key fix_circuit_config rewrites
+LEGACY_CIRCUIT_FIELDS = ('rest_between_rounds_sec',)
+
+has_legacy_fields = key_prefilter(LEGACY_FIELDS)
+has_legacy_circuit_fields = key_prefilter(LEGACY_CIRCUIT_FIELDS)
+
+
+def convert_duration_field(data: Dict[str, Any], old_field: str, new_field: str, unit: str,
+                           counts: Optional[Counter] = None) -> None:
+    """Convert a duration field from plain number to {value, unit} structure."""
+    if old_field in data:
+        if counts is None:
+            counts = Counter()
+        value = data[old_field]
+        if value is None:
+            del data[old_field]
+            counts['null_fields_removed'] += 1
+        elif isinstance(value, (int, float)):
+            del data[old_field]
+            data[new_field] = {"value": value, "unit": unit}
+            counts['duration_fields_converted'] += 1
+        else:
+            token = parse_quantity(value) if isinstance(value, str) else None
+            if token is None or (token.unit is not None and token.unit not in ('sec', 'min')):
+                # Not a plain duration ("AMRAP", "500m"): leave it for manual review
+                counts['values_skipped'] += 1
+            else:
+                del data[old_field]
+                data[new_field] = measure(token, unit)
+                counts['duration_fields_converted'] += 1
+                if token.kind == 'range':
+                    counts['ranges_converted'] += 1
+
+
+def convert_distance_field(data: Dict[str, Any], old_field: str, new_field: str, unit: str = "m",
+                           counts: Optional[Counter] = None) -> None:
+    """Convert a distance field from plain number to {value, unit} structure."""
+    if old_field in data:
+        if counts is None:
+            counts = Counter()
+        value = data[old_field]
+        if value is None:
+            del data[old_field]
+            counts['null_fields_removed'] += 1
+        elif isinstance(value, (int, float)):
+            del data[old_field]
+            data[new_field] = {"value": value, "unit": unit}
+            counts['distance_fields_converted'] += 1
+        else:
+            counts['values_skipped'] += 1
+
+
+def convert_object(obj: Any, counts: Optional[Counter] = None) -> Any:
+    """Recursively convert all duration and distance fields in an object."""
+    if counts is None:
+        counts = Counter()
+    if isinstance(obj, dict):
+        # Convert duration fields - check _min FIRST to preserve original unit
+        if "target_duration_min" in obj:
+            convert_duration_field(obj, "target_duration_min", "target_duration", "min", counts)
+        elif "target_duration_sec" in obj:
+            convert_duration_field(obj, "target_duration_sec", "target_duration", "sec", counts)
+
+        # Rest fields
+        if "target_rest_min" in obj:
+            convert_duration_field(obj, "target_rest_min", "target_rest", "min", counts)
+        elif "target_rest_sec" in obj:
+            convert_duration_field(obj, "target_rest_sec", "target_rest", "sec", counts)
+
+        # AMRAP and ForTime
+        convert_duration_field(obj, "target_amrap_duration_sec", "target_amrap_duration", "sec", counts)
+        convert_duration_field(obj, "target_fortime_cap_sec", "target_fortime_cap", "sec", counts)
+
+        # Convert duration fields (performed level)
+        convert_duration_field(obj, "actual_duration_sec", "actual_duration", "sec", counts)
+        convert_duration_field(obj, "actual_time_sec", "actual_time", "sec", counts)
+
+        # Convert distance fields (plain number format)
+        convert_distance_field(obj, "target_meters", "target_distance", "m", counts)
+        convert_distance_field(obj, "actual_meters", "actual_distance", "m", counts)
+        convert_distance_field(obj, "target_distance_m", "target_distance", "m", counts)
+        convert_distance_field(obj, "actual_distance_m", "actual_distance", "m", counts)
+
+        # Handle legacy format: target_distance + distance_unit (separate fields)
+        for field in ("target_distance", "actual_distance"):
+            if "distance_unit" in obj and field in obj:
+                if isinstance(obj[field], (int, float)):
+                    value = obj.pop(field)
+                    obj[field] = {"value": value, "unit": obj.pop("distance_unit")}
+                    counts['distance_fields_converted'] += 1
+                else:
+                    counts['values_skipped'] += 1
+
+        # Recursively process nested objects
+        for key, value in obj.items():
+            obj[key] = convert_object(value, counts)
+
+        return obj
+    elif isinstance(obj, list):
+        return [convert_object(item, counts) for item in obj]
+    else:
+        return obj
+
+
+def fix_circuit_config(obj: Any, counts: Optional[Counter] = None) -> Any:
+    """Recursively convert legacy rest_between_rounds_sec to {value, unit}."""
+    if counts is None:
+        counts = Counter()
+    if isinstance(obj, dict):
+        # Check if this is a circuit_config with rest_between_rounds_sec
+        if 'rest_between_rounds_sec' in obj:
+            value = obj['rest_between_rounds_sec']
+            if value is None:
+                del obj['rest_between_rounds_sec']
+                counts['null_fields_removed'] += 1
+            elif isinstance(value, (int, float)):
+                del obj['rest_between_rounds_sec']
+                obj['rest_between_rounds'] = {
+                    "value": value,
+                    "unit": "sec"
+                }
+                counts['rest_between_rounds_converted'] += 1
+            else:
+                counts['values_skipped'] += 1
+
+        # Recursively process nested objects
+        for key, value in obj.items():
+            obj[key] = fix_circuit_config(value, counts)
+
+        return obj
+    elif isinstance(obj, list):
+        return [fix_circuit_config(item, counts) for item in obj]
+    else:
+        return obj
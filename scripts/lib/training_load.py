@@ -0,0 +1,264 @@
+"""
+Incremental Training-Load Aggregates
+====================================
+Per athlete / exercise / ISO week (Monday): sets, reps, tonnage (reps ×
+load_kg), best estimated 1RM and RPE average, kept in a local SQLite store
+and updated per committed workout instead of re-reading every workout.
+
+Set values come from lib/fact_table.flatten_workout (the res_item_sets
+rows, loads converted like ``extract_measurement_value``). e1RM is Epley,
+load × (1 + reps / 30), from sets of 1..E1RM_MAX_REPS reps; higher-rep sets
+still count toward volume and tonnage.
+
+Each workout's contribution per (athlete, exercise, week) is stored under
+its source name with the file checksum, so:
+
+- an unchanged workout (same checksum) is skipped,
+- a re-committed/edited workout replaces its old contribution,
+- only the weeks a workout touches (old and new) are recomputed, from the
+  stored contributions, which keeps best_e1rm (a max) exact.
+
+Workouts without athlete_id use the ``<athlete>_<date>`` file-name prefix
+(stored as '' when there is neither); rows without an exercise name or
+date are ignored.
+
+The same aggregates for committed workouts in Postgres live in
+zamm.agg_training_load_weekly (supabase/migrations/
+20260113100000_training_load_weekly.sql, 20260115100000_...edits.sql),
+refreshed incrementally by ``zamm.refresh_training_load_weekly()``; see
+``refresh_database``. They read the same sets (res_item_sets plus the
+per-set lists) except circuit children (``exercises``), which commit does
+not store as workout_items.
+
+Usage:
+    with TrainingLoadStore(Path('.cache/training_load.sqlite')) as store:
+        store.add_workout('tomer_2025-11-02_deadlift.json', checksum, data)
+        store.weekly(athlete='tomer', exercise='Deadlift')
+"""
+
+import json
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .fact_table import flatten_workout
+
+E1RM_MAX_REPS = 12
+
+STORE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workouts (
+    source        TEXT PRIMARY KEY,
+    checksum      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS contributions (
+    source        TEXT NOT NULL,
+    athlete       TEXT NOT NULL,
+    exercise      TEXT NOT NULL,
+    week          TEXT NOT NULL,
+    sets          INTEGER NOT NULL,
+    reps          REAL NOT NULL,
+    tonnage_kg    REAL NOT NULL,
+    best_e1rm_kg  REAL,
+    rpe_sum       REAL NOT NULL,
+    rpe_count     INTEGER NOT NULL,
+    PRIMARY KEY (source, athlete, exercise, week)
+);
+CREATE INDEX IF NOT EXISTS idx_contributions_group ON contributions (athlete, exercise, week);
+CREATE TABLE IF NOT EXISTS weekly (
+    athlete       TEXT NOT NULL,
+    exercise      TEXT NOT NULL,
+    week          TEXT NOT NULL,
+    workouts      INTEGER NOT NULL,
+    sets          INTEGER NOT NULL,
+    reps          REAL NOT NULL,
+    tonnage_kg    REAL NOT NULL,
+    best_e1rm_kg  REAL,
+    rpe_sum       REAL NOT NULL,
+    rpe_count     INTEGER NOT NULL,
+    PRIMARY KEY (athlete, exercise, week)
+);
+"""
+
+Group = Tuple[str, str, str]
+
+
+def week_start(iso_date: str) -> str:
+    """Monday of the ISO week (what Postgres date_trunc('week', ...) returns)"""
+    day = date.fromisoformat(iso_date)
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def estimated_1rm(load_kg: Optional[float], reps: Optional[float]) -> Optional[float]:
+    """Epley e1RM; None outside 1..E1RM_MAX_REPS reps or without a positive load"""
+    if load_kg is None or reps is None or load_kg <= 0 or not 1 <= reps <= E1RM_MAX_REPS:
+        return None
+    return load_kg if reps == 1 else load_kg * (1 + reps / 30)
+
+
+def workout_contributions(data: Dict[str, Any], source: str = '') -> Dict[Group, Dict[str, Any]]:
+    """(athlete, exercise, week) → partial aggregate of one workout"""
+    groups: Dict[Group, Dict[str, Any]] = {}
+    for row in flatten_workout(data, source):
+        exercise = row['exercise_name']
+        if not isinstance(exercise, str) or not exercise.strip() or not row['date']:
+            continue
+        key = (row['athlete'] or '', exercise.strip(), week_start(row['date']))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {'sets': 0, 'reps': 0, 'tonnage_kg': 0.0, 'best_e1rm_kg': None,
+                                   'rpe_sum': 0.0, 'rpe_count': 0}
+        reps, load = row['reps'], row['load_kg']
+        group['sets'] += 1
+        if reps is not None:
+            group['reps'] += reps
+            if load is not None:
+                group['tonnage_kg'] += reps * load
+        e1rm = estimated_1rm(load, reps)
+        if e1rm is not None and (group['best_e1rm_kg'] is None or e1rm > group['best_e1rm_kg']):
+            group['best_e1rm_kg'] = e1rm
+        if row['rpe'] is not None:
+            group['rpe_sum'] += row['rpe']
+            group['rpe_count'] += 1
+    return groups
+
+
+class TrainingLoadStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, STORE_VERSION):
+            raise ValueError(f"{self.path}: training-load store version {version}, expected {STORE_VERSION} "
+                             f"(delete it and re-add the workouts)")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+        self._conn.commit()
+
+    # -- updates ------------------------------------------------------------
+
+    def add_workout(self, source: str, checksum: str, data: Union[Dict[str, Any], str, bytes]) -> bool:
+        """Add or replace one workout; False when it is already stored with this checksum"""
+        return bool(self.add_workouts([(source, checksum, data)]))
+
+    def add_workouts(self, entries: Iterable[Tuple[str, str, Union[Dict[str, Any], str, bytes]]]) -> List[str]:
+        """
+        Add or replace several workouts in one transaction, then recompute the
+        touched weeks once. Returns the sources that changed. Workouts given
+        as raw JSON are only parsed when their checksum is new.
+        """
+        changed, touched = [], set()
+        with self._conn:
+            for source, checksum, data in entries:
+                row = self._conn.execute("SELECT checksum FROM workouts WHERE source = ?", (source,)).fetchone()
+                if row is not None and row[0] == checksum:
+                    continue
+                if isinstance(data, (str, bytes)):
+                    data = json.loads(data)
+                touched |= self._drop(source)
+                contributions = workout_contributions(data, source)
+                self._conn.executemany(
+                    "INSERT INTO contributions (source, athlete, exercise, week, sets, reps, tonnage_kg, "
+                    "best_e1rm_kg, rpe_sum, rpe_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(source, *key, group['sets'], group['reps'], group['tonnage_kg'], group['best_e1rm_kg'],
+                      group['rpe_sum'], group['rpe_count']) for key, group in contributions.items()]
+                )
+                self._conn.execute("INSERT OR REPLACE INTO workouts (source, checksum) VALUES (?, ?)",
+                                   (source, checksum))
+                touched |= set(contributions)
+                changed.append(source)
+            self._refresh(touched)
+        return changed
+
+    def remove_workouts(self, sources: Iterable[str]) -> int:
+        touched, removed = set(), 0
+        with self._conn:
+            for source in sources:
+                touched |= self._drop(source)
+                removed += self._conn.execute("DELETE FROM workouts WHERE source = ?", (source,)).rowcount
+            self._refresh(touched)
+        return removed
+
+    def _drop(self, source: str) -> Set[Group]:
+        groups = set(self._conn.execute(
+            "SELECT athlete, exercise, week FROM contributions WHERE source = ?", (source,)
+        ).fetchall())
+        self._conn.execute("DELETE FROM contributions WHERE source = ?", (source,))
+        return groups
+
+    def _refresh(self, groups: Set[Group]) -> None:
+        """Recompute ``weekly`` for the given groups from their stored contributions"""
+        for athlete, exercise, week in groups:
+            self._conn.execute("DELETE FROM weekly WHERE athlete = ? AND exercise = ? AND week = ?",
+                               (athlete, exercise, week))
+            self._conn.execute(
+                "INSERT INTO weekly (athlete, exercise, week, workouts, sets, reps, tonnage_kg, best_e1rm_kg, "
+                "rpe_sum, rpe_count) "
+                "SELECT athlete, exercise, week, COUNT(*), SUM(sets), SUM(reps), SUM(tonnage_kg), "
+                "MAX(best_e1rm_kg), SUM(rpe_sum), SUM(rpe_count) FROM contributions "
+                "WHERE athlete = ? AND exercise = ? AND week = ? GROUP BY athlete, exercise, week",
+                (athlete, exercise, week)
+            )
+
+    # -- queries ------------------------------------------------------------
+
+    def weekly(self, athlete: Optional[str] = None, exercise: Optional[str] = None,
+               since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Weekly aggregates (athlete/exercise case-insensitive, since/until ISO dates), oldest week first"""
+        clauses, params = [], []
+        if athlete is not None:
+            clauses.append("athlete = ? COLLATE NOCASE")
+            params.append(athlete)
+        if exercise is not None:
+            clauses.append("exercise = ? COLLATE NOCASE")
+            params.append(exercise)
+        if since is not None:
+            clauses.append("week >= ?")
+            params.append(week_start(since))
+        if until is not None:
+            clauses.append("week <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._conn.execute(
+            "SELECT athlete, exercise, week, workouts, sets, reps, tonnage_kg, best_e1rm_kg, rpe_sum, rpe_count "
+            f"FROM weekly {where} ORDER BY athlete, exercise, week", params
+        ).fetchall()
+        return [
+            {
+                'athlete': athlete or None, 'exercise': exercise, 'week': week, 'workouts': workouts,
+                'sets': sets, 'reps': reps, 'tonnage_kg': round(tonnage, 2),
+                'best_e1rm_kg': None if e1rm is None else round(e1rm, 2),
+                'rpe_avg': round(rpe_sum / rpe_count, 2) if rpe_count else None,
+            }
+            for athlete, exercise, week, workouts, sets, reps, tonnage, e1rm, rpe_sum, rpe_count in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('workouts', 'contributions', 'weekly')}
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'TrainingLoadStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def refresh_database(conn, workout_ids: Optional[List[str]] = None) -> int:
+    """
+    Run zamm.refresh_training_load_weekly: the given workouts (edited or
+    deleted ones included: their previous weeks are recomputed too), or
+    every workout committed since the last refresh. Returns the weekly rows
+    rewritten.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT zamm.refresh_training_load_weekly(%s::uuid[])", (workout_ids,))
+    refreshed = cur.fetchone()[0]
+    conn.commit()
+    return refreshed
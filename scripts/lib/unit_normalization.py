@@ -0,0 +1,120 @@
+"""
+Measurement Unit Normalization
+==============================
+Converts v3.2 measurement objects ({value, unit} / {value_min, value_max,
+unit}) to canonical units with the factor table of
+``zamm.extract_measurement_value`` (supabase/migrations/
+20260111120000_commit_full_workout_v4_quality_gate.sql):
+
+    load      lbs → kg ×0.453592, g → kg ×0.001
+    duration  min → sec ×60, hours → sec ×3600
+    distance  km → m ×1000, yards → m ×0.9144, miles → m ×1609.34
+
+The unit picks the conversion (no two families share a unit name). Units
+outside the table (spm, cal, %) and non-numeric values are left as they
+are; values_skipped counts the latter.
+
+Each measurement is converted in place by ``normalize_measurement``; the
+cost is the walk over the document, not the arithmetic.
+
+Results are rounded to ``DECIMALS`` places; integral results are stored as
+ints (2 min → 120 sec).
+
+Usage:
+    counts = Counter()
+    normalize_workouts(workouts, counts)       # in place; counts['measurements_normalized']
+    python3 scripts/ops/normalize_units.py data/parsed --dry-run
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .batch import key_prefilter
+
+# canonical unit → {unit: factor}, as zamm.extract_measurement_value
+UNIT_FACTORS: Dict[str, Dict[str, float]] = {
+    'kg': {'kg': 1.0, 'lbs': 0.453592, 'g': 0.001},
+    'sec': {'sec': 1.0, 'min': 60.0, 'hours': 3600.0},
+    'm': {'m': 1.0, 'km': 1000.0, 'yards': 0.9144, 'miles': 1609.34},
+}
+
+DECIMALS = 6
+MEASUREMENT_FIELDS = ('value', 'value_min', 'value_max')
+_MEASUREMENT_KEYS = frozenset(MEASUREMENT_FIELDS + ('unit',))
+
+CANONICAL_UNIT = {unit: canonical for canonical, factors in UNIT_FACTORS.items() for unit in factors}
+FACTOR = {unit: factor for factors in UNIT_FACTORS.values() for unit, factor in factors.items()}
+CONVERTIBLE_UNITS = tuple(unit for unit, factor in FACTOR.items() if factor != 1.0)
+
+# Raw-bytes test: a file without any convertible unit string has nothing to normalize
+has_convertible_units = key_prefilter(CONVERTIBLE_UNITS)
+
+
+def collect_measurements(obj: Any, out: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Append every measurement object in ``obj`` (depth first, document order) to ``out``"""
+    if isinstance(obj, dict):
+        if 'unit' in obj and obj.keys() <= _MEASUREMENT_KEYS:
+            out.append(obj)
+        else:
+            for value in obj.values():
+                if isinstance(value, (dict, list)):
+                    collect_measurements(value, out)
+    elif isinstance(obj, list):
+        for value in obj:
+            if isinstance(value, (dict, list)):
+                collect_measurements(value, out)
+    return out
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _store(number: float) -> Any:
+    number = round(number, DECIMALS)
+    return int(number) if number.is_integer() else number
+
+
+def extract_measurement_value(measurement: Any, target_unit: Optional[str] = None) -> Optional[float]:
+    """
+    ``zamm.extract_measurement_value``: ``value`` converted to ``target_unit``
+    (unknown units unconverted), None for a missing/empty object, a range
+    or a non-numeric value
+    """
+    if not isinstance(measurement, dict) or not _is_number(measurement.get('value')):
+        return None
+    value = measurement['value']
+    unit = measurement.get('unit')
+    if unit is None or target_unit is None:
+        return value
+    return value * UNIT_FACTORS.get(target_unit, {}).get(unit, 1.0)
+
+
+def normalize_measurement(measurement: Dict[str, Any], counts: Optional[Counter] = None) -> bool:
+    """Convert one measurement in place. Returns True if it changed."""
+    factor = FACTOR.get(measurement.get('unit'))
+    if factor is None or factor == 1.0:
+        return False
+    fields = [field for field in MEASUREMENT_FIELDS if field in measurement]
+    if not fields or not all(_is_number(measurement[field]) for field in fields):
+        if counts is not None:
+            counts['values_skipped'] += 1
+        return False
+    for field in fields:
+        measurement[field] = _store(measurement[field] * factor)
+    measurement['unit'] = CANONICAL_UNIT[measurement['unit']]
+    if counts is not None:
+        counts['measurements_normalized'] += 1
+    return True
+
+
+def normalize_workouts(documents: List[Any], counts: Optional[Counter] = None) -> List[int]:
+    """Normalize every measurement of ``documents`` in place. Returns the indexes of the documents that changed."""
+    if counts is None:
+        counts = Counter()
+    changed = []
+    for index, document in enumerate(documents):
+        results = [normalize_measurement(measurement, counts) for measurement in collect_measurements(document, [])]
+        if any(results):
+            changed.append(index)
+    return changed
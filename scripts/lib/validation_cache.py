@@ -0,0 +1,69 @@
+"""
+Incremental Validation Cache
+============================
+Persistent SQLite store of validation results keyed by
+(file checksum, rule set checksum). A file whose bytes and rules are both
+unchanged since the last run can reuse its previous result instead of being
+parsed and validated again.
+
+Entries recorded under any other rule set are pruned on open, so the cache
+never grows beyond one result per distinct file content.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS validation_cache (
+    checksum   TEXT NOT NULL,
+    ruleset    TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    PRIMARY KEY (checksum, ruleset)
+)
+"""
+
+
+class ValidationCache:
+    def __init__(self, path: Path, ruleset: str):
+        self.path = Path(path)
+        self.ruleset = ruleset
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute(SCHEMA)
+        self._conn.execute("DELETE FROM validation_cache WHERE ruleset != ?", (ruleset,))
+        self._conn.commit()
+
+    def get(self, checksum: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            "SELECT payload FROM validation_cache WHERE checksum = ? AND ruleset = ?",
+            (checksum, self.ruleset)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, checksum: str, payload: Dict[str, Any]) -> None:
+        self.put_many([(checksum, payload)])
+
+    def put_many(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO validation_cache (checksum, ruleset, payload) VALUES (?, ?, ?)",
+            [(checksum, self.ruleset, json.dumps(payload, ensure_ascii=False)) for checksum, payload in entries]
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'ValidationCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,313 @@
+"""
+Typed Workout Model
+===================
+Compact ``__slots__`` classes for the CANONICAL_JSON_SCHEMA v3.2 tree:
+
+    Workout → sessions: [Session] → blocks: [Block] → items: [Item]
+    Item.exercises / Item.exercise_options: [Item]
+    {value, unit} / {value_min, value_max, unit} anywhere in a
+    prescription or performed object: Measurement
+
+Known fields are typed attributes (``item.exercise_name``, ``block.items``),
+so code no longer probes ``'items' in obj`` at every level. Fields the
+model does not name are kept in ``extra``; prescription/performed stay
+plain dicts (their field set is open-ended) with Measurements inside.
+
+``from_json``/``to_json`` round-trip a document exactly, key order and
+explicit nulls included: each node keeps the tuple of keys it was loaded
+with (interned, so thousands of items share a handful of tuples). Fields
+that were absent and are set later are written after the original keys,
+like a dict assignment would. Repeated strings (exercise names, block
+codes, units, nested keys) are interned across workouts. Malformed input
+is kept as-is (a non-list ``sessions``, a string in ``items``) for the
+validators to report.
+
+Every node is also a Mapping over its JSON keys, so rules written against
+dicts (``'prescription' in node``, ``node.keys()``, ``node['block_code']``)
+work unchanged on the model. ``Block.items`` is the items field, so pairs
+come from ``node.fields()`` rather than ``items()``.
+
+Usage:
+    workout = Workout.from_json(json.load(f))
+    for session, block, item in workout.iter_items():
+        item.equipment_key = item.equipment_key or resolve_equipment_key(item.exercise_name)
+    json.dump(workout.to_json(), f, indent=4, ensure_ascii=False)
+
+Memory/time vs dict trees: scripts/benchmarks/bench_workout_model.py
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+MEASUREMENT_KEYS = frozenset({'value', 'value_min', 'value_max', 'unit'})
+
+# Nested string values up to this length are interned (units, types, short notes)
+INTERN_MAX_LEN = 32
+
+_KEY_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_KEY_SETS: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+
+
+def _intern_keys(keys: Tuple[str, ...]) -> Tuple[str, ...]:
+    shared = _KEY_TUPLES.get(keys)
+    if shared is None:
+        shared = _KEY_TUPLES[keys] = tuple(sys.intern(key) for key in keys)
+        _KEY_SETS[shared] = frozenset(shared)
+    return shared
+
+
+def _intern(value: Any) -> Any:
+    """Shared copy of a repeated string (exercise names, codes, units); other values unchanged"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class Node(Mapping):
+    """Base for model nodes: typed slots for FIELDS, ``extra`` for the rest"""
+
+    __slots__ = ('_keys', 'extra')
+    FIELDS: Tuple[str, ...] = ()
+    _FIELD_SET: FrozenSet[str] = frozenset()
+    # Field name → converter applied by from_json (identity when absent)
+    _LOADERS: Dict[str, Callable[[Any], Any]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+        cls._LOADERS = {}
+
+    def __init__(self, **fields: Any):
+        self._keys: Tuple[str, ...] = ()
+        self.extra: Optional[Dict[str, Any]] = None
+        for name in self.FIELDS:
+            setattr(self, name, None)
+        for name, value in fields.items():
+            self[name] = value
+
+    # -- construction -------------------------------------------------------
+
+    @classmethod
+    def from_json(cls, data: Any) -> Any:
+        """Node for a JSON object; anything else is returned unchanged"""
+        if not isinstance(data, dict):
+            return data
+        node = cls.__new__(cls)
+        node._keys = _intern_keys(tuple(data))
+        node.extra = None
+        field_set = cls._FIELD_SET
+        loaders = cls._LOADERS
+        for name in cls.FIELDS:
+            setattr(node, name, None)
+        for key, value in data.items():
+            if key in field_set:
+                loader = loaders.get(key)
+                setattr(node, key, value if loader is None else loader(value))
+            else:
+                if node.extra is None:
+                    node.extra = {}
+                node.extra[key] = value
+        return node
+
+    def to_json(self) -> Dict[str, Any]:
+        return {key: _dump(value) if key in self._FIELD_SET else value for key, value in self.fields()}
+
+    # -- field access -------------------------------------------------------
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def unset(self, key: str) -> None:
+        """Remove a field entirely (unlike assigning None, which keeps an explicit null)"""
+        if key in self._keys:
+            self._keys = _intern_keys(tuple(k for k in self._keys if k != key))
+        if key in self._FIELD_SET:
+            setattr(self, key, None)
+        elif self.extra:
+            self.extra.pop(key, None)
+
+    def fields(self) -> Iterator[Tuple[str, Any]]:
+        """(key, value) pairs in JSON order. Use this, not ``items()``: Block.items is a field"""
+        field_set = self._FIELD_SET
+        extra = self.extra
+        keys = self._keys
+        for key in keys:
+            if key in field_set:
+                yield key, getattr(self, key)
+            elif extra and key in extra:
+                yield key, extra[key]
+        # Keys set after loading come last, in field order then insertion order
+        present = _KEY_SETS.get(keys, frozenset())
+        for key in self.FIELDS:
+            if key not in present:
+                value = getattr(self, key)
+                if value is not None:
+                    yield key, value
+        if extra:
+            for key, value in extra.items():
+                if key not in present:
+                    yield key, value
+
+    # -- Mapping over the JSON keys ----------------------------------------
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._FIELD_SET:
+            return key in self._keys or getattr(self, key) is not None
+        return bool(self.extra) and key in self.extra
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self:
+            return getattr(self, key) if key in self._FIELD_SET else self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key, _ in self.fields():
+            yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.fields())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Node):
+            return type(self) is type(other) and self.to_json() == other.to_json()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        shown = ', '.join(f"{key}={getattr(self, key)!r}" for key in self.FIELDS[:3] if key in self)
+        return f"{type(self).__name__}({shown})"
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, Node):
+        return value.to_json()
+    if isinstance(value, list):
+        return [_dump(element) for element in value]
+    if isinstance(value, dict):
+        return {key: _dump(element) for key, element in value.items()}
+    return value
+
+
+def _load_nested(value: Any) -> Any:
+    """Prescription/performed content: dicts stay dicts, measurement objects become Measurements"""
+    if isinstance(value, dict):
+        if value and value.keys() <= MEASUREMENT_KEYS:
+            return Measurement.from_json(value)
+        return {sys.intern(key): _load_nested(element) for key, element in value.items()}
+    if isinstance(value, list):
+        return [_load_nested(element) for element in value]
+    if type(value) is str and len(value) <= INTERN_MAX_LEN:
+        return sys.intern(value)
+    return value
+
+
+def _list_of(node_type) -> Callable[[Any], Any]:
+    def load(value: Any) -> Any:
+        if isinstance(value, list):
+            return [node_type.from_json(element) for element in value]
+        return value
+    return load
+
+
+class Measurement(Node):
+    """``{value, unit}`` or ``{value_min, value_max, unit}``"""
+
+    __slots__ = ('value', 'value_min', 'value_max', 'unit')
+    FIELDS = __slots__
+
+    value: Any
+    value_min: Any
+    value_max: Any
+    unit: Optional[str]
+
+    @property
+    def is_range(self) -> bool:
+        return self.value_min is not None or self.value_max is not None
+
+    def __repr__(self):
+        # Validation messages embed values; keep them identical to the dict tree's
+        return repr(self.to_json())
+
+
+class Item(Node):
+    __slots__ = ('item_sequence', 'exercise_name', 'equipment_key', 'prescription', 'performed',
+                 'circuit_config', 'exercises', 'exercise_options')
+    FIELDS = __slots__
+
+    item_sequence: Optional[int]
+    exercise_name: Optional[str]
+    equipment_key: Optional[str]
+    prescription: Optional[Dict[str, Any]]
+    performed: Optional[Dict[str, Any]]
+    circuit_config: Optional[Dict[str, Any]]
+    exercises: Optional[List['Item']]
+    exercise_options: Optional[List['Item']]
+
+
+class Block(Node):
+    __slots__ = ('block_code', 'block_label', 'block_title', 'block_type', 'format',
+                 'prescription', 'performed', 'items')
+    FIELDS = __slots__
+
+    block_code: Optional[str]
+    block_label: Optional[str]
+    block_title: Optional[str]
+    block_type: Optional[str]
+    format: Optional[str]
+    prescription: Optional[Dict[str, Any]]
+    performed: Optional[Dict[str, Any]]
+    items: Optional[List[Item]]
+
+
+class Session(Node):
+    __slots__ = ('session_code', 'session_time', 'blocks')
+    FIELDS = __slots__
+
+    session_code: Optional[str]
+    session_time: Optional[str]
+    blocks: Optional[List[Block]]
+
+
+class Workout(Node):
+    __slots__ = ('workout_date', 'athlete_id', 'title', 'status', 'sessions')
+    FIELDS = __slots__
+
+    workout_date: Optional[str]
+    athlete_id: Optional[str]
+    title: Optional[str]
+    status: Optional[str]
+    sessions: Optional[List[Session]]
+
+    def iter_blocks(self) -> Iterator[Tuple[Session, Block]]:
+        for session in self.sessions if isinstance(self.sessions, list) else ():
+            if isinstance(session, Session) and isinstance(session.blocks, list):
+                for block in session.blocks:
+                    if isinstance(block, Block):
+                        yield session, block
+
+    def iter_items(self) -> Iterator[Tuple[Session, Block, Item]]:
+        """Top-level items of every block (not the nested exercises/exercise_options)"""
+        for session, block in self.iter_blocks():
+            if isinstance(block.items, list):
+                for item in block.items:
+                    if isinstance(item, Item):
+                        yield session, block, item
+
+
+Measurement._LOADERS.update(unit=_intern)
+Item._LOADERS.update(
+    exercise_name=_intern, equipment_key=_intern,
+    prescription=_load_nested, performed=_load_nested, circuit_config=_load_nested,
+    exercises=_list_of(Item), exercise_options=_list_of(Item),
+)
+Block._LOADERS.update(
+    block_code=_intern, block_label=_intern, block_type=_intern, format=_intern,
+    prescription=_load_nested, performed=_load_nested, items=_list_of(Item),
+)
+Session._LOADERS.update(session_code=_intern, session_time=_intern, blocks=_list_of(Block))
+Workout._LOADERS.update(athlete_id=_intern, status=_intern, sessions=_list_of(Session))
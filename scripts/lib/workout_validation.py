@@ -0,0 +1,604 @@
+"""
+Offline workout validation
+==========================
+Python port of ``zamm.validate_parsed_workout`` and the five checks it runs
+(supabase/migrations/20260107150000_comprehensive_validation_functions.sql,
+with the catalog check as rewritten in 20260112110000_set_based_catalog_validation.sql).
+
+Each ``validate_*`` function returns the same rows as its SQL namesake, in the
+same order, so a draft can be screened in-process and only clean drafts need
+to reach Postgres. Values go through the same casts as the SQL (``->>`` text,
+then ``::INTEGER`` / ``::NUMERIC`` / ``::DATE``): where the SQL function
+would raise (e.g. ``target_reps: "8-10"``), these raise ValueError.
+
+Catalog and athlete lookups read a local snapshot
+(data/reference/catalog_snapshot.json, written by
+scripts/ops/export_catalog_snapshot.sh). Without a snapshot the catalog check
+and the athlete lookup are skipped; every other check still runs.
+
+Parity against the SQL functions: scripts/tests/validate_sql_parity.py
+"""
+
+import json
+import re
+from datetime import date, datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SNAPSHOT = REPO_ROOT / 'data' / 'reference' / 'catalog_snapshot.json'
+
+VALID_BLOCK_CODES = frozenset({
+    'WU', 'ACT', 'MOB',                 # PREPARATION
+    'STR', 'ACC', 'HYP',                # STRENGTH
+    'PWR', 'WL',                        # POWER
+    'SKILL', 'GYM',                     # SKILL
+    'METCON', 'INTV', 'SS', 'HYROX',    # CONDITIONING
+    'CD', 'STRETCH', 'BREATH',          # RECOVERY
+})
+SESSION_CODES = ('AM', 'PM', 'SINGLE')
+FORBIDDEN_PRESCRIPTION_KEYS = ('actual_sets', 'actual_reps', 'reps_performed', 'sets_performed',
+                               'did_complete', 'notes_performed')
+FORBIDDEN_PERFORMED_KEYS = ('target_sets', 'target_reps', 'target_load', 'target_reps_planned')
+OLDEST_WORKOUT_DATE = date(2015, 1, 1)
+
+_DATE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+_UUID = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+_INTEGER = re.compile(r'\s*[+-]?[0-9]+\s*')
+_INT4_RANGE = (-2 ** 31, 2 ** 31 - 1)
+
+Row = Tuple[Any, ...]
+
+
+# --------------------------------------------------------
+# jsonb operators and casts
+# --------------------------------------------------------
+
+def _jsonb_out(value: Any) -> str:
+    """Text of a jsonb value as Postgres prints it (keys ordered by length, then bytes)"""
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: (len(item[0].encode()), item[0].encode()))
+        return '{' + ', '.join(f'{json.dumps(k, ensure_ascii=False)}: {_jsonb_out(v)}' for k, v in items) + '}'
+    if isinstance(value, list):
+        return '[' + ', '.join(_jsonb_out(v) for v in value) + ']'
+    if value is None:
+        return 'null'
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    return _scalar_text(value)
+
+
+def _scalar_text(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        # json.dumps writes repr(); jsonb keeps that as a numeric
+        return format(Decimal(repr(value)), 'f')
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    return _jsonb_out(value)
+
+
+def _text(obj: Any, key: str) -> Optional[str]:
+    """``obj->>key``: None for a missing key, JSON null or a non-object"""
+    if not isinstance(obj, dict):
+        return None
+    value = obj.get(key)
+    if value is None:
+        return None
+    return value if isinstance(value, str) else _scalar_text(value)
+
+
+def _has_key(obj: Any, key: str) -> bool:
+    """``obj ? key`` (also true for a matching string element / string scalar)"""
+    if isinstance(obj, dict):
+        return key in obj
+    if isinstance(obj, list):
+        return key in (v for v in obj if isinstance(v, str))
+    return obj == key
+
+
+def _get(obj: Any, key: str) -> Any:
+    return obj.get(key) if isinstance(obj, dict) else None
+
+
+def _is_set(obj: Any, key: str) -> bool:
+    """``obj->key IS NOT NULL AND obj->key != '{}'``"""
+    return isinstance(obj, dict) and key in obj and obj[key] != {}
+
+
+def _kind(value: Any) -> str:
+    return 'an object' if isinstance(value, dict) else 'a scalar'
+
+
+def _elements(obj: Any, key: str) -> Sequence[Any]:
+    """``jsonb_array_elements(obj->key)``: nothing for SQL NULL, raises for a non-array"""
+    if not isinstance(obj, dict) or key not in obj:
+        return ()
+    value = obj[key]
+    if not isinstance(value, list):
+        raise ValueError(f"cannot extract elements from {_kind(value)}")
+    return value
+
+
+def _array_length(obj: Any, key: str) -> Optional[int]:
+    if not isinstance(obj, dict) or key not in obj:
+        return None
+    value = obj[key]
+    if not isinstance(value, list):
+        raise ValueError(f"cannot get array length of {_kind(value)}")
+    return len(value)
+
+
+def _to_int(text: Optional[str]) -> Optional[int]:
+    if text is None:
+        return None
+    if not _INTEGER.fullmatch(text):
+        raise ValueError(f'invalid input syntax for type integer: "{text}"')
+    value = int(text)
+    if not _INT4_RANGE[0] <= value <= _INT4_RANGE[1]:
+        raise ValueError(f'value "{text}" is out of range for type integer')
+    return value
+
+
+def _to_numeric(text: Optional[str]) -> Optional[Decimal]:
+    if text is None:
+        return None
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f'invalid input syntax for type numeric: "{text}"') from None
+    if value.is_nan():
+        # Postgres sorts NaN above every number; not worth mirroring offline
+        raise ValueError(f'NaN is not supported by the offline validator: "{text}"')
+    return value
+
+
+def _to_date(text: str) -> date:
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f'date/time field value out of range: "{text}"') from None
+
+
+def _num(value: Decimal) -> str:
+    return format(value, 'f')
+
+
+def _round(value: Decimal, places: int) -> str:
+    """``ROUND(numeric, places)`` (half away from zero)"""
+    return _num(value.quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP))
+
+
+# --------------------------------------------------------
+# Catalog snapshot
+# --------------------------------------------------------
+
+class WorkoutCatalog:
+    """The lookups behind the catalog and athlete checks"""
+
+    def __init__(self, exercises: Iterable[Dict[str, Any]], exercise_aliases: Iterable[Dict[str, Any]],
+                 equipment: Iterable[Dict[str, Any]], equipment_aliases: Iterable[Dict[str, Any]],
+                 athletes: Optional[Iterable[str]] = None):
+        # Exercise names match case-insensitively (display_name, exercise_key, alias);
+        # equipment keys exactly (equipment_key, alias)
+        self.exercise_names = set()
+        for row in exercises:
+            for name in (row.get('display_name'), row.get('exercise_key')):
+                if name is not None:
+                    self.exercise_names.add(name.lower())
+        self.exercise_names.update(row['alias'].lower() for row in exercise_aliases)
+        self.equipment_keys = {row['equipment_key'] for row in equipment}
+        self.equipment_keys.update(row['alias'] for row in equipment_aliases)
+        self.athlete_ids = None if athletes is None else {str(a).lower() for a in athletes}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> 'WorkoutCatalog':
+        return cls(snapshot.get('exercises', []), snapshot.get('exercise_aliases', []),
+                   snapshot.get('equipment', []), snapshot.get('equipment_aliases', []),
+                   snapshot.get('athletes'))
+
+    def has_exercise(self, name: str) -> bool:
+        return name.lower() in self.exercise_names
+
+    def has_equipment(self, key: str) -> bool:
+        return key in self.equipment_keys
+
+    def has_athlete(self, athlete_id: Optional[str]) -> bool:
+        """Always true when the snapshot has no athlete list; None (SQL NULL) never matches"""
+        if self.athlete_ids is None:
+            return True
+        return athlete_id is not None and athlete_id in self.athlete_ids
+
+
+def load_catalog(snapshot_path: Path = DEFAULT_SNAPSHOT) -> Optional[WorkoutCatalog]:
+    snapshot_path = Path(snapshot_path)
+    if not snapshot_path.exists():
+        return None
+    with open(snapshot_path, 'r', encoding='utf-8') as f:
+        return WorkoutCatalog.from_snapshot(json.load(f))
+
+
+_CATALOG: Optional[WorkoutCatalog] = None
+_CATALOG_LOADED = False
+
+
+def get_catalog() -> Optional[WorkoutCatalog]:
+    """Process-wide catalog from the default snapshot (None if there is none)"""
+    global _CATALOG, _CATALOG_LOADED
+    if not _CATALOG_LOADED:
+        _CATALOG = load_catalog()
+        _CATALOG_LOADED = True
+    return _CATALOG
+
+
+# --------------------------------------------------------
+# 1. Structure
+# --------------------------------------------------------
+
+def validate_parsed_structure(parsed: Dict[str, Any], catalog: Optional[WorkoutCatalog] = None) -> List[Row]:
+    """Rows: (is_valid, severity, field, issue)"""
+    rows: List[Row] = []
+
+    if 'workout_date' not in parsed:
+        rows.append((False, 'error', 'workout_date', 'Missing required field'))
+    else:
+        text = _text(parsed, 'workout_date')
+        if text is not None:
+            if not _DATE.fullmatch(text):
+                rows.append((False, 'error', 'workout_date', 'Invalid date format (expected YYYY-MM-DD)'))
+            else:
+                workout_date = _to_date(text)
+                if workout_date > date.today():
+                    rows.append((False, 'error', 'workout_date', 'Date is in the future'))
+                elif workout_date < OLDEST_WORKOUT_DATE:
+                    rows.append((False, 'warning', 'workout_date', 'Date is before 2015 (very old)'))
+
+    if 'athlete_id' not in parsed:
+        rows.append((False, 'error', 'athlete_id', 'Missing required field'))
+    else:
+        text = _text(parsed, 'athlete_id')
+        if text is not None and not _UUID.fullmatch(text):
+            rows.append((False, 'error', 'athlete_id', 'Invalid UUID format'))
+        elif catalog is not None and not catalog.has_athlete(text):
+            rows.append((False, 'error', 'athlete_id', 'Athlete ID not found in lib_athletes table'))
+
+    if 'sessions' not in parsed:
+        rows.append((False, 'error', 'sessions', 'Missing required field'))
+    elif not isinstance(parsed['sessions'], list):
+        rows.append((False, 'error', 'sessions', 'Must be an array'))
+    elif not parsed['sessions']:
+        rows.append((False, 'error', 'sessions', 'Sessions array is empty'))
+
+    if not rows:
+        rows.append((True, 'info', None, 'All structure checks passed'))
+    return rows
+
+
+# --------------------------------------------------------
+# 2. Block codes
+# --------------------------------------------------------
+
+def validate_block_codes(parsed: Dict[str, Any]) -> List[Row]:
+    """Rows: (is_valid, severity, field, issue, location)"""
+    rows: List[Row] = []
+    sessions = _elements(parsed, 'sessions')
+
+    for s_idx, session in enumerate(sessions, 1):
+        location = f'Session {s_idx}'
+        if not _has_key(session, 'session_code'):
+            rows.append((False, 'error', 'session_code', 'Missing required field', location))
+        else:
+            code = _text(session, 'session_code')
+            if code is not None and code not in SESSION_CODES:
+                rows.append((False, 'error', 'session_code',
+                             f'Invalid value "{code}" (must be AM, PM, or SINGLE)', location))
+
+        if not _has_key(session, 'blocks'):
+            rows.append((False, 'error', 'blocks', 'Missing required field', location))
+            continue
+        if _array_length(session, 'blocks') == 0:
+            rows.append((False, 'error', 'blocks', 'Blocks array is empty', location))
+            continue
+
+        for b_idx, block in enumerate(_elements(session, 'blocks'), 1):
+            location = f'Session {s_idx}, Block {b_idx}'
+            code = _text(block, 'block_code')
+            if code is None:
+                rows.append((False, 'error', 'block_code', 'Missing required field', location))
+            elif code not in VALID_BLOCK_CODES:
+                rows.append((False, 'error', 'block_code',
+                             f'Invalid block_code "{code}" (must be one of 17 standard codes)', location))
+            if not _has_key(block, 'block_label'):
+                rows.append((False, 'error', 'block_label', 'Missing required field', location))
+            if not _has_key(block, 'prescription'):
+                rows.append((False, 'error', 'prescription', 'Missing required field', location))
+            if not _has_key(block, 'performed'):
+                rows.append((False, 'error', 'performed',
+                             'Missing required field (use null or {} if no performance data)', location))
+
+    # The SQL's IF NOT FOUND sees the session loop: the info row means "no sessions"
+    if not sessions:
+        rows.append((True, 'info', None, 'All block codes are valid', None))
+    return rows
+
+
+# --------------------------------------------------------
+# 3. Data values
+# --------------------------------------------------------
+
+def _check_prescription(prescription: Any, location: str, rows: List[Row]) -> None:
+    if _has_key(prescription, 'steps'):
+        for step in _elements(prescription, 'steps'):
+            sets = _to_int(_text(step, 'target_sets'))
+            if sets is not None and (sets < 1 or sets > 10):
+                if sets > 10:
+                    rows.append((False, 'warning', 'target_sets',
+                                 f'Unusually high ({sets} sets - typically 1-8)', location, str(sets)))
+                else:
+                    rows.append((False, 'error', 'target_sets',
+                                 f'Invalid value {sets} (must be >= 1)', location, str(sets)))
+
+            reps = _to_int(_text(step, 'target_reps'))
+            if reps is not None:
+                if reps > 200:
+                    rows.append((False, 'error', 'target_reps',
+                                 f'Unrealistic value ({reps} reps)', location, str(reps)))
+                elif reps > 50:
+                    rows.append((False, 'warning', 'target_reps',
+                                 f'High rep count ({reps} reps - verify this is correct)', location, str(reps)))
+                elif reps < 1:
+                    rows.append((False, 'error', 'target_reps', 'Must be at least 1', location, str(reps)))
+
+            target_load = _get(step, 'target_load')
+            if _has_key(target_load, 'value'):
+                load = _to_numeric(_text(target_load, 'value'))
+                if load is not None:
+                    if load > 500:
+                        rows.append((False, 'error', 'target_load',
+                                     f'Unrealistic load ({_num(load)} kg)', location, _num(load)))
+                    elif load > 300:
+                        rows.append((False, 'warning', 'target_load',
+                                     f'Very heavy load ({_num(load)} kg - verify this is correct)',
+                                     location, _num(load)))
+                    elif load <= 0:
+                        rows.append((False, 'error', 'target_load', 'Must be greater than 0',
+                                     location, _num(load)))
+
+    time_cap = _to_int(_text(prescription, 'time_cap_seconds'))
+    if time_cap is not None:
+        if time_cap > 7200:
+            rows.append((False, 'error', 'time_cap_seconds',
+                         f'Unrealistic time cap ({time_cap} seconds = {_round(Decimal(time_cap) / 3600, 1)} hours)',
+                         location, str(time_cap)))
+        elif time_cap > 3600:
+            rows.append((False, 'warning', 'time_cap_seconds',
+                         f'Very long time cap ({time_cap} seconds = {_round(Decimal(time_cap) / 60, 0)} minutes)',
+                         location, str(time_cap)))
+
+
+def _check_performed(performed: Any, location: str, rows: List[Row]) -> None:
+    total_time = _to_int(_text(performed, 'total_time_sec'))
+    if total_time is not None:
+        if total_time > 10800:
+            rows.append((False, 'error', 'total_time_sec',
+                         f'Unrealistic workout time ({total_time} seconds = '
+                         f'{_round(Decimal(total_time) / 3600, 1)} hours)',
+                         f'{location} (performed)', str(total_time)))
+        elif total_time > 3600:
+            rows.append((False, 'warning', 'total_time_sec',
+                         f'Very long workout ({total_time} seconds = {_round(Decimal(total_time) / 60, 0)} minutes)',
+                         f'{location} (performed)', str(total_time)))
+
+    if not _has_key(performed, 'steps'):
+        return
+    for step in _elements(performed, 'steps'):
+        if not _has_key(step, 'sets'):
+            continue
+        for performed_set in _elements(step, 'sets'):
+            set_location = f"{location}, Set {_text(performed_set, 'set_index') or ''}"
+
+            rpe = _to_numeric(_text(performed_set, 'rpe'))
+            if rpe is not None and (rpe < 1 or rpe > 10):
+                rows.append((False, 'error', 'rpe', f'RPE must be between 1-10 (got {_num(rpe)})',
+                             set_location, _num(rpe)))
+
+            rir = _to_int(_text(performed_set, 'rir'))
+            if rir is not None and (rir < 0 or rir > 10):
+                rows.append((False, 'error', 'rir', f'RIR must be between 0-10 (got {rir})',
+                             set_location, str(rir)))
+
+            load = _to_numeric(_text(performed_set, 'load_kg'))
+            if load is not None:
+                if load > 500:
+                    rows.append((False, 'error', 'load_kg', f'Unrealistic load ({_num(load)} kg)',
+                                 set_location, _num(load)))
+                elif load > 300:
+                    rows.append((False, 'warning', 'load_kg', f'Very heavy ({_num(load)} kg)',
+                                 set_location, _num(load)))
+
+            reps = _to_int(_text(performed_set, 'reps'))
+            if reps is not None:
+                if reps > 200:
+                    rows.append((False, 'error', 'reps', f'Unrealistic ({reps} reps)', set_location, str(reps)))
+                elif reps > 50:
+                    rows.append((False, 'warning', 'reps', f'High rep count ({reps})', set_location, str(reps)))
+
+
+def validate_data_values(parsed: Dict[str, Any]) -> List[Row]:
+    """Rows: (is_valid, severity, field, issue, location, actual_value)"""
+    rows: List[Row] = []
+    sessions = _elements(parsed, 'sessions')
+
+    for s_idx, session in enumerate(sessions, 1):
+        for b_idx, block in enumerate(_elements(session, 'blocks'), 1):
+            location = f'Session {s_idx}, Block {b_idx}'
+            if _is_set(block, 'prescription'):
+                _check_prescription(block['prescription'], location, rows)
+            if _is_set(block, 'performed'):
+                _check_performed(block['performed'], location, rows)
+
+    if not sessions:
+        rows.append((True, 'info', None, 'All data values are reasonable', None, None))
+    return rows
+
+
+# --------------------------------------------------------
+# 4. Catalog references
+# --------------------------------------------------------
+
+def validate_catalog_references(parsed: Dict[str, Any], catalog: WorkoutCatalog) -> List[Row]:
+    """Rows: (is_valid, severity, field, issue, location, value)"""
+    rows: List[Row] = []
+    sessions = _elements(parsed, 'sessions')
+
+    for s_idx, session in enumerate(sessions, 1):
+        for b_idx, block in enumerate(_elements(session, 'blocks'), 1):
+            prescription = _get(block, 'prescription')
+            if not _has_key(prescription, 'steps'):
+                continue
+            for st_idx, step in enumerate(_elements(prescription, 'steps'), 1):
+                location = f'Session {s_idx}, Block {b_idx}, Step {st_idx}'
+                name = _text(step, 'exercise_name')
+                if name is not None and not catalog.has_exercise(name):
+                    rows.append((False, 'error', 'exercise_name',
+                                 f'Exercise "{name}" not found in catalog', location, name))
+                key = _text(step, 'equipment_key')
+                if key is not None and not catalog.has_equipment(key):
+                    rows.append((False, 'error', 'equipment_key',
+                                 f'Equipment "{key}" not found in catalog', location, key))
+
+    if not sessions:
+        rows.append((True, 'info', None, 'All catalog references are valid', None, None))
+    return rows
+
+
+# --------------------------------------------------------
+# 5. Prescription vs performance separation
+# --------------------------------------------------------
+
+def validate_prescription_performance_separation(parsed: Dict[str, Any]) -> List[Row]:
+    """Rows: (is_valid, severity, field, issue, location)"""
+    rows: List[Row] = []
+    sessions = _elements(parsed, 'sessions')
+
+    for s_idx, session in enumerate(sessions, 1):
+        for b_idx, block in enumerate(_elements(session, 'blocks'), 1):
+            location = f'Session {s_idx}, Block {b_idx}'
+
+            if isinstance(block, dict) and 'prescription' in block:
+                prescription = block['prescription']
+                for key in FORBIDDEN_PRESCRIPTION_KEYS:
+                    if _has_key(prescription, key):
+                        rows.append((False, 'error', key,
+                                     f'Prescription contains performance key "{key}" - violation of separation principle',
+                                     f'{location} (prescription)'))
+                if _has_key(prescription, 'steps'):
+                    for step in _elements(prescription, 'steps'):
+                        for key in FORBIDDEN_PRESCRIPTION_KEYS:
+                            if _has_key(step, key):
+                                rows.append((False, 'error', key,
+                                             f'Prescription step contains performance key "{key}"',
+                                             f'{location} (prescription steps)'))
+
+            if _is_set(block, 'performed'):
+                performed = block['performed']
+                for key in FORBIDDEN_PERFORMED_KEYS:
+                    if _has_key(performed, key):
+                        rows.append((False, 'error', key,
+                                     f'Performed contains prescription key "{key}" - violation of separation principle',
+                                     f'{location} (performed)'))
+                if _has_key(performed, 'steps'):
+                    for step in _elements(performed, 'steps'):
+                        for key in FORBIDDEN_PERFORMED_KEYS:
+                            if _has_key(step, key):
+                                rows.append((False, 'error', key,
+                                             f'Performed step contains prescription key "{key}"',
+                                             f'{location} (performed steps)'))
+
+    if not sessions:
+        rows.append((True, 'info', None, 'Prescription/Performance separation is correct', None))
+    return rows
+
+
+# --------------------------------------------------------
+# validate_parsed_workout
+# --------------------------------------------------------
+
+# category → names of the columns after (is_valid, severity, field, issue)
+REPORT_COLUMNS = {
+    'structure': (),
+    'block_structure': ('location',),
+    'data_values': ('location', 'actual_value'),
+    'catalog': ('location', 'value'),
+    'prescription_performance_separation': ('location',),
+}
+
+
+def run_checks(parsed: Dict[str, Any], catalog: Optional[WorkoutCatalog] = None) -> List[Tuple[str, List[Row]]]:
+    """(category, rows) per check in the SQL order; the catalog check needs a catalog"""
+    if not isinstance(parsed, dict):
+        raise ValueError("parsed workout must be a JSON object")
+    results = [
+        ('structure', validate_parsed_structure(parsed, catalog)),
+        ('block_structure', validate_block_codes(parsed)),
+        ('data_values', validate_data_values(parsed)),
+    ]
+    if catalog is not None:
+        results.append(('catalog', validate_catalog_references(parsed, catalog)))
+    results.append(('prescription_performance_separation', validate_prescription_performance_separation(parsed)))
+    return results
+
+
+def build_report(results: List[Tuple[str, List[Row]]], draft_id: Optional[str] = None) -> Dict[str, Any]:
+    """The ``report`` column of zamm.validate_parsed_workout"""
+    errors: List[Dict[str, Any]] = []
+    warnings: List[Dict[str, Any]] = []
+    info: List[Dict[str, Any]] = []
+    total = info_count = 0
+
+    for category, rows in results:
+        columns = REPORT_COLUMNS[category]
+        for _, severity, field, issue, *extra in rows:
+            total += 1
+            if severity in ('error', 'warning'):
+                entry = {'severity': severity, 'category': category, 'field': field, 'issue': issue}
+                entry.update(zip(columns, extra))
+                (errors if severity == 'error' else warnings).append(entry)
+            else:
+                info_count += 1
+                # Only the structure check lists its info rows
+                if category == 'structure':
+                    info.append({'severity': 'info', 'category': category, 'message': issue})
+
+    status = 'fail' if errors else 'warning' if warnings else 'pass'
+    return {
+        'validation_status': status,
+        'draft_id': draft_id,
+        'validated_at': datetime.now(timezone.utc).isoformat(),
+        'summary': {
+            'total_checks': total,
+            'passed': total - len(errors) - len(warnings),
+            'errors': len(errors),
+            'warnings': len(warnings),
+            'info': info_count,
+        },
+        'errors': errors,
+        'warnings': warnings,
+        'info': info,
+    }
+
+
+def validate_parsed_workout(parsed: Dict[str, Any], draft_id: Optional[str] = None,
+                            catalog: Optional[WorkoutCatalog] = None) -> Dict[str, Any]:
+    """
+    Offline ``zamm.validate_parsed_workout``: the same report, without a round
+    trip. ``catalog`` defaults to the local snapshot; raises ValueError where
+    the SQL function would raise.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    return build_report(run_checks(parsed, catalog), draft_id)
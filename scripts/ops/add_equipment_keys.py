@@ -1,88 +1,35 @@
 #!/usr/bin/env python3
 """
 Add equipment_key to all exercises in golden set JSON files
-Based on zamm.equipment_catalog
+Based on zamm.lib_equipment_catalog (see lib/equipment_taxonomy.py)
 """
 
 import json
 import os
+import sys
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
 
-# Equipment mapping rules based on exercise names
-EQUIPMENT_MAPPING = {
-    # Free weights
-    'barbell': ['Back Squat', 'Front Squat', 'Barbell', 'Squat', 'Deadlift', 'Clean', 
-                'Snatch', 'Press', 'Bench Press', 'Overhead Press', 'Thruster', 
-                'Power Clean', 'Hang Clean', 'RDL'],
-    'dumbbell': ['DB', 'Dumbbell', 'Dumbell'],
-    'kettlebell': ['KB', 'Kettlebell'],
-    
-    # Cardio machines
-    'rowing_machine': ['Row', 'C2', 'Rowing', 'Erg', 'Concept2'],
-    'assault_bike': ['Assault Bike', 'AB', 'Air Bike'],
-    'bike': ['Bike', 'Stationary Bike'],
-    'treadmill': ['Treadmill', 'Jog', 'Run'],
-    'ski_erg': ['Ski Erg', 'Ski'],
-    
-    # Machines
-    'cable_machine': ['Cable'],
-    'lat_pulldown': ['Lat Pulldown'],
-    'leg_press': ['Leg Press'],
-    
-    # Bodyweight equipment
-    'pull_up_bar': ['Pull-up', 'Pullup', 'Pull Up', 'Chin-up', 'Chinup', 'Bar Hang', 'Muscle-up'],
-    'dip_station': ['Dip', 'Dips'],
-    'rings': ['Ring'],
-    
-    # Bands
-    'resistance_band': ['Band', 'Resistance Band'],
-    'mini_band': ['Mini-Band', 'Mini Band', 'Miniband'],
-    
-    # Mobility & Recovery
-    'foam_roller': ['Foam Roll', 'FR', 'Foam Roller'],
-    'lacrosse_ball': ['Lacrosse Ball', 'Lacrosse'],
-    'pvc_pipe': ['PVC'],
-    
-    # Functional
-    'wall_ball': ['Wall Ball', 'WB'],
-    'medicine_ball': ['Medicine Ball', 'Med Ball'],
-    'slam_ball': ['Slam Ball'],
-    'jump_rope': ['Jump Rope', 'DU', 'Double Under', 'Single Under'],
-    'box': ['Box Jump', 'Step Up', 'Box Step'],
-    'sandbag': ['Sandbag', 'Sand Bag'],
-    'sled': ['Sled Push', 'Sled Pull', 'Sled'],
-    
-    # Bodyweight/None
-    'bodyweight': ['BW', 'Bodyweight', 'Body Weight', 'Air Squat', 'Push-up', 'Pushup', 
-                   'Push Up', 'Burpee', 'Plank', 'Sit-up', 'Situp', 'Mountain Climber', 
-                   'Lunge', 'Walk', 'Light Jog', 'Stretch', 'Breathing', 'Mobility', 
-                   'Activation', 'Scap', 'Shoulder']
-}
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.equipment import has_exercise_names  # noqa: E402
+from lib.equipment_taxonomy import get_taxonomy  # noqa: E402
 
 def get_equipment_key(exercise_name):
-    """Determine equipment_key from exercise name"""
+    """Determine equipment_key from exercise name (catalog aliases, then shared patterns)"""
     if not exercise_name:
         return 'none'
-    
-    lower_name = exercise_name.lower()
-    
-    # Check each equipment type
-    for equip_key, patterns in EQUIPMENT_MAPPING.items():
-        for pattern in patterns:
-            if pattern.lower() in lower_name:
-                return equip_key
-    
-    # Default to bodyweight if uncertain
-    return 'bodyweight'
 
-def add_equipment_to_exercise(exercise):
+    return get_taxonomy().resolve(exercise_name)
+
+def add_equipment_to_exercise(exercise, counts=None):
     """Add equipment_key to a single exercise object"""
     if 'equipment_key' not in exercise and 'exercise_name' in exercise:
         exercise['equipment_key'] = get_equipment_key(exercise['exercise_name'])
+        if counts is not None:
+            counts['equipment_keys_added'] += 1
     return exercise
 
-def process_workout(data):
+def process_workout(data, counts=None):
     """Recursively process workout structure"""
     if 'sessions' not in data:
         return data
@@ -99,11 +46,11 @@ def process_workout(data):
                 # Handle exercise_options (alternative exercises)
                 if 'exercise_options' in item and isinstance(item['exercise_options'], list):
                     for exercise in item['exercise_options']:
-                        add_equipment_to_exercise(exercise)
+                        add_equipment_to_exercise(exercise, counts)
                 
                 # Handle direct exercise (standard format)
                 if 'exercise_name' in item:
-                    add_equipment_to_exercise(item)
+                    add_equipment_to_exercise(item, counts)
     
     return data
 
@@ -125,19 +72,19 @@ def main():
     
     for file_path in sorted(json_files):
         try:
-            # Read file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Track before state
-            before = json.dumps(data, sort_keys=True)
+            # Read file; without any exercise_name there is nothing to add
+            raw = file_path.read_bytes()
+            if not has_exercise_names(raw):
+                print(f"  No changes: {file_path.name}")
+                continue
+            data = json.loads(raw)
             
             # Process workout
-            process_workout(data)
+            counts = Counter()
+            process_workout(data, counts)
             
             # Check if changed
-            after = json.dumps(data, sort_keys=True)
-            if before != after:
+            if counts['equipment_keys_added']:
                 # Write back with pretty formatting
                 with open(file_path, 'w', encoding='utf-8') as f:
                     json.dump(data, f, indent=2, ensure_ascii=False)
@@ -2,75 +2,23 @@
 """
 Bulk add equipment_key to all golden set JSON files
 Writes results to output file to avoid terminal issues
+Files are only parsed when they contain an exercise_name and only rewritten
+when a key was added.
+
+To run the full v3.0 → v3.2 chain in one pass per file, use
+scripts/ops/migrate_workouts.py instead.
 """
 
 import json
 import os
+import sys
 from pathlib import Path
-from collections import defaultdict
-
-# Equipment mapping
-EQUIPMENT_MAP = {
-    'barbell': ['Back Squat', 'Front Squat', 'Barbell', ' Squat', 'Deadlift', 'Clean', 'Snatch', 'Press', 'Bench Press', 'Overhead Press', 'Thruster', 'Power Clean', 'Hang Clean', 'RDL', ' BB ', 'Hip Thrust'],
-    'dumbbell': [' DB ', 'Dumbbell', 'Dumbell'],
-    'kettlebell': [' KB ', ' KTB ', 'Kettlebell'],
-    'rowing_machine': ['Row', ' C2 ', 'Rowing', ' Erg', 'Concept2'],
-    'assault_bike': ['Assault Bike', ' AB ', 'Air Bike'],
-    'bike': ['Bike', 'Stationary Bike'],
-    'treadmill': ['Treadmill', ' Jog', ' Run'],
-    'ski_erg': ['Ski Erg', ' Ski'],
-    'cable_machine': ['Cable'],
-    'lat_pulldown': ['Lat Pulldown'],
-    'leg_press': ['Leg Press'],
-    'pull_up_bar': ['Pull-up', 'Pullup', 'Pull Up', 'Chin-up', 'Chinup', 'Bar Hang', 'Muscle-up', 'Dead Hang'],
-    'dip_station': [' Dip', 'Dips'],
-    'rings': ['Ring'],
-    'resistance_band': ['Band', 'Banded'],
-    'mini_band': ['Mini-Band', 'Mini Band', 'Miniband'],
-    'foam_roller': ['Foam Roll', ' FR ', 'Foam Roller'],
-    'lacrosse_ball': ['Lacrosse Ball', 'Lacrosse'],
-    'pvc_pipe': [' PVC', 'Dowel'],
-    'wall_ball': ['Wall Ball', ' WB '],
-    'medicine_ball': ['Medicine Ball', 'Med Ball'],
-    'slam_ball': ['Slam Ball'],
-    'jump_rope': ['Jump Rope', ' DU', 'Double Under', 'Single Under'],
-    'box': ['Box Jump', 'Step Up', 'Box Step'],
-    'sandbag': ['Sandbag', 'Sand Bag'],
-    'sled': ['Sled Push', 'Sled Pull', ' Sled'],
-    'landmine': ['Landmine'],
-    'bodyweight': [' BW ', 'Bodyweight', 'Body Weight', 'Air Squat', 'Push-up', 'Pushup', 'Push Up', 'Burpee', 'Plank', 'Sit-up', 'Situp', 'Mountain Climber', ' Lunge', ' Walk', 'Light Jog', 'Stretch', 'Breathing', 'Mobility', 'Activation', 'Scap', 'Shoulder', 'Dead Bug', 'Glute Bridge', 'Hip', 'Ankle', 'Calf', 'Cat', 'Frog', 'Inchworm', 'Couch', ' Cars', 'Curl-Up', 'Hard-Style', 'Back Extension', 'Isometric', 'Airplane', 'Groiner', 'Floss', 'Hyper', 'Open Books', 'Smash']
-}
+from collections import Counter, defaultdict
 
-def get_equipment_key(exercise_name):
-    if not exercise_name:
-        return 'bodyweight'
-    
-    # Normalize the name
-    name = ' ' + exercise_name + ' '
-    
-    # Check patterns (order matters - check specific before general)
-    for equip_key, patterns in EQUIPMENT_MAP.items():
-        for pattern in patterns:
-            if pattern.lower() in name.lower():
-                return equip_key
-    
-    return 'bodyweight'
-
-def add_equipment_recursive(obj):
-    """Recursively add equipment_key to all exercise objects"""
-    if isinstance(obj, dict):
-        # If this is an exercise object
-        if 'exercise_name' in obj and 'equipment_key' not in obj:
-            obj['equipment_key'] = get_equipment_key(obj['exercise_name'])
-        
-        # Recurse into all values
-        for value in obj.values():
-            add_equipment_recursive(value)
-    
-    elif isinstance(obj, list):
-        # Recurse into list items
-        for item in obj:
-            add_equipment_recursive(item)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.batch import atomic_write_text  # noqa: E402
+from lib.equipment import add_equipment_recursive, has_exercise_names  # noqa: E402
+from lib.equipment_taxonomy import resolve_equipment_key  # noqa: E402
 
 def main():
     script_dir = Path(__file__).parent
@@ -94,17 +42,17 @@ def main():
     
     for file_path in json_files:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            before = json.dumps(data, sort_keys=True)
-            add_equipment_recursive(data)
-            after = json.dumps(data, sort_keys=True)
+            raw = file_path.read_bytes()
+            if not has_exercise_names(raw):
+                results.append(f"  No changes: {file_path.name}\n")
+                continue
+
+            data = json.loads(raw)
+            counts = Counter()
+            add_equipment_recursive(data, counts, classify=resolve_equipment_key)
             
-            if before != after:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                    f.write('\n')
+            if counts['equipment_keys_added']:
+                atomic_write_text(file_path, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
                 
                 stats['files_updated'] += 1
                 results.append(f"✓ Updated: {file_path.name}\n")
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Bulk Commit Parsed Workouts
+
+Commits a directory of parsed workout JSON to Postgres in batches through
+zamm.commit_full_workouts_bulk_v4 (one call and one multi-row INSERT per
+table per batch), instead of one zamm.commit_full_workout_v4 call per
+workout. A batch that fails is split in half and each half retried
+through the same function, down to single-draft calls, so one bad draft
+does not block the rest and every draft gets the bulk function's
+athlete_id / workout_date fallbacks whatever its batch-mates did.
+
+Usage:
+    python3 scripts/ops/bulk_commit_workouts.py data/parsed --batch-size 50
+    python3 scripts/ops/bulk_commit_workouts.py data/parsed --mode single        # v4 per workout
+    python3 scripts/ops/bulk_commit_workouts.py data/parsed --compare --repeat 20 # throughput, rolled back
+    python3 scripts/ops/bulk_commit_workouts.py data/parsed --dry-run            # batches only, no DB
+    python3 scripts/ops/bulk_commit_workouts.py data/parsed --prescreen          # skip drafts failing offline validation
+
+Each file may carry import_id / draft_id / ruleset_id / athlete_id at the top
+level; --ruleset-id and --athlete-id fill in missing values. Files that are
+not a JSON object are listed as errors and skipped, in every mode. The DSN
+comes from --dsn, then $DATABASE_URL, then the local Supabase default.
+"""
+
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.db import connect, resolve_dsn  # noqa: E402
+from lib.workout_validation import validate_parsed_workout  # noqa: E402
+
+PARSED_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'parsed'
+
+BULK_SQL = "SELECT workout_ordinal, workout_id, requires_review FROM zamm.commit_full_workouts_bulk_v4(%s::jsonb)"
+SINGLE_SQL = "SELECT zamm.commit_full_workout_v4(%s, %s, %s, %s, %s::jsonb)"
+REVIEW_SQL = "SELECT requires_review FROM zamm.workout_main WHERE workout_id = %s"
+
+
+def collect_files(paths):
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(path.glob('*.json'))
+        else:
+            yield path
+
+
+def read_entry(path, ruleset_id=None, athlete_id=None):
+    """Commit payload for one file; ValueError when it is not a JSON object"""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as err:
+            raise ValueError(f"invalid JSON: {err}") from None
+    if not isinstance(data, dict):
+        raise ValueError("not a JSON object")
+    return {
+        'import_id': data.get('import_id'),
+        'draft_id': data.get('draft_id'),
+        'ruleset_id': data.get('ruleset_id') or ruleset_id,
+        'athlete_id': data.get('athlete_id') or athlete_id,
+        'normalized_json': data,
+    }
+
+
+def load_entries(files, errors, ruleset_id=None, athlete_id=None, repeat=1):
+    """
+    (file, commit payload) per workout; ``repeat`` > 1 inflates the set for
+    benchmarks. Unreadable files are skipped and appended to ``errors`` once.
+    """
+    for round_index in range(repeat):
+        for path in files:
+            try:
+                entry = read_entry(path, ruleset_id, athlete_id)
+            except (OSError, ValueError) as err:
+                if round_index == 0:
+                    errors.append((path, str(err)))
+                continue
+            yield path, entry
+
+
+def prescreen(files, ruleset_id=None, athlete_id=None):
+    """
+    Split files into (clean, rejected, unchecked) with the offline
+    zamm.validate_parsed_workout. Unchecked files (the offline validator
+    raised on them) stay in ``clean``: the database decides.
+    """
+    clean, rejected, unchecked = [], [], []
+    for path in files:
+        try:
+            entry = read_entry(path, ruleset_id, athlete_id)
+        except (OSError, ValueError) as err:
+            rejected.append((path, str(err)))
+            continue
+        try:
+            report = validate_parsed_workout(entry['normalized_json'], entry['draft_id'])
+        except ValueError as err:
+            # A value the SQL casts reject as well (bad uuid/date)
+            rejected.append((path, str(err)))
+            continue
+        except Exception as err:
+            unchecked.append((path, f"{type(err).__name__}: {err}"))
+            clean.append(path)
+            continue
+        if report['validation_status'] == 'fail':
+            rejected.append((path, report['errors'][0]['issue']))
+        else:
+            clean.append(path)
+    return clean, rejected, unchecked
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def commit_single(cur, entry):
+    """v4 for one draft; returns (workout_id, requires_review)"""
+    cur.execute(SINGLE_SQL, (entry['import_id'], entry['draft_id'], entry['ruleset_id'],
+                             entry['athlete_id'], json.dumps(entry['normalized_json'])))
+    workout_id = cur.fetchone()[0]
+    cur.execute(REVIEW_SQL, (workout_id,))
+    return workout_id, cur.fetchone()[0]
+
+
+def commit_bulk(conn, cur, batch, rollback=False):
+    """
+    One bulk call for ``batch``; when it fails, bisect and retry both halves
+    the same way until the failing drafts are isolated in one-draft calls.
+    Returns (committed, flagged, errors).
+    """
+    try:
+        cur.execute(BULK_SQL, (json.dumps([entry for _, entry in batch]),))
+        rows = cur.fetchall()
+        conn.rollback() if rollback else conn.commit()
+    except Exception as err:
+        conn.rollback()
+        if len(batch) == 1:
+            return 0, 0, [(batch[0][0], str(err).strip())]
+        middle = len(batch) // 2
+        first = commit_bulk(conn, cur, batch[:middle], rollback)
+        second = commit_bulk(conn, cur, batch[middle:], rollback)
+        return first[0] + second[0], first[1] + second[1], first[2] + second[2]
+    return len(rows), sum(1 for _, _, requires_review in rows if requires_review), []
+
+
+def run(conn, entries, mode, batch_size, rollback=False):
+    """Commit everything; returns (committed, flagged, errors, seconds)"""
+    committed = flagged = 0
+    errors = []
+    started = time.perf_counter()
+    cur = conn.cursor()
+
+    if mode == 'single':
+        for path, entry in entries:
+            try:
+                _, requires_review = commit_single(cur, entry)
+                conn.rollback() if rollback else conn.commit()
+                committed += 1
+                flagged += bool(requires_review)
+            except Exception as err:
+                conn.rollback()
+                errors.append((path, str(err).strip()))
+        return committed, flagged, errors, time.perf_counter() - started
+
+    for batch in chunked(entries, batch_size):
+        batch_committed, batch_flagged, batch_errors = commit_bulk(conn, cur, batch, rollback)
+        committed += batch_committed
+        flagged += batch_flagged
+        errors += batch_errors
+    return committed, flagged, errors, time.perf_counter() - started
+
+
+def print_run(label, committed, flagged, errors, seconds):
+    rate = committed / seconds if seconds else 0.0
+    print(f"{label:<8} {committed:>6} workouts in {seconds:8.2f}s  ({rate:8.1f} workouts/s)"
+          + (f", {flagged} flagged for review" if flagged else '')
+          + (f", {len(errors)} errors" if errors else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Commit parsed workout JSON to Postgres in batches")
+    parser.add_argument('paths', nargs='*', type=Path, default=[PARSED_DIR],
+                        help="JSON files or directories (default: data/parsed)")
+    parser.add_argument('--batch-size', type=int, default=50, help="Workouts per bulk call (default: 50)")
+    parser.add_argument('--mode', choices=('bulk', 'single'), default='bulk',
+                        help="bulk = commit_full_workouts_bulk_v4, single = commit_full_workout_v4 per workout")
+    parser.add_argument('--ruleset-id', help="ruleset_id for files that do not carry one")
+    parser.add_argument('--athlete-id', help="athlete_id for files that do not carry one")
+    parser.add_argument('--dsn', help="Postgres DSN (default: $DATABASE_URL or local Supabase)")
+    parser.add_argument('--rollback', action='store_true', help="Roll back every transaction (timing only)")
+    parser.add_argument('--compare', action='store_true',
+                        help="Time single vs bulk on the same input, rolled back")
+    parser.add_argument('--repeat', type=int, default=1, help="Commit each file N times (benchmark input size)")
+    parser.add_argument('--dry-run', action='store_true', help="Show batching without connecting")
+    parser.add_argument('--prescreen', action='store_true',
+                        help="Validate offline first and skip drafts that fail (lib/workout_validation.py)")
+    args = parser.parse_args()
+
+    files = list(collect_files(args.paths))
+    if not files:
+        print("❌ No JSON files found")
+        return 1
+
+    if args.prescreen:
+        files, rejected, unchecked = prescreen(files, args.ruleset_id, args.athlete_id)
+        print(f"🔍 Prescreen: {len(files) - len(unchecked)} clean, {len(rejected)} rejected"
+              + (f", {len(unchecked)} not checked" if unchecked else ''))
+        for path, issue in rejected:
+            print(f"✗ {path.name}: {issue}")
+        for path, issue in unchecked:
+            print(f"⚠️  {path.name}: offline validation failed ({issue}); left to the database")
+        if not files:
+            return 1
+
+    def entries(errors):
+        return load_entries(files, errors, args.ruleset_id, args.athlete_id, args.repeat)
+
+    total = len(files) * args.repeat
+    if args.dry_run:
+        batches = -(-total // args.batch_size)
+        print(f"📦 {total} workouts → {batches} bulk calls of up to {args.batch_size} "
+              f"(vs {total} commit_full_workout_v4 calls)")
+        return 0
+
+    print(f"🚀 Committing {total} workouts ({resolve_dsn(args.dsn).rsplit('@', 1)[-1]})\n")
+    try:
+        conn = connect(args.dsn)
+    except Exception as err:
+        print(f"❌ Cannot connect: {err}")
+        return 1
+    errors = []
+    try:
+        if args.compare:
+            single = run(conn, entries(errors), 'single', args.batch_size, rollback=True)
+            bulk = run(conn, entries([]), 'bulk', args.batch_size, rollback=True)
+            print_run('single', *single)
+            print_run('bulk', *bulk)
+            if single[3] and bulk[3]:
+                print(f"\n⚡ Speedup: {single[3] / bulk[3]:.1f}x (batch size {args.batch_size}, rolled back)")
+            errors += single[2] + bulk[2]
+        else:
+            committed, flagged, run_errors, seconds = run(conn, entries(errors), args.mode, args.batch_size,
+                                                          args.rollback)
+            errors += run_errors
+            print_run(args.mode, committed, flagged, errors, seconds)
+    finally:
+        conn.close()
+
+    for path, error in errors:
+        print(f"✗ {path.name}: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Set Fact Table Export / Query
+
+Flattens parsed workout JSON into the columnar per-set fact table of
+lib/fact_table.py (.npy columns, dictionary-encoded strings) and queries it
+memory-mapped, without walking JSON or scanning performed_data.
+
+Usage:
+    python3 scripts/ops/export_facts.py export data/golden_set data/parsed          # → .cache/facts
+    python3 scripts/ops/export_facts.py query --exercise "Back Squat" --min-load 100 --since 2025-01-01
+    python3 scripts/ops/export_facts.py query --athlete tomer --group-by exercise_name --value load_kg --how max
+    python3 scripts/ops/export_facts.py query --athlete yehuda --json                # matching rows as JSON Lines
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.fact_table import CATEGORICAL_COLUMNS, COLUMNS, FactTable, export_files  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_FACTS_DIR = REPO_ROOT / '.cache' / 'facts'
+GOLDEN_SET_DIR = REPO_ROOT / 'data' / 'golden_set'
+
+
+def cmd_export(args) -> int:
+    files = []
+    for path in args.paths:
+        files.extend(sorted(path.glob('*.json')) if path.is_dir() else [path])
+    start = time.perf_counter()
+    manifest = export_files(files, args.facts)
+    print(f"✅ Exported {manifest['rows']} sets from {len(files)} workouts to {args.facts} "
+          f"({time.perf_counter() - start:.2f}s)", file=sys.stderr)
+    return 0
+
+
+def cmd_query(args) -> int:
+    table = FactTable(args.facts)
+    filters = {
+        'athlete': args.athlete,
+        'exercise_name': args.exercise,
+        'block_code': args.block,
+        'equipment_key': args.equipment,
+        'date_from': args.since,
+        'date_to': args.until,
+        'min_load_kg': args.min_load,
+        'max_load_kg': args.max_load,
+        'min_reps': args.min_reps,
+    }
+    start = time.perf_counter()
+    rows = table.select(**filters)
+    if args.group_by:
+        result = table.group_by(rows, args.group_by, args.value, how=args.how)
+        elapsed = time.perf_counter() - start
+        for key, value in sorted(result.items(), key=lambda pair: -pair[1]):
+            print(f"{str(key):<40} {value:12.2f}")
+    else:
+        records = table.records(rows, limit=args.limit)
+        elapsed = time.perf_counter() - start
+        for record in records:
+            if args.json:
+                print(json.dumps(record, ensure_ascii=False))
+            else:
+                print(f"{record['date'] or '-':<11} {record['athlete'] or '-':<12} {record['exercise_name'] or '-':<28} "
+                      f"set {record['set_index']:<3} reps {record['reps'] if record['reps'] is not None else '-':<6} "
+                      f"load {record['load_kg'] if record['load_kg'] is not None else '-'}")
+    print(f"📊 {len(rows)} of {len(table)} sets matched ({elapsed * 1000:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar per-set fact table for analytics")
+    parser.add_argument('--facts', type=Path, default=DEFAULT_FACTS_DIR,
+                        help="Fact table directory (default: .cache/facts)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Flatten workout JSON files/directories into the fact table")
+    export.add_argument('paths', nargs='*', type=Path, default=[GOLDEN_SET_DIR])
+    export.set_defaults(run=cmd_export)
+
+    query = commands.add_parser('query', help="Filter sets; print rows or a grouped aggregate")
+    query.add_argument('--athlete')
+    query.add_argument('--exercise')
+    query.add_argument('--block')
+    query.add_argument('--equipment')
+    query.add_argument('--since', help="First date (YYYY-MM-DD, inclusive)")
+    query.add_argument('--until', help="Last date (YYYY-MM-DD, inclusive)")
+    query.add_argument('--min-load', type=float, help="Minimum load in kg")
+    query.add_argument('--max-load', type=float, help="Maximum load in kg")
+    query.add_argument('--min-reps', type=float)
+    query.add_argument('--group-by', choices=CATEGORICAL_COLUMNS + ('date', 'workout'))
+    query.add_argument('--value', choices=[name for name, dtype in COLUMNS.items() if dtype.startswith('float')])
+    query.add_argument('--how', choices=('sum', 'max', 'mean', 'count'), default='count')
+    query.add_argument('--limit', type=int, default=100, help="Rows to print (default: 100)")
+    query.add_argument('--json', action='store_true', help="Print rows as JSON Lines")
+    query.set_defaults(run=cmd_query)
+    args = parser.parse_args()
+
+    try:
+        return args.run(args)
+    except (RuntimeError, ValueError, FileNotFoundError) as err:
+        print(f"❌ {err}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Find Near-Duplicate Workouts
+
+Indexes every session of data/raw_logs (plus any extra .txt directories,
+e.g. data/golden_set) with lib/near_duplicates.py and reports near-duplicate
+pairs per athlete, or checks new workout files against that history before
+they are parsed and committed.
+
+Same-day matches are likely double imports (re-export, reformatted paste);
+matches on different days are a repeated program week, reported as counts.
+
+Usage:
+    python3 scripts/ops/find_near_duplicates.py                          # pairs in data/raw_logs
+    python3 scripts/ops/find_near_duplicates.py --extra data/golden_set
+    python3 scripts/ops/find_near_duplicates.py --check new/itamar_2025-06-21.txt   # exit 1 on a same-day match
+    python3 scripts/ops/find_near_duplicates.py --check day.txt --athlete "yarden frank" --threshold 0.9
+"""
+
+import argparse
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.near_duplicates import DEFAULT_THRESHOLD, NearDuplicateIndex  # noqa: E402
+from lib.raw_logs import iter_logs, parse_day_line  # noqa: E402
+
+RAW_LOGS_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'raw_logs'
+FILENAME = re.compile(r'^(?P<athlete>.+?)_(?P<date>\d{4}-\d{2}-\d{2})')
+
+
+def athlete_key(name: Optional[str]) -> Optional[str]:
+    """'Yarden Frank' / 'yarden_frank' → 'yarden frank'"""
+    if not name:
+        return None
+    return ' '.join(re.split(r'[\s_]+', name.strip().lower()))
+
+
+def resolve_athletes(name: Optional[str], known) -> List[Optional[str]]:
+    """Indexed athletes ``name`` refers to: 'tomer' → ['tomer yacov']; 'yarden' → both Yardens"""
+    key = athlete_key(name)
+    if key is None:
+        return [None]
+    matches = sorted(athlete for athlete in known if athlete and (athlete == key or athlete.startswith(key + ' ')))
+    return matches or [key]
+
+
+def file_identity(path: Path, text: str) -> Tuple[Optional[str], Optional[str]]:
+    """(athlete, ISO date) from <athlete>_<date>.txt; a day line in the text takes precedence for the date"""
+    workout_date = None
+    for line in text.splitlines():
+        day = parse_day_line(line.strip())
+        if day:
+            workout_date = day.isoformat()
+            break
+    match = FILENAME.match(path.name.lower())
+    athlete = athlete_key(match.group('athlete')) if match else None
+    if workout_date is None and match:
+        workout_date = match.group('date')
+    return athlete, workout_date
+
+
+def build_index(paths, extra_dirs, threshold: float) -> Tuple[NearDuplicateIndex, Dict[str, Optional[str]]]:
+    index = NearDuplicateIndex(threshold=threshold)
+    dates: Dict[str, Optional[str]] = {}
+    for record in iter_logs(paths):
+        index.add(record.source_ref, record.raw_text, group=athlete_key(record.athlete))
+        dates[record.source_ref] = record.workout_date.isoformat()
+    log_athletes = set(index.groups.values())
+    for directory in extra_dirs:
+        for path in sorted(directory.glob('*.txt')):
+            text = path.read_text(encoding='utf-8')
+            athlete, workout_date = file_identity(path, text)
+            athletes = resolve_athletes(athlete, log_athletes)
+            # An ambiguous short name ('yarden') stays its own group
+            index.add(str(path), text, group=athletes[0] if len(athletes) == 1 else athlete)
+            dates[str(path)] = workout_date
+    return index, dates
+
+
+def check_files(index: NearDuplicateIndex, dates, files, athlete: Optional[str]) -> int:
+    duplicates = 0
+    for path in files:
+        text = path.read_text(encoding='utf-8')
+        file_athlete, workout_date = file_identity(path, text)
+        groups = resolve_athletes(athlete or file_athlete, set(index.groups.values()))
+        matches = sorted((match for group in groups for match in index.query(text, group=group)),
+                         key=lambda match: -match[1])
+        same_day = [(key, score) for key, score in matches if workout_date is None or dates[key] == workout_date]
+        if same_day:
+            duplicates += 1
+            print(f"❌ {path.name}: near-duplicate of")
+            for key, score in same_day[:5]:
+                print(f"     {score:.2f}  {key}")
+        elif matches:
+            print(f"⚠️  {path.name}: same text as {len(matches)} session(s) on other days "
+                  f"(best {matches[0][1]:.2f}, {dates[matches[0][0]]})")
+        else:
+            print(f"✅ {path.name}: no near-duplicate for {', '.join(map(str, groups))} ({len(index)} sessions indexed)")
+    return 1 if duplicates else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate detection over raw workout texts")
+    parser.add_argument('paths', nargs='*', type=Path, default=[RAW_LOGS_DIR],
+                        help="Raw logs or directories (default: data/raw_logs)")
+    parser.add_argument('--extra', nargs='*', type=Path, default=[],
+                        help="Directories of single-workout .txt files to index as well")
+    parser.add_argument('--check', nargs='+', type=Path, help="Workout .txt files to check against the index")
+    parser.add_argument('--athlete', help="Athlete of the --check files (default: from the file name)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Estimated Jaccard similarity to report (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--verbose', '-v', action='store_true', help="List cross-day repeats too")
+    args = parser.parse_args()
+
+    index, dates = build_index(args.paths, args.extra, args.threshold)
+    if args.check:
+        return check_files(index, dates, args.check, args.athlete)
+
+    same_day = 0
+    repeats: Counter = Counter()
+    for left, right, score in index.pairs():
+        if dates[left] == dates[right]:
+            same_day += 1
+            print(f"❌ {score:.2f}  {left}  ≈  {right}")
+        else:
+            repeats[index.groups[left]] += 1
+            if args.verbose:
+                print(f"   {score:.2f}  {left} ({dates[left]})  ≈  {right} ({dates[right]})")
+
+    sizes = Counter(index.groups.values())
+    all_pairs = sum(n * (n - 1) for n in sizes.values())
+    print(f"\n📊 {len(index)} sessions, {index.comparisons} signature comparisons "
+          f"(all pairs per athlete: {all_pairs})")
+    print(f"   {same_day} same-day near-duplicate pair(s)")
+    if repeats:
+        print(f"   {sum(repeats.values())} cross-day repeats: "
+              + ', '.join(f"{athlete} {count}" for athlete, count in repeats.most_common()))
+    return 1 if same_day else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,35 +2,19 @@
 """
 Fix legacy duration fields in circuit_config objects.
 Converts rest_between_rounds_sec to v3.2 {value, unit} structure.
+
+To run the full v3.0 → v3.2 chain in one pass per file, use
+scripts/ops/migrate_workouts.py instead.
 """
 
 import json
+import sys
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict
-
-
-def fix_circuit_config(obj: Any) -> Any:
-    """Recursively fix circuit_config objects."""
-    if isinstance(obj, dict):
-        # Check if this is a circuit_config with rest_between_rounds_sec
-        if 'rest_between_rounds_sec' in obj:
-            value = obj.pop('rest_between_rounds_sec')
-            if isinstance(value, (int, float)):
-                obj['rest_between_rounds'] = {
-                    "value": value,
-                    "unit": "sec"
-                }
-                print(f"  → Converted rest_between_rounds_sec: {value} → {{value: {value}, unit: 'sec'}}")
-
-        # Recursively process nested objects
-        for key, value in obj.items():
-            obj[key] = fix_circuit_config(value)
 
-        return obj
-    elif isinstance(obj, list):
-        return [fix_circuit_config(item) for item in obj]
-    else:
-        return obj
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.batch import atomic_write_text, count_changes  # noqa: E402
+from lib.schema_v3_2 import fix_circuit_config, has_legacy_circuit_fields  # noqa: E402
 
 
 def fix_file(file_path: Path) -> bool:
@@ -38,22 +22,26 @@ def fix_file(file_path: Path) -> bool:
     print(f"Processing {file_path.name}...")
 
     try:
-        # Read the file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Check if file needs fixing
-        file_content = json.dumps(data)
-        if 'rest_between_rounds_sec' not in file_content:
+        # Check if file needs fixing - on the raw bytes, before parsing
+        raw = file_path.read_bytes()
+        if not has_legacy_circuit_fields(raw):
             print("  ✓ No legacy fields found")
             return False
 
+        data = json.loads(raw)
+
         # Fix the data
-        fixed_data = fix_circuit_config(data)
+        counts = Counter()
+        fixed_data = fix_circuit_config(data, counts)
+        if counts['values_skipped']:
+            print(f"  ⚠️  Skipped {counts['values_skipped']} non-numeric rest_between_rounds_sec - needs manual review")
+        if not count_changes(counts):
+            print("  ✓ No legacy fields converted")
+            return False
+        print(f"  → Converted {counts['rest_between_rounds_converted']} rest_between_rounds_sec → {{value, unit: 'sec'}}")
 
         # Write back with proper formatting
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(fixed_data, f, indent=4, ensure_ascii=False)
+        atomic_write_text(file_path, json.dumps(fixed_data, indent=4, ensure_ascii=False))
 
         print(f"  ✅ Fixed successfully")
         return True
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Ingest Preflight
+
+Checks raw athlete logs against Postgres before they are imported: is each
+athlete registered, which sessions are already committed (same athlete,
+date and raw-text SHA-256 as workout_main.content_hash_ref), the athletes'
+context, and - with --parsed - whether every equipment key exists.
+
+All lookups go through lib/batch_lookups.py: one array-parameter call per
+lookup kind (per --batch-size chunk) on a pooled connection, so a
+190-session log costs a handful of round trips (each statement is also
+prepared once per connection) instead of several per session.
+
+Usage:
+    python3 scripts/ops/ingest_preflight.py "data/raw_logs/Workout Log: itamar shatnay.txt"
+    python3 scripts/ops/ingest_preflight.py data/raw_logs --parsed data/parsed
+    python3 scripts/ops/ingest_preflight.py data/raw_logs --json     # one JSON line per session
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.batch_lookups import BATCH_SIZE, BatchLookups  # noqa: E402
+from lib.checksum import calculate_checksum  # noqa: E402
+from lib.db import ConnectionPool, resolve_dsn  # noqa: E402
+from lib.name_resolver import workout_names  # noqa: E402
+from lib.raw_logs import iter_logs  # noqa: E402
+
+RAW_LOGS_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'raw_logs'
+
+
+def parsed_equipment_keys(paths):
+    keys = {}
+    for path in paths:
+        for file_path in sorted(path.glob('*.json')) if path.is_dir() else [path]:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for key in workout_names(json.load(f))[1]:
+                    keys[key] = None
+    return list(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check raw logs against Postgres with batched lookups")
+    parser.add_argument('paths', nargs='*', type=Path, default=[RAW_LOGS_DIR],
+                        help="Raw log files or directories (default: data/raw_logs)")
+    parser.add_argument('--parsed', nargs='+', type=Path, default=[],
+                        help="Parsed workout JSON files/directories whose equipment keys to check")
+    parser.add_argument('--dsn', help="Postgres DSN (default: $DATABASE_URL or local Supabase)")
+    parser.add_argument('--pool-size', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Values per array call")
+    parser.add_argument('--json', action='store_true', help="Print one JSON line per session")
+    args = parser.parse_args()
+
+    records = list(iter_logs(args.paths))
+    equipment_keys = parsed_equipment_keys(args.parsed)
+    if not records and not equipment_keys:
+        print("❌ No sessions found", file=sys.stderr)
+        return 1
+
+    print(f"🚀 Preflight: {len(records)} sessions ({resolve_dsn(args.dsn).rsplit('@', 1)[-1]})\n", file=sys.stderr)
+    start = time.perf_counter()
+    try:
+        with ConnectionPool(args.dsn, size=args.pool_size) as pool:
+            lookups = BatchLookups(pool, args.batch_size)
+            athletes = lookups.athletes_by_name(record.athlete for record in records)
+            keys = [
+                (athletes[record.athlete]['athlete_id'], record.workout_date.isoformat(),
+                 calculate_checksum(record.raw_text))
+                if athletes.get(record.athlete) else None
+                for record in records
+            ]
+            duplicates = lookups.workout_duplicates(key for key in keys if key)
+            contexts = lookups.athlete_contexts(athlete['athlete_id'] for athlete in athletes.values() if athlete)
+            equipment = lookups.equipment(equipment_keys)
+            round_trips = pool.round_trips
+    except Exception as err:
+        print(f"❌ {err}", file=sys.stderr)
+        return 1
+    seconds = time.perf_counter() - start
+
+    sessions = Counter(record.athlete for record in records)
+    committed = Counter(record.athlete for record, key in zip(records, keys) if key and duplicates.get(key))
+    if args.json:
+        for record, key in zip(records, keys):
+            duplicate = duplicates.get(key) if key else None
+            print(json.dumps({
+                **record.to_dict(include_text=False),
+                'athlete_id': key[0] if key else None,
+                'content_hash': key[2] if key else None,
+                'existing_workout_id': duplicate['workout_id'] if duplicate else None,
+            }, ensure_ascii=False))
+    for name, count in sessions.items():
+        athlete = athletes.get(name)
+        if athlete is None:
+            print(f"  ❌ {name or '(no Workout Log header)'}: not registered ({count} sessions)")
+            continue
+        recent = (contexts.get(athlete['athlete_id']) or {}).get('recent_workouts') or []
+        print(f"  ✅ {name} → {athlete['athlete_id']}: {count} sessions, {committed[name]} already committed, "
+              f"{len(recent)} recent workouts")
+    unknown_equipment = [key for key, matches in equipment.items() if not matches]
+    for key in unknown_equipment:
+        print(f"  ❌ equipment_key {key}: not in the catalog")
+
+    per_call = len(sessions) + sum(1 for key in keys if key) + len(contexts) + len(equipment)
+    print(f"\n📊 {round_trips} round trips in {seconds:.2f}s (one call per name/session: {per_call})",
+          file=sys.stderr)
+    unknown_athletes = sum(1 for name in sessions if athletes.get(name) is None)
+    return 1 if unknown_athletes or unknown_equipment else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,148 +7,45 @@ Changes:
 1. Reorder item fields: item_sequence → exercise_name → equipment_key → prescription → performed
 2. Convert weight fields from simple values to {value, unit} structure
 
-Usage: python3 scripts/migrate_schema_v3.py
+Usage: python3 scripts/ops/migrate_schema_v3.py [--workers N] [--resume]
+
+Files are replaced atomically; completed files are journaled so an
+interrupted run can continue with --resume.
+
+To run the full v3.0 → v3.2 chain in one pass per file, use
+scripts/ops/migrate_workouts.py instead.
 """
 
+import argparse
 import json
 import os
+import sys
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict
 
-GOLDEN_SET_DIR = Path(__file__).parent.parent / 'data' / 'golden_set'
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.batch import ProgressJournal, atomic_write_text, map_files  # noqa: E402
+from lib.checksum import calculate_checksum  # noqa: E402
+from lib.schema_v3 import process_items, transform_weights  # noqa: E402
 
-# Weight field patterns to transform
-WEIGHT_FIELDS = [
-    'actual_weight_kg',
-    'target_weight_kg',
-    'target_weight_kg_min',
-    'target_weight_kg_max',
-    'target_load',
-    'actual_load'
-]
+GOLDEN_SET_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'golden_set'
+JOURNAL_NAME = '.migrate_schema_v3.progress.jsonl'
 
 # Statistics
 stats = {
     'files_processed': 0,
     'items_reordered': 0,
     'weight_fields_converted': 0,
+    'weight_fields_renamed': 0,
     'errors': []
 }
 
 
-def convert_weight(value: Any) -> Any:
-    """Convert weight value to new structure"""
-    if value is None:
-        return None
-    
-    # Handle arrays (multiple sets)
-    if isinstance(value, list):
-        return [{'value': v, 'unit': 'kg'} for v in value]
-    
-    # Handle single values
-    return {'value': value, 'unit': 'kg'}
-
-
-def transform_weights(obj: Any) -> None:
-    """Transform weight fields in an object"""
-    if not isinstance(obj, dict):
-        return
-    
-    # Handle min/max range pattern
-    if 'target_weight_kg_min' in obj and 'target_weight_kg_max' in obj:
-        obj['target_weight'] = {
-            'value_min': obj['target_weight_kg_min'],
-            'value_max': obj['target_weight_kg_max'],
-            'unit': 'kg'
-        }
-        del obj['target_weight_kg_min']
-        del obj['target_weight_kg_max']
-        stats['weight_fields_converted'] += 2
-    
-    # Handle individual weight fields
-    for field in WEIGHT_FIELDS:
-        if field in obj and field not in ['target_weight_kg_min', 'target_weight_kg_max']:
-            new_field = field.replace('_kg', '')
-            obj[new_field] = convert_weight(obj[field])
-            del obj[field]
-            stats['weight_fields_converted'] += 1
-    
-    # Recursively process nested objects and arrays
-    for key, value in list(obj.items()):
-        if isinstance(value, list):
-            for item in value:
-                transform_weights(item)
-        elif isinstance(value, dict):
-            transform_weights(value)
-
-
-def reorder_item_fields(item: Dict[str, Any]) -> Dict[str, Any]:
-    """Reorder fields in an item object"""
-    if not isinstance(item, dict):
-        return item
-    
-    # Check if this is an item with exercise fields
-    if not ('exercise_name' in item or 'exercises' in item or 'exercise_options' in item):
-        return item
-    
-    # Create new dict with desired field order
-    ordered_item = {}
-    
-    # 1. Sequence
-    if 'item_sequence' in item:
-        ordered_item['item_sequence'] = item['item_sequence']
-    
-    # 2. Identity fields (exercise_name, equipment_key)
-    if 'exercise_name' in item:
-        ordered_item['exercise_name'] = item['exercise_name']
-    if 'equipment_key' in item:
-        ordered_item['equipment_key'] = item['equipment_key']
-    
-    # 3. Prescription
-    if 'prescription' in item:
-        ordered_item['prescription'] = item['prescription']
-    
-    # 4. Performed
-    if 'performed' in item:
-        ordered_item['performed'] = item['performed']
-    
-    # 5. All other fields
-    for key, value in item.items():
-        if key not in ordered_item:
-            ordered_item[key] = value
-    
-    stats['items_reordered'] += 1
-    return ordered_item
-
-
-def process_items(obj: Any) -> None:
-    """Process all items in blocks recursively"""
-    if not isinstance(obj, dict):
-        return
-    
-    # If this is an items array, reorder each item
-    if 'items' in obj and isinstance(obj['items'], list):
-        obj['items'] = [reorder_item_fields(item) for item in obj['items']]
-        
-        # Process nested exercises/exercise_options
-        for item in obj['items']:
-            if 'exercises' in item and isinstance(item['exercises'], list):
-                item['exercises'] = [reorder_item_fields(ex) for ex in item['exercises']]
-            if 'exercise_options' in item and isinstance(item['exercise_options'], list):
-                item['exercise_options'] = [reorder_item_fields(ex) for ex in item['exercise_options']]
-    
-    # Recursively process nested structures
-    for key, value in obj.items():
-        if isinstance(value, list):
-            for item in value:
-                process_items(item)
-        elif isinstance(value, dict):
-            process_items(value)
-
-
-def process_file(filename: str) -> None:
-    """Process a single JSON file"""
+def process_file(filename: str) -> Dict[str, Any]:
+    """Process a single JSON file; returns its counts (safe to run in a worker process)"""
     filepath = GOLDEN_SET_DIR / filename
+    result = {'file': filename, 'counts': Counter(), 'checksum': None, 'error': None}
     
     try:
         print(f"Processing: {filename}")
@@ -158,26 +55,34 @@ def process_file(filename: str) -> None:
             data = json.load(f)
         
         # Step 1: Reorder fields
-        process_items(data)
+        process_items(data, result['counts'])
         
         # Step 2: Transform weights
-        transform_weights(data)
+        transform_weights(data, result['counts'])
         
-        # Write back with pretty formatting
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write('\n')
+        # Write back with pretty formatting (temp file + rename, never truncated)
+        content = json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+        atomic_write_text(filepath, content)
+        result['checksum'] = calculate_checksum(content)
         
-        stats['files_processed'] += 1
         print(f"✓ {filename} updated")
         
     except Exception as error:
-        stats['errors'].append({'file': filename, 'error': str(error)})
+        result['error'] = str(error)
         print(f"✗ Error processing {filename}: {error}")
+    
+    return result
 
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Schema v3.0 migration")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (1 = sequential, 0 = one per CPU)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip files completed by a previous (interrupted) run")
+    args = parser.parse_args()
+    
     print('🚀 Starting Schema v3.0 Migration\n')
     print('Changes:')
     print('  1. Reorder item fields (exercise_name, equipment_key before prescription/performed)')
@@ -188,17 +93,34 @@ def main():
     
     print(f'Found {len(files)} JSON files\n')
     
+    journal = ProgressJournal(GOLDEN_SET_DIR / JOURNAL_NAME, reset=not args.resume)
+    pending = [
+        name for name in files
+        if not journal.is_done(name, calculate_checksum((GOLDEN_SET_DIR / name).read_bytes()))
+    ]
+    if len(pending) < len(files):
+        print(f'Resuming: {len(files) - len(pending)} files already migrated\n')
+    
     # Process each file
-    for filename in files:
-        process_file(filename)
+    with journal:
+        for result in map_files(process_file, pending, args.workers or os.cpu_count() or 1):
+            if result['error']:
+                stats['errors'].append({'file': result['file'], 'error': result['error']})
+                continue
+            stats['files_processed'] += 1
+            stats['items_reordered'] += result['counts']['items_reordered']
+            stats['weight_fields_converted'] += result['counts']['weight_fields_converted']
+            stats['weight_fields_renamed'] += result['counts']['weight_fields_renamed']
+            journal.record(result['file'], result['checksum'])
     
     # Print summary
     print('\n' + '=' * 60)
     print('📊 Migration Summary')
     print('=' * 60)
-    print(f"Files processed: {stats['files_processed']}/{len(files)}")
+    print(f"Files processed: {stats['files_processed']}/{len(pending)}")
     print(f"Items reordered: {stats['items_reordered']}")
     print(f"Weight fields converted: {stats['weight_fields_converted']}")
+    print(f"Weight fields renamed: {stats['weight_fields_renamed']}")
     
     if stats['errors']:
         print(f"\n❌ Errors: {len(stats['errors'])}")
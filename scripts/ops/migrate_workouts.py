@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unified Workout JSON Migration
+
+Applies every pending schema step (v3.0 field order + weights, v3.2
+duration/distance units, circuit_config rest, equipment keys) in one
+read/parse/write pass per file, recording the resulting schema version in
+.schema_versions.jsonl next to the files. Replaces running
+migrate_schema_v3.py, upgrade_to_v3.2.py, fix_circuit_config_legacy.py and
+bulk_add_equipment.py one after another.
+
+Usage:
+    python3 scripts/ops/migrate_workouts.py                  # data/golden_set
+    python3 scripts/ops/migrate_workouts.py data/parsed --dry-run
+    python3 scripts/ops/migrate_workouts.py --list
+    python3 scripts/ops/migrate_workouts.py /srv/drafts --workers 0   # all cores
+    python3 scripts/ops/migrate_workouts.py data/parsed --metrics nightly.jsonl --profile .cache/profile
+
+Files are replaced atomically and the manifest is written as each file
+completes, so an interrupted run can just be started again: finished files
+are skipped. Files not in the manifest yet only get the steps whose legacy
+keys appear in them (v3.2 durations/distances, circuit rest); pass
+--assume-version (e.g. 2.0.0 for pre-v3 drafts) to run the chain from there.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.migrations import CURRENT_SCHEMA_VERSION, MIGRATIONS, MigrationRunner  # noqa: E402
+from lib.profiling import Timings, profiled, write_metrics  # noqa: E402
+
+GOLDEN_SET_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'golden_set'
+
+
+def collect_files(paths):
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(path.glob('*.json'))
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate workout JSON files to the current schema")
+    parser.add_argument('paths', nargs='*', type=Path, default=[GOLDEN_SET_DIR],
+                        help="JSON files or directories (default: data/golden_set)")
+    parser.add_argument('--to', dest='target', default=CURRENT_SCHEMA_VERSION,
+                        help=f"Target schema version (default: {CURRENT_SCHEMA_VERSION})")
+    parser.add_argument('--assume-version', metavar='VERSION',
+                        help="Schema version of files not yet in the manifest; without it they only get "
+                             "the steps whose legacy keys they contain")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (1 = sequential, 0 = one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=8,
+                        help="Files handed to a worker per task in parallel mode")
+    parser.add_argument('--dry-run', action='store_true', help="Transform but do not write files")
+    parser.add_argument('--list', action='store_true', help="List registered migration steps and exit")
+    parser.add_argument('--metrics', type=Path,
+                        help="Write per-step/per-file timings as JSON (*.jsonl appends, for nightly trends)")
+    parser.add_argument('--profile', type=Path, metavar='DIR',
+                        help="Run under cProfile (sequentially); write migrate_workouts.prof/.collapsed to DIR")
+    args = parser.parse_args()
+
+    if args.list:
+        for step in MIGRATIONS:
+            print(f"  {step.version:<8} {step.name:<28} {step.description}")
+        return 0
+
+    print(f"🚀 Migrating to schema v{args.target}{' (dry run)' if args.dry_run else ''}\n")
+
+    workers = args.workers or os.cpu_count() or 1
+    if args.profile and workers > 1:
+        print("⚠️  --profile runs sequentially (cProfile only sees this process)\n")
+        workers = 1
+    runner = MigrationRunner(target_version=args.target, dry_run=args.dry_run,
+                             assume_version=args.assume_version,
+                             workers=workers, chunk_size=args.chunk_size)
+    statuses = Counter()
+    counts = Counter()
+    timings = Timings()
+    per_file = []
+    errors = []
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+    with profiled(args.profile, 'migrate_workouts'):
+        for outcome in runner.run(collect_files(args.paths)):
+            statuses[outcome['status']] += 1
+            counts.update(outcome['counts'])
+            timings.merge(outcome['timings'])
+            file_timings = outcome['timings']
+            per_file.append({'file': outcome['file'], 'status': outcome['status'],
+                             'wall_ms': round(sum(file_timings.wall.values()) * 1000, 3),
+                             'cpu_ms': round(sum(file_timings.cpu.values()) * 1000, 3)})
+            name = Path(outcome['file']).name
+            if outcome['status'] == 'migrated':
+                print(f"✓ {name} ({', '.join(outcome['steps'])})")
+            elif outcome['status'] == 'error':
+                errors.append(outcome)
+                print(f"✗ {name}: {outcome['error']}")
+            elif outcome['steps'] or outcome['from_version'] is None:
+                print(f"  {name} unchanged, stamped v{args.target}")
+            else:
+                print(f"  {name} already at v{outcome['from_version']}")
+    elapsed, cpu_elapsed = time.perf_counter() - started, time.process_time() - cpu_started
+
+    print('\n' + '=' * 60)
+    print('📊 Migration Summary')
+    print('=' * 60)
+    print(f"Files migrated: {statuses['migrated']}")
+    print(f"Already current: {statuses['current']}")
+    for key, value in sorted(counts.items()):
+        print(f"{key.replace('_', ' ').capitalize()}: {value}")
+
+    if args.metrics or args.profile:
+        print(f"\n⏱️  {elapsed * 1000:.1f} ms wall, {cpu_elapsed * 1000:.1f} ms cpu (this process)")
+        for line in timings.report_lines('file:') + timings.report_lines('step:'):
+            print(f"   {line}")
+    if args.metrics:
+        write_metrics(args.metrics, 'migrate_workouts', {
+            'files': len(per_file), 'workers': workers, 'dry_run': args.dry_run,
+            'elapsed_sec': round(elapsed, 3), 'cpu_sec': round(cpu_elapsed, 3),
+            'statuses': dict(statuses), 'counts': dict(counts),
+            'timings': timings.to_dict(), 'per_file': per_file,
+        })
+        print(f"📈 Metrics written to: {args.metrics}")
+    if args.profile:
+        print(f"📈 Profile written to: {args.profile}/migrate_workouts.prof (+ .collapsed)")
+
+    if errors:
+        print(f"\n❌ Errors: {len(errors)}")
+        return 1
+    print('\n✅ Migration complete!')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
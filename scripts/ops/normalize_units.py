@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Normalize Measurement Units
+
+Converts every {value, unit} / {value_min, value_max, unit} measurement in
+workout JSON files to canonical units (kg, sec, m) with lib/unit_normalization.py,
+the factor table of zamm.extract_measurement_value. Files without a
+convertible unit are skipped on their raw bytes, and only files that changed
+are rewritten.
+
+Usage:
+    python3 scripts/ops/normalize_units.py                       # data/golden_set
+    python3 scripts/ops/normalize_units.py data/parsed --dry-run
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.batch import atomic_write_text  # noqa: E402
+from lib.unit_normalization import has_convertible_units, normalize_workouts  # noqa: E402
+
+GOLDEN_SET_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'golden_set'
+
+
+def expand(paths: List[Path]) -> List[Path]:
+    files = []
+    for path in paths:
+        files.extend(sorted(path.glob('*.json')) if path.is_dir() else [path])
+    return files
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Normalize measurement units to kg / sec / m")
+    parser.add_argument('paths', nargs='*', type=Path, default=[GOLDEN_SET_DIR],
+                        help="JSON files or directories (default: data/golden_set)")
+    parser.add_argument('--dry-run', action='store_true', help="Report changes without writing")
+    args = parser.parse_args()
+
+    files = expand(args.paths)
+    if not files:
+        print("❌ No JSON files found")
+        return 1
+
+    candidates, documents, errors = [], [], 0
+    for path in files:
+        try:
+            raw = path.read_bytes()
+            if has_convertible_units(raw):
+                documents.append(json.loads(raw))
+                candidates.append(path)
+        except (OSError, ValueError) as e:
+            print(f"  ❌ {path.name}: {e}")
+            errors += 1
+
+    counts = Counter()
+    start = time.perf_counter()
+    changed = normalize_workouts(documents, counts)
+    elapsed = time.perf_counter() - start
+
+    for index in changed:
+        path = candidates[index]
+        if not args.dry_run:
+            atomic_write_text(path, json.dumps(documents[index], indent=4, ensure_ascii=False))
+        print(f"  ✅ {path.name}")
+
+    print("=" * 60)
+    print(f"Files:        {len(files)} ({len(candidates)} with convertible units)")
+    print(f"Normalized:   {counts['measurements_normalized']} measurements in {len(changed)} files "
+          f"({elapsed * 1000:.1f} ms){' [dry run]' if args.dry_run else ''}")
+    if counts['values_skipped']:
+        print(f"⚠️  Skipped {counts['values_skipped']} non-numeric values - needs manual review")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Parse-Result Cache
+
+Looks up and stores parsed workout JSON by normalized workout text + active
+parser ruleset (lib/parse_cache.py), so a re-import or retry of a text that
+was already parsed skips the parser.
+
+Usage:
+    python3 scripts/ops/parse_cache.py get workout.txt > draft.json       # exit 1 on a miss
+    python3 scripts/ops/parse_cache.py put workout.txt draft.json
+    python3 scripts/ops/parse_cache.py seed data/golden_set               # every .txt with a .json next to it
+    python3 scripts/ops/parse_cache.py scan --uncached /tmp/todo.jsonl    # raw_logs sessions still to parse
+    python3 scripts/ops/parse_cache.py stats
+
+The ruleset version comes from zamm.get_active_ruleset() (--dsn /
+$DATABASE_URL) unless --ruleset is given. Entries from other rulesets are
+dropped when the cache is opened.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.db import connect  # noqa: E402
+from lib.parse_cache import (  # noqa: E402
+    DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, ParseCache, fetch_ruleset_version, text_key,
+)
+from lib.raw_logs import iter_logs  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_PATH = REPO_ROOT / '.cache' / 'parse_cache.sqlite'
+RAW_LOGS_DIR = REPO_ROOT / 'data' / 'raw_logs'
+
+
+def resolve_ruleset(args) -> str:
+    if args.ruleset:
+        return args.ruleset
+    conn = connect(args.dsn)
+    try:
+        return fetch_ruleset_version(conn)
+    finally:
+        conn.close()
+
+
+def cmd_get(cache: ParseCache, args) -> int:
+    payload = cache.get(args.text.read_text(encoding='utf-8'))
+    if payload is None:
+        print(f"❌ Not cached: {args.text.name}", file=sys.stderr)
+        return 1
+    print(json.dumps(payload, indent=4, ensure_ascii=False))
+    return 0
+
+
+def cmd_put(cache: ParseCache, args) -> int:
+    with open(args.json, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    key = cache.put(args.text.read_text(encoding='utf-8'), payload)
+    print(f"✅ Cached {args.text.name} ({key[:16]}...)", file=sys.stderr)
+    return 0
+
+
+def cmd_seed(cache: ParseCache, args) -> int:
+    entries = []
+    for directory in args.dirs:
+        for txt_path in sorted(directory.glob('*.txt')):
+            json_path = txt_path.with_suffix('.json')
+            if not json_path.exists():
+                continue
+            with open(json_path, 'r', encoding='utf-8') as f:
+                entries.append((text_key(txt_path.read_text(encoding='utf-8')), json.load(f)))
+    cache.put_many(entries)
+    print(f"✅ Cached {len(entries)} parsed workouts", file=sys.stderr)
+    return 0
+
+
+def cmd_scan(cache: ParseCache, args) -> int:
+    out = open(args.uncached, 'w', encoding='utf-8') if args.uncached else None
+    cached = uncached = 0
+    try:
+        for record in iter_logs(args.paths):
+            if cache.get(record.raw_text) is not None:
+                cached += 1
+                continue
+            uncached += 1
+            if out:
+                entry = record.to_dict()
+                entry['source_ref'] = record.source_ref
+                out.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    finally:
+        if out:
+            out.close()
+    print(f"📊 {cached} sessions cached, {uncached} still to parse"
+          + (f" (written to {args.uncached})" if args.uncached else ''), file=sys.stderr)
+    return 0
+
+
+def cmd_stats(cache: ParseCache, args) -> int:
+    print(json.dumps(cache.stats(), indent=2))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed cache of parsed workout JSON")
+    parser.add_argument('--cache', type=Path, default=DEFAULT_CACHE_PATH,
+                        help="SQLite file (default: .cache/parse_cache.sqlite)")
+    parser.add_argument('--ruleset', help="Parser ruleset version (default: zamm.get_active_ruleset())")
+    parser.add_argument('--dsn', help="Postgres DSN (default: $DATABASE_URL or local Supabase)")
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument('--max-bytes', type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument('--metrics', action='store_true', help="Print hit/miss/eviction counts on stderr")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    get = commands.add_parser('get', help="Print the cached JSON for a workout text (exit 1 on a miss)")
+    get.add_argument('text', type=Path)
+    get.set_defaults(run=cmd_get)
+
+    put = commands.add_parser('put', help="Store the parsed JSON for a workout text")
+    put.add_argument('text', type=Path)
+    put.add_argument('json', type=Path)
+    put.set_defaults(run=cmd_put)
+
+    seed = commands.add_parser('seed', help="Store every .txt/.json pair in the given directories")
+    seed.add_argument('dirs', nargs='+', type=Path)
+    seed.set_defaults(run=cmd_seed)
+
+    scan = commands.add_parser('scan', help="Count raw log sessions with and without a cached parse")
+    scan.add_argument('paths', nargs='*', type=Path, default=[RAW_LOGS_DIR])
+    scan.add_argument('--uncached', type=Path, help="Write the uncached sessions here as JSON Lines")
+    scan.set_defaults(run=cmd_scan)
+
+    stats = commands.add_parser('stats', help="Entries, bytes and bounds of the cache")
+    stats.set_defaults(run=cmd_stats)
+    args = parser.parse_args()
+
+    try:
+        ruleset = resolve_ruleset(args)
+    except Exception as err:
+        print(f"❌ Cannot determine the active ruleset (use --ruleset): {err}", file=sys.stderr)
+        return 1
+
+    with ParseCache(args.cache, ruleset, args.max_entries, args.max_bytes) as cache:
+        status = args.run(cache, args)
+        if args.metrics:
+            stats = cache.stats()
+            print(f"📊 Parse cache [{ruleset}]: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']}%), {stats['evictions']} evictions, {stats['size']} entries",
+                  file=sys.stderr)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
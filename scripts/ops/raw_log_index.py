@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Raw Log Index
+
+Builds the byte-offset sidecars (<log>.idx) for data/raw_logs and prints a
+single workout day straight from the log via mmap, without rescanning it.
+
+Usage:
+    python3 scripts/ops/raw_log_index.py --build                     # (re)index every log
+    python3 scripts/ops/raw_log_index.py itamar 2025-06-21           # print that day's text
+    python3 scripts/ops/raw_log_index.py "yarden frank" 2025-07-06 --title W1
+    python3 scripts/ops/raw_log_index.py itamar --list               # dates/titles/offsets
+
+Sidecars are rebuilt automatically when a log's size or mtime changes.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.raw_log_index import RawLogIndex, find_log, index_directory  # noqa: E402
+
+RAW_LOGS_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'raw_logs'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index raw athlete logs and fetch single workout days")
+    parser.add_argument('athlete', nargs='?', help="Athlete name or prefix (e.g. itamar, 'yarden frank')")
+    parser.add_argument('date', nargs='?', help="Workout date YYYY-MM-DD")
+    parser.add_argument('--title', help="Pick the session with this title when a day has several")
+    parser.add_argument('--list', action='store_true', help="List the athlete's indexed sessions")
+    parser.add_argument('--build', action='store_true', help="Rebuild the sidecar index for every log")
+    parser.add_argument('--dir', type=Path, default=RAW_LOGS_DIR, help="Raw log directory (default: data/raw_logs)")
+    args = parser.parse_args()
+
+    if args.build:
+        logs = index_directory([args.dir])
+        print(f"✅ Indexed {len(logs)} logs in {args.dir}", file=sys.stderr)
+        if not args.athlete:
+            return 0
+
+    if not args.athlete:
+        parser.error("athlete is required (or use --build)")
+
+    log = find_log(args.dir, args.athlete)
+    if log is None:
+        print(f"❌ No log for athlete '{args.athlete}' in {args.dir}", file=sys.stderr)
+        return 1
+
+    with RawLogIndex.open(log) as index:
+        if args.list or not args.date:
+            for entry in index.entries:
+                print(f"{entry.workout_date}  {entry.status or '-':<10} {entry.start:>8} {entry.length:>6}  {entry.title or ''}")
+            return 0
+
+        entries = index.find(args.date, title=args.title)
+        if not entries:
+            print(f"❌ No session on {args.date} in {log.name}", file=sys.stderr)
+            return 1
+        for position, entry in enumerate(entries):
+            if position:
+                print('\n-----\n')
+            print(index.read(entry, verify=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
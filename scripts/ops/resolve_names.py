@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Resolve Exercise / Equipment / Athlete Names
+
+Ranked canonical matches from the local catalog snapshot (lib/name_resolver.py)
+for names as they appear in logs: typos ("Dumbell", "riounds"), case and
+Unicode variants ("T‑Spine" with a non-breaking hyphen). One process, no
+per-name zamm.check_*_exists round trips.
+
+Usage:
+    python3 scripts/ops/resolve_names.py "Bulgarain split squat" "T‑Spine rotation"
+    python3 scripts/ops/resolve_names.py --kind equipment Dumbell "kettle bell"
+    python3 scripts/ops/resolve_names.py --workout data/golden_set/workout.json   # every name in a workout
+    python3 scripts/ops/resolve_names.py --json --limit 3 --min-score 0.8 "Deadlfit"
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.name_resolver import DEFAULT_SNAPSHOT, MAX_RESULTS, MIN_SCORE, load_resolver  # noqa: E402
+
+
+def print_matches(kind: str, results, as_json: bool) -> int:
+    unresolved = 0
+    for name, matches in results.items():
+        if not matches:
+            unresolved += 1
+        if as_json:
+            print(json.dumps({'kind': kind, 'name': name, 'matches': [m._asdict() for m in matches]},
+                             ensure_ascii=False))
+        elif not matches:
+            print(f"  ❌ {name}")
+        else:
+            best = matches[0]
+            others = ', '.join(f"{m.key} ({m.score:.2f})" for m in matches[1:])
+            mark = '✅' if best.score == 1.0 else '⚠️ '
+            print(f"  {mark} {name} → {best.key} ({best.score:.2f}, {best.via}: {best.name})"
+                  + (f"  also: {others}" if others else ''))
+    return unresolved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve names against the catalog snapshot")
+    parser.add_argument('names', nargs='*')
+    parser.add_argument('--kind', choices=('exercise', 'equipment', 'athlete'), default='exercise')
+    parser.add_argument('--workout', type=Path, help="Resolve every exercise name and equipment key in a workout JSON")
+    parser.add_argument('--snapshot', type=Path, default=DEFAULT_SNAPSHOT)
+    parser.add_argument('--limit', type=int, default=MAX_RESULTS)
+    parser.add_argument('--min-score', type=float, default=MIN_SCORE)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON Lines")
+    args = parser.parse_args()
+
+    if not args.names and not args.workout:
+        parser.error("give names or --workout")
+    if not args.snapshot.exists():
+        print(f"⚠️  {args.snapshot} not found (scripts/ops/export_catalog_snapshot.sh); "
+              f"only equipment keys from lib/equipment.py are known", file=sys.stderr)
+
+    resolver = load_resolver(args.snapshot)
+    options = {'limit': args.limit, 'min_score': args.min_score}
+    unresolved = 0
+    if args.workout:
+        try:
+            data = json.loads(args.workout.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as err:
+            print(f"❌ {args.workout}: {err}", file=sys.stderr)
+            return 1
+        for kind, results in resolver.resolve_workout(data, **options).items():
+            unresolved += print_matches(kind, results, args.json)
+    if args.names:
+        index = {'exercise': resolver.exercises, 'equipment': resolver.equipment, 'athlete': resolver.athletes}
+        unresolved += print_matches(args.kind, index[args.kind].search_many(args.names, **options), args.json)
+    return 1 if unresolved else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Split Raw Athlete Logs
+
+Streams the dated sessions of data/raw_logs/*.txt as JSON Lines (one
+workout per line: athlete, workout_date, title, status, byte offsets, body
+and raw_text), or writes each session to its own .txt file instead of
+cutting them by hand. Logs are read line by line, so memory use does not
+grow with the length of an athlete's history.
+
+Usage:
+    python3 scripts/ops/split_raw_logs.py                                 # all logs → stdout
+    python3 scripts/ops/split_raw_logs.py "data/raw_logs/Workout Log: itamar shatnay.txt" --since 2025-12-01
+    python3 scripts/ops/split_raw_logs.py --status completed --no-text -o /tmp/sessions.jsonl
+    python3 scripts/ops/split_raw_logs.py --write-dir /tmp/days          # <athlete>_<date>.txt per session
+
+Each JSONL line's raw_text is what zamm.import_raw_text_idempotent() takes
+as p_raw_text; source_ref (<file>#<start>-<end>) can go in p_source_ref.
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.raw_logs import filter_records, iter_logs, parse_iso_date  # noqa: E402
+
+RAW_LOGS_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'raw_logs'
+
+
+def session_filename(record, seen: Counter) -> str:
+    """<first name>_<YYYY-MM-DD>.txt, with _2, _3 ... for repeated days"""
+    athlete = (record.athlete or Path(record.source_file).stem).split()[0].lower()
+    stem = f"{athlete}_{record.workout_date.isoformat()}"
+    seen[stem] += 1
+    if seen[stem] > 1:
+        stem = f"{stem}_{seen[stem]}"
+    return f"{stem}.txt"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split raw athlete logs into one record per workout")
+    parser.add_argument('paths', nargs='*', type=Path, default=[RAW_LOGS_DIR],
+                        help="Log files or directories (default: data/raw_logs)")
+    parser.add_argument('--since', type=parse_iso_date, help="Only sessions on/after YYYY-MM-DD")
+    parser.add_argument('--until', type=parse_iso_date, help="Only sessions on/before YYYY-MM-DD")
+    parser.add_argument('--status', help="Only sessions with this status (completed, missed, pending)")
+    parser.add_argument('--no-text', action='store_true', help="Omit body/raw_text from JSONL output")
+    parser.add_argument('-o', '--output', type=Path, help="Write JSONL here instead of stdout")
+    parser.add_argument('--write-dir', type=Path, help="Write each session's raw_text to its own .txt file")
+    args = parser.parse_args()
+
+    records = filter_records(iter_logs(args.paths), since=args.since,
+                             until=args.until, status=args.status)
+
+    if args.write_dir:
+        args.write_dir.mkdir(parents=True, exist_ok=True)
+        seen = Counter()
+        written = 0
+        for record in records:
+            target = args.write_dir / session_filename(record, seen)
+            target.write_text(record.raw_text + '\n', encoding='utf-8')
+            written += 1
+        print(f"✅ Wrote {written} session files to {args.write_dir}", file=sys.stderr)
+        return 0
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    count = 0
+    try:
+        for record in records:
+            entry = record.to_dict(include_text=not args.no_text)
+            entry['source_ref'] = record.source_ref
+            out.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if args.output:
+            out.close()
+    print(f"✅ {count} sessions", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Training-Load Aggregates
+
+Keeps weekly sets / reps / tonnage / best e1RM / RPE per athlete and
+exercise in a local SQLite store (lib/training_load.py), updated only for
+workouts that are new or changed since the last run, and refreshes the
+Postgres mirror (zamm.agg_training_load_weekly) incrementally.
+
+Usage:
+    python3 scripts/ops/training_load.py add data/golden_set data/parsed     # new/changed files only
+    python3 scripts/ops/training_load.py show --athlete tomer --exercise Deadlift --since 2025-09-01
+    python3 scripts/ops/training_load.py remove tomer_2025-11-02_simple_deadlift.json
+    python3 scripts/ops/training_load.py stats
+    python3 scripts/ops/training_load.py refresh-db                          # workouts committed since last refresh
+    python3 scripts/ops/training_load.py refresh-db --workout-id <uuid> ...  # edited or deleted workouts
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.checksum import calculate_checksum  # noqa: E402
+from lib.db import connect  # noqa: E402
+from lib.training_load import TrainingLoadStore, refresh_database  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_STORE_PATH = REPO_ROOT / '.cache' / 'training_load.sqlite'
+GOLDEN_SET_DIR = REPO_ROOT / 'data' / 'golden_set'
+
+
+def iter_entries(paths):
+    for path in paths:
+        for file_path in sorted(path.glob('*.json')) if path.is_dir() else [path]:
+            raw = file_path.read_bytes()
+            yield file_path.name, calculate_checksum(raw), raw
+
+
+def cmd_add(store: TrainingLoadStore, args) -> int:
+    start = time.perf_counter()
+    changed = store.add_workouts(iter_entries(args.paths))
+    for source in changed:
+        print(f"  ✅ {source}")
+    print(f"📊 {len(changed)} workouts added or updated ({time.perf_counter() - start:.2f}s); "
+          f"{store.stats()['weekly']} weekly rows", file=sys.stderr)
+    return 0
+
+
+def cmd_remove(store: TrainingLoadStore, args) -> int:
+    removed = store.remove_workouts(args.sources)
+    print(f"📊 {removed} workouts removed", file=sys.stderr)
+    return 0 if removed == len(args.sources) else 1
+
+
+def cmd_show(store: TrainingLoadStore, args) -> int:
+    rows = store.weekly(athlete=args.athlete, exercise=args.exercise, since=args.since, until=args.until)
+    for row in rows:
+        if args.json:
+            print(json.dumps(row, ensure_ascii=False))
+            continue
+        e1rm = '-' if row['best_e1rm_kg'] is None else f"{row['best_e1rm_kg']:.1f}"
+        rpe = '-' if row['rpe_avg'] is None else f"{row['rpe_avg']:.1f}"
+        print(f"{row['week']}  {row['athlete'] or '-':<12} {row['exercise']:<28} {row['sets']:>4} sets "
+              f"{row['reps']:>6g} reps {row['tonnage_kg']:>10.1f} kg  e1RM {e1rm:>6}  RPE {rpe}")
+    return 0
+
+
+def cmd_stats(store: TrainingLoadStore, args) -> int:
+    print(json.dumps(store.stats(), indent=2))
+    return 0
+
+
+def cmd_refresh_db(store: TrainingLoadStore, args) -> int:
+    conn = connect(args.dsn)
+    try:
+        start = time.perf_counter()
+        refreshed = refresh_database(conn, args.workout_id)
+    finally:
+        conn.close()
+    print(f"✅ zamm.agg_training_load_weekly: {refreshed} rows refreshed ({time.perf_counter() - start:.2f}s)",
+          file=sys.stderr)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental per-athlete training-load aggregates")
+    parser.add_argument('--store', type=Path, default=DEFAULT_STORE_PATH,
+                        help="SQLite file (default: .cache/training_load.sqlite)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    add = commands.add_parser('add', help="Add new or changed workout JSON files/directories")
+    add.add_argument('paths', nargs='*', type=Path, default=[GOLDEN_SET_DIR])
+    add.set_defaults(run=cmd_add)
+
+    remove = commands.add_parser('remove', help="Remove workouts by file name")
+    remove.add_argument('sources', nargs='+')
+    remove.set_defaults(run=cmd_remove)
+
+    show = commands.add_parser('show', help="Print weekly aggregates")
+    show.add_argument('--athlete')
+    show.add_argument('--exercise')
+    show.add_argument('--since', help="First week containing this date (YYYY-MM-DD)")
+    show.add_argument('--until', help="Last week starting on or before this date (YYYY-MM-DD)")
+    show.add_argument('--json', action='store_true', help="Print rows as JSON Lines")
+    show.set_defaults(run=cmd_show)
+
+    stats = commands.add_parser('stats', help="Stored workouts, contributions and weekly rows")
+    stats.set_defaults(run=cmd_stats)
+
+    refresh = commands.add_parser('refresh-db', help="Run zamm.refresh_training_load_weekly() in Postgres")
+    refresh.add_argument('--dsn', help="Postgres DSN (default: $DATABASE_URL or local Supabase)")
+    refresh.add_argument('--workout-id', action='append', help="Refresh these (edited or deleted) workouts (default: new since last run)")
+    refresh.set_defaults(run=cmd_refresh_db)
+    args = parser.parse_args()
+
+    try:
+        with TrainingLoadStore(args.store) as store:
+            return args.run(store, args)
+    except (RuntimeError, ValueError) as err:
+        print(f"❌ {err}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Batched vs Single-Value Lookup Parity
+=====================================
+Checks the zamm.*_batch functions (migration 20260114100000) and
+lib/batch_lookups.py against the single-value functions on a local Postgres
+loaded from supabase/migrations:
+
+- check_athlete_by_name_batch  vs check_athlete_by_name per name
+- check_workout_duplicate_batch vs check_workout_duplicate per key
+- get_athlete_context_batch    vs get_athlete_context per id
+- check_equipment_exists_batch vs the catalog tables read directly (the
+  single-value check_equipment_exists reads columns the catalog does not have)
+
+Inputs are the stored athletes, workouts and equipment plus case/whitespace
+variants and unknown values. Then, on the same single pooled connection, a
+lookup that fails on the server (malformed uuid / date) must raise and the
+next lookups must still work: the statement prepared before the failure
+stays prepared. Read-only; every transaction is rolled back.
+
+Usage: python3 scripts/tests/validate_batch_lookups.py [--sample 200] [--dsn ...]
+"""
+
+import argparse
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.batch_lookups import BatchLookups  # noqa: E402
+from lib.db import ConnectionPool, connect, resolve_dsn  # noqa: E402
+
+# Colors
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+NC = '\033[0m'
+
+
+def sample_inputs(cur, sample: int):
+    cur.execute("SELECT full_name, athlete_id::text FROM zamm.lib_athletes ORDER BY full_name LIMIT %s", (sample,))
+    athletes = cur.fetchall()
+    names = [name for name, _ in athletes]
+    names += [f"  {name.upper()} " for name in names[:20]] + ['Nobody Registered', '']
+    athlete_ids = [athlete_id for _, athlete_id in athletes] + [str(uuid.uuid4())]
+
+    cur.execute("SELECT athlete_id::text, workout_date::text, content_hash_ref FROM zamm.workout_main "
+                "WHERE athlete_id IS NOT NULL AND workout_date IS NOT NULL AND content_hash_ref IS NOT NULL "
+                "ORDER BY created_at DESC LIMIT %s", (sample,))
+    keys = [tuple(row) for row in cur.fetchall()]
+    keys += [(athlete_id, workout_date, '0' * 64) for athlete_id, workout_date, _ in keys[:20]]
+    keys += [(str(uuid.uuid4()), '2025-01-01', 'f' * 64)]
+
+    cur.execute("SELECT equipment_key, display_name FROM zamm.lib_equipment_catalog ORDER BY equipment_key LIMIT %s",
+                (sample,))
+    equipment = [value for row in cur.fetchall() for value in row]
+    cur.execute("SELECT alias FROM zamm.lib_equipment_aliases ORDER BY alias LIMIT %s", (sample,))
+    equipment += [row[0] for row in cur.fetchall()]
+    equipment += [name.upper() for name in equipment[:20]] + ['unknown_gear']
+    return names, athlete_ids, keys, equipment
+
+
+def expected_equipment(cur, names):
+    cur.execute("SELECT equipment_key, display_name, category FROM zamm.lib_equipment_catalog")
+    catalog = cur.fetchall()
+    cur.execute("SELECT alias, equipment_key FROM zamm.lib_equipment_aliases")
+    aliases = cur.fetchall()
+    by_key = {row[0]: row for row in catalog}
+    expected = {}
+    for name in names:
+        lowered = name.lower()
+        exact = sorted((row[0], row[1], row[2], 'exact') for row in catalog
+                       if row[1].lower() == lowered or row[0].lower() == lowered)
+        alias = sorted(by_key[key][:3] + ('alias',) for text, key in aliases
+                       if text.lower() == lowered and key in by_key)
+        expected[name] = (exact + alias)[:5]
+    return expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sample', type=int, default=200, help="Stored rows per kind (default: 200)")
+    parser.add_argument('--dsn', help="Postgres DSN (default: $DATABASE_URL or local Supabase)")
+    args = parser.parse_args()
+
+    print(f"🚀 Batched lookup parity ({resolve_dsn(args.dsn).rsplit('@', 1)[-1]})\n")
+    try:
+        conn = connect(args.dsn)
+    except Exception as err:
+        print(f"❌ Cannot connect: {err}")
+        return 1
+
+    mismatches = []
+    try:
+        cur = conn.cursor()
+        names, athlete_ids, keys, equipment = sample_inputs(cur, args.sample)
+
+        single_athletes = {}
+        for name in dict.fromkeys(names):
+            cur.execute("SELECT found, athlete_id::text, full_name, email, is_active "
+                        "FROM zamm.check_athlete_by_name(%s)", (name,))
+            single_athletes[name] = tuple(cur.fetchone())
+        cur.execute("SELECT input_name, found, athlete_id::text, full_name, email, is_active "
+                    "FROM zamm.check_athlete_by_name_batch(%s::text[]) ORDER BY ordinal", (names,))
+        for row in cur.fetchall():
+            if tuple(row[1:]) != single_athletes[row[0]]:
+                mismatches.append(f"athlete {row[0]!r}: batch {row[1:]} != single {single_athletes[row[0]]}")
+
+        single_duplicates = {}
+        for key in keys:
+            cur.execute("SELECT found, workout_id::text, created_at, session_title "
+                        "FROM zamm.check_workout_duplicate(%s::uuid, %s::date, %s)", key)
+            single_duplicates[key] = tuple(cur.fetchone())
+        cur.execute("SELECT ordinal, found, workout_id::text, created_at, session_title "
+                    "FROM zamm.check_workout_duplicate_batch(%s::uuid[], %s::date[], %s::text[])",
+                    tuple(list(column) for column in zip(*keys)))
+        for row in cur.fetchall():
+            key = keys[row[0] - 1]
+            if tuple(row[1:]) != single_duplicates[key]:
+                mismatches.append(f"duplicate {key}: batch {row[1:]} != single {single_duplicates[key]}")
+
+        single_contexts = {}
+        for athlete_id in athlete_ids:
+            cur.execute("SELECT zamm.get_athlete_context(%s::uuid)", (athlete_id,))
+            single_contexts[athlete_id] = cur.fetchone()[0]
+        cur.execute("SELECT athlete_id::text, context FROM zamm.get_athlete_context_batch(%s::uuid[])",
+                    (athlete_ids,))
+        batch_contexts = dict(cur.fetchall())
+        for athlete_id in athlete_ids:
+            if batch_contexts.get(athlete_id) != single_contexts[athlete_id]:
+                mismatches.append(f"context {athlete_id}: batch differs from get_athlete_context")
+
+        expected = expected_equipment(cur, equipment)
+        conn.rollback()
+
+        # Same answers through the pooled, prepared-statement client
+        with ConnectionPool(args.dsn, size=1) as pool:
+            lookups = BatchLookups(pool, batch_size=50)
+            athletes = lookups.athletes_by_name(names)
+            for name in dict.fromkeys(names):
+                found, athlete_id = single_athletes[name][:2]
+                got = athletes.get(name)
+                if (got['athlete_id'] if got else None) != (athlete_id if found else None):
+                    mismatches.append(f"BatchLookups.athletes_by_name {name!r}: {got}")
+            duplicates = lookups.workout_duplicates(keys)
+            for key in keys:
+                got = duplicates.get(key)
+                found, workout_id = single_duplicates[key][:2]
+                if (got['workout_id'] if got else None) != (workout_id if found else None):
+                    mismatches.append(f"BatchLookups.workout_duplicates {key}: {got}")
+            contexts = lookups.athlete_contexts(athlete_ids)
+            for athlete_id in athlete_ids:
+                if contexts.get(athlete_id) != single_contexts[athlete_id]:
+                    mismatches.append(f"BatchLookups.athlete_contexts {athlete_id}: differs")
+            for name, matches in lookups.equipment(equipment).items():
+                got = [(m['equipment_key'], m['display_name'], m['category'], m['matched_via']) for m in matches]
+                if got != expected[name]:
+                    mismatches.append(f"equipment {name!r}: batch {got} != catalog {expected[name]}")
+            round_trips = pool.round_trips
+
+        # Server-side errors on a fresh connection: EXECUTE fails right after PREPARE
+        with ConnectionPool(args.dsn, size=1) as pool:
+            lookups = BatchLookups(pool, batch_size=50)
+            bad_calls = [
+                ('athlete_contexts', lambda: lookups.athlete_contexts(['not-a-uuid'])),
+                ('workout_duplicates', lambda: lookups.workout_duplicates([(athlete_ids[0], '2025-13-45', 'f' * 64)])),
+            ]
+            for label, call in bad_calls:
+                try:
+                    call()
+                    mismatches.append(f"BatchLookups.{label} with malformed input did not raise")
+                except Exception:
+                    pass
+                try:
+                    if lookups.athlete_contexts(athlete_ids[:1]).get(athlete_ids[0]) != single_contexts[athlete_ids[0]]:
+                        mismatches.append(f"BatchLookups.athlete_contexts after failed {label}: differs")
+                    got = lookups.workout_duplicates(keys[:1]).get(keys[0])
+                    if (got['workout_id'] if got else None) != single_duplicates[keys[0]][1]:
+                        mismatches.append(f"BatchLookups.workout_duplicates after failed {label}: {got}")
+                except Exception as err:
+                    mismatches.append(f"pooled connection unusable after failed {label}: {err}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+    for mismatch in mismatches:
+        print(f"{RED}✗{NC} {mismatch}")
+    print(f"\n📊 {len(names)} names, {len(keys)} duplicate keys, {len(athlete_ids)} athlete ids, "
+          f"{len(equipment)} equipment names; BatchLookups used {round_trips} round trips")
+    if mismatches:
+        print(f"{RED}❌ {len(mismatches)} mismatches{NC}")
+        return 1
+    print(f"{GREEN}✅ Batched lookups match the single-value functions{NC}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,11 +6,22 @@ Purpose: Comprehensive validation of parser outputs
 Date: January 10, 2026
 """
 
+import argparse
+import inspect
 import json
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib import rule_engine  # noqa: E402
+from lib.checksum import calculate_checksum, combined_checksum  # noqa: E402
+from lib.profiling import Timings, profiled, write_metrics  # noqa: E402
+from lib.rule_engine import InstrumentedRuleEngine, Rule, RuleEngine, WORKOUT  # noqa: E402
+from lib.validation_cache import ValidationCache  # noqa: E402
 
 # Colors
 RED = '\033[0;31m'
@@ -24,6 +35,8 @@ class ValidationStats:
         self.passed = 0
         self.failed = 0
         self.warnings = 0
+        # Wall/CPU per file phase and (with --metrics/--profile) per rule
+        self.timings = Timings()
     
     def add_pass(self):
         self.total += 1
@@ -36,231 +49,496 @@ class ValidationStats:
     def add_warning(self):
         self.warnings += 1
     
+    def merge(self, other: 'ValidationStats'):
+        self.total += other.total
+        self.passed += other.passed
+        self.failed += other.failed
+        self.warnings += other.warnings
+        self.timings.merge(other.timings)
+    
     @property
     def pass_rate(self):
         return (self.passed / self.total * 100) if self.total > 0 else 0
+    
+    @classmethod
+    def from_dict(cls, counts: Dict) -> 'ValidationStats':
+        stats = cls()
+        stats.total = counts['total']
+        stats.passed = counts['passed']
+        stats.failed = counts['failed']
+        stats.warnings = counts['warnings']
+        return stats
+    
+    def to_dict(self) -> Dict:
+        return {
+            'total': self.total,
+            'passed': self.passed,
+            'failed': self.failed,
+            'warnings': self.warnings,
+            'pass_rate': round(self.pass_rate, 2)
+        }
+
+# Fields that must hold numbers (or {value, unit} objects for weights)
+NUMERIC_FIELDS = frozenset({
+    'target_reps', 'target_sets', 'actual_reps', 'actual_sets',
+    'target_duration_sec', 'actual_duration_sec', 'target_weight',
+    'actual_weight', 'rpe', 'rir', 'item_sequence'
+})
+
+# 17 standard block types
+VALID_BLOCK_CODES = frozenset({
+    'WU', 'ACT', 'MOB',  # PREPARATION
+    'STR', 'ACC', 'HYP',  # STRENGTH
+    'PWR', 'WL',  # POWER
+    'SKILL', 'GYM',  # SKILL
+    'METCON', 'INTV', 'SS', 'HYROX',  # CONDITIONING
+    'CD', 'STRETCH', 'BREATH'  # RECOVERY
+})
+
+RAW_FIELDS = frozenset({'reps', 'sets', 'weight', 'duration'})
+
+
+class StructureRule(Rule):
+    """Validate JSON structure against CANONICAL_JSON_SCHEMA"""
+    name = 'structure'
+    kinds = (WORKOUT,)
+
+    def begin(self):
+        super().begin()
+        self.checks = []
+        self._seen = False
+
+    def visit(self, node, ctx):
+        self._seen = True
+        self.check(node)
+
+    def finish(self):
+        # Root was not an object - report both fields as missing
+        if not self._seen:
+            self.check({})
+
+    def check(self, data):
+        # Test 1: Required top-level fields
+        if 'workout_date' not in data:
+            self.fail("Missing 'workout_date' field")
+        elif not isinstance(data['workout_date'], str):
+            self.fail("'workout_date' must be string")
+        else:
+            self.checks.append(True)
+
+        # Test 2: Sessions array
+        if 'sessions' not in data:
+            self.fail("Missing 'sessions' array")
+        elif not isinstance(data['sessions'], list):
+            self.fail("'sessions' must be array")
+        elif len(data['sessions']) == 0:
+            self.fail("'sessions' array is empty")
+        else:
+            self.checks.append(True)
+
+    def fail(self, message):
+        self.report(message)
+        self.checks.append(False)
+
+
+class TypeSafetyRule(Rule):
+    """Check for string values in numeric fields"""
+    name = 'type_safety'
+    fields = NUMERIC_FIELDS
+
+    def visit_field(self, node, key, value, ctx):
+        if value is None:
+            return
+        # Check for weight objects (v3.0 structure)
+        if key in ('target_weight', 'actual_weight') and isinstance(value, dict):
+            if 'value' in value and not isinstance(value['value'], (int, float)):
+                self.report(f"{ctx.child_path(key)}.value is string: {value['value']}")
+        elif not isinstance(value, (int, float)):
+            self.report(f"{ctx.child_path(key)} is string: {value}")
+
+
+class BlockCodeRule(Rule):
+    """Validate block codes against 17 standard types"""
+    name = 'block_codes'
+    fields = frozenset({'block_code'})
+
+    def visit_field(self, node, key, value, ctx):
+        if value and value not in VALID_BLOCK_CODES:
+            self.report(f"{ctx.path}: Invalid block_code '{value}'")
+
+
+class EquipmentCoverageRule(Rule):
+    """Count items with/without equipment_key"""
+    name = 'equipment'
+    fields = frozenset({'items'})
+
+    def begin(self):
+        super().begin()
+        self.total_items = 0
+        self.items_with_equipment = 0
+
+    def visit_field(self, node, key, value, ctx):
+        if not isinstance(value, list):
+            return
+        for item in value:
+            if isinstance(item, dict) and 'exercise_name' in item:
+                self.total_items += 1
+                if item.get('equipment_key'):
+                    self.items_with_equipment += 1
+
+
+class SeparationRule(Rule):
+    """Check for mixed prescription/performance data"""
+    name = 'separation'
+
+    def visit(self, node, ctx):
+        if 'prescription' in node or 'performed' in node:
+            return
+        raw_fields = node.keys() & RAW_FIELDS
+        if raw_fields:
+            self.report(f"{ctx.path}: Has raw fields {raw_fields} without prescription/performed wrapper")
+
+
+RULES = [StructureRule, TypeSafetyRule, BlockCodeRule, EquipmentCoverageRule, SeparationRule]
+
+ENGINE = RuleEngine([rule() for rule in RULES])
+
+
+def enable_instrumentation():
+    """Swap in an engine that records per-rule time and node counts into each file's stats"""
+    global ENGINE
+    if not isinstance(ENGINE, InstrumentedRuleEngine):
+        ENGINE = InstrumentedRuleEngine([rule() for rule in RULES])
+
+DEFAULT_CACHE_PATH = Path(".cache/validation_cache.sqlite")
+
+
+def ruleset_checksum() -> str:
+    """Fingerprint of the rule set; cached results are only reused while it is unchanged"""
+    parts = [
+        ','.join(sorted(NUMERIC_FIELDS)),
+        ','.join(sorted(VALID_BLOCK_CODES)),
+        ','.join(sorted(RAW_FIELDS)),
+    ]
+    for rule in RULES:
+        try:
+            parts.append(inspect.getsource(rule))
+        except (OSError, TypeError):
+            parts.append(rule.__qualname__)
+    parts.append(inspect.getsource(_run_checks))
+    parts.append(inspect.getsource(rule_engine))
+    return combined_checksum(parts)
+
+
+def _run_rule(rule: Rule, data: Any, path: str = "") -> Rule:
+    return RuleEngine([rule]).run(data, path)[rule.name]
+
 
 def validate_json_structure(data: Dict, filename: str, stats: ValidationStats) -> List[str]:
     """Validate JSON structure against CANONICAL_JSON_SCHEMA"""
-    issues = []
-    
-    # Test 1: Required top-level fields
-    if 'workout_date' not in data:
-        issues.append("Missing 'workout_date' field")
-        stats.add_fail()
-    elif not isinstance(data['workout_date'], str):
-        issues.append("'workout_date' must be string")
-        stats.add_fail()
-    else:
-        stats.add_pass()
-    
-    # Test 2: Sessions array
-    if 'sessions' not in data:
-        issues.append("Missing 'sessions' array")
-        stats.add_fail()
-    elif not isinstance(data['sessions'], list):
-        issues.append("'sessions' must be array")
-        stats.add_fail()
-    elif len(data['sessions']) == 0:
-        issues.append("'sessions' array is empty")
-        stats.add_fail()
-    else:
-        stats.add_pass()
-    
-    return issues
+    rule = StructureRule()
+    rule.begin()
+    rule.check(data)
+    for passed in rule.checks:
+        stats.add_pass() if passed else stats.add_fail()
+    return rule.issues
 
 def check_type_safety(obj: Any, path: str = "") -> List[str]:
     """Recursively check for string values in numeric fields"""
-    issues = []
-    
-    if isinstance(obj, dict):
-        numeric_fields = [
-            'target_reps', 'target_sets', 'actual_reps', 'actual_sets',
-            'target_duration_sec', 'actual_duration_sec', 'target_weight',
-            'actual_weight', 'rpe', 'rir', 'item_sequence'
-        ]
-        
-        for key, value in obj.items():
-            current_path = f"{path}.{key}" if path else key
-            
-            if key in numeric_fields and value is not None:
-                # Check for weight objects (v3.0 structure)
-                if key in ['target_weight', 'actual_weight'] and isinstance(value, dict):
-                    if 'value' in value and not isinstance(value['value'], (int, float)):
-                        issues.append(f"{current_path}.value is string: {value['value']}")
-                elif not isinstance(value, (int, float)):
-                    issues.append(f"{current_path} is string: {value}")
-            
-            # Recurse
-            if isinstance(value, (dict, list)):
-                issues.extend(check_type_safety(value, current_path))
-    
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            issues.extend(check_type_safety(item, f"{path}[{i}]"))
-    
-    return issues
+    return _run_rule(TypeSafetyRule(), obj, path).issues
 
 def check_block_codes(data: Dict) -> List[str]:
     """Validate block codes against 17 standard types"""
-    valid_codes = {
-        'WU', 'ACT', 'MOB',  # PREPARATION
-        'STR', 'ACC', 'HYP',  # STRENGTH
-        'PWR', 'WL',  # POWER
-        'SKILL', 'GYM',  # SKILL
-        'METCON', 'INTV', 'SS', 'HYROX',  # CONDITIONING
-        'CD', 'STRETCH', 'BREATH'  # RECOVERY
-    }
-    
-    issues = []
-    
-    def check_recursive(obj, path=""):
-        if isinstance(obj, dict):
-            if 'block_code' in obj:
-                code = obj['block_code']
-                if code and code not in valid_codes:
-                    issues.append(f"{path}: Invalid block_code '{code}'")
-            
-            for key, value in obj.items():
-                check_recursive(value, f"{path}.{key}" if path else key)
-        
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                check_recursive(item, f"{path}[{i}]")
-    
-    check_recursive(data)
-    return issues
+    return _run_rule(BlockCodeRule(), data).issues
 
 def count_equipment_keys(data: Dict) -> tuple:
     """Count items with/without equipment_key"""
-    total_items = 0
-    items_with_equipment = 0
-    
-    def count_recursive(obj):
-        nonlocal total_items, items_with_equipment
-        
-        if isinstance(obj, dict):
-            if 'items' in obj and isinstance(obj['items'], list):
-                for item in obj['items']:
-                    if isinstance(item, dict) and 'exercise_name' in item:
-                        total_items += 1
-                        if 'equipment_key' in item and item['equipment_key']:
-                            items_with_equipment += 1
-            
-            for value in obj.values():
-                if isinstance(value, (dict, list)):
-                    count_recursive(value)
-        
-        elif isinstance(obj, list):
-            for item in obj:
-                count_recursive(item)
-    
-    count_recursive(data)
-    return items_with_equipment, total_items
+    rule = _run_rule(EquipmentCoverageRule(), data)
+    return rule.items_with_equipment, rule.total_items
 
 def check_prescription_performance_separation(data: Dict) -> List[str]:
     """Check for mixed prescription/performance data"""
-    issues = []
-    
-    def check_recursive(obj, path=""):
-        if isinstance(obj, dict):
-            # Check if object has both prescription/performed AND raw fields
-            has_prescription = 'prescription' in obj or 'performed' in obj
-            raw_fields = {'reps', 'sets', 'weight', 'duration'} & set(obj.keys())
-            
-            if raw_fields and not has_prescription:
-                issues.append(f"{path}: Has raw fields {raw_fields} without prescription/performed wrapper")
-            
-            for key, value in obj.items():
-                if isinstance(value, (dict, list)):
-                    check_recursive(value, f"{path}.{key}" if path else key)
-        
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                check_recursive(item, f"{path}[{i}]")
+    return _run_rule(SeparationRule(), data).issues
+
+def _silent(*args, **kwargs):
+    pass
+
+def _run_checks(data: Any, results: Dict, stats: ValidationStats, log) -> None:
+    """Run the rule set over parsed JSON, filling results and stats"""
+    log(f"  {GREEN}✓{NC} Valid JSON structure")
+    stats.add_pass()
+    
+    # All checks share a single traversal of the tree
+    rules = ENGINE.run(data)
+    if isinstance(ENGINE, InstrumentedRuleEngine):
+        stats.timings.merge(ENGINE.drain())
+
+    # Structural validation
+    structure = rules['structure']
+    for passed in structure.checks:
+        stats.add_pass() if passed else stats.add_fail()
+    if structure.issues:
+        results['issues'].extend(structure.issues)
+        results['valid'] = False
+    else:
+        log(f"  {GREEN}✓{NC} Required fields present")
     
-    check_recursive(data)
-    return issues
+    # Type safety
+    type_issues = rules['type_safety'].issues
+    if type_issues:
+        log(f"  {RED}✗{NC} Type safety: Found {len(type_issues)} string numbers")
+        results['issues'].extend(type_issues)
+        results['valid'] = False
+        stats.add_fail()
+    else:
+        log(f"  {GREEN}✓{NC} Type safety: All numbers are numeric")
+        stats.add_pass()
+    
+    # Block codes
+    block_issues = rules['block_codes'].issues
+    if block_issues:
+        log(f"  {RED}✗{NC} Block codes: {len(block_issues)} invalid")
+        results['issues'].extend(block_issues)
+        results['valid'] = False
+        stats.add_fail()
+    else:
+        log(f"  {GREEN}✓{NC} Block codes: All valid")
+        stats.add_pass()
+    
+    # Equipment keys (v3.0)
+    equipment = rules['equipment']
+    with_equipment, total_items = equipment.items_with_equipment, equipment.total_items
+    if total_items == 0:
+        log(f"  {YELLOW}⚠{NC} No exercise items found")
+        stats.add_warning()
+    elif with_equipment == total_items:
+        log(f"  {GREEN}✓{NC} Equipment keys: {with_equipment}/{total_items}")
+        stats.add_pass()
+    else:
+        log(f"  {YELLOW}⚠{NC} Equipment keys: {with_equipment}/{total_items} (partial)")
+        stats.add_warning()
+        stats.add_pass()
+    
+    # Prescription/Performance separation
+    separation_issues = rules['separation'].issues
+    if separation_issues:
+        log(f"  {YELLOW}⚠{NC} Separation: {len(separation_issues)} potential issues")
+        results['issues'].extend(separation_issues)
+        stats.add_warning()
+
+def _cached_result(filepath: Path, checksum: str, cache: ValidationCache) -> Optional[Tuple[Dict, ValidationStats]]:
+    """Previous result for identical file content under the current rule set"""
+    cached = cache.get(checksum)
+    if cached is None:
+        return None
+    results = {
+        'filename': filepath.name,
+        'path': str(filepath),
+        'valid': cached['valid'],
+        'issues': cached['issues'],
+        'checksum': checksum,
+        'cached': True,
+        'duration_ms': 0.0,
+        'cpu_ms': 0.0
+    }
+    return results, ValidationStats.from_dict(cached['stats'])
+
+def _cache_entry(results: Dict, stats: ValidationStats) -> Tuple[str, Dict]:
+    return results['checksum'], {
+        'valid': results['valid'],
+        'issues': results['issues'],
+        'stats': stats.to_dict()
+    }
 
-def validate_file(filepath: Path, stats: ValidationStats) -> Dict:
-    """Validate a single JSON file"""
+def validate_file(filepath: Path, stats: ValidationStats, quiet: bool = False,
+                  cache: Optional[ValidationCache] = None) -> Dict:
+    """Validate a single JSON file (reusing a cached result if the content is unchanged)"""
+    log = _silent if quiet else print
+    start = time.perf_counter()
+    cpu_start = time.process_time()
     results = {
         'filename': filepath.name,
+        'path': str(filepath),
         'valid': True,
         'issues': []
     }
+    file_stats = ValidationStats()
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        print(f"  {GREEN}✓{NC} Valid JSON structure")
-        stats.add_pass()
-        
-        # Structural validation
-        structure_issues = validate_json_structure(data, filepath.name, stats)
-        if structure_issues:
-            results['issues'].extend(structure_issues)
-            results['valid'] = False
-        else:
-            print(f"  {GREEN}✓{NC} Required fields present")
-        
-        # Type safety
-        type_issues = check_type_safety(data)
-        if type_issues:
-            print(f"  {RED}✗{NC} Type safety: Found {len(type_issues)} string numbers")
-            results['issues'].extend(type_issues)
-            results['valid'] = False
-            stats.add_fail()
-        else:
-            print(f"  {GREEN}✓{NC} Type safety: All numbers are numeric")
-            stats.add_pass()
-        
-        # Block codes
-        block_issues = check_block_codes(data)
-        if block_issues:
-            print(f"  {RED}✗{NC} Block codes: {len(block_issues)} invalid")
-            results['issues'].extend(block_issues)
-            results['valid'] = False
-            stats.add_fail()
-        else:
-            print(f"  {GREEN}✓{NC} Block codes: All valid")
-            stats.add_pass()
+        with file_stats.timings.section('file:read'):
+            raw = filepath.read_bytes()
+            results['checksum'] = calculate_checksum(raw)
         
-        # Equipment keys (v3.0)
-        with_equipment, total_items = count_equipment_keys(data)
-        if total_items == 0:
-            print(f"  {YELLOW}⚠{NC} No exercise items found")
-            stats.add_warning()
-        elif with_equipment == total_items:
-            print(f"  {GREEN}✓{NC} Equipment keys: {with_equipment}/{total_items}")
-            stats.add_pass()
-        else:
-            print(f"  {YELLOW}⚠{NC} Equipment keys: {with_equipment}/{total_items} (partial)")
-            stats.add_warning()
-            stats.add_pass()
+        hit = _cached_result(filepath, results['checksum'], cache) if cache else None
+        if hit:
+            log(f"  {GREEN}✓{NC} Unchanged since last run (cached result)")
+            results, file_stats = hit
+            stats.merge(file_stats)
+            return results
         
-        # Prescription/Performance separation
-        separation_issues = check_prescription_performance_separation(data)
-        if separation_issues:
-            print(f"  {YELLOW}⚠{NC} Separation: {len(separation_issues)} potential issues")
-            results['issues'].extend(separation_issues)
-            stats.add_warning()
+        with file_stats.timings.section('file:load'):
+            workout = json.loads(raw)
+        with file_stats.timings.section('file:checks'):
+            _run_checks(workout, results, file_stats, log)
         
     except json.JSONDecodeError as e:
-        print(f"  {RED}✗{NC} Invalid JSON: {e}")
+        log(f"  {RED}✗{NC} Invalid JSON: {e}")
         results['valid'] = False
         results['issues'].append(f"JSON parse error: {e}")
-        stats.add_fail()
+        file_stats.add_fail()
     except Exception as e:
-        print(f"  {RED}✗{NC} Error: {e}")
+        log(f"  {RED}✗{NC} Error: {e}")
         results['valid'] = False
         results['issues'].append(f"Validation error: {e}")
-        stats.add_fail()
+        file_stats.add_fail()
     
+    stats.merge(file_stats)
+    results['duration_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    results['cpu_ms'] = round((time.process_time() - cpu_start) * 1000, 3)
+    if cache and 'checksum' in results:
+        cache.put(*_cache_entry(results, file_stats))
     return results
 
-def main():
+def _validate_in_worker(filepath: str) -> Tuple[Dict, ValidationStats]:
+    """Process-pool entry point: validate one file with private stats"""
+    stats = ValidationStats()
+    return validate_file(Path(filepath), stats, quiet=True), stats
+
+def _init_worker(instrument: bool) -> None:
+    if instrument:
+        enable_instrumentation()
+
+def validate_parallel(files: List[Path], workers: int, chunk_size: int,
+                      cache: Optional[ValidationCache] = None) -> Tuple[List[Dict], ValidationStats]:
+    """Fan validate_file() out across a process pool and aggregate the stats"""
+    stats = ValidationStats()
+    by_path = {}
+    pending = []
+    
+    # Cache lookups stay in the parent so workers never contend on SQLite
+    for f in files:
+        hit = None
+        if cache:
+            try:
+                hit = _cached_result(f, calculate_checksum(f.read_bytes()), cache)
+            except OSError:
+                pass
+        if hit:
+            by_path[str(f)] = hit
+        else:
+            pending.append(str(f))
+    
+    fresh = []
+    instrument = isinstance(ENGINE, InstrumentedRuleEngine)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(instrument,)) as pool:
+        for path, (result, worker_stats) in zip(pending, pool.map(_validate_in_worker, pending, chunksize=chunk_size)):
+            by_path[path] = (result, worker_stats)
+            if 'checksum' in result:
+                fresh.append(_cache_entry(result, worker_stats))
+    if cache and fresh:
+        cache.put_many(fresh)
+    
+    all_results = []
+    for f in files:
+        result, file_stats = by_path[str(f)]
+        stats.merge(file_stats)
+        all_results.append(result)
+        mark = f"{GREEN}✓{NC}" if result['valid'] else f"{RED}✗{NC}"
+        note = "cached" if result.get('cached') else f"{result['duration_ms']:.1f} ms"
+        print(f"  {mark} {result['filename']} ({len(result['issues'])} issues, {note})")
+    
+    return all_results, stats
+
+def collect_json_files(paths: List[Path]) -> List[Path]:
+    """Expand files/directories into the JSON files to validate (exclude audit/review files)"""
+    json_files = []
+    for path in paths:
+        candidates = sorted(path.rglob("*.json")) if path.is_dir() else [path]
+        json_files.extend(
+            f for f in candidates
+            if not any(x in f.name for x in ['AUDIT', 'REVIEW', 'MANUAL'])
+        )
+    return json_files
+
+def write_report(report_path: Path, results: List[Dict], stats: ValidationStats, elapsed: float, workers: int):
+    """Write per-file issues and timings as JSON (or JSONL for *.jsonl paths)"""
+    summary = {
+        'files': len(results),
+        'files_with_issues': sum(1 for r in results if not r['valid'] or r['issues']),
+        'workers': workers,
+        'elapsed_sec': round(elapsed, 3),
+        'stats': stats.to_dict()
+    }
+    if stats.timings:
+        summary['timings'] = stats.timings.to_dict()
+    
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        if report_path.suffix == '.jsonl':
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + '\n')
+            f.write(json.dumps({'summary': summary}, ensure_ascii=False) + '\n')
+        else:
+            json.dump({'summary': summary, 'files': results}, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+def run_metrics(results: List[Dict], stats: ValidationStats, elapsed: float, cpu_elapsed: float,
+                workers: int) -> Dict:
+    """Per-run performance numbers for the --metrics file"""
+    return {
+        'files': len(results),
+        'cached_files': sum(1 for r in results if r.get('cached')),
+        'workers': workers,
+        'elapsed_sec': round(elapsed, 3),
+        'cpu_sec': round(cpu_elapsed, 3),
+        'stats': stats.to_dict(),
+        'timings': stats.timings.to_dict(),
+        'per_file': [
+            {'file': r['path'], 'wall_ms': r.get('duration_ms'), 'cpu_ms': r.get('cpu_ms'), 'cached': bool(r.get('cached'))}
+            for r in results
+        ],
+    }
+
+def print_performance(results: List[Dict], stats: ValidationStats, elapsed: float, cpu_elapsed: float):
+    """Where the time went: file phases, rules, node counts, slowest files"""
+    timings = stats.timings
+    print("Performance:")
+    print(f"  Total: {elapsed * 1000:.1f} ms wall, {cpu_elapsed * 1000:.1f} ms cpu (this process)")
+    for line in timings.report_lines('file:') + timings.report_lines('rule:'):
+        print(f"  {line}")
+    nodes = {name[len('nodes:'):]: n for name, n in timings.counts.items() if name.startswith('nodes:')}
+    if nodes:
+        print(f"  Nodes visited: {sum(nodes.values())} ("
+              + ', '.join(f"{kind} {n}" for kind, n in sorted(nodes.items(), key=lambda kv: -kv[1])) + ")")
+    slowest = sorted((r for r in results if not r.get('cached')), key=lambda r: -r['duration_ms'])[:5]
+    if slowest:
+        print("  Slowest files: " + ', '.join(f"{r['filename']} {r['duration_ms']:.1f} ms" for r in slowest))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Validate parser outputs against CANONICAL_JSON_SCHEMA")
+    parser.add_argument('paths', nargs='*', type=Path, default=[Path("data/golden_set")],
+                        help="JSON files or directories (default: data/golden_set)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes (1 = sequential, 0 = one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=16,
+                        help="Files handed to a worker per task in parallel mode")
+    parser.add_argument('--report', type=Path,
+                        help="Write a machine-readable report (.json or .jsonl)")
+    parser.add_argument('--cache', type=Path, default=DEFAULT_CACHE_PATH,
+                        help=f"Result cache keyed by file SHA-256 (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-validate every file and leave the cache untouched")
+    parser.add_argument('--metrics', type=Path,
+                        help="Time every rule and count visited nodes; write run metrics as JSON (*.jsonl appends)")
+    parser.add_argument('--profile', type=Path, metavar='DIR',
+                        help="Run under cProfile (sequentially); write validate_golden_sets.prof/.collapsed to DIR")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+    
     print("🧪 FULL SYSTEM STRESS TEST - ZAMM PARSER")
     print("=" * 50)
     print()
@@ -268,29 +546,44 @@ def main():
     # Stats
     stats = ValidationStats()
     
-    # Golden set directory
-    golden_dir = Path("data/golden_set")
-    if not golden_dir.exists():
-        print(f"{RED}✗ Golden set directory not found{NC}")
+    missing = [p for p in args.paths if not p.exists()]
+    if missing:
+        print(f"{RED}✗ Golden set directory not found{NC}: {', '.join(map(str, missing))}")
         return 1
     
-    # Find JSON files (exclude audit/review files)
-    json_files = [
-        f for f in golden_dir.glob("*.json")
-        if not any(x in f.name for x in ['AUDIT', 'REVIEW', 'MANUAL'])
-    ]
+    json_files = collect_json_files(args.paths)
     
     print(f"📂 PHASE 2: Golden Set Regression Test")
     print("-" * 50)
     print(f"Found {len(json_files)} golden JSON files\n")
     
-    all_results = []
+    if args.metrics or args.profile:
+        enable_instrumentation()
+    if args.profile and workers > 1:
+        print(f"{YELLOW}⚠{NC} --profile runs sequentially (cProfile only sees this process)\n")
+        workers = 1
     
-    for json_file in sorted(json_files):
-        print(f"Testing: {json_file.name}")
-        result = validate_file(json_file, stats)
-        all_results.append(result)
-        print()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    cache = None if args.no_cache else ValidationCache(args.cache, ruleset_checksum())
+    
+    with profiled(args.profile, 'validate_golden_sets'):
+        if workers > 1:
+            print(f"Validating with {workers} worker processes\n")
+            all_results, stats = validate_parallel(json_files, workers, args.chunk_size, cache)
+        else:
+            all_results = []
+            for json_file in json_files:
+                print(f"Testing: {json_file.name}")
+                result = validate_file(json_file, stats, cache=cache)
+                all_results.append(result)
+                print()
+    
+    elapsed = time.perf_counter() - started
+    cpu_elapsed = time.process_time() - cpu_started
+    if cache:
+        print(f"Cache: {sum(1 for r in all_results if r.get('cached'))}/{len(all_results)} files unchanged ({args.cache})")
+        cache.close()
     
     # Phase 3: Stress Test
     print()
@@ -349,6 +642,10 @@ def main():
     else:
         print("  None! 🎉")
     
+    if args.metrics or args.profile:
+        print()
+        print_performance(all_results, stats, elapsed, cpu_elapsed)
+    
     print()
     print("Next Steps:")
     print("  1. Parse stress_test_10.txt via AI agent")
@@ -356,6 +653,16 @@ def main():
     print("  3. Test DB commit with validate_parsed_workout()")
     print("  4. Document any failures in learning examples")
     print()
+    
+    if args.report:
+        write_report(args.report, all_results, stats, elapsed, workers)
+        print(f"Report written to: {args.report}")
+    if args.metrics:
+        write_metrics(args.metrics, 'validate_golden_sets', run_metrics(all_results, stats, elapsed, cpu_elapsed, workers))
+        print(f"Metrics written to: {args.metrics}")
+    if args.profile:
+        print(f"Profile written to: {args.profile}/validate_golden_sets.prof (+ .collapsed)")
+    
     print("✅ Test suite execution complete!")
     
     # Return exit code based on results
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Migration Chain Regression
+==========================
+Runs lib/migrations.py over a temporary copy of data/golden_set the way
+`python3 scripts/ops/migrate_workouts.py` does by default (no manifest, no
+--assume-version) and checks that the only change is the version stamp:
+
+- a dry run reports no edits (count_changes == 0 for every file)
+- every JSON file is byte-identical afterwards and was not rewritten
+  (same inode and mtime: files no step changed keep their bytes)
+- .schema_versions.jsonl records each file at the current version
+- a second run skips every file
+
+Then runs the full chain (--assume-version 2.0.0): target_load/actual_load
+must survive the v3.0 weight conversion, and each registered step must make
+no change to the migrated documents.
+
+Usage: python3 scripts/tests/validate_migrations.py
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.batch import count_changes  # noqa: E402
+from lib.migrations import CURRENT_SCHEMA_VERSION, MANIFEST_NAME, MIGRATIONS, MigrationRunner  # noqa: E402
+
+GOLDEN_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'golden_set'
+
+# Colors
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+NC = '\033[0m'
+
+
+def main():
+    print("🚀 Migration chain on a golden-set copy\n")
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp) / 'golden_set'
+        shutil.copytree(GOLDEN_DIR, directory)
+        files = sorted(directory.glob('*.json'))
+        originals = {path.name: (GOLDEN_DIR / path.name).read_bytes() for path in files}
+        stats = {path.name: (path.stat().st_ino, path.stat().st_mtime_ns) for path in files}
+
+        for outcome in MigrationRunner(dry_run=True).run(files):
+            if outcome['status'] != 'current' or count_changes(outcome['counts']):
+                failures.append(f"dry run {Path(outcome['file']).name}: {outcome['status']} "
+                                f"{outcome.get('error') or dict(outcome['counts'])}")
+        outcomes = list(MigrationRunner().run(files))
+        for outcome in outcomes:
+            if outcome['status'] != 'current':
+                failures.append(f"{Path(outcome['file']).name}: {outcome['status']} "
+                                f"{outcome.get('error') or dict(outcome['counts'])}")
+        for path in files:
+            if path.read_bytes() != originals[path.name]:
+                failures.append(f"{path.name}: content changed")
+            elif (path.stat().st_ino, path.stat().st_mtime_ns) != stats[path.name]:
+                failures.append(f"{path.name}: rewritten with identical bytes")
+        added = {path.name for path in directory.iterdir()} - {path.name for path in GOLDEN_DIR.iterdir()}
+        failures += [f"{name}: added" for name in sorted(added - {MANIFEST_NAME})]
+
+        with open(directory / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            stamped = {entry['file']: entry['version'] for entry in map(json.loads, f)}
+        for path in files:
+            if stamped.get(path.name) != CURRENT_SCHEMA_VERSION:
+                failures.append(f"{path.name}: manifest has {stamped.get(path.name)!r}")
+
+        rerun = [outcome for outcome in MigrationRunner().run(files) if outcome['status'] != 'current'
+                 or outcome['from_version'] != CURRENT_SCHEMA_VERSION or outcome['record']]
+        failures += [f"second run {Path(outcome['file']).name}: not skipped" for outcome in rerun]
+
+        # The whole chain from pre-v3, then every step again on its output
+        full = directory.parent / 'full'
+        shutil.copytree(GOLDEN_DIR, full)
+        full_files = sorted(full.glob('*.json'))
+        for outcome in MigrationRunner(assume_version='2.0.0').run(full_files):
+            if outcome['status'] == 'error':
+                failures.append(f"full chain {Path(outcome['file']).name}: {outcome['error']}")
+        for path in full_files:
+            raw = path.read_bytes()
+            for field in ('target_load', 'actual_load'):
+                key = f'"{field}"'.encode()
+                if raw.count(key) != originals[path.name].count(key):
+                    failures.append(f"{path.name}: full chain dropped {field}")
+            data = json.loads(raw)
+            for step in MIGRATIONS:
+                counts = Counter()
+                data = step.transform(data, counts)
+                if count_changes(counts):
+                    failures.append(f"{path.name}: {step.name} not a no-op after migration ({dict(counts)})")
+
+    for failure in failures:
+        print(f"{RED}✗{NC} {failure}")
+    print(f"\n📊 {len(files)} files, {len(failures)} failures")
+    if failures:
+        print(f"{RED}❌ Migration chain changed data it should not have{NC}")
+        return 1
+    print(f"{GREEN}✅ Default run only stamped the manifest; every step is a no-op on migrated data{NC}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
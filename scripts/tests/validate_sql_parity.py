@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Offline vs SQL Validation Parity
+================================
+Runs every draft through both lib/workout_validation.py and the zamm.validate_*
+functions of a local Postgres and compares the rows of each check, then the
+validate_parsed_workout report (minus validated_at).
+
+Drafts: each JSON in data/golden_set as-is, plus --variants seeded mutations
+per file (bad dates/ids/codes, out-of-range values, prescription steps with
+catalog and unknown names, forbidden keys, uncastable values) so every branch
+is reached. Read-only; the transaction is rolled back.
+
+Usage: python3 scripts/tests/validate_sql_parity.py [paths...] [--variants 25] [--seed 7] [--dsn ...]
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.db import connect, resolve_dsn  # noqa: E402
+from lib.workout_validation import (  # noqa: E402
+    WorkoutCatalog, build_report, run_checks,
+)
+
+GOLDEN_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'golden_set'
+
+SQL_FUNCTIONS = {
+    'structure': 'validate_parsed_structure',
+    'block_structure': 'validate_block_codes',
+    'data_values': 'validate_data_values',
+    'catalog': 'validate_catalog_references',
+    'prescription_performance_separation': 'validate_prescription_performance_separation',
+}
+
+CATALOG_QUERIES = {
+    'exercises': "SELECT exercise_key, display_name FROM zamm.lib_exercise_catalog",
+    'exercise_aliases': "SELECT alias, exercise_key FROM zamm.lib_exercise_aliases",
+    'equipment': "SELECT equipment_key FROM zamm.lib_equipment_catalog",
+    'equipment_aliases': "SELECT alias, equipment_key FROM zamm.lib_equipment_aliases",
+}
+
+# Colors
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+NC = '\033[0m'
+
+
+def fetch_catalog(cur) -> WorkoutCatalog:
+    snapshot = {}
+    for name, sql in CATALOG_QUERIES.items():
+        cur.execute(sql)
+        columns = [column[0] for column in cur.description]
+        snapshot[name] = [dict(zip(columns, row)) for row in cur.fetchall()]
+    cur.execute("SELECT athlete_id::text FROM zamm.lib_athletes")
+    snapshot['athletes'] = [row[0] for row in cur.fetchall()]
+    return WorkoutCatalog.from_snapshot(snapshot)
+
+
+# --------------------------------------------------------
+# Mutations
+# --------------------------------------------------------
+
+def _blocks(draft):
+    return [block for session in draft.get('sessions') or [] if isinstance(session, dict)
+            for block in session.get('blocks') or [] if isinstance(block, dict)]
+
+
+def _step(rng, names, equipment):
+    step = {'exercise_name': rng.choice(names + ['Unknown Movement', 'DEADLIFT', None])}
+    if rng.random() < 0.7:
+        step['equipment_key'] = rng.choice(equipment + ['unknown_gear'])
+    if rng.random() < 0.6:
+        step['target_sets'] = rng.choice([0, 1, 3, 5, 11, '4'])
+    if rng.random() < 0.6:
+        step['target_reps'] = rng.choice([0, 5, 12, 60, 250, '10'])
+    if rng.random() < 0.5:
+        step['target_load'] = {'value': rng.choice([-5, 0, 62.5, 100.50, 320, 620]), 'unit': 'kg'}
+    if rng.random() < 0.1:
+        step[rng.choice(['actual_reps', 'did_complete'])] = 5
+    return step
+
+
+def _performed_step(rng):
+    sets = []
+    for index in range(rng.randint(1, 4)):
+        performed_set = {'set_index': index + 1}
+        for key, values in (('rpe', [0, 7, 8.5, 11]), ('rir', [-1, 2, 11]),
+                            ('load_kg', [40, 305.5, 510]), ('reps', [5, 55, 210])):
+            if rng.random() < 0.5:
+                performed_set[key] = rng.choice(values)
+        sets.append(performed_set)
+    step = {'sets': sets}
+    if rng.random() < 0.1:
+        step['target_reps'] = 5
+    return step
+
+
+def mutate(draft, rng, names, equipment, athletes):
+    draft = copy.deepcopy(draft)
+    blocks = _blocks(draft)
+    mutations = [
+        lambda: draft.pop('workout_date', None),
+        lambda: draft.update(workout_date=rng.choice(['2025/01/01', '2014-06-01', '2099-01-01', '2025-06-17'])),
+        lambda: draft.update(athlete_id=rng.choice(athletes + [str(uuid.uuid4()), 'not-a-uuid', None])),
+        lambda: draft.pop('athlete_id', None),
+        lambda: draft.update(sessions=[]),
+        lambda: draft.pop('sessions', None),
+    ]
+    if blocks:
+        # Captured up front: a mutation above may replace draft['sessions']
+        session = draft['sessions'][0]
+        mutations += [
+            lambda: session.update(session_code=rng.choice(['AM', 'EVENING', None])),
+            lambda: session.pop('session_code', None),
+            lambda: rng.choice(blocks).update(block_code=rng.choice(['XYZ', 'STR', None, 7])),
+            lambda: rng.choice(blocks).pop(rng.choice(['block_label', 'prescription', 'performed']), None),
+            lambda: rng.choice(blocks).update(prescription={
+                'steps': [_step(rng, names, equipment) for _ in range(rng.randint(1, 6))],
+                'time_cap_seconds': rng.choice([600, 4000, 7300]),
+            }),
+            lambda: rng.choice(blocks).update(performed={
+                'total_time_sec': rng.choice([900, 4000, 11000]),
+                'steps': [_performed_step(rng) for _ in range(rng.randint(1, 3))],
+            }),
+            lambda: rng.choice(blocks).update(prescription={'actual_sets': 3, 'target_sets': 3}),
+            lambda: rng.choice(blocks).update(performed={'target_load': {'value': 60}}),
+            lambda: rng.choice(blocks).update(prescription={'steps': [{'target_reps': '8-10'}]}),
+        ]
+    for mutation in rng.sample(mutations, k=min(len(mutations), rng.randint(1, 4))):
+        mutation()
+    return draft
+
+
+# --------------------------------------------------------
+# Comparison
+# --------------------------------------------------------
+
+def sql_checks(cur, payload):
+    """Same shape as run_checks(), or ('raised', message)"""
+    results = []
+    try:
+        cur.execute("SAVEPOINT parity")
+        for category, function in SQL_FUNCTIONS.items():
+            cur.execute(f"SELECT * FROM zamm.{function}(%s::jsonb)", (payload,))
+            results.append((category, [tuple(row) for row in cur.fetchall()]))
+        cur.execute("SELECT report FROM zamm.validate_parsed_workout(NULL, %s::jsonb)", (payload,))
+        report = cur.fetchone()[0]
+        cur.execute("RELEASE SAVEPOINT parity")
+    except Exception as err:
+        cur.execute("ROLLBACK TO SAVEPOINT parity")
+        return 'raised', str(err).strip().splitlines()[0]
+    return results, report if isinstance(report, dict) else json.loads(report)
+
+
+def python_checks(draft, catalog):
+    try:
+        results = run_checks(draft, catalog)
+    except ValueError as err:
+        return 'raised', str(err)
+    return results, build_report(results)
+
+
+def compare(draft, cur, catalog):
+    """None if both sides agree, else a short description of the first difference"""
+    payload = json.dumps(draft)
+    # Round-trip so Python sees exactly what Postgres parses
+    draft = json.loads(payload)
+    sql_results, sql_report = sql_checks(cur, payload)
+    py_results, py_report = python_checks(draft, catalog)
+
+    if sql_results == 'raised' or py_results == 'raised':
+        if sql_results == py_results:
+            return None
+        return f"sql: {sql_report if sql_results == 'raised' else 'ok'} / python: " \
+               f"{py_report if py_results == 'raised' else 'ok'}"
+
+    for (category, sql_rows), (_, py_rows) in zip(sql_results, py_results):
+        if sql_rows != py_rows:
+            return f"{SQL_FUNCTIONS[category]}: sql {sql_rows} != python {py_rows}"
+    for report in (sql_report, py_report):
+        report.pop('validated_at', None)
+    if sql_report != py_report:
+        return f"report: sql {sql_report} != python {py_report}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('paths', nargs='*', type=Path, default=[GOLDEN_DIR])
+    parser.add_argument('--variants', type=int, default=25, help="Mutated drafts per file (default: 25)")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--dsn', help="Postgres DSN (default: $DATABASE_URL or local Supabase)")
+    parser.add_argument('--verbose', '-v', action='store_true')
+    args = parser.parse_args()
+
+    files = []
+    for path in args.paths:
+        files.extend(sorted(path.glob('*.json')) if path.is_dir() else [path])
+
+    print(f"🚀 Offline vs SQL validation parity ({resolve_dsn(args.dsn).rsplit('@', 1)[-1]})\n")
+    try:
+        conn = connect(args.dsn)
+    except Exception as err:
+        print(f"❌ Cannot connect: {err}")
+        return 1
+
+    rng = random.Random(args.seed)
+    checked = 0
+    mismatches = []
+    try:
+        cur = conn.cursor()
+        catalog = fetch_catalog(cur)
+        cur.execute("SELECT display_name FROM zamm.lib_exercise_catalog ORDER BY display_name LIMIT 50")
+        names = [row[0] for row in cur.fetchall()]
+        equipment = sorted(catalog.equipment_keys)[:50]
+        athletes = sorted(catalog.athlete_ids)[:5]
+
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                original = json.load(f)
+            drafts = [original] + [mutate(original, rng, names, equipment, athletes) for _ in range(args.variants)]
+            for index, draft in enumerate(drafts):
+                difference = compare(draft, cur, catalog)
+                checked += 1
+                label = path.name if index == 0 else f"{path.name} #{index}"
+                if difference is not None:
+                    mismatches.append((label, difference))
+                    print(f"{RED}✗{NC} {label}: {difference}")
+                elif args.verbose:
+                    print(f"{GREEN}✓{NC} {label}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+    print(f"\n📊 {checked} drafts from {len(files)} files, {len(mismatches)} mismatches")
+    if mismatches:
+        print(f"{RED}❌ Offline validator differs from SQL{NC}")
+        return 1
+    print(f"{GREEN}✅ Offline validator matches SQL{NC}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,394 @@
+-- ============================================
+-- Migration: commit_full_workouts_bulk_v4 (set-based batch commit)
+-- ============================================
+-- Purpose: Commit many drafts in one call with one multi-row INSERT per table
+-- Date: 2026-01-12
+--
+-- commit_full_workout_v4 inserts row by row through nested PL/pgSQL loops
+-- (sessions → blocks → items → sets) and commits a single workout per call.
+-- Backfilling an athlete's history therefore costs one RPC round trip per
+-- workout and one INSERT per row.
+--
+-- This function takes an array of drafts, flattens them with
+-- jsonb_array_elements WITH ORDINALITY, generates every primary key up front
+-- and writes each table with a single INSERT ... SELECT, all in one statement
+-- (data-modifying CTEs; foreign keys are checked at end of statement).
+--
+-- Rows written are the same as calling commit_full_workout_v4 once per
+-- draft, in array order: same quality gate, status, item_order numbering,
+-- {value, unit} extraction and JSONB backups. The whole batch is atomic.
+--
+-- Input (p_workouts): JSON array of
+--   {import_id, draft_id, ruleset_id, athlete_id, normalized_json}
+-- athlete_id falls back to normalized_json.athlete_id, and workout_date to
+-- normalized_json.workout_date when the import's source_ref has no date.
+--
+-- Driver: scripts/ops/bulk_commit_workouts.py
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.commit_full_workouts_bulk_v4(
+    p_workouts JSONB
+)
+RETURNS TABLE(
+    workout_ordinal INTEGER,
+    workout_id UUID,
+    requires_review BOOLEAN
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_workout_count INTEGER;
+BEGIN
+    IF p_workouts IS NULL OR jsonb_typeof(p_workouts) <> 'array' THEN
+        RAISE EXCEPTION 'p_workouts must be a JSON array of {import_id, draft_id, ruleset_id, athlete_id, normalized_json}';
+    END IF;
+
+    RETURN QUERY
+    WITH
+    -- ============================================
+    -- 1. Flatten: one row per workout / session / block / item / set
+    -- ============================================
+    workouts AS (
+        SELECT
+            w.ord::INTEGER AS ord,
+            gen_random_uuid() AS workout_id,
+            (w.value->>'import_id')::UUID AS import_id,
+            (w.value->>'draft_id')::UUID AS draft_id,
+            (w.value->>'ruleset_id')::UUID AS ruleset_id,
+            COALESCE((w.value->>'athlete_id')::UUID,
+                     (w.value->'normalized_json'->>'athlete_id')::UUID) AS athlete_id,
+            COALESCE((regexp_match(i.source_ref, '\d{4}-\d{2}-\d{2}'))[1]::DATE,
+                     (w.value->'normalized_json'->>'workout_date')::DATE) AS workout_date,
+            w.value->'normalized_json' AS doc,
+            q.needs_review,
+            q.review_reason
+        FROM jsonb_array_elements(p_workouts) WITH ORDINALITY AS w(value, ord)
+        LEFT JOIN zamm.stg_imports i ON i.import_id = (w.value->>'import_id')::UUID
+        CROSS JOIN LATERAL zamm.check_workout_quality(w.value->'normalized_json') AS q
+    ),
+    workouts_status AS (
+        SELECT
+            wk.*,
+            CASE WHEN wk.needs_review THEN 'pending_review' ELSE 'completed' END AS status
+        FROM workouts wk
+    ),
+    sessions AS (
+        SELECT
+            wk.ord,
+            s.ord AS sess_ord,
+            gen_random_uuid() AS session_id,
+            wk.workout_id,
+            wk.workout_date,
+            wk.status,
+            -- v4 reads jsonb_to_recordset(...) AS x(sessionInfo jsonb, ...): the
+            -- unquoted column name folds to "sessioninfo", so match that key
+            NULLIF(s.value->'sessioninfo', 'null'::JSONB)->>'title' AS session_title,
+            NULLIF(s.value->'blocks', 'null'::JSONB) AS blocks
+        FROM workouts_status wk
+        CROSS JOIN LATERAL jsonb_array_elements(wk.doc->'sessions') WITH ORDINALITY AS s(value, ord)
+    ),
+    blocks AS (
+        SELECT
+            se.ord,
+            se.sess_ord,
+            b.ord AS block_ord,
+            gen_random_uuid() AS block_id,
+            se.session_id,
+            b.value->>'block_code' AS block_code,
+            b.value->>'block_type' AS block_type,
+            b.value->>'name' AS name,
+            NULLIF(b.value->'prescription', 'null'::JSONB) AS prescription,
+            NULLIF(b.value->'performed', 'null'::JSONB) AS performed,
+            NULLIF(b.value->'items', 'null'::JSONB) AS items
+        FROM sessions se
+        CROSS JOIN LATERAL jsonb_array_elements(se.blocks) WITH ORDINALITY AS b(value, ord)
+    ),
+    items_raw AS (
+        SELECT
+            bl.ord,
+            bl.sess_ord,
+            bl.block_ord,
+            it.ord AS item_ord,
+            gen_random_uuid() AS item_id,
+            bl.block_id,
+            (it.value->>'item_sequence')::INTEGER AS item_sequence,
+            it.value->>'exercise_name' AS exercise_name,
+            it.value->>'exercise_key' AS exercise_key,
+            it.value->>'equipment_key' AS equipment_key,
+            NULLIF(it.value->'prescription_data', 'null'::JSONB) AS prescription_data,
+            NULLIF(it.value->'performed_data', 'null'::JSONB) AS performed_data,
+            it.value->>'notes' AS notes
+        FROM blocks bl
+        CROSS JOIN LATERAL jsonb_array_elements(bl.items) WITH ORDINALITY AS it(value, ord)
+    ),
+    items_grouped AS (
+        -- v4 numbers items as COALESCE(item_sequence, previous + 1). Each run of
+        -- items without a sequence counts on from the last explicit one.
+        SELECT
+            ir.*,
+            COUNT(ir.item_sequence) OVER (
+                PARTITION BY ir.block_id ORDER BY ir.item_ord
+            ) AS seq_group
+        FROM items_raw ir
+    ),
+    items AS (
+        SELECT
+            ig.*,
+            COALESCE(
+                ig.item_sequence,
+                CASE
+                    WHEN ig.seq_group = 0 THEN ig.item_ord::INTEGER
+                    ELSE (MAX(ig.item_sequence) OVER grp)
+                         + (ig.item_ord - MIN(ig.item_ord) OVER grp)::INTEGER
+                END
+            ) AS item_order,
+            (
+                ig.exercise_key IS NOT NULL
+                AND ig.exercise_key != ''
+                AND ig.prescription_data IS NOT NULL
+                AND ig.prescription_data != '{}'::JSONB
+            ) AS is_verified
+        FROM items_grouped ig
+        WINDOW grp AS (PARTITION BY ig.block_id, ig.seq_group)
+    ),
+    sets AS (
+        SELECT
+            itm.ord,
+            itm.sess_ord,
+            itm.block_ord,
+            itm.item_ord,
+            st.ord AS set_ord,
+            itm.block_id,
+            itm.item_id,
+            (st.value->>'set_index')::INTEGER AS set_index,
+            (st.value->>'reps')::INTEGER AS reps,
+            zamm.extract_measurement_value(NULLIF(st.value->'load', 'null'::JSONB), 'kg') AS load_kg,
+            zamm.extract_measurement_value(NULLIF(st.value->'duration', 'null'::JSONB), 'sec') AS duration_sec,
+            zamm.extract_measurement_value(NULLIF(st.value->'distance', 'null'::JSONB), 'm') AS distance_m,
+            (st.value->>'rpe')::NUMERIC AS rpe,
+            (st.value->>'rir')::NUMERIC AS rir,
+            st.value->>'notes' AS notes
+        FROM items itm
+        CROSS JOIN LATERAL jsonb_array_elements(itm.performed_data->'sets') WITH ORDINALITY AS st(value, ord)
+        WHERE itm.performed_data ? 'sets'
+    ),
+
+    -- ============================================
+    -- 2. One multi-row INSERT per table
+    -- ============================================
+    ins_main AS (
+        INSERT INTO zamm.workout_main (
+            workout_id,
+            import_id,
+            draft_id,
+            ruleset_id,
+            athlete_id,
+            workout_date,
+            status,
+            requires_review,
+            review_reason,
+            created_at,
+            approved_at
+        )
+        SELECT
+            wk.workout_id,
+            wk.import_id,
+            wk.draft_id,
+            wk.ruleset_id,
+            wk.athlete_id,
+            wk.workout_date,
+            wk.status,
+            wk.needs_review,
+            wk.review_reason,
+            NOW(),
+            CASE WHEN wk.status = 'completed' THEN NOW() ELSE NULL END
+        FROM workouts_status wk
+        ORDER BY wk.ord
+    ),
+    ins_sessions AS (
+        INSERT INTO zamm.workout_sessions (
+            session_id,
+            workout_id,
+            session_title,
+            date,
+            status,
+            created_at
+        )
+        SELECT
+            se.session_id,
+            se.workout_id,
+            COALESCE(se.session_title, 'Main Session'),
+            se.workout_date,
+            se.status,
+            NOW()
+        FROM sessions se
+        ORDER BY se.ord, se.sess_ord
+    ),
+    ins_blocks AS (
+        INSERT INTO zamm.workout_blocks (
+            block_id,
+            session_id,
+            letter,
+            block_code,
+            block_type,
+            name,
+            structure_model,
+            presentation_structure,
+            result_entry_model,
+            prescription,
+            performed,
+            block_notes,
+            confidence_score,
+            created_at
+        )
+        SELECT
+            bl.block_id,
+            bl.session_id,
+            bl.block_code,
+            bl.block_code,
+            COALESCE(bl.block_type, 'unknown'),
+            COALESCE(bl.name, bl.block_code),
+            COALESCE(bl.prescription->>'structure', 'sets_reps'),
+            'standard',
+            'sets_reps_load',
+            bl.prescription,
+            COALESCE(bl.performed, '{}'::JSONB),
+            '[]'::JSONB,
+            0.95,
+            NOW()
+        FROM blocks bl
+        ORDER BY bl.ord, bl.sess_ord, bl.block_ord
+    ),
+    ins_res_blocks AS (
+        INSERT INTO zamm.res_blocks (
+            block_id,
+            did_complete,
+            total_time_sec,
+            score_text,
+            athlete_notes,
+            created_at
+        )
+        SELECT
+            bl.block_id,
+            COALESCE((bl.performed->>'did_complete')::BOOLEAN,
+                     (bl.performed->>'completed')::BOOLEAN,
+                     true),
+            zamm.extract_measurement_value(bl.performed->'actual_duration', 'sec'),
+            bl.performed->>'score_text',
+            bl.performed->>'notes',
+            NOW()
+        FROM blocks bl
+        WHERE bl.performed IS NOT NULL AND bl.performed != '{}'::JSONB
+        ORDER BY bl.ord, bl.sess_ord, bl.block_ord
+        ON CONFLICT (block_id) DO UPDATE
+        SET
+            did_complete = EXCLUDED.did_complete,
+            total_time_sec = EXCLUDED.total_time_sec,
+            score_text = EXCLUDED.score_text,
+            athlete_notes = EXCLUDED.athlete_notes
+    ),
+    ins_items AS (
+        INSERT INTO zamm.workout_items (
+            item_id,
+            block_id,
+            item_order,
+            exercise_name,
+            exercise_key,
+            equipment_key,
+            tempo,
+            notes,
+            prescription_data,
+            performed_data,
+            is_verified,
+            created_at
+        )
+        SELECT
+            itm.item_id,
+            itm.block_id,
+            itm.item_order,
+            itm.exercise_name,
+            itm.exercise_key,
+            itm.equipment_key,
+            itm.prescription_data->>'target_tempo',
+            itm.notes,
+            COALESCE(itm.prescription_data, '{}'::JSONB),
+            COALESCE(itm.performed_data, '{}'::JSONB),
+            itm.is_verified,
+            NOW()
+        FROM items itm
+        ORDER BY itm.ord, itm.sess_ord, itm.block_ord, itm.item_ord
+    ),
+    ins_sets AS (
+        INSERT INTO zamm.res_item_sets (
+            block_id,
+            item_id,
+            set_index,
+            reps,
+            load_kg,
+            duration_sec,
+            distance_m,
+            rpe,
+            rir,
+            notes,
+            created_at
+        )
+        SELECT
+            st.block_id,
+            st.item_id,
+            st.set_index,
+            st.reps,
+            st.load_kg,
+            st.duration_sec,
+            st.distance_m,
+            st.rpe,
+            st.rir,
+            st.notes,
+            NOW()
+        FROM sets st
+        ORDER BY st.ord, st.sess_ord, st.block_ord, st.item_ord, st.set_ord
+    )
+    SELECT wk.ord, wk.workout_id, wk.needs_review
+    FROM workouts_status wk
+    ORDER BY wk.ord;
+
+    GET DIAGNOSTICS v_workout_count = ROW_COUNT;
+    RAISE NOTICE 'commit_full_workouts_bulk_v4: % workouts committed', v_workout_count;
+
+EXCEPTION WHEN OTHERS THEN
+    -- The batch is one statement: any error rolls back every workout in it
+    RAISE EXCEPTION 'commit_full_workouts_bulk_v4 failed: % (SQLSTATE: %)', SQLERRM, SQLSTATE;
+END;
+$$;
+
+-- ============================================
+-- Metadata and Permissions
+-- ============================================
+
+COMMENT ON FUNCTION zamm.commit_full_workouts_bulk_v4 IS
+'Set-based batch variant of commit_full_workout_v4: one multi-row INSERT per table for an array of drafts. Returns (workout_ordinal, workout_id, requires_review) in input order.';
+
+GRANT EXECUTE ON FUNCTION zamm.commit_full_workouts_bulk_v4 TO service_role;
+
+-- ============================================
+-- Example Usage
+-- ============================================
+
+-- SELECT * FROM zamm.commit_full_workouts_bulk_v4(
+--     jsonb_build_array(
+--         jsonb_build_object(
+--             'import_id', d.import_id,
+--             'draft_id', d.draft_id,
+--             'ruleset_id', d.ruleset_id,
+--             'athlete_id', i.athlete_id,
+--             'normalized_json', d.normalized_draft
+--         )
+--     )
+-- )
+-- FROM zamm.stg_parse_drafts d
+-- JOIN zamm.stg_imports i USING (import_id)
+-- WHERE d.draft_id = '...';
+
+-- ============================================
+-- Migration Complete
+-- ============================================
@@ -0,0 +1,164 @@
+-- ============================================
+-- Migration: Set-based validate_catalog_references + lower() indexes
+-- ============================================
+-- Purpose: Validate catalog references with one anti-join instead of two
+--          sequential scans per step
+-- Date: 2026-01-12
+--
+-- The PL/pgSQL version loops sessions → blocks → steps and, for every step,
+-- runs NOT EXISTS subqueries comparing LOWER(...) = LOWER(v_exercise_name).
+-- The plain btree indexes on the catalogs cannot serve LOWER() lookups, so
+-- each step costs a sequential scan of lib_exercise_catalog and
+-- lib_exercise_aliases.
+--
+-- Rewrite:
+-- 1. Expression indexes on lower(display_name), lower(exercise_key) and
+--    lower(alias), so a case-insensitive lookup is an index probe.
+-- 2. A LANGUAGE sql function that extracts every step in one pass
+--    (jsonb_array_elements WITH ORDINALITY), checks each DISTINCT name once
+--    with an anti-join against the catalogs, then joins the unknown names
+--    back to their steps.
+--
+-- Output rows, messages, locations and ordering are the same as before. Two
+-- notes on behaviour:
+-- - lib_exercise_catalog has no exercise_name column; the previous version
+--   failed with "column exercise_name does not exist" as soon as a step
+--   had an exercise_name. Names are now matched against display_name and
+--   exercise_key (plus lib_exercise_aliases.alias).
+-- - The 'All catalog references are valid' info row is returned when there
+--   are no sessions to check, as before (the PL/pgSQL version's IF NOT FOUND
+--   tested the outer session loop).
+--
+-- Benchmark: scripts/benchmarks/bench_catalog_validation.py
+-- ============================================
+
+-- ============================================
+-- STEP 1: Expression indexes for case-insensitive lookups
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_exercise_catalog_display_name_lower
+ON zamm.lib_exercise_catalog (lower(display_name));
+
+CREATE INDEX IF NOT EXISTS idx_exercise_catalog_key_lower
+ON zamm.lib_exercise_catalog (lower(exercise_key));
+
+CREATE INDEX IF NOT EXISTS idx_exercise_aliases_alias_lower
+ON zamm.lib_exercise_aliases (lower(alias));
+
+-- Equipment keys are compared exactly (equipment_key / alias), which the
+-- existing primary keys already serve; only the alias needs an index
+CREATE INDEX IF NOT EXISTS idx_equipment_aliases_alias
+ON zamm.lib_equipment_aliases (alias);
+
+-- ============================================
+-- STEP 2: Set-based validate_catalog_references
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.validate_catalog_references(parsed_json JSONB)
+RETURNS TABLE (
+    is_valid BOOLEAN,
+    severity TEXT,
+    field TEXT,
+    issue TEXT,
+    location TEXT,
+    value TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH steps AS (
+        SELECT
+            s.ord AS session_idx,
+            b.ord AS block_idx,
+            st.ord AS step_idx,
+            st.value->>'exercise_name' AS exercise_name,
+            st.value->>'equipment_key' AS equipment_key
+        FROM jsonb_array_elements(parsed_json->'sessions') WITH ORDINALITY AS s(value, ord)
+        CROSS JOIN LATERAL jsonb_array_elements(s.value->'blocks') WITH ORDINALITY AS b(value, ord)
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE WHEN b.value->'prescription' ? 'steps' THEN b.value->'prescription'->'steps' END
+        ) WITH ORDINALITY AS st(value, ord)
+    ),
+    -- Each distinct name is looked up once, however many steps use it
+    unknown_exercises AS (
+        SELECT n.name_lower
+        FROM (
+            SELECT DISTINCT lower(exercise_name) AS name_lower
+            FROM steps
+            WHERE exercise_name IS NOT NULL
+        ) n
+        WHERE NOT EXISTS (
+            SELECT 1 FROM zamm.lib_exercise_catalog c
+            WHERE lower(c.display_name) = n.name_lower
+        ) AND NOT EXISTS (
+            SELECT 1 FROM zamm.lib_exercise_catalog c
+            WHERE lower(c.exercise_key) = n.name_lower
+        ) AND NOT EXISTS (
+            SELECT 1 FROM zamm.lib_exercise_aliases a
+            WHERE lower(a.alias) = n.name_lower
+        )
+    ),
+    unknown_equipment AS (
+        SELECT k.equipment_key
+        FROM (
+            SELECT DISTINCT equipment_key
+            FROM steps
+            WHERE equipment_key IS NOT NULL
+        ) k
+        WHERE NOT EXISTS (
+            SELECT 1 FROM zamm.lib_equipment_catalog c
+            WHERE c.equipment_key = k.equipment_key
+        ) AND NOT EXISTS (
+            SELECT 1 FROM zamm.lib_equipment_aliases a
+            WHERE a.alias = k.equipment_key
+        )
+    ),
+    issues AS (
+        SELECT
+            st.session_idx, st.block_idx, st.step_idx, 1 AS check_order,
+            'exercise_name'::TEXT AS field,
+            format('Exercise "%s" not found in catalog', st.exercise_name) AS issue,
+            st.exercise_name AS value
+        FROM steps st
+        JOIN unknown_exercises u ON u.name_lower = lower(st.exercise_name)
+
+        UNION ALL
+
+        SELECT
+            st.session_idx, st.block_idx, st.step_idx, 2 AS check_order,
+            'equipment_key'::TEXT,
+            format('Equipment "%s" not found in catalog', st.equipment_key),
+            st.equipment_key
+        FROM steps st
+        JOIN unknown_equipment u ON u.equipment_key = st.equipment_key
+    )
+    SELECT is_valid, severity, field, issue, location, value
+    FROM (
+        SELECT
+            FALSE AS is_valid,
+            'error'::TEXT AS severity,
+            i.field,
+            i.issue,
+            format('Session %s, Block %s, Step %s', i.session_idx, i.block_idx, i.step_idx) AS location,
+            i.value,
+            i.session_idx, i.block_idx, i.step_idx, i.check_order
+        FROM issues i
+
+        UNION ALL
+
+        SELECT
+            TRUE, 'info', NULL::TEXT, 'All catalog references are valid', NULL::TEXT, NULL::TEXT,
+            0, 0, 0, 0
+        WHERE NOT EXISTS (SELECT 1 FROM jsonb_array_elements(parsed_json->'sessions'))
+    ) results
+    ORDER BY session_idx, block_idx, step_idx, check_order;
+$$;
+
+COMMENT ON FUNCTION zamm.validate_catalog_references IS
+'Validates that all exercise names and equipment keys exist in their respective catalogs or alias tables. Set-based: one anti-join per distinct name, served by lower() expression indexes.';
+
+GRANT EXECUTE ON FUNCTION zamm.validate_catalog_references TO service_role;
+
+-- ============================================
+-- Migration Complete
+-- ============================================
@@ -0,0 +1,197 @@
+-- ============================================
+-- Migration: Incremental weekly training-load aggregates
+-- ============================================
+-- Purpose: Weekly volume / tonnage / e1RM per athlete and exercise without
+--          re-aggregating every res_item_sets row on each dashboard load
+-- Date: 2026-01-13
+--
+-- zamm.agg_training_load_weekly holds one row per (athlete, exercise, ISO
+-- week starting Monday): workouts, sets, reps, tonnage (reps × load_kg),
+-- best Epley e1RM from sets of 1-12 reps, and average RPE, from
+-- res_item_sets. (20260115100000 adds list-form per-set results and
+-- refreshes by (athlete, week) so edits cannot leave stale rows; see there
+-- for the remaining difference from scripts/lib/training_load.py.)
+--
+-- zamm.refresh_training_load_weekly(p_workout_ids) recomputes only the
+-- (athlete, exercise, week) groups the given workouts touch, from all sets
+-- in those groups, so it is idempotent and exact for MAX(e1RM). Without
+-- ids it takes the workouts created since the last refresh (watermark in
+-- zamm.agg_refresh_state, minus a small overlap for commits still in flight
+-- at the previous refresh; re-processing a group is harmless).
+--
+-- Edited workouts: pass their ids. Deleted workouts leave no sets to find
+-- their groups by: run zamm.rebuild_training_load_weekly().
+--
+-- Python: scripts/ops/training_load.py refresh-db
+-- ============================================
+
+-- ============================================
+-- STEP 1: Summary + refresh state tables
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS zamm.agg_training_load_weekly (
+    athlete_id      UUID NOT NULL,
+    exercise_name   TEXT NOT NULL,
+    week_start      DATE NOT NULL,
+    workouts        INTEGER NOT NULL,
+    sets            INTEGER NOT NULL,
+    reps            INTEGER NOT NULL,
+    tonnage_kg      NUMERIC(14,2) NOT NULL,
+    best_e1rm_kg    NUMERIC(10,2),
+    rpe_avg         NUMERIC(4,2),
+    refreshed_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (athlete_id, exercise_name, week_start)
+);
+
+COMMENT ON TABLE zamm.agg_training_load_weekly IS
+'Per athlete / exercise / ISO week training load from res_item_sets. Maintained by zamm.refresh_training_load_weekly().';
+
+CREATE TABLE IF NOT EXISTS zamm.agg_refresh_state (
+    aggregate_name   TEXT PRIMARY KEY,
+    last_created_at  TIMESTAMPTZ NOT NULL DEFAULT '-infinity',
+    refreshed_at     TIMESTAMPTZ
+);
+
+-- New-workout lookups by creation time
+CREATE INDEX IF NOT EXISTS idx_workout_main_created_at
+ON zamm.workout_main (created_at);
+
+-- ============================================
+-- STEP 2: Incremental refresh
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.refresh_training_load_weekly(
+    p_workout_ids UUID[] DEFAULT NULL
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_watermark      TIMESTAMPTZ;
+    v_new_watermark  TIMESTAMPTZ;
+    v_rows           INTEGER;
+BEGIN
+    IF p_workout_ids IS NULL THEN
+        INSERT INTO zamm.agg_refresh_state (aggregate_name)
+        VALUES ('training_load_weekly')
+        ON CONFLICT (aggregate_name) DO NOTHING;
+
+        -- Row lock: concurrent refreshes run one after the other
+        SELECT last_created_at INTO v_watermark
+        FROM zamm.agg_refresh_state
+        WHERE aggregate_name = 'training_load_weekly'
+        FOR UPDATE;
+
+        SELECT array_agg(workout_id), MAX(created_at)
+        INTO p_workout_ids, v_new_watermark
+        FROM zamm.workout_main
+        WHERE created_at > v_watermark - INTERVAL '5 minutes';
+
+        UPDATE zamm.agg_refresh_state
+        SET last_created_at = GREATEST(last_created_at, COALESCE(v_new_watermark, last_created_at)),
+            refreshed_at = NOW()
+        WHERE aggregate_name = 'training_load_weekly';
+
+        IF p_workout_ids IS NULL THEN
+            RETURN 0;
+        END IF;
+    END IF;
+
+    DROP TABLE IF EXISTS pg_temp.training_load_groups;
+    CREATE TEMP TABLE training_load_groups ON COMMIT DROP AS
+    SELECT DISTINCT
+        w.athlete_id,
+        btrim(i.exercise_name) AS exercise_name,
+        date_trunc('week', w.workout_date)::date AS week_start
+    FROM zamm.workout_main w
+    JOIN zamm.workout_sessions s ON s.workout_id = w.workout_id
+    JOIN zamm.workout_blocks b ON b.session_id = s.session_id
+    JOIN zamm.workout_items i ON i.block_id = b.block_id
+    WHERE w.workout_id = ANY(p_workout_ids)
+      AND w.athlete_id IS NOT NULL
+      AND w.workout_date IS NOT NULL
+      AND btrim(i.exercise_name) <> '';
+
+    DELETE FROM zamm.agg_training_load_weekly a
+    USING training_load_groups g
+    WHERE a.athlete_id = g.athlete_id
+      AND a.exercise_name = g.exercise_name
+      AND a.week_start = g.week_start;
+
+    -- Recompute each touched group from every set in it (served by
+    -- idx_workouts_athlete_date, idx_sessions_workout, idx_blocks_session,
+    -- idx_items_block and idx_res_item_sets_item)
+    INSERT INTO zamm.agg_training_load_weekly (
+        athlete_id, exercise_name, week_start,
+        workouts, sets, reps, tonnage_kg, best_e1rm_kg, rpe_avg, refreshed_at
+    )
+    SELECT
+        g.athlete_id,
+        g.exercise_name,
+        g.week_start,
+        COUNT(DISTINCT w.workout_id),
+        COUNT(*),
+        COALESCE(SUM(r.reps), 0),
+        COALESCE(SUM(r.reps * r.load_kg), 0),
+        MAX(
+            CASE
+                WHEN r.load_kg > 0 AND r.reps = 1 THEN r.load_kg
+                WHEN r.load_kg > 0 AND r.reps BETWEEN 2 AND 12 THEN r.load_kg * (1 + r.reps / 30.0)
+            END
+        ),
+        AVG(r.rpe),
+        NOW()
+    FROM training_load_groups g
+    JOIN zamm.workout_main w
+      ON w.athlete_id = g.athlete_id
+     AND w.workout_date >= g.week_start
+     AND w.workout_date < g.week_start + 7
+    JOIN zamm.workout_sessions s ON s.workout_id = w.workout_id
+    JOIN zamm.workout_blocks b ON b.session_id = s.session_id
+    JOIN zamm.workout_items i ON i.block_id = b.block_id AND btrim(i.exercise_name) = g.exercise_name
+    JOIN zamm.res_item_sets r ON r.item_id = i.item_id
+    GROUP BY g.athlete_id, g.exercise_name, g.week_start;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+COMMENT ON FUNCTION zamm.refresh_training_load_weekly IS
+'Recomputes agg_training_load_weekly for the (athlete, exercise, week) groups of the given workouts, or of workouts created since the last refresh. Returns the rows written.';
+
+-- ============================================
+-- STEP 3: Full rebuild (after deletes / definition changes)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.rebuild_training_load_weekly()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    TRUNCATE zamm.agg_training_load_weekly;
+    v_rows := zamm.refresh_training_load_weekly(
+        ARRAY(SELECT workout_id FROM zamm.workout_main WHERE athlete_id IS NOT NULL)
+    );
+    INSERT INTO zamm.agg_refresh_state (aggregate_name, last_created_at, refreshed_at)
+    SELECT 'training_load_weekly', COALESCE(MAX(created_at), '-infinity'), NOW()
+    FROM zamm.workout_main
+    ON CONFLICT (aggregate_name) DO UPDATE
+    SET last_created_at = EXCLUDED.last_created_at,
+        refreshed_at = EXCLUDED.refreshed_at;
+    RETURN v_rows;
+END;
+$$;
+
+COMMENT ON FUNCTION zamm.rebuild_training_load_weekly IS
+'Truncates and recomputes agg_training_load_weekly from every workout.';
+
+GRANT SELECT ON zamm.agg_training_load_weekly TO service_role;
+GRANT EXECUTE ON FUNCTION zamm.refresh_training_load_weekly TO service_role;
+GRANT EXECUTE ON FUNCTION zamm.rebuild_training_load_weekly TO service_role;
+
+-- ============================================
+-- Migration Complete
+-- ============================================
@@ -0,0 +1,232 @@
+-- ============================================
+-- Migration: Array-parameter batch versions of the lookup helpers
+-- ============================================
+-- Purpose: Resolve every athlete / equipment name, duplicate key and
+--          athlete context of an ingest in one call each instead of one
+--          round trip per name or workout
+-- Date: 2026-01-14
+--
+-- Batch twins of:
+--   zamm.check_athlete_by_name(TEXT)          → check_athlete_by_name_batch(TEXT[])
+--   zamm.check_equipment_exists(TEXT)         → check_equipment_exists_batch(TEXT[])
+--   zamm.check_workout_duplicate(UUID, DATE, TEXT)
+--                                             → check_workout_duplicate_batch(UUID[], DATE[], TEXT[])
+--   zamm.get_athlete_context(UUID)            → get_athlete_context_batch(UUID[])
+--
+-- Each takes arrays, unnests them WITH ORDINALITY and returns the ordinal of
+-- the input element with every row, in input order, so callers can map the
+-- results back. LANGUAGE sql + STABLE: planned as one join, no per-element
+-- PL/pgSQL loop.
+--
+-- Same matching rules as the single-value functions, except for
+-- check_equipment_exists: the version from 20260111140000 reads
+-- equipment_name / equipment_category / alias_name, which
+-- lib_equipment_catalog and lib_equipment_aliases do not have (columns are
+-- display_name / category / alias), and its ORDER BY matched_via sorts
+-- 'alias' before 'exact'. The batch version matches display_name or
+-- equipment_key ('exact') and alias ('alias'), exact matches first, up to 5
+-- per name.
+--
+-- Python: scripts/lib/batch_lookups.py (pooled, prepared statements)
+-- ============================================
+
+-- ============================================
+-- STEP 1: Index for case-insensitive athlete names
+-- ============================================
+
+-- check_athlete_by_name compares lower(trim(full_name)) among active athletes
+CREATE INDEX IF NOT EXISTS idx_lib_athletes_full_name_lower
+ON zamm.lib_athletes (lower(trim(full_name)))
+WHERE is_active = true;
+
+-- Duplicate checks are served by idx_workouts_athlete_date (athlete_id,
+-- workout_date); the equipment catalogs are small enough to scan.
+
+-- ============================================
+-- STEP 2: Athletes by name
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.check_athlete_by_name_batch(
+    p_full_names TEXT[]
+) RETURNS TABLE (
+    ordinal INTEGER,
+    input_name TEXT,
+    found BOOLEAN,
+    athlete_id UUID,
+    full_name TEXT,
+    email TEXT,
+    is_active BOOLEAN
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        n.ordinal::INTEGER,
+        n.input_name,
+        a.athlete_id IS NOT NULL,
+        a.athlete_id,
+        a.full_name,
+        a.email,
+        a.is_active
+    FROM unnest(p_full_names) WITH ORDINALITY AS n(input_name, ordinal)
+    LEFT JOIN LATERAL (
+        SELECT la.athlete_id, la.full_name, la.email, la.is_active
+        FROM zamm.lib_athletes la
+        WHERE lower(trim(la.full_name)) = lower(trim(n.input_name))
+          AND la.is_active = true
+        LIMIT 1
+    ) a ON true
+    ORDER BY n.ordinal;
+$$;
+
+COMMENT ON FUNCTION zamm.check_athlete_by_name_batch IS
+'Batch check_athlete_by_name: one row per input name (found = false when no active athlete has that name, case-insensitive), in input order.';
+
+-- ============================================
+-- STEP 3: Equipment by name
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.check_equipment_exists_batch(
+    p_equipment_names TEXT[]
+) RETURNS TABLE (
+    ordinal INTEGER,
+    input_name TEXT,
+    equipment_key TEXT,
+    display_name TEXT,
+    category TEXT,
+    matched_via TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        n.ordinal::INTEGER,
+        n.input_name,
+        m.equipment_key,
+        m.display_name,
+        m.category,
+        m.matched_via
+    FROM unnest(p_equipment_names) WITH ORDINALITY AS n(input_name, ordinal)
+    CROSS JOIN LATERAL (
+        SELECT *
+        FROM (
+            SELECT c.equipment_key, c.display_name, c.category, 'exact'::TEXT AS matched_via, 1 AS match_rank
+            FROM zamm.lib_equipment_catalog c
+            WHERE lower(c.display_name) = lower(n.input_name)
+               OR lower(c.equipment_key) = lower(n.input_name)
+
+            UNION ALL
+
+            SELECT c.equipment_key, c.display_name, c.category, 'alias'::TEXT, 2
+            FROM zamm.lib_equipment_aliases ea
+            JOIN zamm.lib_equipment_catalog c ON c.equipment_key = ea.equipment_key
+            WHERE lower(ea.alias) = lower(n.input_name)
+        ) candidates
+        ORDER BY match_rank, equipment_key
+        LIMIT 5
+    ) m
+    ORDER BY n.ordinal, m.match_rank, m.equipment_key;
+$$;
+
+COMMENT ON FUNCTION zamm.check_equipment_exists_batch IS
+'Batch check_equipment_exists: up to 5 matches per input name (exact display_name/equipment_key first, then aliases), in input order. Names without a match return no rows.';
+
+-- ============================================
+-- STEP 4: Duplicate workouts
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.check_workout_duplicate_batch(
+    p_athlete_ids UUID[],
+    p_workout_dates DATE[],
+    p_content_hashes TEXT[]
+) RETURNS TABLE (
+    ordinal INTEGER,
+    found BOOLEAN,
+    workout_id UUID,
+    created_at TIMESTAMPTZ,
+    session_title TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        k.ordinal::INTEGER,
+        w.workout_id IS NOT NULL,
+        w.workout_id,
+        w.created_at,
+        w.session_title
+    FROM unnest(p_athlete_ids, p_workout_dates, p_content_hashes)
+         WITH ORDINALITY AS k(athlete_id, workout_date, content_hash, ordinal)
+    LEFT JOIN LATERAL (
+        SELECT wm.workout_id, wm.created_at, wm.session_title
+        FROM zamm.workout_main wm
+        WHERE wm.athlete_id = k.athlete_id
+          AND wm.workout_date = k.workout_date
+          AND wm.content_hash_ref = k.content_hash
+        LIMIT 1
+    ) w ON true
+    ORDER BY k.ordinal;
+$$;
+
+COMMENT ON FUNCTION zamm.check_workout_duplicate_batch IS
+'Batch check_workout_duplicate over parallel athlete/date/hash arrays: one row per position, in input order.';
+
+-- ============================================
+-- STEP 5: Athlete contexts
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.get_athlete_context_batch(
+    p_athlete_ids UUID[]
+) RETURNS TABLE (
+    ordinal INTEGER,
+    athlete_id UUID,
+    context JSON
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        i.ordinal::INTEGER,
+        i.athlete_id,
+        (
+            SELECT json_build_object(
+                'athlete_id', la.athlete_id,
+                'full_name', la.full_name,
+                'email', la.email,
+                'recent_workouts', (
+                    SELECT json_agg(workout_summary)
+                    FROM (
+                        SELECT
+                            wm.workout_id,
+                            wm.workout_date,
+                            wm.session_title AS workout_title
+                        FROM zamm.workout_main wm
+                        WHERE wm.athlete_id = la.athlete_id
+                        ORDER BY wm.workout_date DESC
+                        LIMIT 10
+                    ) AS workout_summary
+                )
+            )
+            FROM zamm.lib_athletes la
+            WHERE la.athlete_id = i.athlete_id
+              AND la.is_active = true
+        )
+    FROM unnest(p_athlete_ids) WITH ORDINALITY AS i(athlete_id, ordinal)
+    ORDER BY i.ordinal;
+$$;
+
+COMMENT ON FUNCTION zamm.get_athlete_context_batch IS
+'Batch get_athlete_context: one row per input id with the same JSON (NULL for unknown or inactive athletes), in input order.';
+
+-- ============================================
+-- STEP 6: Grant permissions
+-- ============================================
+
+GRANT EXECUTE ON FUNCTION zamm.check_athlete_by_name_batch TO service_role, authenticated;
+GRANT EXECUTE ON FUNCTION zamm.check_equipment_exists_batch TO service_role, authenticated;
+GRANT EXECUTE ON FUNCTION zamm.check_workout_duplicate_batch TO service_role, authenticated;
+GRANT EXECUTE ON FUNCTION zamm.get_athlete_context_batch TO service_role, authenticated;
+
+-- ============================================
+-- Migration Complete
+-- ============================================
@@ -0,0 +1,245 @@
+-- ============================================
+-- Migration: Training-load refresh for edited workouts + list-form sets
+-- ============================================
+-- Purpose: Keep zamm.agg_training_load_weekly exact when a workout is
+--          edited (exercise renamed, date or athlete moved) or deleted,
+--          and count the same sets as scripts/lib/training_load.py
+-- Date: 2026-01-15
+--
+-- 20260113100000 found the groups to recompute from the workout's current
+-- items and date only. After an edit that renames an exercise or moves the
+-- workout to another week, the old (athlete, exercise, week) row was never
+-- revisited and kept the workout's old sets.
+--
+-- Now:
+-- - zamm.agg_training_load_workout_weeks records the (athlete, week) each
+--   workout was last aggregated under.
+-- - refresh_training_load_weekly(p_workout_ids) recomputes every exercise
+--   of each affected (athlete, week): the workouts' current weeks plus the
+--   recorded ones. An edited or deleted workout's old rows are rewritten
+--   or removed when its id is passed. The created_at watermark path still
+--   sees new workouts only.
+--
+-- Set definition, aligned with lib/training_load.py (lib/fact_table.py
+-- flatten_workout):
+-- - res_item_sets rows (performed_data.sets; loads already converted by
+--   zamm.extract_measurement_value at commit)
+-- - per-set parallel lists in performed_data when there is no sets array
+--   (actual_reps, actual_weight / actual_load, actual_rpe), one row per
+--   position; commit does not write these to res_item_sets
+-- - e1RM (Epley) from sets of 1-12 reps, non-integer reps included
+-- Remaining difference: commit stores circuit children (an item's
+-- "exercises") inside the item's JSON, not as workout_items, so only the
+-- Python aggregates count their sets.
+--
+-- Python: scripts/ops/training_load.py refresh-db [--workout-id ...]
+-- ============================================
+
+-- ============================================
+-- STEP 1: Weeks each workout was aggregated under
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS zamm.agg_training_load_workout_weeks (
+    workout_id    UUID PRIMARY KEY,
+    athlete_id    UUID NOT NULL,
+    week_start    DATE NOT NULL
+);
+
+COMMENT ON TABLE zamm.agg_training_load_workout_weeks IS
+'(athlete, ISO week) each workout was last aggregated under in agg_training_load_weekly, so a refresh after an edit or delete also recomputes the old week.';
+
+-- ============================================
+-- STEP 2: Per-set rows from parallel lists
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.performed_list_sets(
+    p_performed JSONB
+) RETURNS TABLE (
+    set_index INTEGER,
+    reps NUMERIC,
+    load_kg NUMERIC,
+    rpe NUMERIC
+)
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    -- actual_load wins over actual_weight when both are lists (fact_table.SET_LISTS order)
+    SELECT
+        n::INTEGER,
+        CASE WHEN jsonb_typeof(p_performed->'actual_reps'->(n - 1)) = 'number'
+             THEN (p_performed->'actual_reps'->>(n - 1))::NUMERIC END,
+        zamm.extract_measurement_value(
+            CASE WHEN jsonb_typeof(p_performed->'actual_load') = 'array'
+                 THEN p_performed->'actual_load'->(n - 1)
+                 ELSE p_performed->'actual_weight'->(n - 1)
+            END,
+            'kg'
+        ),
+        CASE WHEN jsonb_typeof(p_performed->'actual_rpe'->(n - 1)) = 'number'
+             THEN (p_performed->'actual_rpe'->>(n - 1))::NUMERIC END
+    FROM generate_series(1, (
+        SELECT MAX(jsonb_array_length(p_performed->k))
+        FROM unnest(ARRAY['actual_reps', 'actual_weight', 'actual_load',
+                          'actual_duration', 'actual_distance', 'actual_rpe']) AS k
+        WHERE jsonb_typeof(p_performed->k) = 'array'
+    )) AS n
+    WHERE jsonb_typeof(p_performed) = 'object'
+      AND NOT (p_performed ? 'sets');
+$$;
+
+COMMENT ON FUNCTION zamm.performed_list_sets IS
+'One row per position of the per-set lists (actual_reps, actual_weight/actual_load, actual_rpe, ...) of a performed_data object without a sets array; loads in kg.';
+
+-- ============================================
+-- STEP 3: Refresh keyed on (athlete, week)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.refresh_training_load_weekly(
+    p_workout_ids UUID[] DEFAULT NULL
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_watermark      TIMESTAMPTZ;
+    v_new_watermark  TIMESTAMPTZ;
+    v_rows           INTEGER;
+BEGIN
+    IF p_workout_ids IS NULL THEN
+        INSERT INTO zamm.agg_refresh_state (aggregate_name)
+        VALUES ('training_load_weekly')
+        ON CONFLICT (aggregate_name) DO NOTHING;
+
+        -- Row lock: concurrent refreshes run one after the other
+        SELECT last_created_at INTO v_watermark
+        FROM zamm.agg_refresh_state
+        WHERE aggregate_name = 'training_load_weekly'
+        FOR UPDATE;
+
+        SELECT array_agg(workout_id), MAX(created_at)
+        INTO p_workout_ids, v_new_watermark
+        FROM zamm.workout_main
+        WHERE created_at > v_watermark - INTERVAL '5 minutes';
+
+        UPDATE zamm.agg_refresh_state
+        SET last_created_at = GREATEST(last_created_at, COALESCE(v_new_watermark, last_created_at)),
+            refreshed_at = NOW()
+        WHERE aggregate_name = 'training_load_weekly';
+
+        IF p_workout_ids IS NULL THEN
+            RETURN 0;
+        END IF;
+    END IF;
+
+    -- Current and previously aggregated (athlete, week) of each workout
+    DROP TABLE IF EXISTS pg_temp.training_load_weeks;
+    CREATE TEMP TABLE training_load_weeks ON COMMIT DROP AS
+    SELECT w.athlete_id, date_trunc('week', w.workout_date)::date AS week_start
+    FROM zamm.workout_main w
+    WHERE w.workout_id = ANY(p_workout_ids)
+      AND w.athlete_id IS NOT NULL
+      AND w.workout_date IS NOT NULL
+    UNION
+    SELECT ww.athlete_id, ww.week_start
+    FROM zamm.agg_training_load_workout_weeks ww
+    WHERE ww.workout_id = ANY(p_workout_ids);
+
+    DELETE FROM zamm.agg_training_load_weekly a
+    USING training_load_weeks g
+    WHERE a.athlete_id = g.athlete_id
+      AND a.week_start = g.week_start;
+
+    DELETE FROM zamm.agg_training_load_workout_weeks
+    WHERE workout_id = ANY(p_workout_ids);
+
+    INSERT INTO zamm.agg_training_load_workout_weeks (workout_id, athlete_id, week_start)
+    SELECT w.workout_id, w.athlete_id, date_trunc('week', w.workout_date)::date
+    FROM zamm.workout_main w
+    WHERE w.workout_id = ANY(p_workout_ids)
+      AND w.athlete_id IS NOT NULL
+      AND w.workout_date IS NOT NULL;
+
+    -- Recompute every exercise of each affected week from all its sets
+    INSERT INTO zamm.agg_training_load_weekly (
+        athlete_id, exercise_name, week_start,
+        workouts, sets, reps, tonnage_kg, best_e1rm_kg, rpe_avg, refreshed_at
+    )
+    SELECT
+        g.athlete_id,
+        btrim(i.exercise_name),
+        g.week_start,
+        COUNT(DISTINCT w.workout_id),
+        COUNT(*),
+        COALESCE(SUM(r.reps), 0),
+        COALESCE(SUM(r.reps * r.load_kg), 0),
+        MAX(
+            CASE
+                WHEN r.load_kg > 0 AND r.reps = 1 THEN r.load_kg
+                WHEN r.load_kg > 0 AND r.reps >= 1 AND r.reps <= 12 THEN r.load_kg * (1 + r.reps / 30.0)
+            END
+        ),
+        AVG(r.rpe),
+        NOW()
+    FROM training_load_weeks g
+    JOIN zamm.workout_main w
+      ON w.athlete_id = g.athlete_id
+     AND w.workout_date >= g.week_start
+     AND w.workout_date < g.week_start + 7
+    JOIN zamm.workout_sessions s ON s.workout_id = w.workout_id
+    JOIN zamm.workout_blocks b ON b.session_id = s.session_id
+    JOIN zamm.workout_items i ON i.block_id = b.block_id AND btrim(i.exercise_name) <> ''
+    CROSS JOIN LATERAL (
+        SELECT rs.reps::NUMERIC AS reps, rs.load_kg, rs.rpe
+        FROM zamm.res_item_sets rs
+        WHERE rs.item_id = i.item_id
+        UNION ALL
+        SELECT ls.reps, ls.load_kg, ls.rpe
+        FROM zamm.performed_list_sets(i.performed_data) ls
+    ) r
+    GROUP BY g.athlete_id, btrim(i.exercise_name), g.week_start;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+COMMENT ON FUNCTION zamm.refresh_training_load_weekly IS
+'Recomputes agg_training_load_weekly for every exercise in the (athlete, week) groups the given workouts are in now or were last aggregated under (pass ids of edited or deleted workouts too), or for workouts created since the last refresh. Returns the rows written.';
+
+-- ============================================
+-- STEP 4: Full rebuild
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.rebuild_training_load_weekly()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    TRUNCATE zamm.agg_training_load_weekly, zamm.agg_training_load_workout_weeks;
+    v_rows := zamm.refresh_training_load_weekly(
+        ARRAY(SELECT workout_id FROM zamm.workout_main WHERE athlete_id IS NOT NULL)
+    );
+    INSERT INTO zamm.agg_refresh_state (aggregate_name, last_created_at, refreshed_at)
+    SELECT 'training_load_weekly', COALESCE(MAX(created_at), '-infinity'), NOW()
+    FROM zamm.workout_main
+    ON CONFLICT (aggregate_name) DO UPDATE
+    SET last_created_at = EXCLUDED.last_created_at,
+        refreshed_at = EXCLUDED.refreshed_at;
+    RETURN v_rows;
+END;
+$$;
+
+COMMENT ON FUNCTION zamm.rebuild_training_load_weekly IS
+'Truncates and recomputes agg_training_load_weekly (and the per-workout weeks) from every workout.';
+
+-- Existing rows used res_item_sets only; this also fills agg_training_load_workout_weeks
+SELECT zamm.rebuild_training_load_weekly();
+
+GRANT SELECT ON zamm.agg_training_load_workout_weeks TO service_role;
+GRANT EXECUTE ON FUNCTION zamm.performed_list_sets TO service_role;
+
+-- ============================================
+-- Migration Complete
+-- ============================================
@@ -0,0 +1,92 @@
+-- ============================================
+-- Migration: Fix check_workout_quality item fields
+-- ============================================
+-- Purpose: Read item fields from the item's JSON, not from the row alias
+-- Date: 2026-01-16
+--
+-- 20260111120000 selected item->>'exercise_name' where "item" is the
+-- jsonb_array_elements alias (a record with columns data, item_idx), so
+-- every call failed with "operator does not exist: record ->> unknown".
+-- commit_full_workout_v4 and commit_full_workouts_bulk_v4 both run this
+-- quality gate first, so neither could commit a workout on a database
+-- built from these migrations. Same checks, reading item.data.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION zamm.check_workout_quality(
+    p_normalized_json JSONB
+)
+RETURNS TABLE(
+    needs_review BOOLEAN,
+    review_reason TEXT,
+    missing_count INTEGER
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_missing_items TEXT[];
+    v_missing_count INTEGER := 0;
+    v_item RECORD;
+BEGIN
+    -- Check for missing exercise_key or exercise_name in items
+    FOR v_item IN
+        SELECT
+            sess_idx,
+            block_idx,
+            item_idx,
+            item.data->>'exercise_name' as exercise_name,
+            item.data->>'exercise_key' as exercise_key,
+            item.data->'prescription_data' as prescription,
+            item.data->'performed_data' as performed
+        FROM
+            jsonb_array_elements(p_normalized_json->'sessions') WITH ORDINALITY AS sess(data, sess_idx),
+            jsonb_array_elements(sess.data->'blocks') WITH ORDINALITY AS blk(data, block_idx),
+            jsonb_array_elements(blk.data->'items') WITH ORDINALITY AS item(data, item_idx)
+    LOOP
+        -- Check 1: Missing exercise_name
+        IF v_item.exercise_name IS NULL OR v_item.exercise_name = '' THEN
+            v_missing_items := array_append(v_missing_items,
+                format('Session %s Block %s Item %s: Missing exercise_name',
+                       v_item.sess_idx, v_item.block_idx, v_item.item_idx));
+            v_missing_count := v_missing_count + 1;
+        END IF;
+
+        -- Check 2: Missing exercise_key (warning, not error)
+        IF v_item.exercise_key IS NULL OR v_item.exercise_key = '' THEN
+            v_missing_items := array_append(v_missing_items,
+                format('Session %s Block %s Item %s: Missing exercise_key for "%s"',
+                       v_item.sess_idx, v_item.block_idx, v_item.item_idx, v_item.exercise_name));
+            v_missing_count := v_missing_count + 1;
+        END IF;
+
+        -- Check 3: Missing critical prescription data (sets/reps for strength blocks)
+        IF v_item.prescription IS NOT NULL AND v_item.prescription != '{}'::jsonb THEN
+            IF NOT (v_item.prescription ? 'target_sets' OR v_item.prescription ? 'target_reps') THEN
+                v_missing_items := array_append(v_missing_items,
+                    format('Session %s Block %s Item %s: Missing target_sets/target_reps for "%s"',
+                           v_item.sess_idx, v_item.block_idx, v_item.item_idx, v_item.exercise_name));
+                v_missing_count := v_missing_count + 1;
+            END IF;
+        END IF;
+    END LOOP;
+
+    -- Return results
+    IF v_missing_count > 0 THEN
+        RETURN QUERY SELECT
+            true AS needs_review,
+            array_to_string(v_missing_items, '; ') AS review_reason,
+            v_missing_count AS missing_count;
+    ELSE
+        RETURN QUERY SELECT
+            false AS needs_review,
+            NULL::TEXT AS review_reason,
+            0 AS missing_count;
+    END IF;
+END;
+$$;
+
+COMMENT ON FUNCTION zamm.check_workout_quality IS
+'Validates workout JSON for missing critical data and returns review requirements';
+
+-- ============================================
+-- Migration Complete
+-- ============================================